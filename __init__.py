@@ -1 +1 @@
-__all__ = ["detti_db", "detti_server"]
+__all__ = ["detti_db", "detti_server", "detti_async"]
@@ -0,0 +1,117 @@
+"""
+Benchmark of the aggregations of the numeric values ("aggregate" method).
+It compares the latency of the aggregations on the array backed numeric columns and
+the latency of the aggregations on the found key-value pairs of a key prefix search
+(the earlier way: "/search_key" and an aggregation on the client side) with different
+sizes of the aggregated key ranges.
+
+Usage:
+    >> python3 benchmarks/bench_aggregate.py --db_size 1000000 --range_sizes 1000 100000 1000000
+"""
+
+import os
+import sys
+import time
+import json
+import random
+import argparse
+import tempfile
+import statistics
+from typing import List, Tuple, Dict, Any, Callable
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import create_db, print_table  # noqa: E402
+
+# The aggregations of the found values of a key prefix search.
+DICT_AGGREGATIONS: Dict[str, Callable[[List[Any]], Any]] = {
+    "sum": sum,
+    "max": max,
+    "mean": statistics.mean,
+    "percentile": lambda values: statistics.quantiles(values, n=100)[94],
+}
+
+
+def run_scenario(detti_db: Any, range_size: int, repeats: int) -> List[Tuple[str, str, str]]:
+    """
+    Run the aggregations on a key range.
+    :param detti_db: The DettiDB instance.
+    :param range_size: Number of the keys in the aggregated range.
+    :param repeats: Number of the repeats of an aggregation.
+    :return: The aggregation, the latency with the columns and with the prefix search (in ms).
+    """
+
+    # The keys are "key_XXXXXXX", so the prefix of the first "range_size" keys is found by digits.
+    key_prefix: str = "key_" + "{:07d}".format(0)[: 7 - len(str(range_size - 1))]
+    results: List[Tuple[str, str, str]] = []
+    for operation, dict_aggregation in DICT_AGGREGATIONS.items():
+        start_time: float = time.perf_counter()
+        for _ in range(repeats):
+            detti_db.aggregate(operation, key_prefix, 95)
+        column_latency: float = (time.perf_counter() - start_time) / repeats * 1000
+
+        start_time = time.perf_counter()
+        for _ in range(repeats):
+            dict_aggregation(list(detti_db.search_keys_in_db(key_prefix).values()))
+        dict_latency: float = (time.perf_counter() - start_time) / repeats * 1000
+
+        results.append((operation, "{:.3f}".format(column_latency), "{:.3f}".format(dict_latency)))
+    return results
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db_size", type=int, default=1000000, help="Keys in the DB.")
+    parser.add_argument(
+        "--range_sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 100000, 1000000],
+        help="Keys in the aggregated ranges (Powers of 10 from 10 to the DB size).",
+    )
+    parser.add_argument("--repeats", type=int, default=10, help="Repeats of an aggregation.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[Any, ...]] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_of_db: str = os.path.join(tmp_dir, "bench.db")
+        # Every second value is an int, the others are floats.
+        with open(path_of_db, "wt", encoding="utf-8") as opened_db:
+            json.dump(
+                {
+                    "key_{:07d}".format(index): (
+                        random.randrange(10 ** 6) if index % 2 else random.random()
+                    )
+                    for index in range(args.db_size)
+                },
+                opened_db,
+            )
+        detti_db = create_db(path_of_db, persistence_mode="wal", wal_fsync="never")
+
+        start_time: float = time.perf_counter()
+        detti_db.aggregate("count")
+        build_time: float = (time.perf_counter() - start_time) * 1000
+
+        for range_size in args.range_sizes:
+            for result in run_scenario(detti_db, range_size, args.repeats):
+                rows.append((range_size, *result))
+        detti_db.close()
+
+    print(
+        "DB size: {} (int and float values), building of the columns: {:.1f} ms".format(
+            args.db_size, build_time
+        )
+    )
+    print_table(("Range size", "Aggregation", "Columns (ms)", "Prefix search (ms)"), rows)
+
+
+if __name__ == "__main__":
+    main()
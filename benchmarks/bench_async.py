@@ -0,0 +1,135 @@
+"""
+Benchmark of the asyncio API ("AsyncDettiDB" class).
+It measures the latency of the event loop (the delay of a 1 ms periodic timer) during a burst
+of writes with a prefilled DB:
+    - DettiDB called directly from a coroutine ("sync" persistence mode, the dumps block the loop).
+    - AsyncDettiDB with "sync" persistence mode (the writes run in the executor).
+    - AsyncDettiDB with "deferred" persistence mode (in memory writes, background writer).
+    - AsyncDettiDB with "deferred" persistence mode and durable writes (grouped flushes).
+
+Usage:
+    >> python3 benchmarks/bench_async.py --db_size 50000 --writes 200
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from typing import List, Tuple, Any, Callable, Awaitable
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import create_db, prefill_db_file, print_table  # noqa: E402
+from detti_async import AsyncDettiDB  # noqa: E402
+
+# Interval of the timer which measures the latency of the event loop.
+TICK_INTERVAL: float = 0.001
+
+
+async def measure_loop_latency(
+    write_burst: Callable[[], Awaitable[None]]
+) -> Tuple[float, List[float]]:
+    """
+    Run a write burst and measure the delays of a periodic timer meanwhile.
+    :param write_burst: The coroutine function of the burst.
+    :return: Duration of the burst (in sec) and the delays of the timer (in ms).
+    """
+
+    delays: List[float] = []
+    burst_done: asyncio.Event = asyncio.Event()
+
+    async def ticker() -> None:
+        while not burst_done.is_set():
+            start_time: float = time.perf_counter()
+            await asyncio.sleep(TICK_INTERVAL)
+            delays.append((time.perf_counter() - start_time - TICK_INTERVAL) * 1000)
+
+    ticker_task: asyncio.Future = asyncio.ensure_future(ticker())
+    # The ticker is started before the burst.
+    await asyncio.sleep(TICK_INTERVAL)
+    start_time: float = time.perf_counter()
+    await write_burst()
+    duration: float = time.perf_counter() - start_time
+    burst_done.set()
+    await ticker_task
+    return duration, delays
+
+
+def run_scenario(name: str, db_size: int, writes: int) -> Tuple[Any, ...]:
+    """
+    Run a scenario with a prefilled DB.
+    :param name: Name of the scenario.
+    :param db_size: Number of the keys in the DB.
+    :param writes: Number of the writes.
+    :return: The row of the scenario (Name, writes/sec, p50, p99 and max delay in ms).
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_of_db: str = os.path.join(tmp_dir, "bench.db")
+        prefill_db_file(path_of_db, db_size)
+        persistence_mode: str = "sync" if "(sync" in name else "deferred"
+        detti_db = create_db(path_of_db, persistence_mode=persistence_mode)
+        async_detti_db: AsyncDettiDB = AsyncDettiDB(detti_db)
+
+        async def write_burst() -> None:
+            for index in range(writes):
+                if name.startswith("DettiDB"):
+                    detti_db.set("burst_key_{}".format(index), "burst_value")
+                    await asyncio.sleep(0)
+                else:
+                    await async_detti_db.set(
+                        "burst_key_{}".format(index), "burst_value", durable="durable" in name
+                    )
+
+        async def run() -> Tuple[float, List[float]]:
+            result: Tuple[float, List[float]] = await measure_loop_latency(write_burst)
+            await async_detti_db.close()
+            return result
+
+        duration, delays = asyncio.run(run())
+
+    delays.sort()
+    return (
+        name,
+        "{:.0f}".format(writes / duration),
+        "{:.2f}".format(delays[len(delays) // 2]),
+        "{:.2f}".format(delays[int(len(delays) * 0.99)]),
+        "{:.2f}".format(delays[-1]),
+    )
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db_size", type=int, default=50000, help="Keys in the DB.")
+    parser.add_argument("--writes", type=int, default=200, help="Number of the writes.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[Any, ...]] = [
+        run_scenario(name, args.db_size, args.writes)
+        for name in (
+            "DettiDB (sync, in the loop)",
+            "AsyncDettiDB (sync, executor)",
+            "AsyncDettiDB (deferred)",
+            "AsyncDettiDB (deferred, durable)",
+        )
+    ]
+
+    print("DB size: {}, writes: {}".format(args.db_size, args.writes))
+    print_table(
+        ("Scenario", "Writes/sec", "Loop delay p50 (ms)", "p99 (ms)", "max (ms)"),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
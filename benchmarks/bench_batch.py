@@ -0,0 +1,102 @@
+"""
+Benchmark of the write batches ("batch" method).
+It measures the time of a write of N keys with a prefilled DB: the keys are set one by one
+(one persistence step per key) and in one write batch (one persistence step per write) with
+the "sync" persistence mode (complete dump) and the "wal" persistence mode ("always" fsync).
+
+Usage:
+    >> python3 benchmarks/bench_batch.py --db_size 10000 --keys 1 10 50 200
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from typing import List, Tuple, Any
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import create_db, prefill_db_file, print_table  # noqa: E402
+
+PERSISTENCE_MODES: Tuple[str, ...] = ("sync", "wal")
+
+
+def run_scenario(db_size: int, keys: int, repeat: int, persistence_mode: str, batch: bool) -> float:
+    """
+    Run the writes of N keys in a DB.
+    :param db_size: Number of the keys in the DB before the writes.
+    :param keys: Number of the keys of a write.
+    :param repeat: Number of the writes.
+    :param persistence_mode: Persistence mode of the DB.
+    :param batch: Set the keys of a write in one write batch.
+    :return: The average time of a write in milliseconds.
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_of_db: str = os.path.join(tmp_dir, "bench.db")
+        prefill_db_file(path_of_db, db_size)
+        detti_db = create_db(path_of_db, persistence_mode=persistence_mode, wal_fsync="always")
+
+        start_time: float = time.perf_counter()
+        for write in range(repeat):
+            if batch:
+                with detti_db.batch() as write_batch:
+                    for index in range(keys):
+                        write_batch.set(
+                            "bench_key_{}".format(index), "bench_value_{}".format(write)
+                        )
+            else:
+                for index in range(keys):
+                    detti_db.set("bench_key_{}".format(index), "bench_value_{}".format(write))
+        elapsed_time: float = time.perf_counter() - start_time
+
+        detti_db.close()
+
+    return elapsed_time / repeat * 1000
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db_size", type=int, default=10000, help="Keys in the DB.")
+    parser.add_argument(
+        "--keys", type=int, nargs="+", default=[1, 10, 50, 200], help="Keys of a write."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Number of the writes.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[Any, ...]] = []
+    for persistence_mode in PERSISTENCE_MODES:
+        for keys in args.keys:
+            one_by_one: float = run_scenario(
+                args.db_size, keys, args.repeat, persistence_mode, batch=False
+            )
+            batched: float = run_scenario(
+                args.db_size, keys, args.repeat, persistence_mode, batch=True
+            )
+            rows.append(
+                (
+                    persistence_mode,
+                    keys,
+                    "{:.2f}".format(one_by_one),
+                    "{:.2f}".format(batched),
+                    "{:.1f}".format(one_by_one / batched),
+                )
+            )
+
+    print("DB size: {} keys, writes: {}".format(args.db_size, args.repeat))
+    print_table(
+        ("Persistence", "Keys", "One by one (ms/write)", "Batch (ms/write)", "Speedup"), rows
+    )
+
+
+if __name__ == "__main__":
+    main()
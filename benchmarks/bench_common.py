@@ -0,0 +1,85 @@
+"""
+This file contains the common helpers of the Detti DB benchmarks.
+"""
+
+import os
+import sys
+import json
+import logging
+from typing import List, Sequence, Dict, Any
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+# Append the path of the root and the tools folders to find modules.
+sys.path.append(os.path.join(PATH_OF_FILE_DIR, ".."))
+sys.path.append(os.path.join(PATH_OF_FILE_DIR, "..", "tools"))
+
+from detti_db import DettiDB, DEFAULT_CONFIG  # noqa: E402
+from color_logger import ColoredLogger  # noqa: E402
+
+
+def quiet_logger() -> ColoredLogger:
+    """
+    Create a logger which doesn't write anything (The logging would distort the results).
+    :return: ColoredLogger object
+    """
+
+    c_logger: ColoredLogger = ColoredLogger("detti_benchmark", console_level=logging.CRITICAL)
+    c_logger.setLevel(logging.CRITICAL)
+    return c_logger
+
+
+def create_db(path_of_db: str, **kwargs) -> DettiDB:
+    """
+    Create a DettiDB instance for benchmarking.
+    :param path_of_db: Path of the DB file.
+    :param kwargs: Overwritten config file parameters.
+    :return: DettiDB object
+    """
+
+    return DettiDB(
+        config_file=DEFAULT_CONFIG,
+        c_logger=quiet_logger(),
+        path_of_db=path_of_db,
+        log_level="CRITICAL",
+        **kwargs,
+    )
+
+
+def generate_content(number_of_keys: int) -> Dict[str, Any]:
+    """
+    Generate the content of a test DB.
+    :param number_of_keys: Number of the keys in the DB.
+    :return: The generated content.
+    """
+
+    return {"key_{:08d}".format(index): "value_{}".format(index) for index in range(number_of_keys)}
+
+
+def prefill_db_file(path_of_db: str, number_of_keys: int) -> None:
+    """
+    Write a Json DB file with generated content.
+    :param path_of_db: Path of the DB file.
+    :param number_of_keys: Number of the keys in the DB.
+    :return: None
+    """
+
+    with open(path_of_db, "wt", encoding="utf-8") as opened_db:
+        json.dump(generate_content(number_of_keys), opened_db, ensure_ascii=False, indent=4)
+
+
+def print_table(header: Sequence[str], rows: List[Sequence[Any]]) -> None:
+    """
+    Print the results in a simple text table.
+    :param header: Names of the columns.
+    :param rows: The rows of the table.
+    :return: None
+    """
+
+    widths: List[int] = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    line_format: str = "  ".join("{{:>{}}}".format(width) for width in widths)
+    print(line_format.format(*header))
+    print(line_format.format(*("-" * width for width in widths)))
+    for row in rows:
+        print(line_format.format(*row))
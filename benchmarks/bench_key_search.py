@@ -0,0 +1,111 @@
+"""
+Benchmark of the key prefix searching ("search_keys_in_db" method).
+It compares the latency of the searching with the sorted key index (bisection to the first
+matched key) and the latency of the full scan of the keys (the earlier implementation)
+with different DB sizes. The number of the matched keys is the same for every DB size.
+
+Usage:
+    >> python3 benchmarks/bench_key_search.py --db_sizes 10000 100000 1000000 --searches 100
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from typing import List, Tuple, Dict, Any
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import create_db, prefill_db_file, print_table  # noqa: E402
+
+
+def full_scan(db_content: Dict[str, Any], key_prefix: str) -> Dict[str, Any]:
+    """
+    Search the keys with a full scan of the DB (The implementation without index).
+    :param db_content: The content of the DB.
+    :param key_prefix: Prefix of the keys.
+    :return: The found key-value pairs.
+    """
+
+    return {key: value for key, value in db_content.items() if key.startswith(key_prefix)}
+
+
+def run_scenario(db_size: int, searches: int) -> Tuple[float, float, float]:
+    """
+    Run the searches in a DB.
+    :param db_size: Number of the keys in the DB.
+    :param searches: Number of the searches.
+    :return: Average latency of the indexed search, of the full scan (in ms)
+             and the latency of a write with index maintenance (in us).
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_of_db: str = os.path.join(tmp_dir, "bench.db")
+        prefill_db_file(path_of_db, db_size)
+        detti_db = create_db(path_of_db, persistence_mode="wal", wal_fsync="never")
+
+        # Every prefix matches 10 keys ("key_XXXXXXX" + 10 digits).
+        prefixes: List[str] = [
+            "key_{:07d}".format(random.randrange(db_size // 10)) for _ in range(searches)
+        ]
+
+        start_time: float = time.perf_counter()
+        for key_prefix in prefixes:
+            detti_db.search_keys_in_db(key_prefix)
+        indexed_latency: float = (time.perf_counter() - start_time) / searches * 1000
+
+        start_time = time.perf_counter()
+        for key_prefix in prefixes:
+            full_scan(detti_db.detti_db, key_prefix)
+        scan_latency: float = (time.perf_counter() - start_time) / searches * 1000
+
+        start_time = time.perf_counter()
+        for index in range(searches):
+            detti_db.set("new_key_{}".format(index), index)
+        write_latency: float = (time.perf_counter() - start_time) / searches * 1e6
+
+        detti_db.close()
+
+    return indexed_latency, scan_latency, write_latency
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db_sizes",
+        type=int,
+        nargs="+",
+        default=[10000, 100000, 1000000],
+        help="Keys in the DB.",
+    )
+    parser.add_argument("--searches", type=int, default=100, help="Number of the searches.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[int, str, str, str]] = []
+    for db_size in args.db_sizes:
+        indexed_latency, scan_latency, write_latency = run_scenario(db_size, args.searches)
+        rows.append(
+            (
+                db_size,
+                "{:.3f}".format(indexed_latency),
+                "{:.3f}".format(scan_latency),
+                "{:.1f}".format(write_latency),
+            )
+        )
+
+    print("Searches: {} (10 matched keys per search)".format(args.searches))
+    print_table(("DB size", "Indexed search (ms)", "Full scan (ms)", "Write with index (us)"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark of the lazy loading of the DB file ("lazy" storage format).
+It measures the time-to-first-request of the Detti Server: the server is started with a
+prefilled DB file and the first "/get/<key>" request is sent until it is answered.
+The startup of "lazy" storage format grows with the number of the keys and not with the size
+of the values, so the results are shown with different value sizes.
+Note: The started servers write their log files to the "logs" folder.
+
+Usage:
+    >> python3 benchmarks/bench_lazy_load.py --keys 100000 --value_sizes 10 1000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import configparser
+import urllib.error
+import urllib.request
+from typing import List, Tuple, Dict, Any
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import print_table  # noqa: E402
+from detti_db import DEFAULT_CONFIG  # noqa: E402
+from detti_serializers import get_serializer, dump_file  # noqa: E402
+
+PATH_OF_SERVER: str = os.path.join(PATH_OF_FILE_DIR, "..", "detti_server.py")
+
+
+def write_config_file(path_of_config: str, path_of_db: str, storage_format: str, port: int) -> None:
+    """
+    Write a config file for the benchmarked server based on the default config file.
+    :param path_of_config: Path of the config file.
+    :param path_of_db: Path of the DB file.
+    :param storage_format: Storage format of the DB file.
+    :param port: Port of the server.
+    :return: None
+    """
+
+    config_data: configparser.ConfigParser = configparser.ConfigParser()
+    config_data.read(DEFAULT_CONFIG)
+    config_data.set("DETTI_DB", "path_of_db", path_of_db)
+    config_data.set("DETTI_DB", "log_level", "CRITICAL")
+    config_data.set("DETTI_DB", "storage_format", storage_format)
+    config_data.set("SERVER", "port", str(port))
+    # The reloader of the debug mode would start the server twice.
+    config_data.set("SERVER", "debug", "False")
+    for limit in ("sec_limit", "min_limit", "hour_limit", "day_limit"):
+        config_data.set("SERVER", limit, "1000000")
+    with open(path_of_config, "wt", encoding="utf-8") as opened_config:
+        config_data.write(opened_config)
+    os.chmod(path_of_config, 0o600)
+
+
+def time_to_first_request(path_of_config: str, port: int, db_key: str) -> float:
+    """
+    Start the server and measure the time until the first request is answered.
+    :param path_of_config: Path of the config file.
+    :param port: Port of the server.
+    :param db_key: The requested key.
+    :return: The time-to-first-request in seconds.
+    """
+
+    url: str = "http://localhost:{}/get/{}".format(port, db_key)
+    start_time: float = time.perf_counter()
+    server: subprocess.Popen = subprocess.Popen(
+        [sys.executable, PATH_OF_SERVER, "--config_file", path_of_config],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(
+                    "The server has stopped. Exit code: {}".format(server.returncode)
+                )
+            try:
+                with urllib.request.urlopen(url) as response:
+                    response.read()
+                return time.perf_counter() - start_time
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=100000, help="Keys in the DB.")
+    parser.add_argument(
+        "--value_sizes", type=int, nargs="+", default=[10, 1000], help="Sizes of the values."
+    )
+    parser.add_argument("--port", type=int, default=5099, help="Port of the benchmarked server.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[str, int, str, str]] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for value_size in args.value_sizes:
+            content: Dict[str, Any] = {
+                "key_{:08d}".format(index): str(index).rjust(value_size, "x")
+                for index in range(args.keys)
+            }
+            for storage_format in ("json_pretty", "lazy"):
+                path_of_db: str = os.path.join(tmp_dir, "{}.db".format(storage_format))
+                path_of_config: str = os.path.join(tmp_dir, "{}.ini".format(storage_format))
+                dump_file(content, path_of_db, get_serializer(storage_format))
+                write_config_file(path_of_config, path_of_db, storage_format, args.port)
+                elapsed_time: float = time_to_first_request(
+                    path_of_config, args.port, "key_{:08d}".format(args.keys // 2)
+                )
+                rows.append(
+                    (
+                        storage_format,
+                        value_size,
+                        "{:.1f}".format(os.path.getsize(path_of_db) / 1024 / 1024),
+                        "{:.3f}".format(elapsed_time),
+                    )
+                )
+
+    print("DB size: {} keys".format(args.keys))
+    print_table(("Storage format", "Value size", "Size (MB)", "Time-to-first-request (sec)"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark of the striped locks of the keys ("lock_stripes" parameter).
+It measures the throughput of concurrent writer threads on independent keys with 1 to 32
+writer threads, with one lock stripe (every change waits for the previous one, including its
+fsync) and with the configured number of stripes (the fsync calls of the concurrent changes
+are grouped). The "wal" persistence mode is used with "always" fsync policy by default.
+In "sync" persistence mode the dumps of the DB file are grouped instead of the fsync calls.
+
+Usage:
+    >> python3 benchmarks/bench_lock_striping.py --threads 1 2 4 8 16 32 --writes 20000
+    >> python3 benchmarks/bench_lock_striping.py --persistence_mode sync --writes 2000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from threading import Thread
+from typing import List, Tuple, Any
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import create_db, print_table  # noqa: E402
+
+
+def run_scenario(
+    threads: int, writes: int, lock_stripes: int, wal_fsync: str, persistence_mode: str
+) -> float:
+    """
+    Run concurrent writer threads on independent keys.
+    :param threads: Number of the writer threads.
+    :param writes: Number of all writes (They are shared by the threads).
+    :param lock_stripes: Number of the lock stripes.
+    :param wal_fsync: Fsync policy of the write-ahead log.
+    :param persistence_mode: Persistence mode of the DB.
+    :return: Writes/sec.
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        detti_db = create_db(
+            os.path.join(tmp_dir, "bench.db"),
+            persistence_mode=persistence_mode,
+            wal_fsync=wal_fsync,
+            lock_stripes=str(lock_stripes),
+        )
+
+        def writer_thread(writer: int) -> None:
+            for index in range(writes // threads):
+                detti_db.set("key_{}_{:08d}".format(writer, index), "value_{}".format(index))
+
+        writer_threads: List[Thread] = [
+            Thread(target=writer_thread, args=(writer,)) for writer in range(threads)
+        ]
+        start_time: float = time.perf_counter()
+        for writer_thread_instance in writer_threads:
+            writer_thread_instance.start()
+        for writer_thread_instance in writer_threads:
+            writer_thread_instance.join()
+        duration: float = time.perf_counter() - start_time
+        detti_db.close()
+
+    return writes // threads * threads / duration
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16, 32],
+        help="Numbers of the writer threads.",
+    )
+    parser.add_argument("--writes", type=int, default=20000, help="Number of the writes.")
+    parser.add_argument("--lock_stripes", type=int, default=16, help="Number of the stripes.")
+    parser.add_argument(
+        "--wal_fsync",
+        default="always",
+        choices=["always", "every_sec", "never"],
+        help="Fsync policy of the write-ahead log.",
+    )
+    parser.add_argument(
+        "--persistence_mode",
+        default="wal",
+        choices=["wal", "sync"],
+        help="Persistence mode of the DB.",
+    )
+    args = parser.parse_args()
+
+    rows: List[Tuple[Any, ...]] = []
+    for threads in args.threads:
+        single_lock: float = run_scenario(
+            threads, args.writes, 1, args.wal_fsync, args.persistence_mode
+        )
+        striped: float = run_scenario(
+            threads, args.writes, args.lock_stripes, args.wal_fsync, args.persistence_mode
+        )
+        rows.append(
+            (
+                threads,
+                "{:.0f}".format(single_lock),
+                "{:.0f}".format(striped),
+                "{:.2f}".format(striped / single_lock),
+            )
+        )
+
+    print(
+        "Writes: {}, persistence mode: {}, fsync policy: {}".format(
+            args.writes, args.persistence_mode, args.wal_fsync
+        )
+    )
+    print_table(
+        (
+            "Threads",
+            "1 stripe (writes/sec)",
+            "{} stripes (writes/sec)".format(args.lock_stripes),
+            "Speedup",
+        ),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark of the LSM-tree storage engine (compared with the other storage engines).
+It writes random keys into an empty DB with the storage engines and measures the writes/sec,
+the read latency of the existing and the missing keys (The missing keys are filtered by the
+bloom filters of the LSM-tree) and the prefix search time.
+The write amplification of the LSM-tree (written bytes of the log and of the segments per
+written bytes of the changes) is shown after the compactions.
+
+Usage:
+    >> python3 benchmarks/bench_lsm.py --writes 200000 --reads 10000
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from typing import List, Tuple, Dict, Any
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import create_db, print_table  # noqa: E402
+
+STORAGE_ENGINES: Tuple[str, ...] = ("memory", "mmap", "lsm", "sqlite")
+
+
+def percentile(latencies: List[float], percent: int) -> str:
+    """
+    Provide a percentile of the latencies in microseconds.
+    :param latencies: The sorted latencies in seconds.
+    :param percent: The percentile.
+    :return: The formatted percentile.
+    """
+
+    return "{:.1f}".format(
+        latencies[min(len(latencies) - 1, len(latencies) * percent // 100)] * 1e6
+    )
+
+
+def run_scenario(storage_engine: str, writes: int, reads: int, value_size: int) -> Dict[str, Any]:
+    """
+    Run the writes and the reads with a storage engine.
+    :param storage_engine: The storage engine.
+    :param writes: Number of the writes.
+    :param reads: Number of the reads.
+    :param value_size: Size of the values.
+    :return: The results in a dict.
+    """
+
+    keys: List[str] = ["key_{:08d}".format(random.randrange(writes * 10)) for _ in range(writes)]
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        detti_db = create_db(
+            os.path.join(tmp_dir, "bench.db"),
+            persistence_mode="deferred",
+            storage_engine=storage_engine,
+        )
+
+        start_time: float = time.perf_counter()
+        for key in keys:
+            detti_db.set(key, "v" * value_size)
+        results["writes_per_sec"] = writes / (time.perf_counter() - start_time)
+
+        if storage_engine == "lsm":
+            detti_db.detti_db.flush_memtable()
+            detti_db.detti_db.wait_for_compaction()
+            results["write_amplification"] = "{:.2f}".format(
+                detti_db.detti_db.get_stats()["write_amplification"]
+            )
+        else:
+            results["write_amplification"] = "-"
+
+        for name, read_keys in (
+            ("hit", random.sample(keys, min(reads, len(keys)))),
+            ("miss", ["missing_key_{}".format(index) for index in range(reads)]),
+        ):
+            latencies: List[float] = []
+            for key in read_keys:
+                start_time = time.perf_counter()
+                detti_db.get(key)
+                latencies.append(time.perf_counter() - start_time)
+            latencies.sort()
+            results["{}_p50".format(name)] = percentile(latencies, 50)
+            results["{}_p99".format(name)] = percentile(latencies, 99)
+
+        start_time = time.perf_counter()
+        detti_db.search_keys_in_db("key_0000")
+        results["search_ms"] = "{:.1f}".format((time.perf_counter() - start_time) * 1000)
+
+        detti_db.close()
+
+    return results
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writes", type=int, default=200000, help="Number of the writes.")
+    parser.add_argument("--reads", type=int, default=10000, help="Number of the reads.")
+    parser.add_argument("--value_size", type=int, default=100, help="Size of the values.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[str, ...]] = []
+    for storage_engine in STORAGE_ENGINES:
+        results: Dict[str, Any] = run_scenario(
+            storage_engine, args.writes, args.reads, args.value_size
+        )
+        rows.append(
+            (
+                storage_engine,
+                "{:.1f}".format(results["writes_per_sec"]),
+                results["write_amplification"],
+                results["hit_p50"],
+                results["hit_p99"],
+                results["miss_p50"],
+                results["miss_p99"],
+                results["search_ms"],
+            )
+        )
+
+    print("Writes: {}, reads: {}, value size: {}".format(args.writes, args.reads, args.value_size))
+    print_table(
+        (
+            "Engine",
+            "Writes/sec",
+            "Write ampl.",
+            "Hit p50 (us)",
+            "Hit p99 (us)",
+            "Miss p50 (us)",
+            "Miss p99 (us)",
+            "Prefix search (ms)",
+        ),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Benchmark of the multi-process serving of the Detti Server ("workers" parameter).
+The server is started with different numbers of HTTP worker processes and a prefilled DB,
+then concurrent client processes send "/get/<key>" requests (reads) and "/set" requests
+(writes, they are serialized by the storage-owner process) for a fixed time.
+The results are the requests/sec by the number of the workers.
+Note: The started servers write their log files to the "logs" folder.
+
+Usage:
+    >> python3 benchmarks/bench_multiprocess_server.py --workers 1 2 4 8 --clients 16
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+import configparser
+import urllib.error
+import urllib.parse
+import urllib.request
+import multiprocessing
+from typing import List, Tuple, Any
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import prefill_db_file, print_table  # noqa: E402
+from detti_db import DEFAULT_CONFIG  # noqa: E402
+
+PATH_OF_SERVER: str = os.path.join(PATH_OF_FILE_DIR, "..", "detti_server.py")
+
+
+def write_config_file(path_of_config: str, path_of_db: str, port: int, workers: int) -> None:
+    """
+    Write a config file for the benchmarked server based on the default config file.
+    :param path_of_config: Path of the config file.
+    :param path_of_db: Path of the DB file.
+    :param port: Port of the server.
+    :param workers: Number of the HTTP worker processes.
+    :return: None
+    """
+
+    config_data: configparser.ConfigParser = configparser.ConfigParser()
+    config_data.read(DEFAULT_CONFIG)
+    config_data.set("DETTI_DB", "path_of_db", path_of_db)
+    config_data.set("DETTI_DB", "log_level", "CRITICAL")
+    config_data.set("DETTI_DB", "persistence_mode", "wal")
+    config_data.set("SERVER", "port", str(port))
+    config_data.set("SERVER", "workers", str(workers))
+    # The reloader of the debug mode would start the server twice.
+    config_data.set("SERVER", "debug", "False")
+    for limit in ("sec_limit", "min_limit", "hour_limit", "day_limit"):
+        config_data.set("SERVER", limit, "100000000")
+    with open(path_of_config, "wt", encoding="utf-8") as opened_config:
+        config_data.write(opened_config)
+    os.chmod(path_of_config, 0o600)
+
+
+def wait_for_server(server: subprocess.Popen, port: int) -> None:
+    """
+    Wait until the server answers.
+    :param server: The process of the server.
+    :param port: Port of the server.
+    :return: None
+    """
+
+    while True:
+        if server.poll() is not None:
+            raise RuntimeError("The server has stopped. Exit code: {}".format(server.returncode))
+        try:
+            with urllib.request.urlopen("http://localhost:{}/ping".format(port)) as response:
+                response.read()
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.05)
+
+
+def client_process(port: int, db_size: int, write_ratio: float, duration: float) -> int:
+    """
+    Send requests until the end of the duration.
+    :param port: Port of the server.
+    :param db_size: Number of the keys in the DB.
+    :param write_ratio: Ratio of the "/set" requests.
+    :param duration: Duration of the sending in seconds.
+    :return: Number of the answered requests.
+    """
+
+    answered: int = 0
+    end_time: float = time.perf_counter() + duration
+    while time.perf_counter() < end_time:
+        db_key: str = "key_{:08d}".format(random.randrange(db_size))
+        if random.random() < write_ratio:
+            request: urllib.request.Request = urllib.request.Request(
+                "http://localhost:{}/set".format(port),
+                data=urllib.parse.urlencode({db_key: "new_value"}).encode("utf-8"),
+                method="PUT",
+            )
+        else:
+            request = urllib.request.Request("http://localhost:{}/get/{}".format(port, db_key))
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        answered += 1
+    return answered
+
+
+def run_scenario(
+    path_of_config: str, port: int, clients: int, db_size: int, write_ratio: float, duration: float
+) -> float:
+    """
+    Start the server and measure the requests/sec with concurrent clients.
+    :param path_of_config: Path of the config file.
+    :param port: Port of the server.
+    :param clients: Number of the client processes.
+    :param db_size: Number of the keys in the DB.
+    :param write_ratio: Ratio of the "/set" requests.
+    :param duration: Duration of the measurement in seconds.
+    :return: Requests/sec.
+    """
+
+    server: subprocess.Popen = subprocess.Popen(
+        [sys.executable, PATH_OF_SERVER, "--config_file", path_of_config],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_server(server, port)
+        with multiprocessing.Pool(clients) as pool:
+            answered: List[int] = pool.starmap(
+                client_process, [(port, db_size, write_ratio, duration)] * clients
+            )
+    finally:
+        server.terminate()
+        server.wait()
+    return sum(answered) / duration
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Numbers of the workers."
+    )
+    parser.add_argument("--clients", type=int, default=16, help="Number of the client processes.")
+    parser.add_argument("--db_size", type=int, default=10000, help="Keys in the DB.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Duration of a measurement.")
+    parser.add_argument("--port", type=int, default=5099, help="Port of the benchmarked server.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[Any, ...]] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for workers in args.workers:
+            row: List[Any] = [workers]
+            for write_ratio in (0.0, 0.1):
+                path_of_db: str = os.path.join(tmp_dir, "bench_{}.db".format(workers))
+                path_of_config: str = os.path.join(tmp_dir, "bench_{}.ini".format(workers))
+                prefill_db_file(path_of_db, args.db_size)
+                for suffix in (".wal", ".wal.compacting"):
+                    if os.path.isfile(path_of_db + suffix):
+                        os.remove(path_of_db + suffix)
+                write_config_file(path_of_config, path_of_db, args.port, workers)
+                row.append(
+                    "{:.0f}".format(
+                        run_scenario(
+                            path_of_config,
+                            args.port,
+                            args.clients,
+                            args.db_size,
+                            write_ratio,
+                            args.duration,
+                        )
+                    )
+                )
+            rows.append(tuple(row))
+
+    print(
+        "Clients: {}, DB size: {}, CPU cores: {}".format(args.clients, args.db_size, os.cpu_count())
+    )
+    print_table(("Workers", "Reads (req/sec)", "90% reads, 10% writes (req/sec)"), rows)
+
+
+if __name__ == "__main__":
+    main()
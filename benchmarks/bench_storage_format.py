@@ -0,0 +1,90 @@
+"""
+Benchmark of the storage formats (serialization backends) of the DB file.
+It measures the dump time, the load time and the on-disk size per storage format.
+The values of the generated DB are mixed: str, int, float, list and dict values.
+
+Usage:
+    >> python3 benchmarks/bench_storage_format.py --keys 1000000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from typing import List, Tuple, Dict, Any
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import print_table  # noqa: E402
+from detti_serializers import SERIALIZERS, dump_file, load_file  # noqa: E402
+
+
+def generate_mixed_content(number_of_keys: int) -> Dict[str, Any]:
+    """
+    Generate the content of a test DB with mixed value types.
+    :param number_of_keys: Number of the keys in the DB.
+    :return: The generated content.
+    """
+
+    content: Dict[str, Any] = {}
+    for index in range(number_of_keys):
+        key: str = "key_{:08d}".format(index)
+        value_type: int = index % 5
+        if value_type == 0:
+            content[key] = "value_{}".format(index)
+        elif value_type == 1:
+            content[key] = index
+        elif value_type == 2:
+            content[key] = index / 7
+        elif value_type == 3:
+            content[key] = ["item_{}".format(index), index, [index % 10]]
+        else:
+            content[key] = {"id": index, "status": "active", "tags": {"a": 1, "b": [1, 2]}}
+    return content
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=1000000, help="Keys in the DB.")
+    args = parser.parse_args()
+
+    content: Dict[str, Any] = generate_mixed_content(args.keys)
+
+    rows: List[Tuple[str, str, str, str]] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for storage_format, serializer in SERIALIZERS.items():
+            path_of_db: str = os.path.join(tmp_dir, "{}.db".format(storage_format))
+
+            start_time: float = time.perf_counter()
+            dump_file(content, path_of_db, serializer)
+            dump_time: float = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            loaded_content, _ = load_file(path_of_db)
+            load_time: float = time.perf_counter() - start_time
+            assert loaded_content == content
+
+            rows.append(
+                (
+                    storage_format,
+                    "{:.3f}".format(dump_time),
+                    "{:.3f}".format(load_time),
+                    "{:.1f}".format(os.path.getsize(path_of_db) / 1024 / 1024),
+                )
+            )
+
+    print("DB size: {} keys".format(args.keys))
+    print_table(("Storage format", "Dump (sec)", "Load (sec)", "Size (MB)"), rows)
+
+
+if __name__ == "__main__":
+    main()
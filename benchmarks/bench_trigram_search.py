@@ -0,0 +1,132 @@
+"""
+Benchmark of the substring and glob key searching ("search_substring_in_db" and
+"search_glob_in_db" methods).
+It compares the latency of the searching with the trigram index (intersection of the posting
+lists and verification of the candidates) and the latency of a linear regex scan of the keys
+(the client side workaround over "/getall") with different DB sizes.
+The first search builds the trigram index, its time is reported separately.
+
+Usage:
+    >> python3 benchmarks/bench_trigram_search.py --db_sizes 10000 100000 1000000 --searches 100
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import fnmatch
+import argparse
+import tempfile
+from typing import List, Tuple, Dict, Any, Pattern
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import create_db, prefill_db_file, print_table  # noqa: E402
+
+
+def regex_scan(db_content: Dict[str, Any], regex: Pattern) -> Dict[str, Any]:
+    """
+    Search the keys with a linear regex scan of the DB.
+    :param db_content: The content of the DB.
+    :param regex: The compiled regex of the query.
+    :return: The found key-value pairs.
+    """
+
+    return {key: value for key, value in db_content.items() if regex.search(key)}
+
+
+def run_scenario(db_size: int, searches: int) -> Tuple[float, float, float, float, float]:
+    """
+    Run the searches in a DB.
+    :param db_size: Number of the keys in the DB.
+    :param searches: Number of the searches.
+    :return: Time of the index building (in ms), average latency of the indexed substring
+             search, of the substring regex scan, of the indexed glob search
+             and of the glob regex scan (in ms).
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_of_db: str = os.path.join(tmp_dir, "bench.db")
+        prefill_db_file(path_of_db, db_size)
+        detti_db = create_db(path_of_db, persistence_mode="wal", wal_fsync="never")
+
+        # The keys are "key_XXXXXXXX". The substrings are the last 7 digits of a key,
+        # the glob patterns are "key_*" + 5 digits + "?" + 1 digit of a key.
+        digits_of_keys: List[str] = [
+            "{:08d}".format(random.randrange(db_size)) for _ in range(searches)
+        ]
+        substrings: List[str] = [digits[1:] for digits in digits_of_keys]
+        patterns: List[str] = [
+            "key_*{}?{}".format(digits[1:6], digits[7]) for digits in digits_of_keys
+        ]
+
+        start_time: float = time.perf_counter()
+        detti_db.search_substring_in_db("")
+        build_time: float = (time.perf_counter() - start_time) * 1000
+
+        latencies: List[float] = []
+        for queries, search, to_regex in (
+            (substrings, detti_db.search_substring_in_db, re.escape),
+            (patterns, detti_db.search_glob_in_db, fnmatch.translate),
+        ):
+            start_time = time.perf_counter()
+            for query in queries:
+                search(query)
+            latencies.append((time.perf_counter() - start_time) / searches * 1000)
+
+            start_time = time.perf_counter()
+            for query in queries:
+                regex_scan(detti_db.detti_db, re.compile(to_regex(query)))
+            latencies.append((time.perf_counter() - start_time) / searches * 1000)
+
+        detti_db.close()
+
+    return (build_time, *latencies)
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--db_sizes",
+        type=int,
+        nargs="+",
+        default=[10000, 100000, 1000000],
+        help="Keys in the DB.",
+    )
+    parser.add_argument("--searches", type=int, default=100, help="Number of the searches.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[Any, ...]] = []
+    for db_size in args.db_sizes:
+        rows.append(
+            (
+                db_size,
+                *("{:.3f}".format(result) for result in run_scenario(db_size, args.searches)),
+            )
+        )
+
+    print("Searches: {}".format(args.searches))
+    print_table(
+        (
+            "DB size",
+            "Index build (ms)",
+            "Substring indexed (ms)",
+            "Substring regex scan (ms)",
+            "Glob indexed (ms)",
+            "Glob regex scan (ms)",
+        ),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of the persistence modes.
+It compares the writes/sec of the "sync" mode (complete dump after every change),
+the "deferred" mode (coalesced dumps by a background flusher thread)
+and the "wal" mode (appending to the write-ahead log) with the different fsync policies.
+
+Usage:
+    >> python3 benchmarks/bench_wal.py --db_size 100000 --writes 1000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from typing import List, Tuple, Dict
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from bench_common import create_db, prefill_db_file, print_table  # noqa: E402
+
+SCENARIOS: List[Tuple[str, Dict[str, str]]] = [
+    ("sync", dict(persistence_mode="sync")),
+    ("deferred", dict(persistence_mode="deferred")),
+    ("wal (fsync: always)", dict(persistence_mode="wal", wal_fsync="always")),
+    ("wal (fsync: every_sec)", dict(persistence_mode="wal", wal_fsync="every_sec")),
+    ("wal (fsync: never)", dict(persistence_mode="wal", wal_fsync="never")),
+]
+
+
+def run_scenario(db_size: int, writes: int, **kwargs) -> float:
+    """
+    Run the writes in a DB with the given persistence parameters.
+    :param db_size: Number of the keys in the DB before the writes.
+    :param writes: Number of the writes.
+    :param kwargs: Overwritten config file parameters.
+    :return: Writes/sec
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path_of_db: str = os.path.join(tmp_dir, "bench.db")
+        prefill_db_file(path_of_db, db_size)
+        detti_db = create_db(path_of_db, **kwargs)
+
+        start_time: float = time.perf_counter()
+        for index in range(writes):
+            detti_db.set("bench_key_{}".format(index % 100), "bench_value_{}".format(index))
+        elapsed_time: float = time.perf_counter() - start_time
+
+        detti_db.close()
+
+    return writes / elapsed_time
+
+
+def main() -> None:
+    """
+    Main function of the benchmark.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db_size", type=int, default=100000, help="Keys in the DB.")
+    parser.add_argument("--writes", type=int, default=1000, help="Number of the writes.")
+    args = parser.parse_args()
+
+    rows: List[Tuple[str, str]] = []
+    for name, kwargs in SCENARIOS:
+        writes_per_sec: float = run_scenario(args.db_size, args.writes, **kwargs)
+        rows.append((name, "{:.1f}".format(writes_per_sec)))
+
+    print("DB size: {} keys, writes: {}".format(args.db_size, args.writes))
+    print_table(("Persistence", "Writes/sec"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Milan Balazs
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Asyncio API of the Detti DB.
+The "AsyncDettiDB" class is an awaitable facade of a "DettiDB" instance for the asyncio services.
+    - The reads of the in-memory storage engine are served inline (They don't block).
+    - The writes are served inline if they don't wait for I/O ("deferred" persistence mode or
+      "wal" persistence mode without "always" fsync policy). The pending changes are persisted by
+      the background writer of the persistence mode.
+    - The other writes ("sync" persistence mode, "always" fsync policy) and all operations of
+      the on-disk storage engines run in an executor. The executor has one worker by default,
+      so the writes are done in the order of their calls.
+    - A write with "durable=True" returns when the change is on the disk. The flushes of
+      the concurrent durable writes are grouped (A flush persists all earlier changes).
+Usage example:
+    Code part:
+        async def main() -> None:
+            async_detti_db = AsyncDettiDB(persistence_mode="deferred")
+            await async_detti_db.set("test_key", "test_val")  # The change is in the memory.
+            await async_detti_db.set("test_int_key", 5, durable=True)  # The changes are on disk.
+            print(await async_detti_db.get("test_key"))
+            await async_detti_db.close()
+
+        asyncio.run(main())
+    Output:
+        test_val
+"""
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional, Union, Any, Callable
+
+# Import own modules.
+from detti_db import DettiDB, DEFAULT_CONFIG
+
+
+class AsyncDettiDB(object):
+    """
+    Awaitable facade of the DettiDB.
+    """
+
+    def __init__(
+        self,
+        detti_db: Optional[DettiDB] = None,
+        executor: Optional[Executor] = None,
+        config_file: str = DEFAULT_CONFIG,
+        **kwargs,
+    ) -> None:
+        """
+        Init method of 'AsyncDettiDB' class.
+        :param detti_db: The wrapped DettiDB instance. Default: A new instance is created.
+        :param executor: Executor of the blocking operations. Default: Thread pool with one worker.
+        :param config_file: Path of the config file (If a new DettiDB instance is created).
+        :param kwargs: The overwritten config file parameters (If a new instance is created).
+        """
+
+        self.detti_db: DettiDB = (
+            detti_db if detti_db is not None else DettiDB(config_file=config_file, **kwargs)
+        )
+        self.own_executor: bool = executor is None
+        self.executor: Executor = (
+            executor if executor is not None else ThreadPoolExecutor(max_workers=1)
+        )
+        # The reads of the in-memory storage engine don't wait for I/O.
+        self.inline_reads: bool = not self.detti_db.disk_engine
+        # The writes which don't wait for I/O (The background writer persists the changes).
+        self.inline_writes: bool = self.inline_reads and (
+            self.detti_db.persistence_mode == "deferred"
+            or (self.detti_db.persistence_mode == "wal" and self.detti_db.wal_fsync != "always")
+        )
+        # The changes are persisted by the writes themselves (A flush is not needed).
+        self.durable_writes: bool = self.detti_db.persistence_mode == "sync" or (
+            self.detti_db.persistence_mode == "wal" and self.detti_db.wal_fsync == "always"
+        )
+        # The flush which is not started yet (The durable writes wait for it together).
+        self.queued_flush: Optional[asyncio.Future] = None
+        self.flush_lock: Optional[asyncio.Lock] = None
+
+    async def _run(self, inline: bool, function: Callable, *args, **kwargs) -> Any:
+        """
+        Run an operation of the DB inline or in the executor.
+        :param inline: Run the operation inline.
+        :param function: The operation.
+        :param args: The positional arguments of the operation.
+        :param kwargs: The keyword arguments of the operation.
+        :return: The result of the operation.
+        """
+
+        if inline:
+            return function(*args, **kwargs)
+        return await asyncio.get_event_loop().run_in_executor(
+            self.executor, partial(function, *args, **kwargs)
+        )
+
+    async def _write(self, durable: bool, function: Callable, *args) -> bool:
+        """
+        Run a write operation of the DB.
+        :param durable: Wait until the change is persisted.
+        :param function: The write operation.
+        :param args: The arguments of the operation.
+        :return: The result of the operation.
+        """
+
+        result: bool = await self._run(self.inline_writes, function, *args)
+        if durable and not self.durable_writes:
+            await self.flush()
+        return result
+
+    async def get(
+        self, db_key: str, default_value: Any = None
+    ) -> Optional[Union[str, int, float, list, dict]]:
+        """
+        Providing the value of a key (See: "get" method of DettiDB).
+        :param db_key: Related key.
+        :param default_value: If the key is not in DB, the default value will be returned.
+        :return: The value of the key.
+        """
+
+        return await self._run(self.inline_reads, self.detti_db.get, db_key, default_value)
+
+    async def get_all(self) -> Dict[str, Any]:
+        """
+        Providing the complete DB (See: "get_all" method of DettiDB).
+        :return: The complete DB in a dict.
+        """
+
+        return await self._run(self.inline_reads, self.detti_db.get_all)
+
+    async def set(
+        self, db_key: str, db_value: Union[str, int, float, list, dict], durable: bool = False
+    ) -> bool:
+        """
+        Setting an item in the DB. The setter is selected by the type of the value.
+        :param db_key: Key of the item.
+        :param db_value: Value of the key.
+        :param durable: Wait until the change is persisted. Default: The change is in the memory.
+        :return: True if the operation is success else False.
+        """
+
+        return await self._write(durable, self.detti_db.__setitem__, db_key, db_value)
+
+    async def delete(self, db_key: str, durable: bool = False) -> bool:
+        """
+        Deleting an item from the DB.
+        :param db_key: Key of the item.
+        :param durable: Wait until the change is persisted. Default: The change is in the memory.
+        :return: True if the operation is success else False.
+        """
+
+        return await self._write(durable, self.detti_db.delete, db_key)
+
+    async def search_keys_in_db(self, key_prefix: str) -> Dict[str, Any]:
+        """
+        Searching the keys based on the provided prefix (See: DettiDB).
+        :param key_prefix: Prefix of the key.
+        :return: The found key-value pairs in a dict.
+        """
+
+        return await self._run(self.inline_reads, self.detti_db.search_keys_in_db, key_prefix)
+
+    async def search_values_in_db(self, value_prefix: str) -> Dict[str, Any]:
+        """
+        Searching the values based on the provided prefix (See: DettiDB).
+        :param value_prefix: Prefix of the value.
+        :return: The found key-value pairs in a dict.
+        """
+
+        return await self._run(self.inline_reads, self.detti_db.search_values_in_db, value_prefix)
+
+    async def search_substring_in_db(self, text: str, in_values: bool = False) -> Dict[str, Any]:
+        """
+        Searching the keys or the values which contain a text (See: DettiDB).
+        :param text: The searched text.
+        :param in_values: Search in the values instead of the keys.
+        :return: The found key-value pairs in a dict.
+        """
+
+        return await self._run(
+            self.inline_reads, self.detti_db.search_substring_in_db, text, in_values
+        )
+
+    async def search_glob_in_db(self, pattern: str, in_values: bool = False) -> Dict[str, Any]:
+        """
+        Searching the keys or the values which match a glob pattern (See: DettiDB).
+        :param pattern: The glob pattern.
+        :param in_values: Search in the values instead of the keys.
+        :return: The found key-value pairs in a dict.
+        """
+
+        return await self._run(
+            self.inline_reads, self.detti_db.search_glob_in_db, pattern, in_values
+        )
+
+    async def flush(self) -> None:
+        """
+        Persisting the pending changes in the executor (See: "flush" method of DettiDB).
+        The concurrent calls wait for the same flush if it is not started yet.
+        :return: None
+        """
+
+        if self.queued_flush is None:
+            self.queued_flush = asyncio.ensure_future(self._run_flush())
+        await asyncio.shield(self.queued_flush)
+
+    async def _run_flush(self) -> None:
+        """
+        Run a queued flush after the running one.
+        :return: None
+        """
+
+        if self.flush_lock is None:
+            self.flush_lock = asyncio.Lock()
+        async with self.flush_lock:
+            # The changes after this point need a new flush.
+            self.queued_flush = None
+            await self._run(False, self.detti_db.flush)
+
+    async def close(self) -> None:
+        """
+        Closing the DB in the executor (The pending changes are persisted).
+        The own executor is shut down.
+        :return: None
+        """
+
+        await self._run(False, self.detti_db.close)
+        if self.own_executor:
+            self.executor.shutdown()
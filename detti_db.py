@@ -38,11 +38,33 @@ Lightweight Json based key-value DataBase.
 import os
 import sys
 import configparser
-import json
 import signal
+import atexit
+import weakref
+import time
+import glob
+import json
+import base64
+import uuid
+import fnmatch
 from datetime import datetime
-from typing import Dict, Optional, Union, Any, List
-from threading import Thread, Lock
+from types import MappingProxyType
+from contextlib import contextmanager, ExitStack
+from typing import (
+    Dict,
+    Optional,
+    Union,
+    Any,
+    List,
+    Tuple,
+    Set,
+    Iterable,
+    Iterator,
+    Callable,
+    Mapping,
+    ContextManager,
+)
+from threading import Thread, RLock, Lock, Condition, local
 
 # Get the path of the directory of the current file.
 PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
@@ -53,6 +75,33 @@ sys.path.append(os.path.join(PATH_OF_FILE_DIR, "tools"))
 
 # Import own modules.
 from color_logger import ColoredLogger  # noqa: E402
+from detti_wal import WriteAheadLog  # noqa: E402
+from detti_serializers import (  # noqa: E402
+    Serializer,
+    get_serializer,
+    detect_storage_format,
+    load_file,
+    dump_file,
+)
+from detti_lazy import LazyDict  # noqa: E402
+from detti_mmap import MmapHashTable  # noqa: E402
+from detti_lsm import LsmTree  # noqa: E402
+from detti_sqlite import SqliteStore  # noqa: E402
+from detti_key_index import SortedKeyIndex  # noqa: E402
+from detti_value_index import ValueIndex, value_terms  # noqa: E402
+from detti_field_index import FieldIndex, field_value, index_token, MISSING  # noqa: E402
+from detti_trigram_index import TrigramIndex  # noqa: E402
+from detti_numeric_columns import NumericColumns, AGGREGATIONS  # noqa: E402
+from detti_search_cache import SearchCache  # noqa: E402
+from detti_batch import WriteBatch  # noqa: E402
+from detti_shards import (  # noqa: E402
+    shard_index,
+    shard_file_path,
+    read_shard_count,
+    write_shards_metadata,
+    split_to_shards,
+    load_shards,
+)
 
 with open(os.path.join(PATH_OF_FILE_DIR, "VERSION"), "r", encoding="utf-8") as f:
     software_version: str = f.read()
@@ -70,6 +119,54 @@ LOG_LEVELS: Dict[str, int] = {
     "DEBUG": 10,
 }
 
+# Possible persistence modes of the DB.
+#   sync: The complete DB is dumped to the DB file after every change.
+#   deferred: The changes mark the DB dirty and a background flusher thread dumps the DB.
+#   wal: The changes are appended to a write-ahead log which is compacted in the background.
+PERSISTENCE_MODES: Tuple[str, ...] = ("sync", "deferred", "wal")
+
+# Possible methods of the background snapshots (compaction, flushing).
+#   thread: The DB is copied under the lock and the copy is written by a thread.
+#   fork: A forked child process writes the copy-on-write image of the DB (like Redis BGSAVE).
+BACKGROUND_SAVE_METHODS: Tuple[str, ...] = ("thread", "fork")
+
+# Possible storage engines of the DB.
+#   memory: The DB is a dict in the memory which is dumped to the DB file.
+#   mmap: Memory-mapped hash table and value heap files (The DB can be bigger than the RAM).
+#         The files are the DB itself, so the persistence modes only sync them (no dumps).
+#   lsm: LSM-tree (memtable with a log, sorted segment files, background leveled compaction).
+#        The persistence modes only sync its log (no dumps).
+#   sqlite: Table of a SQLite DB file in WAL mode (More processes can read it concurrently).
+#           The persistence modes commit the batched changes (no dumps).
+STORAGE_ENGINES: Tuple[str, ...] = ("memory", "mmap", "lsm", "sqlite")
+
+# Number of the keys which are read under the lock in one step of a scan.
+SCAN_BATCH_SIZE: int = 1000
+
+# A begun snapshot:
+#   (Start time, Copies of the DB files by path or None, PID of the child process or None,
+#    Indexes of the snapshotted dirty shards)
+SNAPSHOT_TYPE = Tuple[float, Optional[Dict[str, Dict[str, Any]]], Optional[int], Set[int]]
+
+# Default values of the optional config file parameters.
+# The config files which were created before these parameters remain usable.
+DEFAULT_CONTROL_VARIABLES: Dict[str, str] = {
+    "persistence_mode": "sync",
+    "wal_fsync": "every_sec",
+    "wal_compaction_size": "67108864",
+    "flush_interval_ms": "1000",
+    "flush_max_dirty": "1000",
+    "background_save": "thread",
+    "storage_format": "json_pretty",
+    "shard_count": "0",
+    "lazy_cache": "True",
+    "storage_engine": "memory",
+    "lsm_memtable_size": "10000",
+    "value_index_numbers": "False",
+    "indexed_fields": "",
+    "search_cache_size": "1000",
+    "lock_stripes": "16",
+}
 
 # Set-up the main logger instance.
 PATH_OF_LOG_FILE: str = os.path.join(
@@ -78,6 +175,19 @@ PATH_OF_LOG_FILE: str = os.path.join(
 C_LOGGER: ColoredLogger = ColoredLogger(os.path.basename(__file__), log_file_path=PATH_OF_LOG_FILE)
 
 
+def _close_at_exit(detti_db_reference: weakref.ref) -> None:
+    """
+    Closing a DettiDB instance (persisting the pending changes) at the exit of the interpreter.
+    The instance is referenced weakly, so the registration doesn't keep it alive.
+    :param detti_db_reference: Weak reference of the DettiDB instance.
+    :return: None
+    """
+
+    detti_db_instance: Optional[DettiDB] = detti_db_reference()
+    if detti_db_instance:
+        detti_db_instance.close()
+
+
 class DettiDB(object):
     def __init__(
         self, config_file: str = DEFAULT_CONFIG, c_logger: ColoredLogger = None, **kwargs
@@ -90,9 +200,65 @@ class DettiDB(object):
         self.set_up_default_logger(log_level=self.log_level)
         self.path_of_db: str = os.path.abspath(self.path_of_db)
         self.set_signal_handler()
+        self.compaction_thread: Optional[Thread] = None
+        self.flush_thread: Optional[Thread] = None
+        self.bgsave_thread: Optional[Thread] = None
+        self.last_snapshot_time: Optional[float] = None
+        self.last_snapshot_duration: Optional[float] = None
+        self.wal: Optional[WriteAheadLog] = None
+        self.lock: RLock = RLock()
+        # Striped locks of the keys ("lock_stripes" parameter). The changes of a key hold
+        # the lock of its stripe, the DB lock is held only while a change is applied and logged
+        # (The DB file of "sync" persistence mode is written without it).
+        self.key_locks: List[RLock] = [RLock() for _ in range(int(self.lock_stripes))]
+        # The write batch of the current thread whose setting is validated (See: "batch" method).
+        self.batch_local: local = local()
+        self.flush_lock: Lock = Lock()
+        self.flush_condition: Condition = Condition(self.lock)
+        self.dirty_writes: int = 0
+        self.closed: bool = False
+        self.shard_keys: List[Set[str]] = []
+        self.dirty_shards: Set[int] = set()
         self.detti_db: Dict[str, str] = self.load_db()
-        self.dump_thread: Optional[Thread] = None
-        self.lock: Lock = Lock()
+        # Versions of the DB and of the changed keys (The loaded keys have 0 version).
+        # The versions restart at every loading, so they are valid with the version epoch.
+        self.version_epoch: str = uuid.uuid4().hex[:16]
+        self.db_version: int = 0
+        self.key_versions: Dict[str, int] = {}
+        # The version of the DB in the last dump of "sync" persistence mode.
+        self.dumped_version: int = 0
+        # The read view which is shared by the readers until the next change.
+        self.read_view: Optional[Dict[str, Any]] = None
+        if self.sharded:
+            self._index_shards()
+        # Sorted index of the keys for the prefix searches (The disk engines have their own).
+        self.key_index: Optional[SortedKeyIndex] = (
+            None if self.disk_engine else SortedKeyIndex(self.detti_db)
+        )
+        # Index of the value terms. It is built by the first value search (It reads all values).
+        self.value_index: Optional[ValueIndex] = None
+        # Trigram indexes of the keys and the value terms for the substring and glob searches.
+        # They are built by the first search (The disk engines are scanned).
+        self.key_trigram_index: Optional[TrigramIndex] = None
+        self.value_trigram_index: Optional[TrigramIndex] = None
+        # Array backed columns of the numeric values for the aggregations.
+        # They are built by the first aggregation (The disk engines are scanned).
+        self.numeric_columns: Optional[NumericColumns] = None
+        # LRU cache of the prefix search results ("search_cache_size" parameter, 0: disabled).
+        self.search_cache: Optional[SearchCache] = (
+            SearchCache(int(self.search_cache_size)) if int(self.search_cache_size) else None
+        )
+        # Secondary indexes on the fields of the dict values by field.
+        # The indexes of the config file are built in the background.
+        self.field_indexes: Dict[str, FieldIndex] = {}
+        for field in str(self.indexed_fields).split(","):
+            if field.strip():
+                self.create_index(field.strip(), background=True)
+        if self.persistence_mode == "wal":
+            self.open_wal()
+        elif self.persistence_mode == "deferred":
+            self.start_flusher()
+        atexit.register(_close_at_exit, weakref.ref(self))
 
     def set_control_variables(self, config_data: dict, **kwargs) -> None:
         """
@@ -103,6 +269,10 @@ class DettiDB(object):
 
         self.c_logger.debug("Starting to set the control variables.")
 
+        # Set the default values of the optional variables.
+        for key, val in DEFAULT_CONTROL_VARIABLES.items():
+            setattr(self, key, val)
+
         # Set the variables based on the provided config file.
         for key, val in config_data.items("DETTI_DB"):
             setattr(self, key, val)
@@ -112,6 +282,96 @@ class DettiDB(object):
             if hasattr(self, key):
                 setattr(self, key, val)
 
+        if self.persistence_mode not in PERSISTENCE_MODES:
+            error_msg: str = "Invalid persistence mode: {}. Possible: {}".format(
+                self.persistence_mode, PERSISTENCE_MODES
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if self.background_save not in BACKGROUND_SAVE_METHODS or (
+            self.background_save == "fork" and not hasattr(os, "fork")
+        ):
+            error_msg: str = "Invalid background save method: {}. Possible: {}".format(
+                self.background_save, BACKGROUND_SAVE_METHODS
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        try:
+            self.serializer: Serializer = get_serializer(self.storage_format)
+        except ValueError as value_error:
+            self.c_logger.error(str(value_error))
+            raise value_error
+
+        if not str(self.shard_count).isdigit():
+            error_msg: str = "Invalid shard count: {}. It has to be a non-negative integer.".format(
+                self.shard_count
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # The DB is stored in a directory of shard files if the shard count is set.
+        self.sharded: bool = int(self.shard_count) > 0
+
+        if self.storage_engine not in STORAGE_ENGINES:
+            error_msg: str = "Invalid storage engine: {}. Possible: {}".format(
+                self.storage_engine, STORAGE_ENGINES
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # The on-disk storage engines persist the changes themselves (no DB file dumps).
+        self.disk_engine: bool = self.storage_engine != "memory"
+        if self.disk_engine and (self.persistence_mode == "wal" or self.sharded):
+            error_msg: str = (
+                "The '{}' storage engine doesn't support the 'wal' persistence mode "
+                "and the sharding.".format(self.storage_engine)
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if not str(self.lsm_memtable_size).isdigit() or int(self.lsm_memtable_size) < 1:
+            error_msg: str = (
+                "Invalid LSM memtable size: {}. It has to be a positive integer.".format(
+                    self.lsm_memtable_size
+                )
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if str(self.lazy_cache).lower() not in configparser.ConfigParser.BOOLEAN_STATES:
+            error_msg: str = "Invalid lazy cache value: {}. It has to be a boolean.".format(
+                self.lazy_cache
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if not str(self.search_cache_size).isdigit():
+            error_msg: str = (
+                "Invalid search cache size: {}. It has to be a non-negative integer.".format(
+                    self.search_cache_size
+                )
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if not str(self.lock_stripes).isdigit() or int(self.lock_stripes) < 1:
+            error_msg: str = "Invalid lock stripes: {}. It has to be a positive integer.".format(
+                self.lock_stripes
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if str(self.value_index_numbers).lower() not in configparser.ConfigParser.BOOLEAN_STATES:
+            error_msg: str = (
+                "Invalid value index numbers value: {}. It has to be a boolean.".format(
+                    self.value_index_numbers
+                )
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
     def __getitem__(self, key: str) -> Optional[Union[str, int, float, list, dict]]:
         """
         Getting item.
@@ -157,7 +417,17 @@ class DettiDB(object):
 
         self.c_logger.info("Starting to calculate the size of DB.")
 
-        current_size_of_db: int = int(os.path.getsize(self.path_of_db))
+        current_size_of_db: int
+        if self.disk_engine:
+            current_size_of_db = self.detti_db.size_on_disk()
+        elif self.sharded:
+            current_size_of_db = sum(
+                os.path.getsize(shard_file_path(self.path_of_db, index))
+                for index in range(int(self.shard_count))
+                if os.path.isfile(shard_file_path(self.path_of_db, index))
+            )
+        else:
+            current_size_of_db = int(os.path.getsize(self.path_of_db))
 
         self.c_logger.ok("The calculated size of DB: {}".format(current_size_of_db))
 
@@ -171,9 +441,12 @@ class DettiDB(object):
 
         self.c_logger.info("Starting to calculate the keys of DB.")
 
-        keys_of_db: List[str] = [*self.detti_db]
+        # The on-disk storage engines are streamed (They can be bigger than the RAM).
+        keys_of_db: List[str] = (
+            [*self.detti_db] if self.disk_engine else [*self._snapshot_content()]
+        )
 
-        self.c_logger.debug("The calculated keys of DB: {}".format(keys_of_db))
+        self.c_logger.debug("The number of the calculated keys of DB: {}".format(len(keys_of_db)))
         self.c_logger.ok("Successfully get the keys of DB.")
 
         return keys_of_db
@@ -253,6 +526,26 @@ class DettiDB(object):
         Loading the DB based on the provided confing file.
         If the DB doesn't exist the method creates it.
         If the DB exists but it is empty the methot returns an empty Dict object.
+        In "wal" persistence mode the write-ahead log is replayed on the loaded DB.
+        :return: Dict[str, str]. The key-value pairs from DB file
+        """
+
+        loaded_db: Dict[str, Any]
+        if self.disk_engine:
+            loaded_db = self._open_storage_engine()
+        elif self.sharded:
+            loaded_db = self._load_db_shards()
+        else:
+            loaded_db = self._load_db_file()
+
+        if self.persistence_mode == "wal":
+            self._replay_wal(loaded_db)
+
+        return loaded_db
+
+    def _load_db_file(self) -> Dict[str, Any]:
+        """
+        Loading the DB file (snapshot of the DB).
         :return: Dict[str, str]. The key-value pairs from DB file
         """
 
@@ -269,8 +562,28 @@ class DettiDB(object):
             self.c_logger.ok("The new '{}' DB has been created.".format(self.path_of_db))
             return {}
         self.c_logger.debug("The DB file exists.")
+        self._remove_stale_tmp_files()
         try:
-            loaded_db: Dict[str, Any] = json.load(open(self.path_of_db, "rt"))
+            loaded_db: Dict[str, Any]
+            storage_format: str
+            if self.storage_format == "lazy" and detect_storage_format(self.path_of_db) == "lazy":
+                # Only the index is loaded, the values are decoded on the first access.
+                loaded_db, storage_format = (
+                    LazyDict(
+                        self.path_of_db,
+                        cache_values=configparser.ConfigParser.BOOLEAN_STATES[
+                            str(self.lazy_cache).lower()
+                        ],
+                    ),
+                    "lazy",
+                )
+            else:
+                loaded_db, storage_format = load_file(self.path_of_db)
+            if storage_format != self.storage_format:
+                self.c_logger.info(
+                    "The storage format of DB file is '{}'. It will be converted to '{}' "
+                    "by the next dump.".format(storage_format, self.storage_format)
+                )
             self.c_logger.ok("The '{}' DB has been loaded.".format(self.path_of_db))
             return loaded_db
         except ValueError as val_error:
@@ -291,55 +604,1524 @@ class DettiDB(object):
             )
             raise unexpected_error
 
-    def get(
-        self, db_key: str, default_value: Any = None
-    ) -> Optional[Union[str, int, float, list, dict]]:
+    def _open_storage_engine(self) -> Union[MmapHashTable, LsmTree, SqliteStore]:
         """
-        Providing the value of a key.
-        The method returns None if the key doesn't exist in the DB.
-        :param db_key: Related key.
-        :param default_value: If the key is not in DB, the default value will be returned.
-        :return: The value of the key as a string.
+        Opening the on-disk storage engine of the DB (The "path_of_db" is its directory).
+        The files of the engine are created if they don't exist.
+        :return: The storage engine (Dict like object).
         """
 
-        self.c_logger.info("Starting to get the '{}' element.".format(db_key))
+        self.c_logger.info("Starting to open the '{}' storage engine.".format(self.storage_engine))
+
+        if os.path.isfile(self.path_of_db):
+            error_msg: str = (
+                "The '{}' DB is a file, the '{}' storage engine needs a directory.".format(
+                    self.path_of_db, self.storage_engine
+                )
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
 
         try:
-            value_of_key: Union[str, int, float, list] = self.detti_db[db_key]
-            self.c_logger.ok("Successfully get the value of '{}': {}".format(db_key, value_of_key))
-            return value_of_key
-        except KeyError:
-            self.c_logger.warning("The '{}' key doesn't exist in the DB.".format(db_key))
-            if default_value:
-                self.c_logger.debug(
-                    "The default value set to '{}'. It will be returned".format(default_value)
+            storage_engine: Union[MmapHashTable, LsmTree, SqliteStore]
+            if self.storage_engine == "lsm":
+                storage_engine = LsmTree(self.path_of_db, memtable_size=int(self.lsm_memtable_size))
+            elif self.storage_engine == "sqlite":
+                # Every change is committed durably in "sync" persistence mode.
+                storage_engine = SqliteStore(
+                    self.path_of_db,
+                    synchronous="FULL" if self.persistence_mode == "sync" else "NORMAL",
+                    batch_size=int(self.flush_max_dirty),
                 )
-                return default_value
-            return None
-        except Exception as unexpected_error:  # pragma: no cover
+            else:
+                storage_engine = MmapHashTable(self.path_of_db)
+            # Only the owner has permissions for DB directory
+            os.chmod(self.path_of_db, 0o700)
+        except Exception as unexpected_error:
             self.c_logger.error(
-                "Unexpected error happened during the get an element. ERROR:\n{}".format(
+                "Unexpected error happened during the opening of storage engine. ERROR:\n{}".format(
+                    unexpected_error
+                )
+            )
+            raise unexpected_error
+
+        self.c_logger.ok(
+            "The '{}' DB has been opened with '{}' storage engine ({} keys).".format(
+                self.path_of_db, self.storage_engine, len(storage_engine)
+            )
+        )
+        return storage_engine
+
+    def _load_db_shards(self) -> Dict[str, Any]:
+        """
+        Loading the shard files of the DB directory (snapshot of the DB).
+        If the DB directory doesn't exist the method creates it.
+        The shard count of the existing DB directory has to be the configured one
+        (The DB can be resharded with the "tools/reshard_db.py" tool).
+        :return: Dict[str, str]. The key-value pairs from the shard files
+        """
+
+        self.c_logger.info("Starting to load the sharded DB.")
+
+        shard_count: int = int(self.shard_count)
+
+        if os.path.isfile(self.path_of_db):
+            error_msg: str = (
+                "The '{}' DB is a single file but {} shards are configured. "
+                "Reshard it with the 'tools/reshard_db.py' tool.".format(
+                    self.path_of_db, shard_count
+                )
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if not os.path.isdir(self.path_of_db):
+            self.c_logger.warning("The '{}' DB directory doesn't exist.".format(self.path_of_db))
+            os.makedirs(self.path_of_db, exist_ok=True)
+            # Only the owner has permissions for DB directory
+            os.chmod(self.path_of_db, 0o700)
+            write_shards_metadata(self.path_of_db, shard_count)
+            self.c_logger.ok("The new '{}' sharded DB has been created.".format(self.path_of_db))
+            return {}
+
+        stored_shard_count: Optional[int] = read_shard_count(self.path_of_db)
+        if stored_shard_count is None:
+            write_shards_metadata(self.path_of_db, shard_count)
+        elif stored_shard_count != shard_count:
+            error_msg: str = (
+                "The '{}' DB has {} shards but {} shards are configured. "
+                "Reshard it with the 'tools/reshard_db.py' tool.".format(
+                    self.path_of_db, stored_shard_count, shard_count
+                )
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        self._remove_stale_tmp_files()
+        try:
+            loaded_db: Dict[str, Any] = load_shards(self.path_of_db, shard_count)
+        except Exception as unexpected_error:
+            self.c_logger.error(
+                "Unexpected error happened during the DB loading. ERROR:\n{}".format(
                     unexpected_error
                 )
             )
-            raise unexpected_error
+            raise unexpected_error
+
+        self.c_logger.ok(
+            "The '{}' DB has been loaded from {} shards.".format(self.path_of_db, shard_count)
+        )
+        return loaded_db
+
+    def _index_shards(self) -> None:
+        """
+        Building the key sets of the shards, so a shard can be written without scanning the DB.
+        :return: None
+        """
+
+        shard_count: int = int(self.shard_count)
+        self.shard_keys: List[Set[str]] = [set() for _ in range(shard_count)]
+        for key in self.detti_db:
+            self.shard_keys[shard_index(key, shard_count)].add(key)
+
+    def _shards_of_record(self, record: Dict[str, Any]) -> Iterable[int]:
+        """
+        Providing the indexes of the shards which are changed by a change record.
+        :param record: The change record. Eg.: {"op": "set", "key": "a", "val": 1}
+        :return: Indexes of the changed shards.
+        """
+
+        if record["op"] == "clear":
+            return range(int(self.shard_count))
+        return (shard_index(record["key"], int(self.shard_count)),)
+
+    def _track_shards(self, record: Dict[str, Any]) -> None:
+        """
+        Updating the key sets of the shards and marking the changed shards dirty.
+        :param record: The applied change record.
+        :return: None
+        """
+
+        operation: str = record["op"]
+        if operation == "clear":
+            for keys_of_shard in self.shard_keys:
+                keys_of_shard.clear()
+        elif operation == "set":
+            self.shard_keys[shard_index(record["key"], int(self.shard_count))].add(record["key"])
+        else:
+            self.shard_keys[shard_index(record["key"], int(self.shard_count))].discard(
+                record["key"]
+            )
+        self.dirty_shards.update(self._shards_of_record(record))
+
+    def _update_key_index(self, record: Dict[str, Any]) -> None:
+        """
+        Updating the sorted key index with an applied change record.
+        :param record: The applied change record.
+        :return: None
+        """
+
+        operation: str = record["op"]
+        if operation == "clear":
+            self.key_index.clear()
+        elif operation == "set":
+            self.key_index.add(record["key"])
+        else:
+            self.key_index.discard(record["key"])
+
+    def _update_value_index(self, record: Dict[str, Any]) -> None:
+        """
+        Updating the value index with an applied change record.
+        :param record: The applied change record.
+        :return: None
+        """
+
+        operation: str = record["op"]
+        if operation == "clear":
+            self.value_index.clear()
+        elif operation == "set":
+            self.value_index.add(record["key"], record["val"])
+        else:
+            self.value_index.discard(record["key"])
+
+    def _build_value_index(self) -> None:
+        """
+        Building the value index from the complete DB. It is called under the lock.
+        :return: None
+        """
+
+        self.c_logger.info("Starting to build the value index.")
+
+        value_index: ValueIndex = ValueIndex(
+            index_numbers=configparser.ConfigParser.BOOLEAN_STATES[
+                str(self.value_index_numbers).lower()
+            ]
+        )
+        for key, value in self._materialized_db().items():
+            value_index.add(key, value)
+        self.value_index = value_index
+
+        self.c_logger.ok("The value index has been built. {}".format(self.get_value_index_info()))
+
+    def _trigram_texts(self, key: str, value: Any, in_values: bool) -> Iterable[str]:
+        """
+        Providing the texts of a key-value pair for the trigram indexes.
+        :param key: The key.
+        :param value: The value of the key.
+        :param in_values: Provide the terms of the value (See: value index) instead of the key.
+        :return: The texts.
+        """
+
+        if not in_values:
+            return (key,)
+        return value_terms(
+            value,
+            configparser.ConfigParser.BOOLEAN_STATES[str(self.value_index_numbers).lower()],
+        )
+
+    def _update_trigram_index(
+        self, trigram_index: TrigramIndex, record: Dict[str, Any], in_values: bool
+    ) -> None:
+        """
+        Updating a trigram index with an applied change record.
+        :param trigram_index: The trigram index of the keys or the values.
+        :param record: The applied change record.
+        :param in_values: The trigram index is the index of the values.
+        :return: None
+        """
+
+        operation: str = record["op"]
+        if operation == "clear":
+            trigram_index.clear()
+        elif operation == "set":
+            # The key index doesn't change when the value of an existing key changes.
+            if in_values or record["key"] not in trigram_index.texts_of_documents:
+                trigram_index.add(
+                    record["key"], self._trigram_texts(record["key"], record["val"], in_values)
+                )
+        else:
+            trigram_index.discard(record["key"])
+
+    def _build_trigram_index(self, in_values: bool) -> TrigramIndex:
+        """
+        Building the trigram index of the keys or the values from the complete DB.
+        It is called under the lock.
+        :param in_values: Build the index of the values.
+        :return: The built trigram index.
+        """
+
+        self.c_logger.info(
+            "Starting to build the trigram index of the {}.".format(
+                "values" if in_values else "keys"
+            )
+        )
+
+        trigram_index: TrigramIndex = TrigramIndex()
+        items: Iterable[Tuple[str, Any]] = (
+            self._materialized_db().items() if in_values else ((key, None) for key in self.detti_db)
+        )
+        for key, value in items:
+            trigram_index.add(key, self._trigram_texts(key, value, in_values))
+        if in_values:
+            self.value_trigram_index = trigram_index
+        else:
+            self.key_trigram_index = trigram_index
+
+        self.c_logger.ok(
+            "The trigram index has been built ({} documents, {} trigrams).".format(
+                len(trigram_index), len(trigram_index.postings)
+            )
+        )
+        return trigram_index
+
+    def _update_numeric_columns(self, record: Dict[str, Any]) -> None:
+        """
+        Updating the numeric columns with an applied change record.
+        :param record: The applied change record.
+        :return: None
+        """
+
+        operation: str = record["op"]
+        if operation == "clear":
+            self.numeric_columns.clear()
+        elif operation == "set":
+            self.numeric_columns.set(record["key"], record["val"])
+        else:
+            self.numeric_columns.discard(record["key"])
+
+    def _build_numeric_columns(self) -> None:
+        """
+        Building the numeric columns from the complete DB. It is called under the lock.
+        :return: None
+        """
+
+        self.c_logger.info("Starting to build the numeric columns.")
+
+        numeric_columns: NumericColumns = NumericColumns()
+        for key, value in self._materialized_db().items():
+            numeric_columns.set(key, value)
+        self.numeric_columns = numeric_columns
+
+        self.c_logger.ok(
+            "The numeric columns have been built ({} numeric values).".format(len(numeric_columns))
+        )
+
+    def get_value_index_info(self) -> Dict[str, Union[bool, int]]:
+        """
+        Providing the size of the value index.
+            built: True if the value index has been built (by the first value search).
+            indexed_keys: Number of the keys with indexed terms.
+            terms: Number of the different indexed terms.
+            memory_usage: Estimated memory overhead of the index in bytes.
+        :return: The information in a dict.
+        """
+
+        with self.lock:
+            if self.value_index is None:
+                return {"built": False, "indexed_keys": 0, "terms": 0, "memory_usage": 0}
+            return {"built": True, **self.value_index.get_info()}
+
+    def create_index(self, field: str, background: bool = False) -> bool:
+        """
+        Creating a secondary index on a field of the dict values.
+        The index is built from a snapshot of the DB, the changes during the building are
+        applied at the end of the building. The "find" method scans the DB until it is ready.
+        :param field: The field. Eg.: "status" or "user.status" (nested field)
+        :param background: Build the index in a background thread.
+        :return: True if the index has been created else False (it already exists).
+        """
+
+        self.c_logger.info("Starting to create index on '{}' field.".format(field))
+
+        if not isinstance(field, str) or not field or "" in field.split("."):
+            error_msg: str = "Invalid field of index: {}".format(field)
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        with self.lock:
+            if field in self.field_indexes:
+                self.c_logger.warning("The '{}' field is already indexed.".format(field))
+                return False
+            field_index: FieldIndex = FieldIndex(field)
+            self.field_indexes[field] = field_index
+            snapshot: Iterator[Tuple[str, Any]] = self._iter_items()
+
+        if background:
+            Thread(
+                target=self._build_field_index, args=(field_index, snapshot), daemon=True
+            ).start()
+        else:
+            self._build_field_index(field_index, snapshot)
+        return True
+
+    def _build_field_index(
+        self, field_index: FieldIndex, snapshot: Iterator[Tuple[str, Any]]
+    ) -> None:
+        """
+        Building a secondary index from a snapshot of the DB (Without blocking the writers).
+        The changes during the building are applied after it (See: "FieldIndex.finish_build"),
+        so the streamed pairs of the on-disk storage engines can be newer than the index.
+        :param field_index: The secondary index.
+        :param snapshot: The key-value pairs of the DB (See: "_iter_items" method).
+        :return: None
+        """
+
+        try:
+            field_index.build(snapshot)
+        except Exception as unexpected_error:
+            with self.lock:
+                self.field_indexes.pop(field_index.field, None)
+            self.c_logger.error(
+                "Unexpected error happened during the building of '{}' index. ERROR:\n{}".format(
+                    field_index.field, unexpected_error
+                )
+            )
+            raise unexpected_error
+
+        with self.lock:
+            field_index.finish_build()
+
+        self.c_logger.ok(
+            "The index on '{}' field has been built ({} keys).".format(
+                field_index.field, len(field_index)
+            )
+        )
+
+    def _read_view(self) -> Dict[str, Any]:
+        """
+        Providing a consistent read view of the DB (MVCC-style immutable snapshot).
+        The view is created under the lock by the first reader after a change and it is shared
+        by the readers until the next change, so the readers use it without the lock and
+        the writers don't wait for them (The point reads don't use the view).
+        The values are not copied (The changes replace the values instead of mutating them).
+        The on-disk storage engines are read to the memory without the DB lock (The engines
+        provide a consistent content themselves) and their view is not cached (They can be
+        bigger than the RAM). Only the methods which provide the complete DB use it,
+        the other bulk readers stream the engine (See: "_iter_items" method).
+        :return: The shallow copy of the DB content. It must not be changed.
+        """
+
+        if self.disk_engine:
+            return self.detti_db.to_dict()
+        with self.lock:
+            if self.read_view is None:
+                self.read_view = self.detti_db.copy()
+            return self.read_view
+
+    def get_read_view(self) -> Mapping[str, Any]:
+        """
+        Providing a consistent, read-only view of the complete DB.
+        The later changes of the DB are not visible in the view.
+        Eg.:
+            read_view = detti_db.get_read_view()
+            total = sum(value for value in read_view.values() if isinstance(value, int))
+        :return: The read-only mapping of the key-value pairs.
+        """
+
+        return MappingProxyType(self._read_view())
+
+    def _snapshot_content(self) -> Dict[str, Any]:
+        """
+        Providing the shared read view of the DB content which can be read without the lock
+        (See: "_read_view" method). The on-disk storage engines are read to the memory.
+        :return: The shared read view. It must not be changed.
+        """
+
+        return self._read_view()
+
+    def _copy_content(self) -> Dict[str, Any]:
+        """
+        Providing a private copy of the DB content which can be changed by the caller.
+        The content is copied once: the shared read view is copied without the lock if it
+        exists, otherwise the DB is copied under the lock without creating the shared view.
+        The lazily loaded values are decoded without the lock.
+        :return: The copy of the DB content.
+        """
+
+        if self.disk_engine:
+            return self.detti_db.to_dict()
+        with self.lock:
+            shared_view: Optional[Dict[str, Any]] = self.read_view
+            content: Dict[str, Any] = self.detti_db.copy() if shared_view is None else shared_view
+        return content if shared_view is None and isinstance(content, dict) else dict(content)
+
+    def _iter_items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Providing the key-value pairs of the DB for the bulk readers (Eg.: scanning searches).
+        The memory storage engine provides the pairs of its read view (It is taken at the call).
+        The on-disk storage engines are streamed by their own iterators without reading
+        the complete DB to the memory. The keys which are deleted during the iteration are
+        skipped (The "mmap" engine raises RuntimeError if its table is rebuilt meanwhile).
+        :return: Iterator of the (key, value) pairs.
+        """
+
+        if not self.disk_engine:
+            return iter(self._read_view().items())
+        return self._stream_engine_items()
+
+    def _stream_engine_items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Streaming the key-value pairs of an on-disk storage engine (See: "_iter_items" method).
+        :return: Iterator of the (key, value) pairs.
+        """
+
+        for key in self.detti_db:
+            try:
+                value: Any = self.detti_db[key]
+            except KeyError:
+                continue
+            yield key, value
+
+    def get_indexes(self) -> Dict[str, Dict[str, Union[bool, int]]]:
+        """
+        Providing the secondary indexes.
+            ready: True if the index has been built.
+            indexed_keys: Number of the keys which have the field.
+            values: Number of the different values of the field.
+        :return: The information of the indexes by field.
+        """
+
+        with self.lock:
+            return {
+                field: {
+                    "ready": field_index.ready.is_set(),
+                    "indexed_keys": len(field_index),
+                    "values": len(field_index.postings),
+                }
+                for field, field_index in self.field_indexes.items()
+            }
+
+    def find(self, field: str, value: Any) -> Dict[str, Any]:
+        """
+        Finding the dict values whose field has a value. Eg.: find("status", "active")
+        The secondary index of the field is used if it is ready, else the DB is scanned.
+        :param field: The field. Eg.: "status" or "user.status" (nested field)
+        :param value: The value of the field.
+        :return: The found key-value pairs.
+        """
+
+        self.c_logger.info("Starting to find '{}' field with '{}' value.".format(field, value))
+
+        return_dict: Dict[str, Any]
+        with self.lock:
+            field_index: Optional[FieldIndex] = self.field_indexes.get(field)
+            if field_index is not None and field_index.ready.is_set():
+                return_dict = {key: self.detti_db[key] for key in sorted(field_index.find(value))}
+                self.c_logger.ok(
+                    "Successfully found {} items by the index.".format(len(return_dict))
+                )
+                return return_dict
+            snapshot: Iterator[Tuple[str, Any]] = self._iter_items()
+
+        self.c_logger.warning("The '{}' field has no ready index, the DB is scanned.".format(field))
+        token: str = index_token(value)
+        return_dict = {}
+        for key, db_value in snapshot:
+            value_of_field: Any = field_value(db_value, field)
+            if value_of_field is not MISSING and index_token(value_of_field) == token:
+                return_dict[key] = db_value
+
+        self.c_logger.ok("Successfully found {} items by scanning.".format(len(return_dict)))
+        return return_dict
+
+    def _db_files_of(self, db_content: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Splitting a complete content of the DB to the DB file or to all shard files.
+        :param db_content: The content of the DB.
+        :return: The contents of the DB files by path.
+        """
+
+        if not self.sharded:
+            return {self.path_of_db: db_content}
+        return {
+            shard_file_path(self.path_of_db, index): shard_content
+            for index, shard_content in split_to_shards(db_content, int(self.shard_count)).items()
+        }
+
+    def _dirty_db_files(self, copy: bool) -> Dict[str, Dict[str, Any]]:
+        """
+        Providing the contents of the DB files which have to be written by the next snapshot.
+        It is the complete DB file or only the dirty shards in case of sharded DB.
+        It has to be called under the lock.
+        :param copy: Copy the content of the single DB file (The shards are always copied).
+        :return: The contents of the DB files by path.
+        """
+
+        if not self.sharded:
+            return {self.path_of_db: self.detti_db.copy() if copy else self.detti_db}
+        return {
+            shard_file_path(self.path_of_db, index): {
+                key: self.detti_db[key] for key in self.shard_keys[index]
+            }
+            for index in self.dirty_shards
+        }
+
+    def _materialized_db(self) -> Dict[str, Any]:
+        """
+        Providing the content of the DB as a dict (The lazily loaded values are decoded).
+        :return: The content of the DB.
+        """
+
+        return self.detti_db if isinstance(self.detti_db, dict) else self.detti_db.to_dict()
+
+    def _write_db_files(
+        self, db_files: Dict[str, Dict[str, Any]], tmp_file_suffix: Optional[str] = None
+    ) -> None:
+        """
+        Writing the contents of DB files (the DB file or the shard files) atomically.
+        :param db_files: The contents of the DB files by path.
+        :param tmp_file_suffix: Suffix of the temporary files. Default: Unique temporary files.
+        :return: None
+        """
+
+        for file_path, db_content in db_files.items():
+            self._write_snapshot(
+                db_content,
+                file_path,
+                path_of_tmp_file="{}.{}".format(file_path, tmp_file_suffix)
+                if tmp_file_suffix
+                else None,
+            )
+
+    def _wal_paths(self) -> Tuple[str, str]:
+        """
+        Providing the path of the write-ahead log and the path of the rotated (compacting) log.
+        :return: Tuple[str, str]. (Path of WAL, Path of the compacting WAL)
+        """
+
+        return "{}.wal".format(self.path_of_db), "{}.wal.compacting".format(self.path_of_db)
+
+    def open_wal(self) -> None:
+        """
+        Open the write-ahead log of the DB for appending.
+        :return: None
+        """
+
+        self.c_logger.info("Starting to open the write-ahead log.")
+
+        path_of_wal: str = self._wal_paths()[0]
+        self.wal: WriteAheadLog = WriteAheadLog(path_of_wal, fsync_policy=self.wal_fsync)
+        self.wal.open()
+
+        self.c_logger.ok(
+            "The '{}' write-ahead log has been opened (fsync: {}).".format(
+                path_of_wal, self.wal_fsync
+            )
+        )
+
+    def _replay_wal(self, loaded_db: Dict[str, Any]) -> None:
+        """
+        Replaying the write-ahead log on the loaded DB.
+        The rotated log of an interrupted compaction is replayed first,
+        then it is folded into the DB file.
+        :param loaded_db: The DB which is loaded from the DB file.
+        :return: None
+        """
+
+        self.c_logger.info("Starting to replay the write-ahead log.")
+
+        path_of_wal: str
+        path_of_compacting_wal: str
+        path_of_wal, path_of_compacting_wal = self._wal_paths()
+
+        number_of_records: int = 0
+        for path_of_log in (path_of_compacting_wal, path_of_wal):
+            for log_record in WriteAheadLog.read_records(path_of_log):
+                # The changes of a write batch are logged in one record.
+                for record in (
+                    log_record["records"] if log_record["op"] == "batch" else [log_record]
+                ):
+                    self._apply(loaded_db, record)
+                    if self.sharded:
+                        # The replayed changes are written to the shards by the next compaction.
+                        self.dirty_shards.update(self._shards_of_record(record))
+                number_of_records += 1
+
+        if os.path.isfile(path_of_compacting_wal):
+            self.c_logger.warning("An interrupted compaction is found. Finishing it.")
+            self._write_db_files(self._db_files_of(loaded_db))
+            os.remove(path_of_compacting_wal)
+
+        self.c_logger.ok(
+            "{} records have been replayed from the write-ahead log.".format(number_of_records)
+        )
+
+    @staticmethod
+    def _apply(db_content: Dict[str, Any], record: Dict[str, Any]) -> None:
+        """
+        Applying a change record on the content of a DB.
+        :param db_content: The content of the DB.
+        :param record: The change record. Eg.: {"op": "set", "key": "a", "val": 1}
+        :return: None
+        """
+
+        operation: str = record["op"]
+        if operation == "set":
+            db_content[record["key"]] = record["val"]
+        elif operation == "delete":
+            db_content.pop(record["key"], None)
+        elif operation == "clear":
+            db_content.clear()
+        else:
+            raise ValueError("Unknown operation in the change record: {}".format(operation))
+
+    def _key_lock(self, db_key: str) -> RLock:
+        """
+        Providing the striped lock of a key.
+        The read-modify-write changes of a key (Eg.: "append_list") hold it during the reading
+        and the committing, so the changes of the other stripes are not blocked by them.
+        :param db_key: The key.
+        :return: The lock of the stripe of the key.
+        """
+
+        return self.key_locks[hash(db_key) % len(self.key_locks)]
+
+    @contextmanager
+    def _all_key_locks(self) -> Iterator[None]:
+        """
+        Holding the locks of all stripes (in order, so the multi-key changes don't deadlock).
+        It is used by the changes of more keys (Eg.: clearing of the DB).
+        :return: Context manager.
+        """
+
+        with ExitStack() as stack:
+            for key_lock in self.key_locks:
+                stack.enter_context(key_lock)
+            yield
+
+    def _commit(self, record: Dict[str, Any]) -> None:
+        """
+        Applying a change record on the DB and persisting it based on the persistence mode.
+        The lock of the stripe of the key is held during the complete change (including
+        the fsync of the log and the dump of the DB), the DB lock only during the applying and
+        the appending to the log, so it defines the global order of the changes.
+        The log record is encoded before it.
+        :param record: The change record. Eg.: {"op": "set", "key": "a", "val": 1}
+        :return: None
+        """
+
+        write_batch: Optional[WriteBatch] = getattr(self.batch_local, "write_batch", None)
+        if write_batch is not None:
+            # The validated change of a write batch is buffered (See: "_buffer_set" method).
+            write_batch.add_record(record)
+            return
+
+        line: Optional[bytes] = (
+            WriteAheadLog.encode_record(record) if self.persistence_mode == "wal" else None
+        )
+        with self._all_key_locks() if record["op"] == "clear" else self._key_lock(record["key"]):
+            self._commit_locked([record], record, line)
+            if self.persistence_mode == "wal" and self.wal_fsync == "always":
+                # The fsync calls of the concurrent changes are grouped.
+                self.wal.sync()
+
+    def _commit_batch(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Applying the change records of a write batch on the DB atomically (The readers see
+        all or none of them) and persisting them in one step (one dump or one log record).
+        The locks of the stripes of all keys are held in order (See: "_all_key_locks" method).
+        :param records: The change records of the batch.
+        :return: None
+        """
+
+        stripes: List[int] = sorted(
+            {hash(record["key"]) % len(self.key_locks) for record in records}
+        )
+        with ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self.key_locks[stripe])
+            # The keys cannot be changed by others now. The deletes of the not existing keys
+            # are dropped (Eg.: They have been deleted since the buffering).
+            existing: Dict[str, bool] = {}
+            applied_records: List[Dict[str, Any]] = []
+            for record in records:
+                if record["op"] == "delete" and not existing.get(
+                    record["key"], record["key"] in self.detti_db
+                ):
+                    continue
+                existing[record["key"]] = record["op"] == "set"
+                applied_records.append(record)
+            if not applied_records:
+                return
+            log_record: Dict[str, Any] = (
+                applied_records[0]
+                if len(applied_records) == 1
+                else {"op": "batch", "records": applied_records}
+            )
+            line: Optional[bytes] = (
+                WriteAheadLog.encode_record(log_record) if self.persistence_mode == "wal" else None
+            )
+            self._commit_locked(applied_records, log_record, line)
+            if self.persistence_mode == "wal" and self.wal_fsync == "always":
+                self.wal.sync()
+
+    def _commit_locked(
+        self, records: List[Dict[str, Any]], log_record: Dict[str, Any], line: Optional[bytes]
+    ) -> None:
+        """
+        Applying change records on the DB under the DB lock and persisting them once
+        (See: "_commit" and "_commit_batch" methods).
+        :param records: The change records.
+        :param log_record: The record of the write-ahead log (The record or the batch record).
+        :param line: The encoded log record in case of "wal" persistence mode.
+        :return: None
+        """
+
+        with self.lock:
+            for record in records:
+                if self.search_cache is not None:
+                    self._invalidate_search_cache(record)
+                self._apply(self.detti_db, record)
+                self._update_versions(record)
+                if self.sharded:
+                    self._track_shards(record)
+                if self.key_index is not None:
+                    self._update_key_index(record)
+                if self.value_index is not None:
+                    self._update_value_index(record)
+                if self.key_trigram_index is not None:
+                    self._update_trigram_index(self.key_trigram_index, record, in_values=False)
+                if self.value_trigram_index is not None:
+                    self._update_trigram_index(self.value_trigram_index, record, in_values=True)
+                if self.numeric_columns is not None:
+                    self._update_numeric_columns(record)
+                for field_index in self.field_indexes.values():
+                    field_index.apply(record)
+            self.read_view = None
+            if self.persistence_mode == "wal":
+                if self.wal.append(log_record, line, sync=False) >= int(self.wal_compaction_size):
+                    self.compact()
+            elif self.persistence_mode == "deferred":
+                self.dirty_writes += len(records)
+                if self.dirty_writes >= int(self.flush_max_dirty):
+                    self.flush_condition.notify()
+            elif self.disk_engine:
+                # The changes are already in the files of the engine, they are synced only.
+                self.dump_json()
+            version: int = self.db_version
+
+        if self.persistence_mode == "sync" and not self.disk_engine:
+            self._dump_committed(version)
+
+    def _dump_committed(self, version: int) -> None:
+        """
+        Dumping the DB after a change in "sync" persistence mode.
+        The DB files are copied under the DB lock and they are written without it, so the keys
+        of the other stripes can be changed during the writing. The dumps are serialized and
+        a dump is skipped if a later dump already contains the change, so the changes which are
+        applied during a dump are persisted together by the next one.
+        :param version: The version of the DB after the change.
+        :return: None
+        """
+
+        with self.flush_lock:
+            if self.dumped_version >= version:
+                return
+            with self.lock:
+                dumped_version: int = self.db_version
+                snapshot: SNAPSHOT_TYPE = self._begin_snapshot("thread")
+            self._end_snapshot(*snapshot)
+            self.dumped_version = dumped_version
+
+    def _update_versions(self, record: Dict[str, Any]) -> None:
+        """
+        Increasing the version of the DB and setting it as the version of the changed key.
+        :param record: The applied change record.
+        :return: None
+        """
+
+        self.db_version += 1
+        operation: str = record["op"]
+        if operation == "clear":
+            self.key_versions.clear()
+        elif operation == "set":
+            self.key_versions[record["key"]] = self.db_version
+        else:
+            self.key_versions.pop(record["key"], None)
+
+    def get_version(self, db_key: Optional[str] = None) -> Optional[int]:
+        """
+        Providing the version of a key or of the DB. The versions increase monotonically
+        (The version of a key is the version of the DB at its last change).
+        The value of the key and the DB are not read.
+        :param db_key: The key or None for the version of the DB.
+        :return: The version or None if the key doesn't exist.
+        """
+
+        with self.lock:
+            if db_key is None:
+                return self.db_version
+            if db_key in self.key_versions:
+                return self.key_versions[db_key]
+            return 0 if db_key in self.detti_db else None
+
+    def get_with_version(
+        self, db_key: str
+    ) -> Tuple[Optional[Union[str, int, float, list, dict]], Optional[int]]:
+        """
+        Providing the value of a key with its version (They are read atomically).
+        :param db_key: Related key.
+        :return: The value and the version of the key or (None, None) if the key doesn't exist.
+        """
+
+        with self.lock:
+            return self.get(db_key), self.get_version(db_key)
+
+    def get_all_with_version(self) -> Tuple[Dict[str, Union[str, int, float]], int]:
+        """
+        Providing the all elements from DB with the version of the DB (They are read atomically).
+        :return: The content of DB in dict and the version of the DB.
+        """
+
+        with self.lock:
+            return self.get_all(), self.db_version
+
+    def start_flusher(self) -> None:
+        """
+        Starting the background flusher thread ("deferred" persistence mode).
+        The flusher dumps the DB if it is dirty after "flush_interval_ms" milliseconds or
+        immediately when the number of the dirty writes reaches "flush_max_dirty".
+        :return: None
+        """
+
+        self.c_logger.info("Starting the background flusher thread.")
+
+        self.flush_thread: Thread = Thread(target=self._flusher, daemon=True)
+        self.flush_thread.start()
+
+    def _flusher(self) -> None:
+        """
+        Target of the background flusher thread.
+        :return: None
+        """
+
+        flush_interval: float = int(self.flush_interval_ms) / 1000
+
+        while True:
+            with self.lock:
+                self.flush_condition.wait_for(
+                    lambda: self.closed or self.dirty_writes >= int(self.flush_max_dirty),
+                    timeout=flush_interval,
+                )
+                if self.closed:
+                    return
+            self._flush_dirty_db()
+
+    def _flush_dirty_db(self) -> bool:
+        """
+        Dumping the DB if it is dirty ("deferred" persistence mode).
+        The snapshot is begun under the lock and it is finished without blocking the writers.
+        The coalesced changes are marked dirty again if the dumping fails.
+        :return: True if the DB has been dumped else False
+        """
+
+        with self.flush_lock:
+            with self.lock:
+                if not self.dirty_writes:
+                    return False
+                dirty_writes: int = self.dirty_writes
+                if self.disk_engine:
+                    # The changes are already in the files of the engine, they are synced only.
+                    self.dirty_writes = 0
+                    self.dump_json()
+                    self.c_logger.debug(
+                        "{} coalesced changes have been flushed.".format(dirty_writes)
+                    )
+                    return True
+                try:
+                    snapshot: SNAPSHOT_TYPE = self._begin_snapshot(self.background_save)
+                except OSError as os_error:
+                    self.c_logger.error("Cannot begin the snapshot. ERROR:\n{}".format(os_error))
+                    return False
+                self.dirty_writes = 0
+
+            try:
+                self._end_snapshot(*snapshot)
+            except Exception as unexpected_error:
+                with self.lock:
+                    self.dirty_writes += dirty_writes
+                self.c_logger.error(
+                    "Unexpected error happened during the flushing of DB. ERROR:\n{}".format(
+                        unexpected_error
+                    )
+                )
+                return False
+
+        self.c_logger.debug("{} coalesced changes have been flushed.".format(dirty_writes))
+        return True
+
+    def flush(self) -> None:
+        """
+        Persisting the pending changes of the DB immediately.
+            deferred: The dirty DB is dumped to the DB file.
+            wal: The write-ahead log is synced to the disk.
+            sync: There are no pending changes.
+        :return: None
+        """
+
+        self.c_logger.info("Starting to flush the pending changes of DB.")
+
+        if self.persistence_mode == "deferred":
+            self._flush_dirty_db()
+        elif self.persistence_mode == "wal" and self.wal:
+            self.wal.sync()
+
+        self.c_logger.ok("The pending changes of DB have been flushed.")
+
+    def close(self) -> None:
+        """
+        Closing the DB.
+        The background threads are stopped and the pending changes are persisted.
+        It is called automatically at the exit of the interpreter and in case of SIGTERM/SIGINT.
+        :return: None
+        """
+
+        if self.closed:
+            return
+
+        self.c_logger.info("Starting to close the DB.")
+
+        with self.lock:
+            self.closed = True
+            self.flush_condition.notify_all()
+
+        if self.flush_thread:
+            self.flush_thread.join()
+            self.flush_thread = None
+
+        self.flush()
+
+        if self.compaction_thread:
+            self.compaction_thread.join()
+
+        if self.bgsave_thread:
+            self.bgsave_thread.join()
+
+        if self.wal:
+            self.wal.close()
+
+        if self.disk_engine:
+            self.detti_db.close()
+
+        self.c_logger.ok("The DB has been closed.")
+
+    def compact(self, wait: bool = False) -> bool:
+        """
+        Folding the write-ahead log into the DB file in the background.
+        The log is rotated and the snapshot of the DB is begun under the lock
+        (the writers wait only for this), then a background thread finishes the snapshot
+        and removes the rotated log.
+        :param wait: Wait for the end of the compaction if it is set.
+        :return: True if the compaction has been started else False
+        """
+
+        if self.persistence_mode != "wal":
+            self.c_logger.warning("The compaction is available only in 'wal' persistence mode.")
+            return False
+
+        with self.lock:
+            if self.compaction_thread and self.compaction_thread.is_alive():
+                self.c_logger.debug("A compaction is already running.")
+                return False
+
+            self.c_logger.info("Starting the compaction of the write-ahead log.")
+            path_of_compacting_wal: str = self._wal_paths()[1]
+            self.wal.rotate(path_of_compacting_wal)
+            try:
+                snapshot: SNAPSHOT_TYPE = self._begin_snapshot(self.background_save)
+            except OSError as os_error:
+                # The rotated log is kept and it is folded by the next compaction.
+                self.c_logger.error("Cannot begin the snapshot. ERROR:\n{}".format(os_error))
+                return False
+            self.compaction_thread: Thread = Thread(
+                target=self._compaction,
+                args=(snapshot, path_of_compacting_wal),
+            )
+            self.compaction_thread.start()
+
+        if wait:
+            self.compaction_thread.join()
+
+        return True
+
+    def _compaction(self, snapshot: SNAPSHOT_TYPE, path_of_compacting_wal: str) -> None:
+        """
+        Target of the compaction thread.
+        If the writing of DB file fails, the rotated log is kept and replayed on the next loading.
+        :param snapshot: The snapshot which is begun at the time of the log rotation.
+        :param path_of_compacting_wal: Path of the rotated log.
+        :return: None
+        """
+
+        try:
+            self._end_snapshot(*snapshot)
+            os.remove(path_of_compacting_wal)
+        except Exception as unexpected_error:
+            self.c_logger.error(
+                "Unexpected error happened during the compaction. ERROR:\n{}".format(
+                    unexpected_error
+                )
+            )
+            return
+
+        self.c_logger.ok("The compaction of the write-ahead log has been done.")
+
+    def _write_snapshot(
+        self,
+        db_content: Dict[str, Any],
+        file_path: str,
+        path_of_tmp_file: Optional[str] = None,
+        serializer: Optional[Serializer] = None,
+    ) -> None:
+        """
+        Writing the content of the DB to a file atomically.
+        The content is written to a temporary file which replaces the destination file,
+        so a reader or a crash never sees a truncated or a half-written file.
+        :param db_content: The content of the DB.
+        :param file_path: Path of the destination file.
+        :param path_of_tmp_file: Path of the temporary file.
+                                 Default: An unique file next to the destination file.
+        :param serializer: The serialization backend. Default: Based on "storage_format".
+        :return: None
+        """
+
+        dump_file(
+            db_content,
+            file_path,
+            serializer if serializer else self.serializer,
+            path_of_tmp_file=path_of_tmp_file,
+        )
+
+    def _remove_stale_tmp_files(self) -> None:
+        """
+        Removing the temporary snapshot files which are left by a crash during the snapshot.
+        :return: None
+        """
+
+        pattern_of_tmp_files: str = (
+            os.path.join(glob.escape(self.path_of_db), "*.tmp")
+            if self.sharded
+            else "{}.*.tmp".format(glob.escape(self.path_of_db))
+        )
+        path_of_tmp_file: str
+        for path_of_tmp_file in glob.glob(pattern_of_tmp_files):
+            self.c_logger.warning("Removing a stale snapshot file: {}".format(path_of_tmp_file))
+            os.remove(path_of_tmp_file)
+
+    def _begin_snapshot(self, background_save: str) -> SNAPSHOT_TYPE:
+        """
+        Beginning a background snapshot of the DB to the DB file (or to the dirty shards).
+        It has to be called under the lock, so the snapshot is consistent.
+            thread: The DB is copied and the copy is written by the caller thread.
+            fork: A forked child process writes the copy-on-write image of the DB.
+        :param background_save: The method of the background snapshot (thread, fork).
+        :return: (Start time, Copies of the DB files or None, PID of the child process or None,
+                  Indexes of the snapshotted dirty shards)
+        """
+
+        start_time: float = time.time()
+        db_files: Dict[str, Dict[str, Any]] = self._dirty_db_files(copy=background_save != "fork")
+        dirty_shards: Set[int] = self.dirty_shards
+        self.dirty_shards = set()
+
+        if background_save == "fork":
+            try:
+                return start_time, None, self._fork_snapshot_child(db_files), dirty_shards
+            except OSError:
+                self.dirty_shards.update(dirty_shards)
+                raise
+
+        return start_time, db_files, None, dirty_shards
+
+    def _end_snapshot(
+        self,
+        start_time: float,
+        db_files: Optional[Dict[str, Dict[str, Any]]],
+        child_pid: Optional[int],
+        dirty_shards: Set[int],
+    ) -> None:
+        """
+        Finishing a background snapshot of the DB. It is called without the lock.
+        The copies of the DB files are written or the forked child process is waited.
+        The snapshotted shards are marked dirty again if the snapshot fails.
+        :param start_time: Start time of the snapshot.
+        :param db_files: Copies of the DB files by path (In case of "thread" method).
+        :param child_pid: PID of the child process (In case of "fork" method).
+        :param dirty_shards: Indexes of the snapshotted dirty shards.
+        :return: None
+        """
+
+        try:
+            if child_pid is None:
+                self._write_db_files(db_files)
+            else:
+                exit_status: int = os.waitpid(child_pid, 0)[1]
+                if exit_status:
+                    raise RuntimeError(
+                        "The snapshot child process ({}) has failed. Exit status: {}".format(
+                            child_pid, exit_status
+                        )
+                    )
+        except BaseException:
+            with self.lock:
+                self.dirty_shards.update(dirty_shards)
+            raise
+
+        self._record_snapshot(start_time)
+
+    def _fork_snapshot_child(self, db_files: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Forking a child process which writes the copy-on-write image of the DB files.
+        The child process doesn't log and exits without running the exit handlers.
+        :param db_files: The contents of the DB files by path.
+        :return: PID of the child process.
+        """
+
+        child_pid: int = os.fork()
+
+        if child_pid == 0:  # pragma: no cover
+            exit_code: int = 0
+            try:
+                self._write_db_files(db_files, tmp_file_suffix="{}.tmp".format(os.getpid()))
+            except BaseException:
+                exit_code = 1
+            os._exit(exit_code)
+
+        return child_pid
+
+    def _record_snapshot(self, start_time: float) -> None:
+        """
+        Recording the statistics of a finished snapshot.
+        :param start_time: Start time of the snapshot.
+        :return: None
+        """
+
+        self.last_snapshot_time: Optional[float] = time.time()
+        self.last_snapshot_duration: Optional[float] = self.last_snapshot_time - start_time
+
+        self.c_logger.debug(
+            "The snapshot of DB has been written in {:.3f} sec.".format(self.last_snapshot_duration)
+        )
+
+    def bgsave(self, wait: bool = False) -> bool:
+        """
+        Saving the DB to the DB file in a forked child process (like BGSAVE of Redis).
+        The child process writes the copy-on-write image of the DB,
+        so the DB can be changed during the saving without copying it.
+        :param wait: Wait for the end of the saving if it is set.
+        :return: True if the saving has been started else False
+        """
+
+        self.c_logger.info("Starting the background saving of DB.")
+
+        if not hasattr(os, "fork"):  # pragma: no cover
+            self.c_logger.warning("The background saving is not supported on this platform.")
+            return False
+
+        if self.disk_engine:
+            self.c_logger.warning(
+                "The background saving is not available with '{}' storage engine.".format(
+                    self.storage_engine
+                )
+            )
+            return False
+
+        with self.lock:
+            if self.bgsave_thread and self.bgsave_thread.is_alive():
+                self.c_logger.debug("A background saving is already running.")
+                return False
+            snapshot: SNAPSHOT_TYPE = self._begin_snapshot("fork")
+            self.bgsave_thread: Thread = Thread(target=self._bgsave, args=(snapshot,))
+            self.bgsave_thread.start()
+
+        if wait:
+            self.bgsave_thread.join()
+
+        return True
+
+    def _bgsave(self, snapshot: SNAPSHOT_TYPE) -> None:
+        """
+        Target of the background saving thread. It waits for the child process.
+        :param snapshot: The snapshot which is begun by the "bgsave" method.
+        :return: None
+        """
+
+        try:
+            self._end_snapshot(*snapshot)
+        except Exception as unexpected_error:
+            self.c_logger.error(
+                "Unexpected error happened during the background saving. ERROR:\n{}".format(
+                    unexpected_error
+                )
+            )
+            return
+
+        self.c_logger.ok("The background saving of DB has been done.")
+
+    def get_snapshot_info(self) -> Dict[str, Union[Optional[float], bool]]:
+        """
+        Providing the statistics of the snapshots (dumps) of the DB file.
+            last_snapshot_time: The time (epoch) when the last snapshot has finished.
+            last_snapshot_duration: The duration of the last snapshot in seconds.
+            bgsave_in_progress: True if a background saving is running.
+        The times are None if no snapshot has been written since the loading.
+        :return: The statistics in a dict.
+        """
+
+        return {
+            "last_snapshot_time": self.last_snapshot_time,
+            "last_snapshot_duration": self.last_snapshot_duration,
+            "bgsave_in_progress": bool(self.bgsave_thread and self.bgsave_thread.is_alive()),
+        }
+
+    def get(
+        self, db_key: str, default_value: Any = None
+    ) -> Optional[Union[str, int, float, list, dict]]:
+        """
+        Providing the value of a key.
+        The method returns None if the key doesn't exist in the DB.
+        :param db_key: Related key.
+        :param default_value: If the key is not in DB, the default value will be returned.
+        :return: The value of the key as a string.
+        """
+
+        self.c_logger.info("Starting to get the '{}' element.".format(db_key))
+
+        try:
+            value_of_key: Union[str, int, float, list] = self.detti_db[db_key]
+            self.c_logger.ok("Successfully get the value of '{}': {}".format(db_key, value_of_key))
+            return value_of_key
+        except KeyError:
+            self.c_logger.warning("The '{}' key doesn't exist in the DB.".format(db_key))
+            if default_value:
+                self.c_logger.debug(
+                    "The default value set to '{}'. It will be returned".format(default_value)
+                )
+                return default_value
+            return None
+        except Exception as unexpected_error:  # pragma: no cover
+            self.c_logger.error(
+                "Unexpected error happened during the get an element. ERROR:\n{}".format(
+                    unexpected_error
+                )
+            )
+            raise unexpected_error
+
+    def get_many(self, db_keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Providing the values of more keys. The values are read under the DB lock, so they are
+        consistent (Eg.: all or none of the changes of a write batch are seen).
+        :param db_keys: The keys.
+        :return: The existing keys and their values in a dict (The not existing keys are skipped).
+        """
+
+        self.c_logger.info("Starting to get more elements.")
+
+        with self.lock:
+            found_items: Dict[str, Any] = {
+                db_key: self.detti_db[db_key] for db_key in db_keys if db_key in self.detti_db
+            }
+        self.c_logger.ok("Successfully get {} elements.".format(len(found_items)))
+        return found_items
+
+    def get_all(self) -> Dict[str, Union[str, int, float]]:
+        """
+        Providing the all elements from DB.
+        The method returns None if the DB is empty.
+        :return: The content of DB in dict or empty dict if the DB is empty.
+        """
+
+        self.c_logger.info("Starting to the get the all elements.")
+
+        content: Dict[str, Any] = self._copy_content()
+        if not content:
+            self.c_logger.warning("The DB is empty")
+            return {}
+        self.c_logger.ok("The DB has content and it's returned.")
+        return content
+
+    def scan(
+        self,
+        start_key: str = "",
+        end_key: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        consistent: bool = False,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterating the key-value pairs in key order without copying the DB.
+        The keys are read by batches under the lock, so the concurrent changes don't break
+        the iteration (A key is provided only once and the keys are always increasing).
+        The "mmap" storage engine is not ordered, its keys are sorted at the start of the scan.
+        A consistent scan with a limit reads the pairs of the page in one batch under the lock,
+        so the cost is bounded by the page. A consistent scan without limit iterates the read
+        view of the DB without the lock (See: "get_read_view" method). The changes during
+        a consistent scan are not visible.
+        :param start_key: The first key (inclusive, it doesn't have to exist).
+        :param end_key: The end of the range (exclusive) or None for the last key.
+        :param limit: The maximum number of the provided pairs or None for no limit.
+        :param cursor: Continue a scan after the last key of a page (See: "scan_page" method).
+        :param consistent: Iterate a consistent snapshot of the DB.
+        :return: Iterator of the (key, value) pairs.
+        """
+
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            error_msg: str = (
+                "Invalid limit of scan: {}. It has to be a non-negative integer.".format(limit)
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        after_key: Optional[str] = self._decode_scan_cursor(cursor) if cursor else None
+        from_key: str = max(start_key, after_key) if after_key is not None else start_key
+
+        if consistent and limit is None:
+            content: Dict[str, Any] = self._read_view()
+            for key in sorted(
+                key
+                for key in content
+                if from_key <= key and (end_key is None or key < end_key) and key != after_key
+            ):
+                yield key, content[key]
+            return
+
+        with self.lock:
+            key_source: Union[SortedKeyIndex, LsmTree, SqliteStore] = (
+                self.key_index
+                if self.key_index is not None
+                else SortedKeyIndex(self.detti_db)
+                if isinstance(self.detti_db, MmapHashTable)
+                else self.detti_db
+            )
+            # A consistent page is read in one batch under the same lock as its keys.
+            page: Optional[List[Tuple[str, Any]]] = (
+                self._read_scan_batch(key_source, from_key, end_key, after_key, limit)
+                if consistent
+                else None
+            )
+        if page is not None:
+            yield from page
+            return
+
+        provided: int = 0
+        while limit is None or provided < limit:
+            with self.lock:
+                batch: List[Tuple[str, Any]] = self._read_scan_batch(
+                    key_source, from_key, end_key, after_key, SCAN_BATCH_SIZE
+                )
+            if not batch:
+                return
+            for key, value in batch[: None if limit is None else limit - provided]:
+                yield key, value
+                provided += 1
+            after_key = from_key = batch[-1][0]
+
+    def _read_scan_batch(
+        self,
+        key_source: Union[SortedKeyIndex, LsmTree, SqliteStore],
+        from_key: str,
+        end_key: Optional[str],
+        after_key: Optional[str],
+        batch_size: int,
+    ) -> List[Tuple[str, Any]]:
+        """
+        Reading the next key-value pairs of a scan. The lock has to be held by the caller.
+        :param key_source: The ordered keys of the DB.
+        :param from_key: The first key (inclusive).
+        :param end_key: The end of the range (exclusive) or None for the last key.
+        :param after_key: The last key of the previous batch or page which is skipped.
+        :param batch_size: The maximum number of the pairs.
+        :return: The key-value pairs in key order.
+        """
+
+        batch: List[Tuple[str, Any]] = []
+        if batch_size < 1:
+            return batch
+        for key in key_source.irange(from_key, end_key):
+            if key == after_key:
+                continue
+            try:
+                batch.append((key, self.detti_db[key]))
+            except KeyError:
+                # The sorted keys of the "mmap" storage engine may be deleted since.
+                continue
+            if len(batch) >= batch_size:
+                break
+        return batch
+
+    def scan_page(
+        self,
+        start_key: str = "",
+        end_key: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Providing a page of an ordered scan with a cursor for the next page.
+        Eg.:
+            page, cursor = detti_db.scan_page(limit=100)
+            while cursor:
+                page, cursor = detti_db.scan_page(limit=100, cursor=cursor)
+        :param start_key: The first key (inclusive, it doesn't have to exist).
+        :param end_key: The end of the range (exclusive) or None for the last key.
+        :param limit: The maximum number of the pairs in the page.
+        :param cursor: The cursor of the previous page or None for the first page.
+        :return: The key-value pairs of the page and the cursor of the next page
+                 (None if there are no more pairs).
+        """
+
+        self.c_logger.info(
+            "Starting to scan a page (start: {}, end: {}, limit: {}).".format(
+                start_key, end_key, limit
+            )
+        )
 
-    def get_all(self) -> Dict[str, Union[str, int, float]]:
+        if not isinstance(limit, int) or limit < 1:
+            error_msg: str = (
+                "Invalid limit of scan page: {}. It has to be a positive integer.".format(limit)
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # One more pair is read to know if there is a next page.
+        items: List[Tuple[str, Any]] = list(self.scan(start_key, end_key, limit + 1, cursor))
+        next_cursor: Optional[str] = (
+            self._encode_scan_cursor(items[limit - 1][0]) if len(items) > limit else None
+        )
+
+        self.c_logger.ok("Successfully scanned a page ({} items).".format(min(len(items), limit)))
+        return dict(items[:limit]), next_cursor
+
+    @staticmethod
+    def _encode_scan_cursor(last_key: str) -> str:
         """
-        Providing the all elements from DB.
-        The method returns None if the DB is empty.
-        :return: The content of DB in dict or empty dict if the DB is empty.
+        Encoding the last key of a page to an opaque cursor.
+        :param last_key: The last key of the page.
+        :return: The cursor (URL safe string).
         """
 
-        self.c_logger.info("Starting to the get the all elements.")
+        return base64.urlsafe_b64encode(
+            json.dumps({"after": last_key}, ensure_ascii=False).encode("utf-8")
+        ).decode("ascii")
 
-        if not self.detti_db:
-            self.c_logger.warning("The DB is empty")
-            return {}
-        self.c_logger.ok("The DB has content and it's returned.")
-        return self.detti_db
+    def _decode_scan_cursor(self, cursor: str) -> str:
+        """
+        Decoding a cursor of the scan.
+        :param cursor: The cursor.
+        :return: The last key of the previous page.
+        """
+
+        try:
+            after_key: Any = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["after"]
+            if not isinstance(after_key, str):
+                raise ValueError("The key of the cursor is not a string.")
+        except (ValueError, TypeError, KeyError, AttributeError) as cursor_error:
+            error_msg: str = "Invalid cursor of scan: {}. ERROR: {}".format(cursor, cursor_error)
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+        return after_key
 
-    def _set(self, db_key: str, db_value: Union[str, int, float, list, dict]) -> bool:
+    def _set(self, db_key: str, db_value: Union[str, bool, int, float, list, dict]) -> bool:
         """
         Decide what type of setting is needed and call the proper method.
         :param db_key: Key of the item.
@@ -354,15 +2136,18 @@ class DettiDB(object):
             return False
 
         if isinstance(db_value, str):
-            self.set(db_key, db_value)
+            return self.set(db_key, db_value)
+        # The bool is a subclass of int, so it is checked first.
+        elif isinstance(db_value, bool):
+            return self.set_bool(db_key, db_value)
         elif isinstance(db_value, int):
-            self.set_int(db_key, db_value)
+            return self.set_int(db_key, db_value)
         elif isinstance(db_value, float):
-            self.set_float(db_key, db_value)
+            return self.set_float(db_key, db_value)
         elif isinstance(db_value, list):
-            self.set_list(db_key, db_value)
+            return self.set_list(db_key, db_value)
         elif isinstance(db_value, dict):
-            self.set_dict(db_key, db_value)
+            return self.set_dict(db_key, db_value)
         else:
             self.c_logger.warning(
                 "The getting value type is not supported ({}). "
@@ -405,8 +2190,7 @@ class DettiDB(object):
                 return False
             db_key: str = db_key.strip()
             db_value: str = db_value.strip()
-            self.detti_db[db_key]: str = db_value
-            self.dump_json()
+            self._commit({"op": "set", "key": db_key, "val": db_value})
             self.c_logger.ok(
                 "'{}:{}' key-value pair has been stored successfully.".format(db_key, db_value)
             )
@@ -449,8 +2233,7 @@ class DettiDB(object):
                 )
                 return False
             db_key: str = db_key.strip()
-            self.detti_db[db_key]: int = db_value
-            self.dump_json()
+            self._commit({"op": "set", "key": db_key, "val": db_value})
             self.c_logger.ok(
                 "'{}:{}' integer key-value pair has been stored successfully.".format(
                     db_key, db_value
@@ -461,6 +2244,41 @@ class DettiDB(object):
             self.c_logger.warning("The key is not string! The value won't be stored!")
             return False
 
+    def set_bool(self, db_key: str, db_value: bool) -> bool:
+        """
+        Setting a new boolean item in the DB.
+        :param db_key: Key of the item.
+        :param db_value: Value of the key.
+        :return: True if the operation is success else False.
+        """
+
+        self.c_logger.info(
+            "Starting to set the '{}:{}' boolean key-value pair".format(db_key, db_value)
+        )
+
+        if not isinstance(db_value, bool):
+            self.c_logger.warning("The value is not boolean. The value won't be stored!")
+            return False
+
+        if isinstance(db_key, str):
+            if len(db_key) > int(self.len_of_key):
+                self.c_logger.warning(
+                    "The length of key is too long. "
+                    "The value won't be stored! Max. len: {}".format(self.len_of_key)
+                )
+                return False
+            db_key: str = db_key.strip()
+            self._commit({"op": "set", "key": db_key, "val": db_value})
+            self.c_logger.ok(
+                "'{}:{}' boolean key-value pair has been stored successfully.".format(
+                    db_key, db_value
+                )
+            )
+            return True
+        else:
+            self.c_logger.warning("The key is not string! The value won't be stored!")
+            return False
+
     def set_float(self, db_key: str, db_value: float) -> bool:
         """
         Setting a new float item in the DB.
@@ -495,8 +2313,7 @@ class DettiDB(object):
                 )
                 return False
             db_key: str = db_key.strip()
-            self.detti_db[db_key]: float = db_value
-            self.dump_json()
+            self._commit({"op": "set", "key": db_key, "val": db_value})
             self.c_logger.ok(
                 "'{}:{}' float key-value pair has been stored successfully.".format(
                     db_key, db_value
@@ -541,8 +2358,7 @@ class DettiDB(object):
                 )
                 return False
             db_key: str = db_key.strip()
-            self.detti_db[db_key]: list = db_value
-            self.dump_json()
+            self._commit({"op": "set", "key": db_key, "val": db_value})
             self.c_logger.ok(
                 "'{}:{}' list key-value pair has been stored successfully.".format(db_key, db_value)
             )
@@ -579,8 +2395,7 @@ class DettiDB(object):
                 return False
             # TODO: Introduce new parameter to config file about size of dict.
             db_key: str = db_key.strip()
-            self.detti_db[db_key]: dict = db_value
-            self.dump_json()
+            self._commit({"op": "set", "key": db_key, "val": db_value})
             self.c_logger.ok(
                 "'{}:{}' dict key-value pair has been stored successfully.".format(db_key, db_value)
             )
@@ -601,24 +2416,180 @@ class DettiDB(object):
             "Starting to append the '{}' item to '{}' list in DB".format(db_val, db_key)
         )
 
-        if db_key not in self.detti_db:
-            self.c_logger.warning("The '{}' key is not in DB.".format(db_key))
-            return False
-
-        if not isinstance(self.detti_db[db_key], list):
-            self.c_logger.warning(
-                "The value of '{}' key is not a list. Cannot append element".format(db_key)
-            )
-            return False
+        with self._key_lock(db_key):
+            if db_key not in self.detti_db:
+                self.c_logger.warning("The '{}' key is not in DB.".format(db_key))
+                return False
 
-        self.detti_db[db_key].append(db_val)
+            if not isinstance(self.detti_db[db_key], list):
+                self.c_logger.warning(
+                    "The value of '{}' key is not a list. Cannot append element".format(db_key)
+                )
+                return False
 
-        self.dump_json()
+            # The list is replaced instead of appending in-place,
+            # so the copies of the DB (Eg.: compaction) are not changed.
+            self._commit({"op": "set", "key": db_key, "val": self.detti_db[db_key] + [db_val]})
 
         self.c_logger.ok("'{}' successfully append to '{}' list".format(db_val, db_key))
 
         return True
 
+    def _normalize_key(self, db_key: str) -> str:
+        """
+        Validating and normalizing a key like the setters do (string, maximum length, stripped).
+        The atomic operations lock, read and write the normalized key.
+        :param db_key: Key of the item.
+        :return: The normalized key.
+        """
+
+        if not isinstance(db_key, str) or len(db_key) > int(self.len_of_key):
+            error_msg: str = "Invalid key: {}. It has to be a string (Max. len: {}).".format(
+                db_key, self.len_of_key
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+        return db_key.strip()
+
+    def _numeric_value(self, db_key: str, number_type: type) -> Union[int, float]:
+        """
+        Providing the current value of a key as a number for the atomic increments.
+        The not existing keys are 0, the strings are converted (The values of the server).
+        It is called under the lock of the stripe of the key.
+        :param db_key: Key of the item.
+        :param number_type: The type of the number (int or float).
+        :return: The current value as a number.
+        """
+
+        if db_key not in self.detti_db:
+            return number_type(0)
+        current_value: Any = self.detti_db[db_key]
+        if isinstance(current_value, (int, float, str)) and not isinstance(current_value, bool):
+            try:
+                if number_type is int and isinstance(current_value, float):
+                    raise ValueError("The float values can be increased only by incrbyfloat.")
+                return number_type(current_value)
+            except ValueError:
+                pass
+        error_msg: str = "The value of '{}' key is not {}: {}".format(
+            db_key, "an integer" if number_type is int else "a number", current_value
+        )
+        self.c_logger.error(error_msg)
+        raise ValueError(error_msg)
+
+    def incrby(self, db_key: str, amount: int) -> int:
+        """
+        Increasing the integer value of a key atomically (Not existing key: 0 before increasing).
+        The value is read and set under the lock of the key, so the concurrent increments
+        are not lost, and the change is one persistence record (See: "set_int" method).
+        :param db_key: Key of the item.
+        :param amount: The increment (It can be negative).
+        :return: The new value.
+        """
+
+        self.c_logger.info("Starting to increase the '{}' key by {}".format(db_key, amount))
+
+        if not isinstance(amount, int) or isinstance(amount, bool):
+            error_msg: str = "Invalid increment: {}. It has to be an integer.".format(amount)
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        db_key = self._normalize_key(db_key)
+        with self._key_lock(db_key):
+            new_value: int = self._numeric_value(db_key, int) + amount
+            if not self.set_int(db_key, new_value):
+                error_msg = "The new value of '{}' key cannot be stored.".format(db_key)
+                self.c_logger.error(error_msg)
+                raise ValueError(error_msg)
+        return new_value
+
+    def incr(self, db_key: str) -> int:
+        """
+        Increasing the integer value of a key by one atomically (See: "incrby" method).
+        :param db_key: Key of the item.
+        :return: The new value.
+        """
+
+        return self.incrby(db_key, 1)
+
+    def incrbyfloat(self, db_key: str, amount: float) -> float:
+        """
+        Increasing the numeric value of a key atomically (See: "incrby" method).
+        The new value is a float (See: "set_float" method).
+        :param db_key: Key of the item.
+        :param amount: The increment (It can be negative).
+        :return: The new value.
+        """
+
+        self.c_logger.info("Starting to increase the '{}' key by {}".format(db_key, amount))
+
+        if not isinstance(amount, (int, float)) or isinstance(amount, bool):
+            error_msg: str = "Invalid increment: {}. It has to be a number.".format(amount)
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        db_key = self._normalize_key(db_key)
+        with self._key_lock(db_key):
+            new_value: float = self._numeric_value(db_key, float) + amount
+            if not self.set_float(db_key, new_value):
+                error_msg = "The new value of '{}' key cannot be stored.".format(db_key)
+                self.c_logger.error(error_msg)
+                raise ValueError(error_msg)
+        return new_value
+
+    def compare_and_set(
+        self,
+        db_key: str,
+        expected: Any,
+        db_value: Union[str, int, float, list, dict],
+        as_string: bool = False,
+    ) -> bool:
+        """
+        Setting a new value of a key atomically if its current value is the expected one.
+        Eg.:
+            detti_db.compare_and_set("lock_owner", None, "worker_1")  # Only if it doesn't exist.
+        :param db_key: Key of the item.
+        :param expected: The expected current value (None: the key doesn't exist).
+        :param db_value: The new value (The setter is selected by its type).
+        :param as_string: Compare the string form of the current value (Eg.: for the server).
+        :return: True if the value has been set else False (ValueError for an invalid key).
+        """
+
+        self.c_logger.info("Starting to compare and set the '{}' key".format(db_key))
+
+        db_key = self._normalize_key(db_key)
+        with self._key_lock(db_key):
+            current_value: Any = self.detti_db[db_key] if db_key in self.detti_db else None
+            if as_string and current_value is not None:
+                current_value = "{}".format(current_value)
+            if current_value != expected:
+                self.c_logger.warning(
+                    "The value of '{}' key is not the expected one. It is not set.".format(db_key)
+                )
+                return False
+            return self._set(db_key, db_value)
+
+    def getset(
+        self, db_key: str, db_value: Union[str, int, float, list, dict]
+    ) -> Optional[Union[str, int, float, list, dict]]:
+        """
+        Setting a new value of a key atomically and providing the old value.
+        :param db_key: Key of the item.
+        :param db_value: The new value (The setter is selected by its type).
+        :return: The old value or None if the key didn't exist.
+        """
+
+        self.c_logger.info("Starting to get and set the '{}' key".format(db_key))
+
+        db_key = self._normalize_key(db_key)
+        with self._key_lock(db_key):
+            old_value: Any = self.detti_db[db_key] if db_key in self.detti_db else None
+            if not self._set(db_key, db_value):
+                error_msg: str = "The new value of '{}' key cannot be stored.".format(db_key)
+                self.c_logger.error(error_msg)
+                raise ValueError(error_msg)
+        return old_value
+
     def delete(self, db_key: str) -> bool:
         """
         Deleting an item from the DB.
@@ -628,14 +2599,109 @@ class DettiDB(object):
 
         self.c_logger.info("Starting to remove the '{}' item from DB".format(db_key))
 
-        if db_key not in self.detti_db:
-            self.c_logger.warning("The '{}' key is not in DB! It cannot be removed".format(db_key))
-            return False
-        del self.detti_db[db_key]
-        self.dump_json()
+        with self._key_lock(db_key):
+            if db_key not in self.detti_db:
+                self.c_logger.warning(
+                    "The '{}' key is not in DB! It cannot be removed".format(db_key)
+                )
+                return False
+            self._commit({"op": "delete", "key": db_key})
         self.c_logger.ok("The '{}' item has been removed successfully from DB.".format(db_key))
         return True
 
+    def _buffer_set(self, write_batch: WriteBatch, db_key: str, db_value: Any) -> bool:
+        """
+        Validating and converting a value by its setter and buffering the change record
+        in a write batch instead of committing it (See: "_commit" method).
+        :param write_batch: The write batch.
+        :param db_key: Key of the item.
+        :param db_value: Value of the key.
+        :return: True if the value is valid else False.
+        """
+
+        self.batch_local.write_batch = write_batch
+        try:
+            return self._set(db_key, db_value)
+        finally:
+            self.batch_local.write_batch = None
+
+    @contextmanager
+    def batch(self, rollback: bool = False) -> Iterator[WriteBatch]:
+        """
+        Context manager of a write batch. The sets and deletes of the batch are buffered
+        and they are applied at the end of the block atomically with one persistence step
+        (One dump of the DB instead of one dump per key in "sync" persistence mode).
+        The buffered changes are applied if an exception is raised in the block, unless
+        the "rollback" parameter is set (See: "transaction" method).
+        Eg.:
+            with detti_db.batch() as write_batch:
+                write_batch["key_1"] = "val_1"
+                write_batch.set("key_2", [1, 2])
+                write_batch.delete("key_3")
+        :param rollback: Drop the buffered changes if an exception is raised in the block.
+        :return: Context manager. The value is the write batch.
+        """
+
+        write_batch: WriteBatch = WriteBatch(self)
+        try:
+            yield write_batch
+        except BaseException:
+            if rollback:
+                self.c_logger.warning(
+                    "Exception in the transaction. {} changes are rolled back.".format(
+                        len(write_batch)
+                    )
+                )
+                write_batch.discard()
+            self._commit_batch(write_batch.records)
+            raise
+        self._commit_batch(write_batch.records)
+        self.c_logger.ok("The {} changes of the batch have been applied.".format(len(write_batch)))
+
+    def transaction(self) -> ContextManager[WriteBatch]:
+        """
+        Context manager of a write batch which is rolled back if an exception is raised
+        in the block (See: "batch" method).
+        :return: Context manager. The value is the write batch.
+        """
+
+        return self.batch(rollback=True)
+
+    def set_many(self, items: Mapping[str, Any], all_or_nothing: bool = False) -> List[str]:
+        """
+        Setting more items in one write batch (The setter is selected by the type of the value).
+        :param items: The key-value pairs.
+        :param all_or_nothing: Don't set any item if an item is invalid.
+        :return: The keys of the invalid items which have not been set.
+        """
+
+        self.c_logger.info("Starting to set {} items in a batch".format(len(items)))
+
+        with self.batch() as write_batch:
+            invalid_keys: List[str] = [
+                db_key
+                for db_key, db_value in items.items()
+                if not write_batch.set(db_key, db_value)
+            ]
+            if invalid_keys and all_or_nothing:
+                self.c_logger.warning(
+                    "Invalid items: {}. None of the items are set.".format(invalid_keys)
+                )
+                write_batch.discard()
+        return invalid_keys
+
+    def delete_many(self, db_keys: Iterable[str]) -> List[str]:
+        """
+        Deleting more items in one write batch.
+        :param db_keys: The keys of the items.
+        :return: The deleted keys (The not existing keys are skipped).
+        """
+
+        with self.batch() as write_batch:
+            deleted_keys: List[str] = [db_key for db_key in db_keys if write_batch.delete(db_key)]
+        self.c_logger.ok("{} items have been removed from DB.".format(len(deleted_keys)))
+        return deleted_keys
+
     def _clear_db(self) -> None:
         """
         It is a really dangerous method.
@@ -645,8 +2711,7 @@ class DettiDB(object):
         """
 
         self.c_logger.info("Starting to clear the complete DB")
-        self.detti_db: dict = {}
-        self.dump_json()
+        self._commit({"op": "clear"})
         self.c_logger.ok("The DB has been cleared successfully.")
 
     def dump_to_json(self, file_path: str, force: bool = False, permissions: int = 0o600) -> bool:
@@ -689,7 +2754,8 @@ class DettiDB(object):
     def dump_json(self, file_path: str = None) -> None:
         """
         Dump the dict object to the Json file in case of DB changing.
-        It is performed on multithreading.
+        The file is replaced atomically (temporary file and rename).
+        The files of an on-disk storage engine are synced instead of dumping the DB.
         :param file_path: Path of the DB file.
         :return: None
         """
@@ -697,15 +2763,22 @@ class DettiDB(object):
         if not file_path:
             file_path = self.path_of_db
 
-        with self.lock:
-            with open(file_path, "wt") as opened_db:
-                self.dump_thread: Thread = Thread(
-                    target=json.dump,
-                    args=(self.detti_db, opened_db),
-                    kwargs=dict(ensure_ascii=False, indent=4),
-                )
-                self.dump_thread.start()
-                self.dump_thread.join()
+        if file_path == self.path_of_db:
+            with self.lock:
+                start_time: float = time.time()
+                if self.disk_engine:
+                    self.detti_db.flush()
+                else:
+                    self._write_db_files(self._dirty_db_files(copy=False))
+                    self.dirty_shards.clear()
+                self._record_snapshot(start_time)
+            return
+
+        # The other files are always Json files (Eg.: "dump_to_json" method).
+        # They are written from the read view without the lock.
+        self._write_snapshot(
+            self._copy_content(), file_path, serializer=get_serializer("json_pretty")
+        )
 
     def search_keys_in_db(self, key_prefix: str) -> Dict[str, str]:
         """
@@ -717,18 +2790,11 @@ class DettiDB(object):
 
         self.c_logger.info("Starting to search keys in DB based on '{}' prefix".format(key_prefix))
 
-        return_dict: Dict[str, str] = {}
-        key: str
-        value: str
-
-        for key, value in self.detti_db.items():
-            if key.startswith(key_prefix):
-                self.c_logger.debug(
-                    "Found key-value pair for '{}' key prefix: {}:{}".format(key_prefix, key, value)
-                )
-                return_dict[key]: str = value
+        return_dict: Dict[str, str] = self._search_with_cache("key", key_prefix, self._search_keys)
 
-        self.c_logger.ok("Successfully run the key searching in the DB.")
+        self.c_logger.ok(
+            "Successfully run the key searching in the DB ({} found).".format(len(return_dict))
+        )
 
         return return_dict
 
@@ -744,25 +2810,304 @@ class DettiDB(object):
             "Starting to search values in DB based on '{}' prefix".format(value_prefix)
         )
 
-        return_dict: Dict[str, str] = {}
-        key: str
-        value: str
+        return_dict: Dict[str, str] = self._search_with_cache(
+            "value", value_prefix, self._search_values
+        )
 
-        for key, value in self.detti_db.items():
-            if not isinstance(value, str):
-                continue
-            if value.startswith(value_prefix):
-                self.c_logger.debug(
-                    "Found key-value pair for '{}' value prefix: {}:{}".format(
-                        value_prefix, key, value
-                    )
-                )
-                return_dict[key]: str = value
+        self.c_logger.ok(
+            "Successfully run the value searching in the DB ({} found).".format(len(return_dict))
+        )
+
+        return return_dict
+
+    def _search_keys(self, key_prefix: str) -> Dict[str, Any]:
+        """
+        Searching the keys with a prefix in the DB (without the search cache).
+        :param key_prefix: Prefix of the keys.
+        :return: The found key-value pairs.
+        """
+
+        # The LSM-tree seeks to the prefix in its sorted segments,
+        # the SQLite storage engine runs a range query on its key index.
+        if isinstance(self.detti_db, (LsmTree, SqliteStore)):
+            return self.detti_db.search_prefix(key_prefix)
+        if self.key_index is not None:
+            # Only the matched keys are visited (bisection to the first one in the sorted index).
+            # The values are accessed after the search (They may be loaded lazily).
+            with self.lock:
+                return {key: self.detti_db[key] for key in self.key_index.iter_prefix(key_prefix)}
+        return {key: value for key, value in self._iter_items() if key.startswith(key_prefix)}
+
+    def _search_values(self, value_prefix: str) -> Dict[str, Any]:
+        """
+        Searching the values with a prefix in the DB (without the search cache).
+        :param value_prefix: Prefix of the value terms.
+        :return: The found key-value pairs.
+        """
+
+        if self.key_index is not None:
+            # The matched keys are found by a range lookup in the value index.
+            with self.lock:
+                if self.value_index is None:
+                    self._build_value_index()
+                return {
+                    key: self.detti_db[key]
+                    for key in sorted(self.value_index.search_prefix(value_prefix))
+                }
+        # The on-disk storage engines are scanned (The index would hold all values in RAM).
+        index_numbers: bool = configparser.ConfigParser.BOOLEAN_STATES[
+            str(self.value_index_numbers).lower()
+        ]
+        return {
+            key: value
+            for key, value in self._iter_items()
+            if any(term.startswith(value_prefix) for term in value_terms(value, index_numbers))
+        }
+
+    def _search_with_cache(
+        self, search_type: str, prefix: str, search: Callable[[str], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Running a prefix search with the search cache.
+        :param search_type: Type of the search ("key" or "value").
+        :param prefix: The searched prefix.
+        :param search: The search without the cache.
+        :return: The found key-value pairs.
+        """
+
+        if self.search_cache is None:
+            return search(prefix)
+
+        with self.lock:
+            cached_result: Optional[Dict[str, Any]] = self.search_cache.get(search_type, prefix)
+            generation: int = self.search_cache.generation
+        if cached_result is not None:
+            self.c_logger.debug("The result of the search is provided from the search cache.")
+            return cached_result
+
+        result: Dict[str, Any] = search(prefix)
+        with self.lock:
+            # The result is not cached if the DB has been changed during the search.
+            self.search_cache.put(search_type, prefix, result, generation)
+        return result
+
+    def _invalidate_search_cache(self, record: Dict[str, Any]) -> None:
+        """
+        Removing the cached search results which can be affected by a change record.
+        It is called under the lock before applying the record (The old value is still readable).
+        :param record: The change record.
+        :return: None
+        """
 
-        self.c_logger.ok("Successfully run the value searching in the DB.")
+        if record["op"] == "clear":
+            self.search_cache.clear()
+            return
+
+        self.search_cache.invalidate("key", (record["key"],))
+        if self.search_cache.has_entries("value"):
+            index_numbers: bool = configparser.ConfigParser.BOOLEAN_STATES[
+                str(self.value_index_numbers).lower()
+            ]
+            changed_terms: Set[str] = (
+                set(value_terms(self.detti_db[record["key"]], index_numbers))
+                if record["key"] in self.detti_db
+                else set()
+            )
+            if record["op"] == "set":
+                changed_terms.update(value_terms(record["val"], index_numbers))
+            self.search_cache.invalidate("value", changed_terms)
+
+    def get_search_version(self, search_type: str, prefix: str) -> Optional[int]:
+        """
+        Providing the version of a cached prefix search result.
+        It changes only if a change of the DB invalidates the result and it is cached again,
+        so the changes which cannot affect the result don't change it.
+        :param search_type: Type of the search ("key" or "value").
+        :param prefix: The searched prefix.
+        :return: The version or None if the result is not in the search cache.
+        """
+
+        if self.search_cache is None:
+            return None
+
+        with self.lock:
+            return self.search_cache.get_version(search_type, prefix)
+
+    def get_search_cache_info(self) -> Dict[str, Union[int, float]]:
+        """
+        Providing the counters and the size of the search cache.
+            hits: Number of the searches which were answered from the cache.
+            misses: Number of the searches which were not found in the cache.
+            hit_rate: Ratio of the hits (0.0 without searches).
+            invalidations: Number of the cached results which were removed by changes.
+            entries: Number of the cached results.
+            max_entries: Maximum number of the cached results ("search_cache_size" parameter).
+        :return: The information in a dict.
+        """
+
+        if self.search_cache is None:
+            return {
+                "hits": 0,
+                "misses": 0,
+                "hit_rate": 0.0,
+                "invalidations": 0,
+                "entries": 0,
+                "max_entries": 0,
+            }
+        with self.lock:
+            return self.search_cache.get_info()
+
+    def aggregate(
+        self, operation: str, key_prefix: str = "", percentile: Optional[float] = None
+    ) -> Optional[Union[int, float]]:
+        """
+        Aggregating the numeric (int and float) values of the keys with a prefix.
+        Eg.: aggregate("sum", "counter_") or aggregate("percentile", "latency_", 95)
+        The values are aggregated from array backed columns which follow the changes.
+        :param operation: The aggregation. Possible: count, sum, min, max, mean, percentile
+        :param key_prefix: Prefix of the keys (Empty string: all keys).
+        :param percentile: The percentile (0-100) of the "percentile" aggregation.
+        :return: The result or None if there are no numeric values (The count and the sum are 0).
+        """
+
+        self.c_logger.info(
+            "Starting to aggregate ({}) the values of '{}' prefix.".format(operation, key_prefix)
+        )
+
+        if operation not in AGGREGATIONS:
+            error_msg: str = "Invalid aggregation: {}. Possible: {}".format(
+                operation, ", ".join(AGGREGATIONS)
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if operation == "percentile" and (
+            isinstance(percentile, bool)
+            or not isinstance(percentile, (int, float))
+            or not 0 <= percentile <= 100
+        ):
+            error_msg: str = "Invalid percentile: {}. It has to be between 0 and 100.".format(
+                percentile
+            )
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        result: Optional[Union[int, float]]
+        if self.disk_engine:
+            # The values of the on-disk storage engines are collected by a prefix search.
+            numeric_columns: NumericColumns = NumericColumns()
+            for key, value in self.search_keys_in_db(key_prefix).items():
+                numeric_columns.set(key, value)
+            result = numeric_columns.aggregate(operation, key_prefix, percentile)
+        else:
+            with self.lock:
+                if self.numeric_columns is None:
+                    self._build_numeric_columns()
+                result = self.numeric_columns.aggregate(operation, key_prefix, percentile)
+
+        self.c_logger.ok("Successfully aggregated the values. Result: {}".format(result))
+
+        return result
+
+    def search_substring_in_db(self, text: str, in_values: bool = False) -> Dict[str, Any]:
+        """
+        Searching the keys (or the string values) which contain a text. Eg.: "user_42"
+        The candidates are found by the trigram index and only the candidates are checked.
+        :param text: The searched text.
+        :param in_values: Search in the values (See: "search_values_in_db") instead of the keys.
+        :return: The found key-value pairs in key order.
+        """
+
+        self.c_logger.info(
+            "Starting to search {} in DB containing '{}'".format(
+                "values" if in_values else "keys", text
+            )
+        )
+
+        return_dict: Dict[str, Any] = self._search_by_trigrams(
+            text,
+            in_values,
+            lambda trigram_index: trigram_index.search_substring(text),
+            lambda indexed_text: text in indexed_text,
+        )
+
+        self.c_logger.ok(
+            "Successfully run the substring searching in the DB ({} found).".format(
+                len(return_dict)
+            )
+        )
+
+        return return_dict
+
+    def search_glob_in_db(self, pattern: str, in_values: bool = False) -> Dict[str, Any]:
+        """
+        Searching the keys (or the string values) which match a glob pattern. Eg.: "session:*:cart"
+        The pattern syntax is the syntax of the "fnmatch" module (*, ?, [seq], [!seq]).
+        The candidates are found by the trigram index and only the candidates are matched.
+        :param pattern: The glob pattern.
+        :param in_values: Search in the values (See: "search_values_in_db") instead of the keys.
+        :return: The found key-value pairs in key order.
+        """
+
+        self.c_logger.info(
+            "Starting to search {} in DB matching '{}' pattern".format(
+                "values" if in_values else "keys", pattern
+            )
+        )
+
+        return_dict: Dict[str, Any] = self._search_by_trigrams(
+            pattern,
+            in_values,
+            lambda trigram_index: trigram_index.search_glob(pattern),
+            lambda indexed_text: fnmatch.fnmatchcase(indexed_text, pattern),
+        )
+
+        self.c_logger.ok(
+            "Successfully run the glob searching in the DB ({} found).".format(len(return_dict))
+        )
 
         return return_dict
 
+    def _search_by_trigrams(
+        self,
+        query: str,
+        in_values: bool,
+        search: Callable[[TrigramIndex], Set[str]],
+        matcher: Callable[[str], bool],
+    ) -> Dict[str, Any]:
+        """
+        Running a substring or glob search on a trigram index.
+        :param query: The searched text or glob pattern.
+        :param in_values: Search in the values instead of the keys.
+        :param search: The search on the trigram index.
+        :param matcher: The matching of a text (The disk engines are scanned with it).
+        :return: The found key-value pairs in key order.
+        """
+
+        if not isinstance(query, str):
+            error_msg: str = "Invalid search query: {}. It has to be a string.".format(query)
+            self.c_logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        if self.disk_engine:
+            # The on-disk storage engines are scanned (The index would hold all keys in RAM).
+            # Only the matched pairs are sorted.
+            return dict(
+                sorted(
+                    (key, value)
+                    for key, value in self._iter_items()
+                    if any(matcher(text) for text in self._trigram_texts(key, value, in_values))
+                )
+            )
+
+        with self.lock:
+            trigram_index: Optional[TrigramIndex] = (
+                self.value_trigram_index if in_values else self.key_trigram_index
+            )
+            if trigram_index is None:
+                trigram_index = self._build_trigram_index(in_values)
+            return {key: self.detti_db[key] for key in sorted(search(trigram_index))}
+
     def is_exist(self, db_key: str) -> bool:
         """
         Checking if key is in DB.
@@ -778,15 +3123,14 @@ class DettiDB(object):
         """
         Set a signal handler.
         It is important if the script gets an interrupt signal during updating the DB.
-        The threads should be joined before exit.
+        The pending changes are persisted (the DB is closed) before exit.
         :return: None
         """
 
         self.c_logger.debug("Starting to setup the Signal handler.")
 
         def sigterm_handler(*args):  # pragma: no cover
-            if self.dump_thread:
-                self.dump_thread.join()
+            self.close()
             sys.exit(1)
 
         signal.signal(signal.SIGTERM, sigterm_handler)
@@ -40,10 +40,50 @@ End-points:
     /set
         Setting/updating key-value pair in the DB.
         Eg.: >> curl http://localhost:5000/set -d "test_key=test_val" -X PUT
+    /mget
+        Providing the values of the keys of the Json body. {"items": {...}, "missing": [...]}
+        Eg.: >> curl http://localhost:5000/mget -d '{"keys": ["key_1", "key_2"]}'
+    /mset
+        Setting the items of the Json body (with Json types) atomically in one write batch.
+        Eg.: >> curl http://localhost:5000/mset -d '{"items": {"key_1": 1}}' -X PUT
+    /mdelete
+        Deleting the keys of the Json body in one write batch. {"deleted": [...]}
+        The size of the bulk requests is limited by "bulk_max_keys" and "bulk_max_body_size".
+    /incr/<string:db_key>
+        Increasing the integer value of the key atomically (by 1 or by "by"). {key: new value}
+        Eg.: >> curl http://localhost:5000/incr/counter -d "by=5" -X PUT
+    /incrbyfloat/<string:db_key>
+        Increasing the numeric value of the key atomically by "by". {key: new value}
+    /cas/<string:db_key>
+        Setting the "value" if the current value is the "expected" one (compare-and-set).
+        The key must not exist without "expected". The conflict is answered with 409.
+        Eg.: >> curl http://localhost:5000/cas/owner -d "expected=a" -d "value=b" -X PUT
+    /getset/<string:db_key>
+        Setting the "value" atomically and providing the old value. {key: old value}
     /search_key/<string:key_prefix>
         Searching keys in the DB based on provided key prefix. {key: value, key: value}
     /search_val/<string:value_prefix>
         Searching values in the DB based on provided value prefix. {key: value, key: value}
+    /search_substr/<string:text>
+        Searching keys in the DB which contain the text. {key: value, key: value}
+        The values are searched with "in=values" query parameter.
+        Eg.: curl http://localhost:5000/search_substr/user_42
+    /search_glob/<string:pattern>
+        Searching keys in the DB which match the glob pattern (*, ?, [seq], [!seq]).
+        The values are searched with "in=values" query parameter. The "?" is sent as "%3F".
+        Eg.: curl http://localhost:5000/search_glob/session:*:cart
+    /find/<string:field>/<string:value>
+        Finding the dict values whose (dotted) field has the value. {key: value, key: value}
+        The value is a string or a Json value with "value_type=json" query parameter.
+        Eg.: curl "http://localhost:5000/find/user.age/42?value_type=json"
+    /scan
+        Providing a page of the key-value pairs in key order and a cursor of the next page.
+        Query parameters: start, end, limit (Default: 100, maximum: scan_max_limit), cursor
+        Eg.: curl "http://localhost:5000/scan?start=prod_&limit=2"
+    /aggregate/<string:operation>/<string:key_prefix>
+        Aggregating the numeric values of the keys with the prefix (or of all keys without prefix).
+        Operations: count, sum, min, max, mean, percentile ("p" query parameter, 0-100)
+        Eg.: curl "http://localhost:5000/aggregate/percentile/latency_?p=95"
     /delete/<string:db_key>
         Deleting an element from the DB.
         Eg.: curl http://localhost:5000/delete/test_key -X DELETE
@@ -51,6 +91,8 @@ End-points:
         Checking if the server is running.
     /getall
         Providing all elements from the DB. {key: value, key: value}
+    /cache_info
+        Providing the hit and miss counters and the size of the response cache.
 
 Limiter:
     There is a limiter in the server to avoid the overload.
@@ -94,17 +136,26 @@ Note:
 """
 
 import argparse
+import json
 import os
 import sys
 import configparser
+import socket
+import signal
+import shutil
+import tempfile
+import multiprocessing
 from functools import wraps
-from typing import Union, Optional, Dict, List, Tuple
-from flask import Flask, request
+from typing import Union, Optional, Dict, List, Tuple, Any, Callable
+from flask import Flask, request, Response, make_response
 from flask_restful import Resource, Api, abort
+from flask_restful.representations.json import output_json
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_jwt import JWT, jwt_required, current_identity
 from werkzeug.security import safe_str_cmp
+from werkzeug.http import quote_etag
+from werkzeug.serving import make_server, select_address_family, get_sockaddr
 from flask_cors import CORS
 
 # Get the path of the directory of the current file.
@@ -114,12 +165,17 @@ PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
 sys.path.append(PATH_OF_FILE_DIR)
 
 from detti_db import DettiDB  # noqa: E402
+from detti_response_cache import ResponseCache  # noqa: E402
+from detti_ipc import StorageOwner, RemoteDettiDB  # noqa: E402
 
 with open(os.path.join(PATH_OF_FILE_DIR, "VERSION"), "r", encoding="utf-8") as f:
     software_version: str = f.read()
 
 __version__: str = software_version
 
+# It is set in the environment of the HTTP worker processes of the multi-process serving.
+WORKER_ENVIRONMENT_VARIABLE: str = "DETTI_SERVER_WORKER"
+
 app: Flask = Flask(__name__)
 CORS(app)
 api: Api = Api(app)
@@ -151,7 +207,18 @@ if os.path.isfile(input_parameters.config_file) and not (
 config: configparser.ConfigParser = configparser.ConfigParser(allow_no_value=True)
 config.read(input_parameters.config_file)
 
-detti_db: DettiDB = DettiDB(config_file=input_parameters.config_file)
+# The HTTP worker processes of the multi-process serving (See: "run_workers") don't load the DB,
+# they call the DB of the storage-owner process.
+detti_db: Union[DettiDB, RemoteDettiDB] = (
+    None
+    if os.environ.get(WORKER_ENVIRONMENT_VARIABLE)
+    else DettiDB(config_file=input_parameters.config_file)
+)
+
+# Cache of the encoded responses of "/getall", "/get/<key>" and the searches.
+response_cache: ResponseCache = ResponseCache(
+    config.getint("SERVER", "response_cache_size", fallback=67108864)
+)
 
 limiter = Limiter(
     app,
@@ -256,6 +323,108 @@ def checkuser(func):
     return wrapper
 
 
+def make_etag(version: int) -> str:
+    """
+    Creating the ETag of a version of the DB or of a key.
+    The versions restart at every loading of the DB, so the ETag contains the version epoch too.
+    :param version: The version.
+    :return: The ETag (without quotes).
+    """
+
+    return "{}-{}".format(detti_db.version_epoch, version)
+
+
+def cached_response(
+    cache_key: str, version: int, produce: Callable[[], Tuple[Any, int]]
+) -> Response:
+    """
+    Providing a Json response from the response cache or producing and caching it.
+    The version has to be read before the producing, so the cached response is at least
+    as new as its version. The "If-None-Match" header with the ETag of the version
+    is answered with "304 Not Modified".
+    :param cache_key: The cache key (Path of the request with the query parameters).
+    :param version: The current version of the DB or of the key.
+    :param produce: The producing of the response data and status code.
+    :return: The response with "ETag" header.
+    """
+
+    etag: str = make_etag(version)
+    if request.if_none_match.contains_weak(etag):
+        return Response(status=304, headers={"ETag": quote_etag(etag)})
+
+    cached: Optional[Tuple[int, bytes]] = response_cache.get(cache_key, version)
+    if cached is None:
+        data, status = produce()
+        cached = status, output_json(data, status).get_data()
+        response_cache.put(cache_key, version, *cached)
+
+    response: Response = make_response(cached[1], cached[0])
+    response.mimetype = "application/json"
+    response.headers["ETag"] = quote_etag(etag)
+    return response
+
+
+def cached_search(
+    search_type: str, prefix: str, produce: Callable[[], Tuple[Any, int]]
+) -> Union[Response, Tuple[Any, int]]:
+    """
+    Providing a prefix search response from the response cache or producing it.
+    The response is cached with the version of the result in the search cache of the DB,
+    so only the changes which can affect the searched prefix invalidate it.
+    The response is not cached until the result is in the search cache.
+    :param search_type: Type of the search ("key" or "value").
+    :param prefix: The searched prefix.
+    :param produce: The producing of the response data and status code.
+    :return: The response or the response data with the status code.
+    """
+
+    version: Optional[int] = detti_db.get_search_version(search_type, prefix)
+    if version is None:
+        return produce()
+    return cached_response(request.full_path, version, produce)
+
+
+def read_bulk_body(field: str, field_type: type) -> Tuple[Any, Optional[tuple]]:
+    """
+    Reading a field of the Json body of a bulk request and checking the size limits
+    ("bulk_max_body_size" and "bulk_max_keys" in the config file).
+    :param field: Name of the field. Eg.: "keys"
+    :param field_type: The expected type of the field (list of keys or dict of items).
+    :return: The value of the field and None, or None and an error message with a status code.
+    """
+
+    max_body_size: int = config.getint("SERVER", "bulk_max_body_size", fallback=1048576)
+    if (request.content_length or 0) > max_body_size:
+        return None, ({"STATUS": "The body of the request is too large."}, 413)
+    # The body is read with the limit, so the chunked bodies (without "Content-Length" header)
+    # are limited too.
+    body_parts: List[bytes] = []
+    body_size: int = 0
+    while body_size <= max_body_size:
+        body_part: bytes = request.stream.read(max_body_size + 1 - body_size)
+        if not body_part:
+            break
+        body_parts.append(body_part)
+        body_size += len(body_part)
+    if body_size > max_body_size:
+        return None, ({"STATUS": "The body of the request is too large."}, 413)
+    try:
+        body: Any = json.loads(b"".join(body_parts))
+    except ValueError:
+        body = None
+    if not isinstance(body, dict) or not isinstance(body.get(field), field_type):
+        return None, (
+            {"STATUS": 'The body has to be a Json object with "{}" field.'.format(field)},
+            400,
+        )
+    value: Union[list, dict] = body[field]
+    if field_type is list and not all(isinstance(key, str) for key in value):
+        return None, ({"STATUS": "The keys have to be strings."}, 400)
+    if len(value) > config.getint("SERVER", "bulk_max_keys", fallback=1000):
+        return None, ({"STATUS": "Too many keys in the request."}, 413)
+    return value, None
+
+
 DECORATORS = (
     [checkuser, jwt_required()]
     if (config.get("SERVER", "user") and config.get("SERVER", "password"))
@@ -271,14 +440,19 @@ class GetItem(Resource):
     decorators = DECORATORS
 
     @staticmethod
-    def get(db_key: str) -> Union[Dict[str, str], Tuple[Dict[str, str], int]]:
+    def get(db_key: str) -> Union[tuple, Dict[str, str]]:
         """
         This get method provides the value of the key and the key itself in a dict.
         If the key doesn't exist in the DB, the method provides an error message
         with 201 status code.
+        The response has an "ETag" header (the version of the key). If the "If-None-Match"
+        header of the request contains it, the answer is "304 Not Modified" without body.
         Eg.:
-            >> curl http://localhost:5000/get/exist
+            >> curl -i http://localhost:5000/get/exist
+            > ETag: "4f2a9c1b8e7d6a50-3"
             > {"exist": "value_of_exist_key"}
+            >> curl -i http://localhost:5000/get/exist -H 'If-None-Match: "4f2a9c1b8e7d6a50-3"'
+            > HTTP/1.0 304 NOT MODIFIED
             >> curl http://localhost:5000/get/doesnt_exist
             > {"doesnt_exist": "The key doesn't exist in DB."}
 
@@ -286,10 +460,17 @@ class GetItem(Resource):
         :return: The value of the key or an error message in dict.
         """
 
-        value: Optional[str] = detti_db[db_key]
-        if not value:
+        version: Optional[int] = detti_db.get_version(db_key)
+        if version is None:
             return {db_key: "The key doesn't exist in DB."}, 201
-        return {"{}".format(db_key): "{}".format(value)}
+
+        def get_value() -> Tuple[Dict[str, str], int]:
+            value: Optional[str] = detti_db[db_key]
+            if not value:
+                return {db_key: "The key doesn't exist in DB."}, 201
+            return {"{}".format(db_key): "{}".format(value)}, 200
+
+        return cached_response(request.path, version, get_value)
 
 
 class SetItem(Resource):
@@ -302,7 +483,8 @@ class SetItem(Resource):
     @staticmethod
     def put() -> Dict[str, str]:
         """
-        This method can set/update an item in the DB.
+        This method can set/update items in the DB.
+        The items are set in one write batch (Atomically and with one persistence step).
         If the operation is success,
         the method returns {"STATUS": "OK"} with 200 status code (default).
         Eg.:
@@ -314,13 +496,217 @@ class SetItem(Resource):
         :return: "OK" as string
         """
 
-        key: str
-        value: str
-        for key, value in request.form.items():
-            detti_db[key]: str = value
+        detti_db.set_many(request.form.to_dict())
+        return {"STATUS": "OK"}
+
+
+class MGetItems(Resource):
+    """
+    This class contains the getting of more keys in one request.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def post() -> Union[tuple, Dict[str, Union[Dict[str, Any], List[str]]]]:
+        """
+        Providing the values of the keys of the Json body (with their types).
+        The values are read consistently (Eg.: all or none of the items of a "/mset").
+        Eg.:
+            >> curl http://localhost:5000/mget -d '{"keys": ["key_1", "key_2", "not_exist"]}'
+            > {"items": {"key_1": "val_1", "key_2": 2}, "missing": ["not_exist"]}
+
+        :return: The found items and the missing keys or an error message.
+        """
+
+        db_keys, error = read_bulk_body("keys", list)
+        if error:
+            return error
+        items: Dict[str, Any] = detti_db.get_many(db_keys)
+        return {"items": items, "missing": [db_key for db_key in db_keys if db_key not in items]}
+
+
+class MSetItems(Resource):
+    """
+    This class contains the setting of more keys in one request.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def put() -> Union[tuple, Dict[str, str]]:
+        """
+        Setting the items of the Json body in one write batch (Atomically and with one
+        persistence step). The values keep their Json types (str, bool, int, float, list, dict).
+        If an item is invalid (Eg.: null value or too long key), no item is set.
+        Eg.:
+            >> curl http://localhost:5000/mset -d '{"items": {"key_1": "val_1", "key_2": 2}}' -X PUT
+            > {"STATUS": "OK"}
+
+        :return: "OK" or the invalid keys with a 400 status code.
+        """
+
+        items, error = read_bulk_body("items", dict)
+        if error:
+            return error
+        invalid_keys: List[str] = detti_db.set_many(items, all_or_nothing=True)
+        if invalid_keys:
+            return {"STATUS": "Invalid items. No item is set.", "invalid_keys": invalid_keys}, 400
+        return {"STATUS": "OK"}
+
+
+class MDeleteItems(Resource):
+    """
+    This class contains the deleting of more keys in one request.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def delete() -> Union[tuple, Dict[str, List[str]]]:
+        """
+        Deleting the keys of the Json body in one write batch.
+        Eg.:
+            >> curl http://localhost:5000/mdelete -d '{"keys": ["key_1", "not_exist"]}' -X DELETE
+            > {"deleted": ["key_1"]}
+
+        :return: The deleted keys (The not existing keys are skipped) or an error message.
+        """
+
+        db_keys, error = read_bulk_body("keys", list)
+        if error:
+            return error
+        return {"deleted": detti_db.delete_many(db_keys)}
+
+
+class IncrItem(Resource):
+    """
+    This class contains the atomic increments of the integer values.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def put(db_key: str) -> Union[tuple, Dict[str, int]]:
+        """
+        Increasing the integer value of the key atomically (One round trip and one persistence
+        record). The not existing key is 0 before increasing. The increment is the "by"
+        parameter (Default: 1, it can be negative).
+        Eg.:
+            >> curl http://localhost:5000/incr/counter -X PUT
+            > {"counter": 1}
+            >> curl http://localhost:5000/incr/counter -d "by=5" -X PUT
+            > {"counter": 6}
+
+        :param db_key: The increased key.
+        :return: The new value or an error message with a 400 status code.
+        """
+
+        try:
+            amount: int = int(request.values.get("by", 1))
+        except ValueError:
+            return {"by": "The increment has to be an integer."}, 400
+        try:
+            return {db_key: detti_db.incrby(db_key, amount)}
+        except ValueError as error:
+            return {db_key: str(error)}, 400
+
+
+class IncrFloatItem(Resource):
+    """
+    This class contains the atomic increments of the numeric values.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def put(db_key: str) -> Union[tuple, Dict[str, float]]:
+        """
+        Increasing the numeric value of the key atomically by the "by" parameter.
+        The not existing key is 0 before increasing. The new value is a float.
+        Eg.:
+            >> curl http://localhost:5000/incrbyfloat/gauge -d "by=1.5" -X PUT
+            > {"gauge": 1.5}
+
+        :param db_key: The increased key.
+        :return: The new value or an error message with a 400 status code.
+        """
+
+        try:
+            amount: float = float(request.values.get("by", ""))
+        except ValueError:
+            return {"by": "The increment has to be a number."}, 400
+        try:
+            return {db_key: detti_db.incrbyfloat(db_key, amount)}
+        except ValueError as error:
+            return {db_key: str(error)}, 400
+
+
+class CompareAndSet(Resource):
+    """
+    This class contains the atomic compare-and-set of the values.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def put(db_key: str) -> Union[tuple, Dict[str, str]]:
+        """
+        Setting the "value" parameter if the current value of the key is the "expected" parameter
+        (The values are compared as strings). Without the "expected" parameter the value is set
+        only if the key doesn't exist.
+        Eg.:
+            >> curl http://localhost:5000/cas/owner -d "value=worker_1" -X PUT
+            > {"STATUS": "OK"}
+            >> curl http://localhost:5000/cas/owner -d "expected=worker_2" -d "value=a" -X PUT
+            > {"STATUS": "The value of the key is not the expected one."}  (409 status code)
+
+        :param db_key: The related key.
+        :return: "OK" or an error message with a 400 or 409 status code.
+        """
+
+        if "value" not in request.values:
+            return {"value": "The new value is missing."}, 400
+        try:
+            is_set: bool = detti_db.compare_and_set(
+                db_key, request.values.get("expected"), request.values["value"], as_string=True
+            )
+        except ValueError as error:
+            return {db_key: str(error)}, 400
+        if not is_set:
+            return {"STATUS": "The value of the key is not the expected one."}, 409
         return {"STATUS": "OK"}
 
 
+class GetSetItem(Resource):
+    """
+    This class contains the atomic get-and-set of the values.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def put(db_key: str) -> Union[tuple, Dict[str, Optional[str]]]:
+        """
+        Setting the "value" parameter atomically and providing the old value of the key
+        (null if the key didn't exist).
+        Eg.:
+            >> curl http://localhost:5000/getset/state -d "value=running" -X PUT
+            > {"state": "stopped"}
+
+        :param db_key: The related key.
+        :return: The old value or an error message with a 400 status code.
+        """
+
+        if "value" not in request.values:
+            return {"value": "The new value is missing."}, 400
+        try:
+            old_value: Any = detti_db.getset(db_key, request.values["value"])
+        except ValueError as error:
+            return {db_key: str(error)}, 400
+        return {db_key: None if old_value is None else "{}".format(old_value)}
+
+
 class SearchKeys(Resource):
     """
     This class contains the all searching in DB related implementations.
@@ -353,10 +739,13 @@ class SearchKeys(Resource):
                  else an error message with a 201 status code.
         """
 
-        values: Dict[str, str] = detti_db.search_keys_in_db(key_prefix)
-        if not values:
-            return {"{}".format(key_prefix): "Cannot find keys for prefix"}, 201
-        return values
+        def search() -> Tuple[Dict[str, str], int]:
+            values: Dict[str, str] = detti_db.search_keys_in_db(key_prefix)
+            if not values:
+                return {"{}".format(key_prefix): "Cannot find keys for prefix"}, 201
+            return values, 200
+
+        return cached_search("key", key_prefix, search)
 
 
 class SearchValues(Resource):
@@ -391,12 +780,246 @@ class SearchValues(Resource):
                  else an error message with a 201 status code.
         """
 
-        values: Dict[str, str] = detti_db.search_values_in_db(value_prefix)
+        def search() -> Tuple[Dict[str, str], int]:
+            values: Dict[str, str] = detti_db.search_values_in_db(value_prefix)
+            if not values:
+                return {"{}".format(value_prefix): "Cannot find values for prefix"}, 201
+            return values, 200
+
+        return cached_search("value", value_prefix, search)
+
+
+class SearchSubstring(Resource):
+    """
+    This class contains the substring searching in DB related implementations.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def get(text: str) -> Union[tuple, Dict[str, str]]:
+        """
+        You can search the keys which contain a text with this method.
+        The values are searched instead of the keys with the "in=values" query parameter.
+        Eg.:
+            >> curl http://localhost:5000/set -d "user_42=a" -X PUT
+            > {"STATUS: "OK"}
+            >> curl http://localhost:5000/set -d "old_user_42=b" -X PUT
+            > {"STATUS: "OK"}
+            >> curl http://localhost:5000/search_substr/user_42
+            > {
+                    "old_user_42": "b",
+                    "user_42": "a"
+                }
+            >> curl http://localhost:5000/search_substr/not_exist
+            > {"not_exist": "Cannot find keys containing the text"}
+
+        :param text: The searched text.
+        :return: The found key-value pairs in a dict if found any
+                 else an error message with a 201 status code.
+        """
+
+        in_values: bool = request.args.get("in") == "values"
+
+        values: Dict[str, str] = detti_db.search_substring_in_db(text, in_values=in_values)
+        if not values:
+            return (
+                {
+                    "{}".format(text): "Cannot find {} containing the text".format(
+                        "values" if in_values else "keys"
+                    )
+                },
+                201,
+            )
+        return values
+
+
+class SearchGlob(Resource):
+    """
+    This class contains the glob pattern searching in DB related implementations.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def get(pattern: str) -> Union[tuple, Dict[str, str]]:
+        """
+        You can search the keys which match a glob pattern with this method.
+        The pattern can contain "*", "?" (sent as "%3F"), "[seq]" and "[!seq]".
+        The values are searched instead of the keys with the "in=values" query parameter.
+        Eg.:
+            >> curl http://localhost:5000/set -d "session:1:cart=a" -X PUT
+            > {"STATUS: "OK"}
+            >> curl http://localhost:5000/set -d "session:1:user=b" -X PUT
+            > {"STATUS: "OK"}
+            >> curl http://localhost:5000/search_glob/session:*:cart
+            > {
+                    "session:1:cart": "a"
+                }
+            >> curl http://localhost:5000/search_glob/not_exist*
+            > {"not_exist*": "Cannot find keys matching the pattern"}
+
+        :param pattern: The glob pattern.
+        :return: The found key-value pairs in a dict if found any
+                 else an error message with a 201 status code.
+        """
+
+        in_values: bool = request.args.get("in") == "values"
+
+        values: Dict[str, str] = detti_db.search_glob_in_db(pattern, in_values=in_values)
+        if not values:
+            return (
+                {
+                    "{}".format(pattern): "Cannot find {} matching the pattern".format(
+                        "values" if in_values else "keys"
+                    )
+                },
+                201,
+            )
+        return values
+
+
+class FindItems(Resource):
+    """
+    This class contains the finding by the secondary indexes related implementations.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def get(field: str, value: str) -> Union[tuple, Dict[str, str]]:
+        """
+        You can find the dict values whose field has a value with this method.
+        The field can be a nested field with dotted path (Eg.: user.status).
+        The value is used as a string unless the "value_type=json" query parameter is set.
+        Eg.:
+            >> curl http://localhost:5000/find/status/active
+            > {
+                    "user_1": {"name": "a", "status": "active"},
+                    "user_3": {"name": "c", "status": "active"}
+                }
+            >> curl "http://localhost:5000/find/user.age/42?value_type=json"
+            > {
+                    "record_1": {"user": {"age": 42}}
+                }
+            >> curl http://localhost:5000/find/status/not_exist
+            > {"status": "Cannot find values for field"}
+
+        :param field: The field of the dict values.
+        :param value: The value of the field.
+        :return: The found key-value pairs in a dict if found any
+                 else an error message with a 201 status code.
+        """
+
+        field_value: Union[str, int, float, bool, None, list, dict] = value
+        if request.args.get("value_type") == "json":
+            try:
+                field_value = json.loads(value)
+            except ValueError:
+                return {"{}".format(value): "Invalid Json value"}, 400
+
+        values: Dict[str, str] = detti_db.find(field, field_value)
         if not values:
-            return {"{}".format(value_prefix): "Cannot find values for prefix"}, 201
+            return {"{}".format(field): "Cannot find values for field"}, 201
         return values
 
 
+class ScanItems(Resource):
+    """
+    This class contains the ordered scanning with cursor based pagination.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def get() -> Union[tuple, Dict[str, Union[Dict[str, str], Optional[str]]]]:
+        """
+        Providing a page of the key-value pairs in key order.
+        The "cursor" of the response can be sent to get the next page (It is null on the last page).
+        Query parameters:
+            start: The first key (inclusive). Default: The first key of the DB.
+            end: The end of the range (exclusive). Default: After the last key of the DB.
+            limit: The maximum number of the items. Default: 100, maximum: scan_max_limit
+            cursor: The cursor of the previous page.
+        Eg.:
+            >> curl "http://localhost:5000/scan?start=prod_&limit=2"
+            > {
+                    "items": {"prod_key_1": "prod_val_1", "prod_key_2": "prod_val_2"},
+                    "cursor": "eyJhZnRlciI6ICJwcm9kX2tleV8yIn0="
+                }
+            >> curl -G "http://localhost:5000/scan" -d "start=prod_" -d "limit=2" \
+                    -d "cursor=eyJhZnRlciI6ICJwcm9kX2tleV8yIn0="
+            > {
+                    "items": {"prod_key_3": "prod_val_3"},
+                    "cursor": null
+                }
+
+        :return: The items of the page and the cursor of the next page
+                 or an error message with a 400 status code.
+        """
+
+        try:
+            limit: int = int(request.args.get("limit", 100))
+        except ValueError:
+            return {"limit": "The limit has to be an integer."}, 400
+        if not 1 <= limit <= config.getint("SERVER", "scan_max_limit", fallback=1000):
+            return {"limit": "The limit is out of range."}, 400
+
+        try:
+            items, cursor = detti_db.scan_page(
+                request.args.get("start", ""),
+                request.args.get("end"),
+                limit,
+                request.args.get("cursor"),
+            )
+        except ValueError:
+            return {"cursor": "Invalid cursor."}, 400
+        return {"items": items, "cursor": cursor}
+
+
+class Aggregate(Resource):
+    """
+    This class contains the aggregations of the numeric values.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def get(operation: str, key_prefix: str = "") -> Union[tuple, Dict[str, Any]]:
+        """
+        Aggregating the numeric (int and float) values of the keys with a prefix.
+        The values of all keys are aggregated without prefix (/aggregate/<operation>).
+        The "percentile" operation needs the "p" query parameter (0-100).
+        Eg.: (The "counter_1": 5 and "counter_2": 7 int values are set by the "set_int" method.)
+            >> curl http://localhost:5000/aggregate/sum/counter_
+            > {"operation": "sum", "key_prefix": "counter_", "result": 12}
+            >> curl "http://localhost:5000/aggregate/percentile/counter_?p=50"
+            > {"operation": "percentile", "key_prefix": "counter_", "result": 6.0}
+            >> curl http://localhost:5000/aggregate/max/not_exist
+            > {"operation": "max", "key_prefix": "not_exist", "result": null}
+
+        :param operation: The aggregation. Possible: count, sum, min, max, mean, percentile
+        :param key_prefix: Prefix of the keys.
+        :return: The result of the aggregation
+                 or an error message with a 400 status code.
+        """
+
+        percentile: Optional[float] = None
+        if operation == "percentile":
+            try:
+                percentile = float(request.args.get("p", ""))
+            except ValueError:
+                return {"p": "The percentile has to be a number (0-100)."}, 400
+
+        try:
+            result: Optional[Union[int, float]] = detti_db.aggregate(
+                operation, key_prefix, percentile
+            )
+        except ValueError as error:
+            return {"{}".format(operation): str(error)}, 400
+        return {"operation": operation, "key_prefix": key_prefix, "result": result}
+
+
 class DeleteItem(Resource):
     """
     This class contains the all deleting from DB related implementations.
@@ -459,7 +1082,7 @@ class GetAll(Resource):
     decorators = DECORATORS
 
     @staticmethod
-    def get() -> Dict[str, str]:
+    def get() -> tuple:
         """
         Providing the all elements of the DB.
         If the DB is empty, an empty dict will be returned.
@@ -474,20 +1097,158 @@ class GetAll(Resource):
                     "test_key_1": "test_val_1"
               }
 
+        The response has an "ETag" header (the version of the DB). If the "If-None-Match"
+        header of the request contains it, the answer is "304 Not Modified" without reading the DB.
+
         :return: The content of DB in dict or empty dict if the DB is empty.
         """
 
-        return detti_db.get_all()
+        return cached_response(
+            request.path, detti_db.get_version(), lambda: (detti_db.get_all(), 200)
+        )
+
+
+class ResponseCacheInfo(Resource):
+    """
+    This class contains the information of the response cache.
+    """
+
+    decorators = DECORATORS
+
+    @staticmethod
+    def get() -> Dict[str, int]:
+        """
+        Providing the counters and the size of the response cache.
+        Eg.:
+            >> curl http://localhost:5000/cache_info
+            > {"hits": 12, "misses": 3, "evictions": 0, "entries": 3, "size": 1536,
+               "max_size": 67108864}
+
+        :return: The information of the response cache in dict.
+        """
+
+        return response_cache.get_info()
 
 
 # Add end-point
 api.add_resource(GetItem, "/get/<string:db_key>")
 api.add_resource(SetItem, "/set")
+api.add_resource(MGetItems, "/mget")
+api.add_resource(MSetItems, "/mset")
+api.add_resource(MDeleteItems, "/mdelete")
+api.add_resource(IncrItem, "/incr/<string:db_key>")
+api.add_resource(IncrFloatItem, "/incrbyfloat/<string:db_key>")
+api.add_resource(CompareAndSet, "/cas/<string:db_key>")
+api.add_resource(GetSetItem, "/getset/<string:db_key>")
 api.add_resource(SearchKeys, "/search_key/<string:key_prefix>")
 api.add_resource(SearchValues, "/search_val/<string:value_prefix>")
+api.add_resource(SearchSubstring, "/search_substr/<string:text>")
+api.add_resource(SearchGlob, "/search_glob/<string:pattern>")
+api.add_resource(FindItems, "/find/<string:field>/<string:value>")
+api.add_resource(ScanItems, "/scan")
+api.add_resource(
+    Aggregate,
+    "/aggregate/<string:operation>/<string:key_prefix>",
+    "/aggregate/<string:operation>",
+)
 api.add_resource(DeleteItem, "/delete/<string:db_key>")
 api.add_resource(PingServer, "/ping")
 api.add_resource(GetAll, "/getall")
+api.add_resource(ResponseCacheInfo, "/cache_info")
+
+
+def _serve_worker(
+    listening_socket: socket.socket,
+    host: str,
+    port: int,
+    address: str,
+    authkey: bytes,
+    threaded: bool,
+    options: dict,
+) -> None:
+    """
+    Target of the HTTP worker processes of the multi-process serving.
+    The worker serves the requests of the shared listening socket and it calls the DettiDB
+    instance of the storage-owner process through a bounded pool of connections
+    ("worker_connections" parameter), which is shared by the request threads.
+    :param listening_socket: The shared listening socket.
+    :param host: The hostname of the listening socket.
+    :param port: The port of the listening socket.
+    :param address: Path of the Unix socket of the storage owner.
+    :param authkey: The authentication key of the storage owner.
+    :param threaded: Should the worker handle each request in a separate thread?
+    :param options: The options of the Werkzeug server.
+    :return: None
+    """
+
+    global detti_db
+
+    # The workers are stopped by the storage owner.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    detti_db = RemoteDettiDB(
+        address, authkey, pool_size=config.getint("SERVER", "worker_connections", fallback=8)
+    )
+    make_server(
+        host, port, app, threaded=threaded, fd=listening_socket.fileno(), **options
+    ).serve_forever()
+
+
+def run_workers(host: str, port: int, workers: int, threaded: bool = True, **options) -> None:
+    """
+    Starting the multi-process serving: the current process is the storage owner
+    (it holds the DettiDB instance) and the HTTP worker processes share the listening socket.
+    The workers call the DB over a Unix socket, so the reads (the HTTP handling and the encoding
+    of the responses) scale across the cores and the changes keep one serialized order.
+    The workers are started by the "spawn" method (The current process has running threads,
+    Eg.: the flusher of the DB) and they don't load the DB.
+    The request limits and the response cache are per worker.
+    :param host: The hostname to listen on.
+    :param port: The port of the webserver.
+    :param workers: Number of the HTTP worker processes.
+    :param threaded: Should the workers handle each request in a separate thread?
+    :param options: The options of the Werkzeug servers (Eg.: ssl_context).
+    :return: None
+    """
+
+    ipc_dir: str = tempfile.mkdtemp(prefix="detti_ipc_")
+    address: str = os.path.join(ipc_dir, "storage_owner.sock")
+    authkey: bytes = os.urandom(32)
+    storage_owner: StorageOwner = StorageOwner(detti_db, address, authkey)
+    # The connections of the workers wait in the backlog until the accepting is started.
+    storage_owner.listen()
+
+    address_family: int = select_address_family(host, int(port))
+    listening_socket: socket.socket = socket.socket(address_family, socket.SOCK_STREAM)
+    listening_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listening_socket.bind(get_sockaddr(host, int(port), address_family))
+    listening_socket.listen(128)
+
+    processes: List[multiprocessing.Process] = [
+        multiprocessing.get_context("spawn").Process(
+            target=_serve_worker,
+            args=(listening_socket, host, int(port), address, authkey, threaded, options),
+            daemon=True,
+        )
+        for _ in range(workers)
+    ]
+    try:
+        os.environ[WORKER_ENVIRONMENT_VARIABLE] = "1"
+        try:
+            for process in processes:
+                process.start()
+        finally:
+            del os.environ[WORKER_ENVIRONMENT_VARIABLE]
+        storage_owner.start()
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        listening_socket.close()
+        storage_owner.close()
+        shutil.rmtree(ipc_dir, ignore_errors=True)
 
 
 def run_server(
@@ -495,6 +1256,7 @@ def run_server(
     port=config.get("SERVER", "port"),
     debug=config.getboolean("SERVER", "debug"),
     threaded=True,
+    workers=config.getint("SERVER", "workers", fallback=1),
     **options,
 ) -> None:
     """
@@ -507,12 +1269,18 @@ def run_server(
                     port defined in the ``SERVER_NAME`` config variable if present.
     :param debug: If given, enable or disable debug mode. See
     :param threaded: Should the process handle each request in a separate thread?
+    :param workers: Number of the HTTP worker processes. More than one worker starts
+                    the multi-process serving without debug mode (See: "run_workers").
     :param options: The options to be forwarded to the underlying Werkzeug
                         server. See :func:`werkzeug.serving.run_simple` for more
                         information.
     :return: None
     """
 
+    if int(workers) > 1:
+        run_workers(host, port, int(workers), threaded, **options)
+        return
+
     app.run(
         host=host,
         port=port,
@@ -57,7 +57,7 @@ setup(
         "Natural Language :: English",
         "Framework :: Flask",
     ],
-    scripts=["tools/color_logger.py"],
+    scripts=["tools/color_logger.py", "tools/convert_db.py", "tools/reshard_db.py"],
     package_data={"": ["tools/*.py", "detti_conf.ini", "doc/pics/*"]},
     packages=["."],
 )
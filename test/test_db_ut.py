@@ -3,13 +3,38 @@ import sys
 import os
 import shutil
 import json
+import stat
+import fnmatch
 import warnings
+import sqlite3
+import time
+import threading
+import asyncio
+import tempfile
+from contextlib import closing
+from unittest.mock import patch
 from random import randint
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 sys.path.append(os.path.join(os.path.realpath(os.path.dirname(__file__)), ".."))
 
 from detti_db import DettiDB  # noqa: E402
+from detti_async import AsyncDettiDB  # noqa: E402
+from detti_serializers import SERIALIZERS, detect_storage_format  # noqa: E402
+from convert_db import convert_db_file  # noqa: E402
+from reshard_db import reshard_db  # noqa: E402
+from detti_shards import shard_index, shard_file_path, read_shard_count  # noqa: E402
+from detti_lazy import LazyDict  # noqa: E402
+from detti_mmap import MmapHashTable  # noqa: E402
+from detti_lsm import LsmTree  # noqa: E402
+from detti_sqlite import SqliteStore, SQLITE_FILE_NAME  # noqa: E402
+from detti_key_index import SortedKeyIndex  # noqa: E402
+from detti_trigram_index import TrigramIndex, glob_fragments  # noqa: E402
+from detti_numeric_columns import NumericColumn, NumericColumns  # noqa: E402
+from detti_response_cache import ResponseCache  # noqa: E402
+from detti_search_cache import SearchCache  # noqa: E402
+from detti_ipc import StorageOwner, RemoteDettiDB  # noqa: E402
+from detti_wal import WriteAheadLog  # noqa: E402
 
 
 def mock_value_error(*args, **kwargs):
@@ -33,12 +58,11 @@ class DettiDBTestCases(unittest.TestCase):
         super(DettiDBTestCases, self).__init__(*args, **kwargs)
         # Show the complete diff in case of error
         self.maxDiff: Optional[int] = None
-        # The "set_up_default_logger" is tested with this instance creation.
-        self.detti_db: DettiDB = DettiDB(
-            config_file=os.path.join(
-                os.path.realpath(os.path.dirname(__file__)), "detti_conf_ut.ini"
-            )
+        self.config_file_path: str = os.path.join(
+            os.path.realpath(os.path.dirname(__file__)), "detti_conf_ut.ini"
         )
+        # The "set_up_default_logger" is tested with this instance creation.
+        self.detti_db: DettiDB = DettiDB(config_file=self.config_file_path)
         # A test Json file
         self.tmp_json_path: str = "unit_test_json_file.json"
 
@@ -277,6 +301,29 @@ class DettiDBTestCases(unittest.TestCase):
         # Testing if key is not string
         self.assertFalse(self.detti_db.set_int(678, 666))
 
+    def test_set_bool(self) -> None:
+        """
+        Testing to set a boolean value in DB.
+        :return: None
+        """
+
+        # Testing correct setting
+        self.assertTrue(self.detti_db.set_bool("test_bool_val", True))
+        self.assertIs(self.detti_db.get("test_bool_val"), True)
+
+        # The booleans are not stored as integers by the generic setting.
+        self.detti_db["test_bool_val_2"] = False
+        self.assertIs(self.detti_db.get("test_bool_val_2"), False)
+        self.assertEqual(self.detti_db.set_many({"test_bool_val_3": True}), [])
+        self.assertIs(self.detti_db.get("test_bool_val_3"), True)
+
+        # Testing the too long key
+        self.assertFalse(self.detti_db.set_bool("x" * 101, True))
+
+        # The value is not casted.
+        self.assertFalse(self.detti_db.set_bool("invalid_type", 1))
+        self.assertIsNone(self.detti_db.get("invalid_type"))
+
     def test_set_float(self) -> None:
         """
         Testing to set a float value in DB.
@@ -393,6 +440,140 @@ class DettiDBTestCases(unittest.TestCase):
         loaded_json: Dict[str, Any] = json.load(open(self.tmp_json_path, "rt"))
         self.assertFalse("test_float_val" in loaded_json)
 
+    def test_atomic_operations(self) -> None:
+        """
+        Testing the atomic increments, compare-and-set and get-and-set.
+        :return: None
+        """
+
+        self.assertEqual(self.detti_db.incr("counter_key"), 1)
+        self.assertEqual(self.detti_db.incrby("counter_key", -5), -4)
+        self.assertEqual(self.detti_db["counter_key"], -4)
+        self.detti_db.set("string_counter_key", "10")
+        self.assertEqual(self.detti_db.incr("string_counter_key"), 11)
+        self.assertEqual(self.detti_db["string_counter_key"], 11)
+        self.assertEqual(self.detti_db.incrbyfloat("float_key", 1.5), 1.5)
+        self.assertEqual(self.detti_db.incrbyfloat("counter_key", 0.5), -3.5)
+        self.assertEqual(self.detti_db["counter_key"], -3.5)
+
+        self.detti_db.set("text_key", "text")
+        for invalid_call in (
+            lambda: self.detti_db.incr("text_key"),
+            lambda: self.detti_db.incr("float_key"),
+            lambda: self.detti_db.incrby("counter_key", 1.5),
+            lambda: self.detti_db.incrbyfloat("text_key", 1),
+        ):
+            with self.assertRaises(ValueError):
+                invalid_call()
+
+        # Compare-and-set (None: the key doesn't exist).
+        self.assertTrue(self.detti_db.compare_and_set("owner_key", None, "worker_1"))
+        self.assertFalse(self.detti_db.compare_and_set("owner_key", None, "worker_2"))
+        self.assertTrue(self.detti_db.compare_and_set("owner_key", "worker_1", ["worker_2"]))
+        self.assertEqual(self.detti_db["owner_key"], ["worker_2"])
+        self.detti_db.set_int("int_key", 5)
+        self.assertFalse(self.detti_db.compare_and_set("int_key", "5", 6))
+        self.assertTrue(self.detti_db.compare_and_set("int_key", "5", 6, as_string=True))
+
+        self.assertEqual(self.detti_db.getset("int_key", "new_val"), 6)
+
+        # The padded keys are normalized like by the setters (The same key is read and set).
+        self.assertEqual([self.detti_db.incr(" padded_key ") for _ in range(3)], [1, 2, 3])
+        self.assertEqual(self.detti_db.incrbyfloat("padded_key ", 0.5), 3.5)
+        self.assertTrue(self.detti_db.compare_and_set(" padded_key", "3.5", 1, as_string=True))
+        self.assertEqual(self.detti_db.getset(" padded_key", 2), 1)
+        self.assertEqual(self.detti_db["padded_key"], 2)
+        with self.assertRaises(ValueError):
+            self.detti_db.incr(5)
+        self.assertIsNone(self.detti_db.getset("not_exist_key", 1))
+        self.assertEqual(self.detti_db["not_exist_key"], 1)
+
+        # The concurrent increments are not lost.
+        def increment_thread() -> None:
+            for _ in range(200):
+                self.detti_db.incr("concurrent_key")
+
+        threads: List[threading.Thread] = [
+            threading.Thread(target=increment_thread) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.detti_db["concurrent_key"], 800)
+
+    def test_batch(self) -> None:
+        """
+        Testing the write batches and the transactions.
+        :return: None
+        """
+
+        self.detti_db["old_key"] = "old_val"
+        with patch.object(
+            self.detti_db, "_write_db_files", wraps=self.detti_db._write_db_files
+        ) as write_db_files:
+            with self.detti_db.batch() as write_batch:
+                write_batch["str_key"] = "str_val"
+                self.assertTrue(write_batch.set("list_key", [1, 2]))
+                self.assertFalse(write_batch.set(5, "invalid_key"))
+                self.assertTrue(write_batch.delete("old_key"))
+                self.assertFalse(write_batch.delete("not_exist_key"))
+                # The buffered changes are not applied yet.
+                self.assertEqual(write_batch["str_key"], "str_val")
+                self.assertNotIn("old_key", write_batch)
+                self.assertNotIn("str_key", self.detti_db)
+                self.assertEqual(self.detti_db["old_key"], "old_val")
+                self.assertEqual(len(write_batch), 3)
+            # The complete DB is dumped once.
+            self.assertEqual(write_db_files.call_count, 1)
+        self.assertEqual(self.detti_db.get_all(), {"str_key": "str_val", "list_key": [1, 2]})
+
+        # Without rollback the changes before the exception are applied.
+        with self.assertRaises(RuntimeError):
+            with self.detti_db.batch() as write_batch:
+                write_batch["applied_key"] = 1
+                mock_runtime_error()
+        self.assertEqual(self.detti_db["applied_key"], 1)
+        with self.assertRaises(RuntimeError):
+            with self.detti_db.transaction() as transaction:
+                transaction["rolled_back_key"] = 1
+                del transaction["applied_key"]
+                mock_runtime_error()
+        self.assertNotIn("rolled_back_key", self.detti_db)
+        self.assertEqual(self.detti_db["applied_key"], 1)
+
+        self.assertEqual(self.detti_db.set_many({"many_1": "a", "many_2": 2, 3: "b"}), [3])
+        self.assertEqual(self.detti_db["many_2"], 2)
+        self.assertEqual(
+            self.detti_db.get_many(["many_1", "many_2", "not_exist_key"]),
+            {"many_1": "a", "many_2": 2},
+        )
+        self.assertEqual(self.detti_db.set_many({"many_3": "c", 3: "b"}, all_or_nothing=True), [3])
+        self.assertNotIn("many_3", self.detti_db)
+        self.assertEqual(
+            self.detti_db.delete_many(["many_1", "many_2", "many_3"]), ["many_1", "many_2"]
+        )
+
+        # The batch is one record of the write-ahead log.
+        path_of_wal_db: str = os.path.abspath("unit_test_batch.db")
+        self.addCleanup(self.remove_db_files, path_of_wal_db)
+        wal_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path, path_of_db=path_of_wal_db, persistence_mode="wal"
+        )
+        wal_db: DettiDB = DettiDB(**wal_db_kwargs)
+        wal_db["deleted_key"] = "val"
+        with wal_db.batch() as write_batch:
+            write_batch["key_1"] = "val_1"
+            write_batch["key_2"] = {"a": 1}
+            del write_batch["deleted_key"]
+        self.assertEqual(wal_db.get_version(), 4)
+        wal_db.wal.close()
+        with open(wal_db.wal.path_of_wal, "rb") as opened_wal:
+            self.assertEqual(len(opened_wal.read().splitlines()), 2)
+        reloaded_wal_db: DettiDB = DettiDB(**wal_db_kwargs)
+        self.assertEqual(reloaded_wal_db.get_all(), {"key_1": "val_1", "key_2": {"a": 1}})
+        reloaded_wal_db.close()
+
     def test_delete(self) -> None:
         """
         Testing the delete method.
@@ -419,6 +600,48 @@ class DettiDBTestCases(unittest.TestCase):
             {"prod_key_1": "prod_val_1", "prod_key_2": "prod_val_2", "prod_key_3": 128},
         )
 
+        # The sorted key index follows the changes.
+        self.detti_db.delete("prod_key_2")
+        self.detti_db.set_list("prod_key_4", [])
+        self.detti_db.append_list("prod_key_4", "a")
+        self.assertEqual(
+            self.detti_db.search_keys_in_db("prod_"),
+            {"prod_key_1": "prod_val_1", "prod_key_3": 128, "prod_key_4": ["a"]},
+        )
+        self.assertEqual(self.detti_db.search_keys_in_db("prod_key_3"), {"prod_key_3": 128})
+        self.assertEqual(self.detti_db.search_keys_in_db("not_exist"), {})
+        self.detti_db._clear_db()
+        self.assertEqual(self.detti_db.search_keys_in_db(""), {})
+
+    def test_sorted_key_index(self) -> None:
+        """
+        Testing the sorted key index of the prefix searches (Splitting and removing buckets).
+        :return: None
+        """
+
+        keys: List[str] = ["key_{}".format(randint(0, 5000)) for _ in range(5000)]
+        key_index: SortedKeyIndex = SortedKeyIndex(keys[:2000])
+        for key in keys[2000:]:
+            key_index.add(key)
+        for key in keys[:1000]:
+            key_index.discard(key)
+        key_index.discard("not_exist")
+        expected_keys: List[str] = sorted(set(keys) - set(keys[:1000]))
+        self.assertEqual(list(key_index), expected_keys)
+        self.assertEqual(len(key_index), len(expected_keys))
+        self.assertEqual(
+            list(key_index.iter_prefix("key_12")),
+            [key for key in expected_keys if key.startswith("key_12")],
+        )
+        self.assertEqual(
+            list(key_index.irange("key_2", "key_3")),
+            [key for key in expected_keys if "key_2" <= key < "key_3"],
+        )
+        self.assertTrue(expected_keys[0] in key_index)
+        self.assertFalse(keys[0] in key_index)
+        key_index.clear()
+        self.assertEqual(list(key_index.iter_prefix("")), [])
+
     def test_search_values_in_db(self) -> None:
         """
         Testing the "search_values_in_db" method.
@@ -434,6 +657,689 @@ class DettiDBTestCases(unittest.TestCase):
             self.detti_db.search_values_in_db("prod_"),
             {"prod_key_1": "prod_val_1", "prod_key_2": "prod_val_2"},
         )
+        self.assertTrue(self.detti_db.get_value_index_info()["built"])
+
+        # The index follows the changes and it contains the strings of the lists and dicts.
+        self.detti_db.set_list("prod_key_4", ["a"])
+        self.detti_db.append_list("prod_key_4", "prod_val_4")
+        self.detti_db.set_dict("prod_key_5", {"a": {"b": ["prod_val_5"]}})
+        self.detti_db["prod_key_1"] = "test_val_1"
+        self.detti_db.delete("prod_key_2")
+        self.assertEqual(
+            self.detti_db.search_values_in_db("prod_"),
+            {"prod_key_4": ["a", "prod_val_4"], "prod_key_5": {"a": {"b": ["prod_val_5"]}}},
+        )
+        self.assertEqual(self.detti_db.search_values_in_db("12"), {})
+        self.assertTrue(self.detti_db.get_value_index_info()["memory_usage"] > 0)
+        self.detti_db._clear_db()
+        self.assertEqual(self.detti_db.search_values_in_db(""), {})
+        self.assertEqual(self.detti_db.get_value_index_info()["terms"], 0)
+
+    def test_search_values_of_numbers(self) -> None:
+        """
+        Testing the value searching with indexed numbers ("value_index_numbers" parameter).
+        :return: None
+        """
+
+        path_of_numbers_db: str = os.path.abspath("unit_test_numbers.db")
+        self.addCleanup(self.remove_db_files, path_of_numbers_db)
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, value_index_numbers="invalid")
+
+        numbers_db: DettiDB = DettiDB(
+            config_file=self.config_file_path,
+            path_of_db=path_of_numbers_db,
+            value_index_numbers="True",
+        )
+        numbers_db.set_int("int_key", 128)
+        numbers_db.set_float("float_key", 12.5)
+        numbers_db.set_list("list_key", [True, -12])
+        self.assertEqual(numbers_db.search_values_in_db("12"), {"int_key": 128, "float_key": 12.5})
+        numbers_db.set_int("int_key", 3)
+        self.assertEqual(numbers_db.search_values_in_db("-1"), {"list_key": [True, -12]})
+        self.assertEqual(numbers_db.search_values_in_db("12"), {"float_key": 12.5})
+        numbers_db.close()
+
+    def test_search_cache(self) -> None:
+        """
+        Testing the search cache and its prefix-aware invalidation.
+        :return: None
+        """
+
+        self.detti_db["prod_key_1"] = "prod_val_1"
+        self.detti_db["test_key_1"] = "test_val_1"
+        search_cache_info: Dict[str, Any] = self.detti_db.get_search_cache_info()
+
+        for _ in range(2):
+            self.assertEqual(self.detti_db.search_keys_in_db("prod_"), {"prod_key_1": "prod_val_1"})
+            self.assertEqual(
+                self.detti_db.search_values_in_db("test_"), {"test_key_1": "test_val_1"}
+            )
+        self.assertEqual(
+            self.detti_db.get_search_cache_info()["hits"], search_cache_info["hits"] + 2
+        )
+
+        # The changes of not matched keys and values don't invalidate the results.
+        prod_version: Optional[int] = self.detti_db.get_search_version("key", "prod_")
+        self.assertIsNotNone(prod_version)
+        self.assertIsNone(self.detti_db.get_search_version("key", "not_searched_"))
+        self.detti_db["other_key"] = "other_val"
+        self.assertEqual(self.detti_db.get_search_version("key", "prod_"), prod_version)
+        self.detti_db["prod_key_1"] = "prod_val_2"
+        self.assertIsNone(self.detti_db.get_search_version("key", "prod_"))
+        self.assertEqual(self.detti_db.get_search_cache_info()["entries"], 1)
+        self.assertEqual(self.detti_db.search_values_in_db("test_"), {"test_key_1": "test_val_1"})
+        self.assertEqual(self.detti_db.search_keys_in_db("prod_"), {"prod_key_1": "prod_val_2"})
+        self.assertGreater(self.detti_db.get_search_version("key", "prod_"), prod_version)
+
+        # The old and the new values invalidate the value searches.
+        self.detti_db["test_key_1"] = "other_val"
+        self.assertEqual(self.detti_db.search_values_in_db("test_"), {})
+        self.detti_db["prod_key_1"] = "test_val_3"
+        self.assertEqual(self.detti_db.search_values_in_db("test_"), {"prod_key_1": "test_val_3"})
+        self.detti_db.delete("prod_key_1")
+        self.assertEqual(self.detti_db.search_keys_in_db("prod_"), {})
+        self.assertEqual(self.detti_db.search_values_in_db("test_"), {})
+
+        search_cache_info = self.detti_db.get_search_cache_info()
+        self.assertEqual(
+            search_cache_info["hits"] / (search_cache_info["hits"] + search_cache_info["misses"]),
+            search_cache_info["hit_rate"],
+        )
+        self.detti_db._clear_db()
+        self.assertEqual(self.detti_db.get_search_cache_info()["entries"], 0)
+
+        # The least recently used result is evicted and the outdated results are not cached.
+        search_cache: SearchCache = SearchCache(max_entries=2)
+        search_cache.put("key", "a", {"a": 1}, search_cache.generation)
+        search_cache.put("key", "b", {"b": 1}, search_cache.generation)
+        self.assertEqual(search_cache.get("key", "a"), {"a": 1})
+        search_cache.put("value", "c", {"c": 1}, search_cache.generation)
+        self.assertIsNone(search_cache.get("key", "b"))
+        generation: int = search_cache.generation
+        search_cache.invalidate("value", ["x"])
+        search_cache.put("key", "d", {"d": 1}, generation)
+        self.assertEqual(len(search_cache), 2)
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, search_cache_size="-1")
+
+    def test_search_substring_and_glob(self) -> None:
+        """
+        Testing the "search_substring_in_db" and "search_glob_in_db" methods.
+        :return: None
+        """
+
+        self.detti_db["session:1:cart"] = "a"
+        self.detti_db["session:2:user"] = "b"
+        self.detti_db["user_42"] = "c"
+        self.detti_db["old_user_42"] = "user_42_d"
+
+        self.assertEqual(
+            self.detti_db.search_substring_in_db("user_42"),
+            {"old_user_42": "user_42_d", "user_42": "c"},
+        )
+        self.assertEqual(self.detti_db.search_glob_in_db("session:*:cart"), {"session:1:cart": "a"})
+        self.assertEqual(self.detti_db.search_glob_in_db("us?r_[0-9]2"), {"user_42": "c"})
+        self.assertEqual(self.detti_db.search_glob_in_db("user"), {})
+        self.assertEqual(
+            self.detti_db.search_substring_in_db("er_4", in_values=True),
+            {"old_user_42": "user_42_d"},
+        )
+
+        # The built indexes follow the changes.
+        self.detti_db.set_dict("session:3:cart", {"items": ["user_42"]})
+        self.detti_db.delete("session:1:cart")
+        self.detti_db["user_42"] = "session"
+        self.assertEqual(
+            self.detti_db.search_glob_in_db("session:*:cart"),
+            {"session:3:cart": {"items": ["user_42"]}},
+        )
+        self.assertEqual(
+            list(self.detti_db.search_glob_in_db("*user_42*", in_values=True)),
+            ["old_user_42", "session:3:cart"],
+        )
+        self.assertEqual(len(self.detti_db.search_substring_in_db("")), 4)
+        with self.assertRaises(ValueError):
+            self.detti_db.search_substring_in_db(42)
+        self.detti_db._clear_db()
+        self.assertEqual(self.detti_db.search_substring_in_db("user"), {})
+
+        # The on-disk storage engines are scanned.
+        path_of_engine_db: str = os.path.abspath("unit_test_trigram_search.db")
+        self.addCleanup(self.remove_db_files, path_of_engine_db)
+        engine_db: DettiDB = DettiDB(
+            config_file=self.config_file_path,
+            path_of_db=path_of_engine_db,
+            storage_engine="sqlite",
+        )
+        engine_db["session:2:cart"] = "user_1"
+        engine_db["session:1:cart"] = "user_2"
+        engine_db["session:1:user"] = "x"
+        self.assertEqual(
+            engine_db.search_glob_in_db("session:*:cart"),
+            {"session:1:cart": "user_2", "session:2:cart": "user_1"},
+        )
+        self.assertEqual(
+            engine_db.search_substring_in_db("er_2", in_values=True), {"session:1:cart": "user_2"}
+        )
+        engine_db.close()
+
+    def test_trigram_index(self) -> None:
+        """
+        Testing the "TrigramIndex" class against the "fnmatch" module.
+        :return: None
+        """
+
+        self.assertEqual(glob_fragments("session:*:cart"), ["\x02session:", ":cart\x03"])
+        self.assertEqual(glob_fragments("*[ab]c?"), ["c"])
+
+        keys: List[str] = sorted(
+            {"".join("ab:_c"[randint(0, 4)] for _ in range(randint(0, 8))) for _ in range(2000)}
+        )
+        trigram_index: TrigramIndex = TrigramIndex()
+        for key in keys:
+            trigram_index.add(key, [key])
+        for key in keys[::3]:
+            trigram_index.discard(key)
+        indexed_keys: List[str] = [key for key in keys if key not in keys[::3]]
+        self.assertEqual(len(trigram_index), len(indexed_keys))
+        for pattern in ("a*b", "*:c*", "ab?c", "[ab]c*", "a", "", "*", "?a:*b", "[!a]bc*", "[a"):
+            self.assertEqual(
+                trigram_index.search_glob(pattern),
+                {key for key in indexed_keys if fnmatch.fnmatchcase(key, pattern)},
+            )
+        for substring in ("ab", "a:b", "", "abc_c", "c"):
+            self.assertEqual(
+                trigram_index.search_substring(substring),
+                {key for key in indexed_keys if substring in key},
+            )
+
+    def test_versions(self) -> None:
+        """
+        Testing the versions of the keys and of the DB.
+        :return: None
+        """
+
+        db_version: int = self.detti_db.get_version()
+        self.assertIsNone(self.detti_db.get_version("version_key"))
+        self.detti_db["version_key"] = "a"
+        self.detti_db["other_key"] = "b"
+        self.assertEqual(self.detti_db.get_version(), db_version + 2)
+        self.assertEqual(self.detti_db.get_version("version_key"), db_version + 1)
+        self.assertEqual(self.detti_db.get_with_version("version_key"), ("a", db_version + 1))
+
+        self.detti_db["version_key"] = "c"
+        self.assertEqual(self.detti_db.get_version("version_key"), db_version + 3)
+        self.assertEqual(self.detti_db.get_version("other_key"), db_version + 2)
+        content, version = self.detti_db.get_all_with_version()
+        self.assertEqual(
+            (content, version), ({"version_key": "c", "other_key": "b"}, db_version + 3)
+        )
+
+        self.detti_db.delete("version_key")
+        self.assertIsNone(self.detti_db.get_version("version_key"))
+        self.assertEqual(self.detti_db.get_with_version("version_key"), (None, None))
+        self.detti_db._clear_db()
+        self.assertIsNone(self.detti_db.get_version("other_key"))
+        self.assertEqual(self.detti_db.get_version(), db_version + 5)
+
+        # The loaded keys have 0 version in a new epoch.
+        self.detti_db["version_key"] = "a"
+        loaded_db: DettiDB = DettiDB(config_file=self.config_file_path)
+        self.assertEqual(loaded_db.get_version("version_key"), 0)
+        self.assertNotEqual(loaded_db.version_epoch, self.detti_db.version_epoch)
+
+    def test_response_cache(self) -> None:
+        """
+        Testing the "ResponseCache" class (LRU eviction and version validation).
+        :return: None
+        """
+
+        response_cache: ResponseCache = ResponseCache(max_size=30)
+        response_cache.put("/a", 1, 200, b"1234567890")
+        response_cache.put("/b", 1, 201, b"1234567890")
+        self.assertEqual(response_cache.get("/a", 1), (200, b"1234567890"))
+        # The "/b" is the least recently used entry.
+        response_cache.put("/c", 2, 200, b"1234567890")
+        self.assertIsNone(response_cache.get("/b", 1))
+        self.assertEqual(response_cache.get("/c", 2), (200, b"1234567890"))
+        # The outdated entry is removed.
+        self.assertIsNone(response_cache.get("/a", 2))
+        self.assertIsNone(response_cache.get("/a", 1))
+        # The too big responses are not cached.
+        response_cache.put("/d", 1, 200, b"0" * 100)
+        self.assertIsNone(response_cache.get("/d", 1))
+        self.assertEqual(
+            response_cache.get_info(),
+            {"hits": 2, "misses": 4, "evictions": 1, "entries": 1, "size": 12, "max_size": 30},
+        )
+        response_cache.clear()
+        self.assertEqual(len(response_cache), 0)
+
+    def test_aggregate(self) -> None:
+        """
+        Testing the "aggregate" method.
+        :return: None
+        """
+
+        self.detti_db.set_int("counter_1", 5)
+        self.detti_db.set_int("counter_2", 7)
+        self.detti_db.set_float("counter_3", 0.5)
+        self.detti_db.set("counter_4", "not_a_number")
+        self.detti_db.set_int("gauge", 100)
+
+        self.assertEqual(self.detti_db.aggregate("count", "counter_"), 3)
+        self.assertEqual(self.detti_db.aggregate("sum", "counter_"), 12.5)
+        self.assertEqual(self.detti_db.aggregate("min", "counter_"), 0.5)
+        self.assertEqual(self.detti_db.aggregate("max"), 100)
+        self.assertEqual(self.detti_db.aggregate("mean", "counter_"), 12.5 / 3)
+        self.assertEqual(self.detti_db.aggregate("percentile", "counter_", 50), 5)
+        self.assertEqual(self.detti_db.aggregate("percentile", "counter_", 75), 6)
+        self.assertEqual(self.detti_db.aggregate("sum", "not_exist"), 0)
+        self.assertIsNone(self.detti_db.aggregate("mean", "not_exist"))
+
+        # The columns follow the changes.
+        self.detti_db.set_int("counter_3", 8)
+        self.detti_db.set("counter_1", "not_a_number")
+        self.detti_db.set_int("counter_4", 1)
+        self.detti_db.delete("counter_2")
+        self.assertEqual(self.detti_db.aggregate("sum", "counter_"), 9)
+        self.assertIsInstance(self.detti_db.aggregate("sum", "counter_"), int)
+        self.detti_db._clear_db()
+        self.assertEqual(self.detti_db.aggregate("count"), 0)
+
+        with self.assertRaises(ValueError):
+            self.detti_db.aggregate("median")
+        with self.assertRaises(ValueError):
+            self.detti_db.aggregate("percentile", "counter_", 101)
+
+        # The on-disk storage engines are scanned.
+        path_of_engine_db: str = os.path.abspath("unit_test_aggregate.db")
+        self.addCleanup(self.remove_db_files, path_of_engine_db)
+        engine_db: DettiDB = DettiDB(
+            config_file=self.config_file_path,
+            path_of_db=path_of_engine_db,
+            storage_engine="lsm",
+        )
+        engine_db.set_int("counter_1", 5)
+        engine_db.set_float("counter_2", 2.5)
+        engine_db.set_int("other", 1)
+        self.assertEqual(engine_db.aggregate("sum", "counter_"), 7.5)
+        self.assertEqual(engine_db.aggregate("percentile", "", 100), 5)
+        engine_db.close()
+
+    def test_numeric_columns(self) -> None:
+        """
+        Testing the "NumericColumns" class with small buckets.
+        :return: None
+        """
+
+        numeric_columns: NumericColumns = NumericColumns()
+        expected_values: Dict[str, Any] = {}
+        with patch.object(NumericColumn, "BUCKET_SIZE", 4):
+            for index in range(2000):
+                key: str = "key_{}".format(randint(0, 300))
+                value: Any = [randint(-100, 100), randint(0, 100) / 8, "a", True, 2 ** 70][
+                    index % 5
+                ]
+                if index % 7 == 0:
+                    numeric_columns.discard(key)
+                    expected_values.pop(key, None)
+                else:
+                    numeric_columns.set(key, value)
+                    expected_values[key] = value
+
+        for key_prefix in ("", "key_1", "key_29", "key_300", "x"):
+            numbers: List[Any] = [
+                value
+                for key, value in expected_values.items()
+                if key.startswith(key_prefix) and type(value) in (int, float)
+            ]
+            self.assertEqual(numeric_columns.aggregate("count", key_prefix), len(numbers))
+            self.assertAlmostEqual(
+                numeric_columns.aggregate("sum", key_prefix), sum(numbers), delta=1e6
+            )
+            if numbers:
+                self.assertEqual(numeric_columns.aggregate("min", key_prefix), min(numbers))
+                self.assertEqual(numeric_columns.aggregate("max", key_prefix), max(numbers))
+                self.assertEqual(
+                    numeric_columns.aggregate("percentile", key_prefix, 100), max(numbers)
+                )
+
+    def test_secondary_indexes(self) -> None:
+        """
+        Testing the secondary indexes on the fields of the dict values.
+        :return: None
+        """
+
+        self.detti_db.set_dict("user_1", {"status": "active", "address": {"city": "X"}})
+        self.detti_db.set_dict("user_2", {"status": "inactive", "address": {"city": "Y"}})
+        self.detti_db.set_dict("user_3", {"status": 1})
+        self.detti_db["not_dict"] = "status"
+
+        # Without index (scanning).
+        self.assertEqual(
+            self.detti_db.find("address.city", "Y"),
+            {"user_2": {"status": "inactive", "address": {"city": "Y"}}},
+        )
+
+        with self.assertRaises(ValueError):
+            self.detti_db.create_index("address.")
+        self.assertTrue(self.detti_db.create_index("status"))
+        self.assertTrue(self.detti_db.create_index("address.city"))
+        self.assertFalse(self.detti_db.create_index("status"))
+        self.assertEqual(
+            self.detti_db.get_indexes()["status"], {"ready": True, "indexed_keys": 3, "values": 3}
+        )
+        self.assertEqual(
+            self.detti_db.find("status", "active"),
+            {"user_1": {"status": "active", "address": {"city": "X"}}},
+        )
+        # The values are compared with their types.
+        self.assertEqual(self.detti_db.find("status", 1), {"user_3": {"status": 1}})
+        self.assertEqual(self.detti_db.find("status", "1"), {})
+        self.assertEqual(self.detti_db.find("status", True), {})
+
+        # The indexes follow the changes.
+        self.detti_db.set_dict("user_2", {"status": "active"})
+        self.detti_db.delete("user_1")
+        self.assertEqual(self.detti_db.find("status", "active"), {"user_2": {"status": "active"}})
+        self.assertEqual(self.detti_db.find("address.city", "X"), {})
+        self.detti_db._clear_db()
+        self.assertEqual(self.detti_db.find("status", "active"), {})
+
+    def test_secondary_indexes_in_background(self) -> None:
+        """
+        Testing the background building of the indexes of "indexed_fields" parameter.
+        The changes during the building are applied on the index.
+        :return: None
+        """
+
+        path_of_indexed_db: str = os.path.abspath("unit_test_indexed.db")
+        self.addCleanup(self.remove_db_files, path_of_indexed_db)
+        with open(path_of_indexed_db, "wt", encoding="utf-8") as opened_db:
+            json.dump(
+                {"key_{}".format(index): {"group": index % 10} for index in range(10000)},
+                opened_db,
+            )
+
+        indexed_db: DettiDB = DettiDB(
+            config_file=self.config_file_path,
+            path_of_db=path_of_indexed_db,
+            persistence_mode="deferred",
+            indexed_fields="group, not.exist",
+        )
+        indexed_db.set_dict("key_0", {"group": 3})
+        indexed_db.delete("key_1")
+        while not all(info["ready"] for info in indexed_db.get_indexes().values()):
+            time.sleep(0.01)
+        self.assertEqual(len(indexed_db.find("group", 0)), 999)
+        self.assertEqual(len(indexed_db.find("group", 1)), 999)
+        self.assertEqual(len(indexed_db.find("group", 3)), 1001)
+        self.assertEqual(indexed_db.get_indexes()["not.exist"]["indexed_keys"], 0)
+        indexed_db.close()
+
+    def test_scan(self) -> None:
+        """
+        Testing the ordered range scans and the cursor based pagination.
+        :return: None
+        """
+
+        # Small batches, so the scans read more batches.
+        batch_size_patcher = patch("detti_db.SCAN_BATCH_SIZE", 10)
+        batch_size_patcher.start()
+        self.addCleanup(batch_size_patcher.stop)
+
+        for index in range(25):
+            self.detti_db.set_int("scan_key_{:04d}".format(index), index)
+        self.detti_db["other_key"] = "other_val"
+
+        self.assertEqual(
+            list(self.detti_db.scan("scan_key_0010", "scan_key_0013")),
+            [("scan_key_0010", 10), ("scan_key_0011", 11), ("scan_key_0012", 12)],
+        )
+        self.assertEqual(len(list(self.detti_db.scan("scan_"))), 25)
+        self.assertEqual(len(list(self.detti_db.scan(limit=13))), 13)
+        self.assertEqual(list(self.detti_db.scan("z")), [])
+
+        # The concurrent changes don't break the scanning.
+        scanned_keys: List[str] = []
+        for key, _ in self.detti_db.scan("scan_"):
+            scanned_keys.append(key)
+            if key == "scan_key_0005":
+                self.detti_db.delete("scan_key_0015")
+                self.detti_db.set_int("scan_key_0015_new", 0)
+        self.assertEqual(scanned_keys, sorted(set(scanned_keys)))
+        self.assertTrue("scan_key_0015_new" in scanned_keys)
+        self.assertFalse("scan_key_0015" in scanned_keys)
+
+        pages: List[Dict[str, Any]] = []
+        cursor: Optional[str] = None
+        while True:
+            page, cursor = self.detti_db.scan_page("scan_", limit=10, cursor=cursor)
+            pages.append(page)
+            if cursor is None:
+                break
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(list(pages[1])[0], "scan_key_0010")
+
+        with self.assertRaises(ValueError):
+            self.detti_db.scan_page(cursor="invalid")
+        with self.assertRaises(ValueError):
+            self.detti_db.scan_page(limit=0)
+
+    def test_scan_of_storage_engines(self) -> None:
+        """
+        Testing the ordered range scans of the on-disk storage engines.
+        :return: None
+        """
+
+        for storage_engine in ("mmap", "lsm", "sqlite"):
+            path_of_engine_db: str = os.path.abspath("unit_test_scan_{}.db".format(storage_engine))
+            self.addCleanup(self.remove_db_files, path_of_engine_db)
+            engine_db: DettiDB = DettiDB(
+                config_file=self.config_file_path,
+                path_of_db=path_of_engine_db,
+                storage_engine=storage_engine,
+                persistence_mode="deferred",
+            )
+            for index in range(2100, 0, -1):
+                engine_db.set_int("key_{:04d}".format(index), index)
+            self.assertEqual(
+                [key for key, _ in engine_db.scan("key_0998", "key_1001")],
+                ["key_0998", "key_0999", "key_1000"],
+            )
+            page, cursor = engine_db.scan_page(limit=2000)
+            self.assertEqual(list(page)[-1], "key_2000")
+            self.assertEqual(
+                engine_db.scan_page(limit=2000, cursor=cursor),
+                ({"key_{:04d}".format(index): index for index in range(2001, 2101)}, None),
+            )
+            # The bulk readers stream the engine instead of reading the DB to the memory.
+            engine_db.set_dict("dict_key", {"status": "active"})
+            with patch.object(engine_db.detti_db, "to_dict", side_effect=mock_runtime_error):
+                self.assertEqual(len(engine_db.get_all_keys()), 2101)
+                self.assertEqual(
+                    engine_db.search_values_in_db("activ"), {"dict_key": {"status": "active"}}
+                )
+                self.assertEqual(
+                    engine_db.find("status", "active"), {"dict_key": {"status": "active"}}
+                )
+                self.assertEqual(list(engine_db.search_glob_in_db("key_210?")), ["key_2100"])
+            self.assertIsNone(engine_db.read_view)
+            engine_db.close()
+
+    def test_concurrent_reads_and_writes(self) -> None:
+        """
+        Testing the consistent reads (read views) during concurrent reads, writes and scans.
+        Every writer sets its keys in increasing order, so a consistent view contains
+        a continuous range of the keys of every writer.
+        :return: None
+        """
+
+        path_of_stress_db: str = os.path.abspath("unit_test_stress.db")
+        self.addCleanup(self.remove_db_files, path_of_stress_db)
+        stress_db: DettiDB = DettiDB(
+            config_file=self.config_file_path,
+            path_of_db=path_of_stress_db,
+            persistence_mode="deferred",
+        )
+        number_of_writers: int = 4
+        writes_per_writer: int = 300
+        errors: List[str] = []
+        writers_done: threading.Event = threading.Event()
+
+        def check_view(view: Dict[str, Any]) -> None:
+            for writer in range(number_of_writers):
+                indexes: List[int] = sorted(
+                    value
+                    for key, value in view.items()
+                    if key.startswith("stress_{}_".format(writer))
+                )
+                if indexes != list(range(len(indexes))):
+                    errors.append("Inconsistent view of writer {}".format(writer))
+
+        def writer_thread(writer: int) -> None:
+            try:
+                for index in range(writes_per_writer):
+                    stress_db.set_int("stress_{}_{:05d}".format(writer, index), index)
+                    # Short-living keys.
+                    stress_db["tmp_{}".format(writer)] = "tmp_val"
+                    stress_db.delete("tmp_{}".format(writer))
+            except Exception as error:
+                errors.append(repr(error))
+
+        def reader_thread(reader: int) -> None:
+            try:
+                while not writers_done.is_set():
+                    if reader == 0:
+                        check_view(stress_db.get_all())
+                    elif reader == 1:
+                        check_view(dict(stress_db.scan(consistent=True)))
+                        # The page is bigger than a scan batch.
+                        check_view(dict(stress_db.scan("stress_", limit=2000, consistent=True)))
+                    elif reader == 2:
+                        keys: List[str] = [key for key, _ in stress_db.scan("stress_")]
+                        if keys != sorted(set(keys)):
+                            errors.append("Unordered scan")
+                    else:
+                        check_view(dict(stress_db.get_read_view()))
+                        stress_db.search_keys_in_db("stress_1_")
+                        if "stress_0_00000" in stress_db and stress_db["stress_0_00000"] != 0:
+                            errors.append("Invalid point read")
+            except Exception as error:
+                errors.append(repr(error))
+
+        threads: List[threading.Thread] = [
+            threading.Thread(target=reader_thread, args=(reader,)) for reader in range(4)
+        ]
+        writers: List[threading.Thread] = [
+            threading.Thread(target=writer_thread, args=(writer,))
+            for writer in range(number_of_writers)
+        ]
+        for thread in threads + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        writers_done.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(stress_db.get_number_of_elements(), number_of_writers * writes_per_writer)
+        check_view(stress_db.get_all())
+        self.assertEqual(errors, [])
+
+        # The views are read-only and don't change.
+        read_view = stress_db.get_read_view()
+        with self.assertRaises(TypeError):
+            read_view["stress_0_00000"] = 1
+        stress_db.delete("stress_0_00000")
+        self.assertTrue("stress_0_00000" in read_view)
+        self.assertFalse("stress_0_00000" in stress_db.get_read_view())
+
+        # The consistent pages and the copies of the DB don't create the shared view.
+        stress_db.delete("stress_0_00001")
+        self.assertEqual(
+            list(stress_db.scan("stress_0_", limit=2, consistent=True)),
+            [("stress_0_00002", 2), ("stress_0_00003", 3)],
+        )
+        all_items: Dict[str, Any] = stress_db.get_all()
+        self.assertIsNone(stress_db.read_view)
+        all_items["stress_0_00002"] = -1
+        self.assertEqual(stress_db.get_read_view()["stress_0_00002"], 2)
+        self.assertFalse(stress_db.get_all() is stress_db.read_view)
+        self.assertEqual(stress_db.get_all()["stress_0_00002"], 2)
+        stress_db.close()
+
+    def test_lock_striping(self) -> None:
+        """
+        Testing the striped locks of the keys with concurrent writers ("wal" persistence mode
+        with grouped fsync calls).
+        :return: None
+        """
+
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, lock_stripes="0")
+
+        path_of_striped_db: str = os.path.abspath("unit_test_striped.db")
+        self.addCleanup(self.remove_db_files, path_of_striped_db)
+        striped_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path,
+            path_of_db=path_of_striped_db,
+            persistence_mode="wal",
+            wal_fsync="always",
+            lock_stripes="4",
+        )
+        striped_db: DettiDB = DettiDB(**striped_db_kwargs)
+        self.assertEqual(len(striped_db.key_locks), 4)
+        self.assertIs(striped_db._key_lock("test_key"), striped_db._key_lock("test_key"))
+
+        striped_db.set_list("shared_list", [])
+
+        def writer_thread(writer: int) -> None:
+            for index in range(50):
+                striped_db.set_int("striped_{}_{}".format(writer, index), index)
+                # The read-modify-write changes of the same key are not lost.
+                striped_db.append_list("shared_list", writer)
+
+        threads: List[threading.Thread] = [
+            threading.Thread(target=writer_thread, args=(writer,)) for writer in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(striped_db["shared_list"]), 400)
+        self.assertEqual(striped_db.get_number_of_elements(), 401)
+        striped_db._clear_db()
+        striped_db["test_key"] = "test_val"
+        striped_db.wal.close()
+
+        reloaded_striped_db: DettiDB = DettiDB(**striped_db_kwargs)
+        self.assertEqual(reloaded_striped_db.get_all(), {"test_key": "test_val"})
+        reloaded_striped_db.close()
+
+        # The DB file of "sync" persistence mode is written without the DB lock.
+        original_write_db_files = self.detti_db._write_db_files
+        unlocked_reads: List[bool] = []
+
+        def write_db_files(db_files: Dict[str, Dict[str, Any]]) -> None:
+            reader: threading.Thread = threading.Thread(target=self.detti_db.get_version)
+            reader.start()
+            reader.join(timeout=5)
+            unlocked_reads.append(not reader.is_alive())
+            original_write_db_files(db_files)
+
+        with patch.object(self.detti_db, "_write_db_files", side_effect=write_db_files):
+            self.detti_db["sync_key"] = "sync_val"
+            # The dump is skipped if a later dump already contains the change.
+            self.detti_db._dump_committed(self.detti_db.dumped_version)
+        self.assertEqual(unlocked_reads, [True])
+        self.assertEqual(self.detti_db.dumped_version, self.detti_db.get_version())
+        with open(self.detti_db.path_of_db, "r") as opened_db_file:
+            self.assertEqual(json.load(opened_db_file)["sync_key"], "sync_val")
 
     def test_append_list(self) -> None:
         """
@@ -473,6 +1379,815 @@ class DettiDBTestCases(unittest.TestCase):
         self.assertFalse(self.detti_db.is_exist("test_key_2"))
         self.assertFalse("test_key_2" in self.detti_db)
 
+    def remove_db_files(self, path_of_db: str) -> None:
+        """
+        Removing the DB file and the related files (Eg.: write-ahead log) of a test DB.
+        :param path_of_db: Path of the test DB file.
+        :return: None
+        """
+
+        for file_path in (path_of_db, path_of_db + ".wal", path_of_db + ".wal.compacting"):
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+            elif os.path.isdir(file_path):
+                shutil.rmtree(file_path)
+
+    def test_invalid_persistence_mode(self) -> None:
+        """
+        Testing an invalid persistence mode.
+        :return: None
+        """
+
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, persistence_mode="invalid")
+
+    def test_wal_persistence(self) -> None:
+        """
+        Testing the "wal" persistence mode (appending and replaying the write-ahead log).
+        :return: None
+        """
+
+        path_of_wal_db: str = os.path.abspath("unit_test_wal.db")
+        self.addCleanup(self.remove_db_files, path_of_wal_db)
+        wal_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path,
+            path_of_db=path_of_wal_db,
+            persistence_mode="wal",
+            wal_fsync="always",
+        )
+
+        wal_db: DettiDB = DettiDB(**wal_db_kwargs)
+        wal_db["test_key"] = "test_val"
+        wal_db.set_int("test_int_key", 5)
+        wal_db.set_list("test_list_key", ["a"])
+        wal_db.append_list("test_list_key", 1)
+        wal_db.delete("test_key")
+        wal_db.wal.close()
+
+        # The DB file is not rewritten, the changes are in the log.
+        self.assertEqual(os.path.getsize(path_of_wal_db), 0)
+        self.assertTrue(os.path.getsize(path_of_wal_db + ".wal") > 0)
+
+        # Truncated record at the end of the log (Eg.: crash during appending).
+        with open(path_of_wal_db + ".wal", "ab") as opened_wal:
+            opened_wal.write(b'{"op":"set","key":"trunc')
+
+        reloaded_wal_db: DettiDB = DettiDB(**wal_db_kwargs)
+        self.assertEqual(reloaded_wal_db.get_all(), {"test_int_key": 5, "test_list_key": ["a", 1]})
+
+        # The new records are appended after the cut truncated record.
+        reloaded_wal_db["test_key_2"] = "test_val_2"
+        reloaded_wal_db.wal.close()
+        reloaded_wal_db = DettiDB(**wal_db_kwargs)
+        self.assertEqual(reloaded_wal_db["test_key_2"], "test_val_2")
+        reloaded_wal_db.close()
+
+    def test_wal_compaction(self) -> None:
+        """
+        Testing the compaction of the write-ahead log.
+        :return: None
+        """
+
+        path_of_wal_db: str = os.path.abspath("unit_test_wal.db")
+        self.addCleanup(self.remove_db_files, path_of_wal_db)
+        wal_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path,
+            path_of_db=path_of_wal_db,
+            persistence_mode="wal",
+            wal_compaction_size=200,
+        )
+
+        wal_db: DettiDB = DettiDB(**wal_db_kwargs)
+        expected_content: Dict[str, str] = {}
+        for index in range(20):
+            wal_db.set("test_key_{}".format(index), "test_val_{}".format(index))
+            expected_content["test_key_{}".format(index)] = "test_val_{}".format(index)
+        # The compaction is triggered automatically by the size of the log.
+        self.assertIsNotNone(wal_db.compaction_thread)
+        wal_db.compaction_thread.join()
+        self.assertTrue(wal_db.compact(wait=True))
+        wal_db.wal.close()
+
+        # The DB file contains the complete DB and the logs are folded.
+        self.assertEqual(json.load(open(path_of_wal_db, "rt")), expected_content)
+        self.assertEqual(os.path.getsize(path_of_wal_db + ".wal"), 0)
+        self.assertFalse(os.path.isfile(path_of_wal_db + ".wal.compacting"))
+
+        # Interrupted compaction: the rotated log is replayed and folded during loading.
+        with open(path_of_wal_db + ".wal.compacting", "wt") as opened_wal:
+            opened_wal.write('{"op":"delete","key":"test_key_0"}\n')
+        del expected_content["test_key_0"]
+
+        reloaded_wal_db: DettiDB = DettiDB(**wal_db_kwargs)
+        self.assertEqual(reloaded_wal_db.get_all(), expected_content)
+        self.assertEqual(json.load(open(path_of_wal_db, "rt")), expected_content)
+        self.assertFalse(os.path.isfile(path_of_wal_db + ".wal.compacting"))
+        reloaded_wal_db.wal.close()
+
+        # The compaction is not available in "sync" mode.
+        self.assertFalse(self.detti_db.compact())
+
+    def test_deferred_persistence(self) -> None:
+        """
+        Testing the "deferred" persistence mode (background flusher and coalesced dumps).
+        :return: None
+        """
+
+        path_of_deferred_db: str = os.path.abspath("unit_test_deferred.db")
+        self.addCleanup(self.remove_db_files, path_of_deferred_db)
+        deferred_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path,
+            path_of_db=path_of_deferred_db,
+            persistence_mode="deferred",
+            flush_interval_ms=60000,
+            flush_max_dirty=1000,
+        )
+
+        deferred_db: DettiDB = DettiDB(**deferred_db_kwargs)
+        number_of_dumps: List[int] = [0]
+        original_write_snapshot = deferred_db._write_snapshot
+
+        def counting_write_snapshot(*args, **kwargs) -> None:
+            number_of_dumps[0] += 1
+            original_write_snapshot(*args, **kwargs)
+
+        deferred_db._write_snapshot = counting_write_snapshot
+
+        # The changes only mark the DB dirty.
+        deferred_db["test_key"] = "test_val"
+        self.assertEqual(os.path.getsize(path_of_deferred_db), 0)
+        self.assertEqual(deferred_db.dirty_writes, 1)
+
+        # Explicit flush.
+        deferred_db.flush()
+        self.assertEqual(deferred_db.dirty_writes, 0)
+        self.assertEqual(json.load(open(path_of_deferred_db, "rt")), {"test_key": "test_val"})
+        self.assertEqual(number_of_dumps[0], 1)
+
+        # A burst of changes costs only a few dumps.
+        for index in range(10000):
+            deferred_db.set_int("test_int_key_{}".format(index), index)
+        deferred_db.close()
+        self.assertTrue(number_of_dumps[0] <= 12)
+        self.assertIsNone(deferred_db.flush_thread)
+
+        reloaded_deferred_db: DettiDB = DettiDB(**deferred_db_kwargs)
+        self.assertEqual(reloaded_deferred_db.get_number_of_elements(), 10001)
+        self.assertEqual(reloaded_deferred_db["test_int_key_9999"], 9999)
+        reloaded_deferred_db.close()
+        reloaded_deferred_db.close()
+
+    def test_async_api(self) -> None:
+        """
+        Testing the asyncio API (inline and executor writes, durable writes).
+        :return: None
+        """
+
+        path_of_async_db: str = os.path.abspath("unit_test_async.db")
+        self.addCleanup(self.remove_db_files, path_of_async_db)
+
+        async def run_deferred() -> None:
+            async_db: AsyncDettiDB = AsyncDettiDB(
+                config_file=self.config_file_path,
+                path_of_db=path_of_async_db,
+                persistence_mode="deferred",
+                flush_interval_ms=60000,
+            )
+            self.assertTrue(async_db.inline_writes)
+            self.assertTrue(await async_db.set("test_key", "test_val"))
+            self.assertEqual(await async_db.get("test_key"), "test_val")
+            # The change is only in the memory.
+            self.assertEqual(os.path.getsize(path_of_async_db), 0)
+
+            # The concurrent durable writes are persisted together.
+            await asyncio.gather(
+                *(async_db.set("test_int_key_{}".format(index), index, True) for index in range(5))
+            )
+            self.assertEqual(len(json.load(open(path_of_async_db, "rt"))), 6)
+
+            self.assertEqual(await async_db.get("not_exist_key", default_value=5), 5)
+            self.assertEqual(len(await async_db.search_keys_in_db("test_int_")), 5)
+            self.assertEqual(await async_db.search_values_in_db("test_v"), {"test_key": "test_val"})
+            self.assertEqual(len(await async_db.search_substring_in_db("int_key")), 5)
+            self.assertEqual(len(await async_db.search_glob_in_db("*_key_?")), 5)
+            self.assertTrue(await async_db.delete("test_key"))
+            self.assertFalse(await async_db.delete("test_key"))
+            await async_db.close()
+            self.assertEqual(len(json.load(open(path_of_async_db, "rt"))), 5)
+
+        async def run_sync() -> None:
+            async_db: AsyncDettiDB = AsyncDettiDB(
+                config_file=self.config_file_path,
+                path_of_db=path_of_async_db,
+                persistence_mode="sync",
+            )
+            # The writes of the "sync" persistence mode are done in the executor.
+            self.assertFalse(async_db.inline_writes)
+            self.assertTrue(await async_db.set("test_list_key", ["a"]))
+            self.assertEqual(json.load(open(path_of_async_db, "rt"))["test_list_key"], ["a"])
+            self.assertEqual(len(await async_db.get_all()), 6)
+            await async_db.close()
+
+        asyncio.run(run_deferred())
+        asyncio.run(run_sync())
+
+    def test_storage_owner(self) -> None:
+        """
+        Testing the calls of a remote DettiDB instance (Multi-process serving of the server).
+        :return: None
+        """
+
+        ipc_dir: str = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, ipc_dir)
+        address: str = os.path.join(ipc_dir, "storage_owner.sock")
+        storage_owner: StorageOwner = StorageOwner(self.detti_db, address, b"test_authkey")
+        storage_owner.start()
+        self.addCleanup(storage_owner.close)
+
+        with self.assertRaises(ValueError):
+            RemoteDettiDB(address, b"test_authkey", pool_size=0)
+        remote_db: RemoteDettiDB = RemoteDettiDB(address, b"test_authkey", pool_size=2)
+        self.assertEqual(remote_db.version_epoch, self.detti_db.version_epoch)
+        remote_db["test_key"] = "test_val"
+        self.assertEqual(self.detti_db["test_key"], "test_val")
+        self.assertEqual(remote_db["test_key"], "test_val")
+        self.assertTrue("test_key" in remote_db)
+        self.assertEqual(remote_db.get_version("test_key"), self.detti_db.get_version("test_key"))
+        self.assertEqual(remote_db.search_keys_in_db("test_"), {"test_key": "test_val"})
+
+        # The exceptions are raised again, the not allowed methods can't be called.
+        with self.assertRaises(ValueError):
+            remote_db.aggregate("invalid")
+        with self.assertRaises(AttributeError):
+            remote_db._clear_db()
+
+        # The threads share the pool of connections, the changes are serialized by the owner.
+        def writer_thread(writer: int) -> None:
+            for index in range(20):
+                remote_db.set_int("remote_{}_{}".format(writer, index), index)
+
+        threads: List[threading.Thread] = [
+            threading.Thread(target=writer_thread, args=(writer,)) for writer in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.detti_db.get_number_of_elements(), 81)
+        self.assertLessEqual(len(remote_db.idle_connections), 2)
+        self.assertLessEqual(len(storage_owner.connections), 2)
+        self.assertEqual(remote_db.get_version(), self.detti_db.get_version())
+
+        del remote_db["test_key"]
+        self.assertFalse("test_key" in self.detti_db)
+        remote_db.close()
+
+    def test_atomic_snapshot(self) -> None:
+        """
+        Testing the atomic snapshots (temporary file and rename) of the DB file.
+        :return: None
+        """
+
+        self.assertEqual(
+            self.detti_db.get_snapshot_info(),
+            {
+                "last_snapshot_time": None,
+                "last_snapshot_duration": None,
+                "bgsave_in_progress": False,
+            },
+        )
+
+        self.detti_db["test_key"] = "test_val"
+        self.assertEqual(json.load(open(self.detti_db.path_of_db, "rt")), {"test_key": "test_val"})
+        snapshot_info: Dict[str, Any] = self.detti_db.get_snapshot_info()
+        self.assertTrue(isinstance(snapshot_info["last_snapshot_time"], float))
+        self.assertTrue(snapshot_info["last_snapshot_duration"] >= 0)
+
+        # The temporary files are not left next to the DB file.
+        db_dir_content: List[str] = os.listdir(os.path.dirname(self.detti_db.path_of_db))
+        self.assertFalse([file_name for file_name in db_dir_content if file_name.endswith(".tmp")])
+
+        # The stale temporary files (Eg.: crash during the snapshot) are removed during loading.
+        path_of_stale_tmp_file: str = "{}.stale.tmp".format(self.detti_db.path_of_db)
+        with open(path_of_stale_tmp_file, "wt") as opened_tmp_file:
+            opened_tmp_file.write('{"test_key": ')
+        self.assertEqual(self.detti_db.load_db(), {"test_key": "test_val"})
+        self.assertFalse(os.path.isfile(path_of_stale_tmp_file))
+
+        # The directory is synced after the renaming of the DB file and of the rotated log.
+        original_fsync = os.fsync
+        synced_directories: List[int] = []
+
+        def fsync(file_descriptor: int) -> None:
+            if stat.S_ISDIR(os.fstat(file_descriptor).st_mode):
+                synced_directories.append(file_descriptor)
+            original_fsync(file_descriptor)
+
+        with patch("os.fsync", side_effect=fsync):
+            self.detti_db["test_key"] = "test_val_2"
+            self.assertEqual(len(synced_directories), 1)
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                wal: WriteAheadLog = WriteAheadLog(os.path.join(tmp_dir, "test.db.wal"), "never")
+                wal.open()
+                wal.append({"op": "set", "key": "test_key", "val": 1})
+                wal.rotate(os.path.join(tmp_dir, "test.db.wal.compacting"))
+                wal.close()
+            # The creation of the log and the rotation.
+            self.assertEqual(len(synced_directories), 3)
+
+    def test_bgsave(self) -> None:
+        """
+        Testing the fork based background saving of DB.
+        :return: None
+        """
+
+        # Invalid background save method.
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, background_save="invalid")
+
+        path_of_deferred_db: str = os.path.abspath("unit_test_deferred.db")
+        self.addCleanup(self.remove_db_files, path_of_deferred_db)
+        deferred_db: DettiDB = DettiDB(
+            config_file=self.config_file_path,
+            path_of_db=path_of_deferred_db,
+            persistence_mode="deferred",
+            flush_interval_ms=60000,
+            background_save="fork",
+        )
+
+        deferred_db["test_key"] = "test_val"
+        self.assertTrue(deferred_db.bgsave(wait=True))
+        self.assertEqual(json.load(open(path_of_deferred_db, "rt")), {"test_key": "test_val"})
+        self.assertFalse(deferred_db.get_snapshot_info()["bgsave_in_progress"])
+        self.assertIsNotNone(deferred_db.get_snapshot_info()["last_snapshot_time"])
+
+        # The flusher uses the forked child process as well.
+        deferred_db.set_int("test_int_key", 5)
+        deferred_db.close()
+        self.assertEqual(
+            json.load(open(path_of_deferred_db, "rt")), {"test_key": "test_val", "test_int_key": 5}
+        )
+
+    def test_storage_formats(self) -> None:
+        """
+        Testing the serialization backends ("storage_format" parameter).
+        :return: None
+        """
+
+        # Invalid storage format.
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, storage_format="invalid")
+
+        path_of_format_db: str = os.path.abspath("unit_test_format.db")
+        self.addCleanup(self.remove_db_files, path_of_format_db)
+        expected_content: Dict[str, Any] = {
+            "test_str_key": "test_val",
+            "test_int_key": 5,
+            "test_float_key": 5.5,
+            "test_list_key": ["a", 1, ["b"]],
+            "test_dict_key": {"a": {"b": [1, 2]}},
+        }
+
+        storage_format: str
+        for storage_format in SERIALIZERS:
+            format_db: DettiDB = DettiDB(
+                config_file=self.config_file_path,
+                path_of_db=path_of_format_db,
+                storage_format=storage_format,
+            )
+            # The DB file of the previous format is loaded and converted by the next dump.
+            for key, value in expected_content.items():
+                format_db[key] = value
+            self.assertEqual(detect_storage_format(path_of_format_db), storage_format)
+            self.assertEqual(format_db.load_db(), expected_content)
+
+        # The "dump_to_json" always writes Json.
+        format_db.dump_to_json(self.tmp_json_path)
+        self.assertEqual(json.load(open(self.tmp_json_path, "rt")), expected_content)
+
+    def test_convert_db_file(self) -> None:
+        """
+        Testing the conversion of DB files between the storage formats.
+        :return: None
+        """
+
+        self.detti_db["test_key"] = "test_val"
+        self.detti_db.set_list("test_list_key", ["a", 1])
+        path_of_db: str = self.detti_db.path_of_db
+
+        # In place conversion.
+        self.assertEqual(convert_db_file(path_of_db, "pickle"), "json_pretty")
+        self.assertEqual(detect_storage_format(path_of_db), "pickle")
+        self.assertEqual(
+            self.detti_db.load_db(), {"test_key": "test_val", "test_list_key": ["a", 1]}
+        )
+
+        # Conversion to another file.
+        self.assertEqual(
+            convert_db_file(path_of_db, "json", path_of_output=self.tmp_json_path), "pickle"
+        )
+        self.assertEqual(
+            json.load(open(self.tmp_json_path, "rt")),
+            {"test_key": "test_val", "test_list_key": ["a", 1]},
+        )
+        self.assertEqual(oct(os.stat(self.tmp_json_path).st_mode & 0o777), "0o600")
+
+    def test_sharded_storage(self) -> None:
+        """
+        Testing the hash-sharded DB directory ("shard_count" parameter).
+        :return: None
+        """
+
+        # Invalid shard count.
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, shard_count="invalid")
+
+        path_of_sharded_db: str = os.path.abspath("unit_test_sharded.db")
+        self.addCleanup(self.remove_db_files, path_of_sharded_db)
+        sharded_db: DettiDB = DettiDB(
+            config_file=self.config_file_path, path_of_db=path_of_sharded_db, shard_count=4
+        )
+        self.assertTrue(os.path.isdir(path_of_sharded_db))
+        self.assertEqual(read_shard_count(path_of_sharded_db), 4)
+
+        for index in range(20):
+            sharded_db.set_int("test_key_{}".format(index), index)
+        sharded_db.delete("test_key_0")
+        self.assertEqual(
+            json.load(open(shard_file_path(path_of_sharded_db, shard_index("test_key_1", 4)))),
+            {
+                "test_key_{}".format(index): index
+                for index in range(1, 20)
+                if shard_index("test_key_{}".format(index), 4) == shard_index("test_key_1", 4)
+            },
+        )
+        self.assertTrue(sharded_db.size_of_db() > 0)
+
+        # A change rewrites only the shard of the key.
+        written_files: List[str] = []
+        original_write_snapshot = sharded_db._write_snapshot
+
+        def recording_write_snapshot(db_content: Dict[str, Any], file_path: str, **kwargs) -> None:
+            written_files.append(file_path)
+            original_write_snapshot(db_content, file_path, **kwargs)
+
+        sharded_db._write_snapshot = recording_write_snapshot
+        sharded_db["test_key_5"] = "test_val"
+        self.assertEqual(
+            written_files, [shard_file_path(path_of_sharded_db, shard_index("test_key_5", 4))]
+        )
+
+        expected_content: Dict[str, Any] = sharded_db.get_all().copy()
+        self.assertEqual(sharded_db.load_db(), expected_content)
+
+        # The sharded DB works with the write-ahead log and the fork based snapshots.
+        sharded_db.close()
+        wal_sharded_db: DettiDB = DettiDB(
+            config_file=self.config_file_path,
+            path_of_db=path_of_sharded_db,
+            shard_count=4,
+            persistence_mode="wal",
+            background_save="fork",
+        )
+        wal_sharded_db["test_wal_key"] = "test_wal_val"
+        expected_content["test_wal_key"] = "test_wal_val"
+        wal_sharded_db.close()
+        self.assertEqual(
+            DettiDB(
+                config_file=self.config_file_path, path_of_db=path_of_sharded_db, shard_count=4
+            ).get_all(),
+            {key: value for key, value in expected_content.items() if key != "test_wal_key"},
+        )
+        wal_sharded_db = DettiDB(
+            config_file=self.config_file_path,
+            path_of_db=path_of_sharded_db,
+            shard_count=4,
+            persistence_mode="wal",
+        )
+        self.assertEqual(wal_sharded_db.get_all(), expected_content)
+        self.assertTrue(wal_sharded_db.compact(wait=True))
+        self.assertFalse(os.path.getsize(path_of_sharded_db + ".wal"))
+        self.assertEqual(
+            DettiDB(
+                config_file=self.config_file_path, path_of_db=path_of_sharded_db, shard_count=4
+            ).get_all(),
+            expected_content,
+        )
+        wal_sharded_db.close()
+
+        # The configured shard count has to match with the stored one.
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, path_of_db=path_of_sharded_db, shard_count=8)
+
+    def test_reshard_db(self) -> None:
+        """
+        Testing the offline resharding of the DB.
+        :return: None
+        """
+
+        self.detti_db["test_key"] = "test_val"
+        self.detti_db.set_list("test_list_key", ["a", 1])
+        path_of_db: str = self.detti_db.path_of_db
+        self.addCleanup(self.remove_db_files, path_of_db)
+        expected_content: Dict[str, Any] = {"test_key": "test_val", "test_list_key": ["a", 1]}
+
+        self.assertEqual(reshard_db(path_of_db, 3), 0)
+        self.assertEqual(read_shard_count(path_of_db), 3)
+        self.assertEqual(
+            DettiDB(
+                config_file=self.config_file_path, path_of_db=path_of_db, shard_count=3
+            ).get_all(),
+            expected_content,
+        )
+
+        self.assertEqual(reshard_db(path_of_db, 5), 3)
+        self.assertEqual(read_shard_count(path_of_db), 5)
+
+        self.assertEqual(reshard_db(path_of_db, 0), 5)
+        self.assertTrue(os.path.isfile(path_of_db))
+        self.assertEqual(detect_storage_format(path_of_db), "json_pretty")
+        self.assertEqual(self.detti_db.load_db(), expected_content)
+
+    def test_lazy_load(self) -> None:
+        """
+        Testing the lazy loading of the DB file ("lazy" storage format).
+        :return: None
+        """
+
+        # Invalid lazy cache value.
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, lazy_cache="invalid")
+
+        path_of_lazy_db: str = os.path.abspath("unit_test_lazy.db")
+        self.addCleanup(self.remove_db_files, path_of_lazy_db)
+        lazy_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path, path_of_db=path_of_lazy_db, storage_format="lazy"
+        )
+
+        lazy_db: DettiDB = DettiDB(**lazy_db_kwargs)
+        lazy_db["test_key"] = "test_val"
+        lazy_db.set_int("test_int_key", 5)
+        lazy_db.set_list("test_list_key", ["a", 1])
+        lazy_db.set_dict("test_dict_key", {"a": {"b": [1, 2]}})
+        self.assertEqual(detect_storage_format(path_of_lazy_db), "lazy")
+        expected_content: Dict[str, Any] = lazy_db.get_all()
+
+        # Only the index is loaded, the values are decoded on the first access.
+        lazy_db = DettiDB(**lazy_db_kwargs)
+        self.assertTrue(isinstance(lazy_db.detti_db, LazyDict))
+        self.assertEqual(lazy_db.detti_db.materialized_count(), 0)
+        self.assertEqual(lazy_db.get_number_of_elements(), 4)
+        self.assertEqual(lazy_db.search_keys_in_db("test_list"), {"test_list_key": ["a", 1]})
+        self.assertEqual(lazy_db["test_dict_key"], {"a": {"b": [1, 2]}})
+        self.assertEqual(lazy_db.detti_db.materialized_count(), 2)
+
+        # The not decoded values are copied by the dumps.
+        lazy_db.set_float("test_float_key", 5.5)
+        lazy_db.delete("test_key")
+        expected_content["test_float_key"] = 5.5
+        del expected_content["test_key"]
+        self.assertEqual(lazy_db.get_all(), expected_content)
+        self.assertTrue(isinstance(lazy_db.get_all(), dict))
+        self.assertEqual(lazy_db.load_db(), expected_content)
+        self.assertTrue(lazy_db.bgsave(wait=True))
+        self.assertEqual(lazy_db.load_db(), expected_content)
+
+        # The values are not cached if the "lazy_cache" is not set.
+        lazy_db = DettiDB(lazy_cache=False, **lazy_db_kwargs)
+        self.assertEqual(lazy_db["test_int_key"], 5)
+        self.assertEqual(lazy_db.detti_db.materialized_count(), 0)
+
+        # The "dump_to_json" always writes Json.
+        lazy_db.dump_to_json(self.tmp_json_path)
+        self.assertEqual(json.load(open(self.tmp_json_path, "rt")), expected_content)
+
+    def test_mmap_storage_engine(self) -> None:
+        """
+        Testing the memory-mapped storage engine ("storage_engine" parameter).
+        :return: None
+        """
+
+        # Invalid storage engine and unsupported combinations.
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, storage_engine="invalid")
+        with self.assertRaises(ValueError):
+            DettiDB(
+                config_file=self.config_file_path, storage_engine="mmap", persistence_mode="wal"
+            )
+
+        path_of_mmap_db: str = os.path.abspath("unit_test_mmap.db")
+        self.addCleanup(self.remove_db_files, path_of_mmap_db)
+        mmap_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path, path_of_db=path_of_mmap_db, storage_engine="mmap"
+        )
+
+        mmap_db: DettiDB = DettiDB(**mmap_db_kwargs)
+        self.assertTrue(isinstance(mmap_db.detti_db, MmapHashTable))
+        mmap_db["test_key"] = "test_val"
+        mmap_db.set_int("test_int_key", 5)
+        mmap_db.set_float("test_float_key", 5.5)
+        mmap_db.set_list("test_list_key", ["a"])
+        mmap_db.append_list("test_list_key", 1)
+        mmap_db.set_dict("test_dict_key", {"a": {"b": [1, 2]}})
+        mmap_db.delete("test_float_key")
+        expected_content: Dict[str, Any] = {
+            "test_key": "test_val",
+            "test_int_key": 5,
+            "test_list_key": ["a", 1],
+            "test_dict_key": {"a": {"b": [1, 2]}},
+        }
+        self.assertEqual(mmap_db.get_all(), expected_content)
+        self.assertEqual(mmap_db.search_keys_in_db("test_list"), {"test_list_key": ["a", 1]})
+        self.assertEqual(mmap_db.get_number_of_elements(), 4)
+        self.assertTrue(mmap_db.size_of_db() > 0)
+        self.assertFalse(mmap_db.bgsave())
+        mmap_db.close()
+
+        # In place updates, growing of the hash table and compaction of the heap.
+        mmap_db = DettiDB(persistence_mode="deferred", **mmap_db_kwargs)
+        self.assertEqual(mmap_db.get_all(), expected_content)
+        mmap_db["test_key"] = "test"
+        for index in range(2000):
+            mmap_db.set_int("test_key_{}".format(index), index)
+        for index in range(0, 2000, 2):
+            mmap_db.delete("test_key_{}".format(index))
+        mmap_db.detti_db.compact()
+        mmap_db.close()
+
+        mmap_db = DettiDB(**mmap_db_kwargs)
+        self.assertEqual(mmap_db["test_key"], "test")
+        self.assertEqual(mmap_db["test_key_1999"], 1999)
+        self.assertIsNone(mmap_db["test_key_1998"])
+        self.assertEqual(mmap_db.get_number_of_elements(), 1004)
+        mmap_db._clear_db()
+        self.assertEqual(mmap_db.get_all(), {})
+        mmap_db.close()
+
+    def test_lsm_storage_engine(self) -> None:
+        """
+        Testing the LSM-tree storage engine ("storage_engine = lsm").
+        :return: None
+        """
+
+        with self.assertRaises(ValueError):
+            DettiDB(config_file=self.config_file_path, storage_engine="lsm", lsm_memtable_size="0")
+
+        path_of_lsm_db: str = os.path.abspath("unit_test_lsm.db")
+        self.addCleanup(self.remove_db_files, path_of_lsm_db)
+        lsm_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path,
+            path_of_db=path_of_lsm_db,
+            storage_engine="lsm",
+            lsm_memtable_size="100",
+        )
+
+        lsm_db: DettiDB = DettiDB(**lsm_db_kwargs)
+        self.assertTrue(isinstance(lsm_db.detti_db, LsmTree))
+        # Small segments and compaction trigger to have more levels.
+        lsm_db.detti_db.segment_size = 2048
+        lsm_db.detti_db.level0_trigger = 2
+        expected_content: Dict[str, Any] = {}
+        for index in range(1000):
+            lsm_db.set_dict("test_key_{:04d}".format(index), {"index": index})
+            expected_content["test_key_{:04d}".format(index)] = {"index": index}
+        for index in range(0, 1000, 3):
+            lsm_db.delete("test_key_{:04d}".format(index))
+            del expected_content["test_key_{:04d}".format(index)]
+        lsm_db["test_key_0001"] = "test_val"
+        expected_content["test_key_0001"] = "test_val"
+        lsm_db.detti_db.wait_for_compaction()
+        self.assertTrue(len(lsm_db.detti_db.get_stats()["segments_per_level"]) > 1)
+        self.assertEqual(lsm_db.get_all(), expected_content)
+        self.assertEqual(
+            lsm_db.search_keys_in_db("test_key_001"),
+            {key: val for key, val in expected_content.items() if key.startswith("test_key_001")},
+        )
+        self.assertEqual(lsm_db.get_number_of_elements(), len(expected_content))
+        self.assertTrue(lsm_db.size_of_db() > 0)
+        self.assertFalse(lsm_db.bgsave())
+        lsm_db.close()
+
+        # The memtable is restored from its log, the segments from the manifest.
+        lsm_db = DettiDB(**lsm_db_kwargs)
+        self.assertEqual(lsm_db["test_key_0001"], "test_val")
+        self.assertEqual(lsm_db["test_key_0002"], {"index": 2})
+        self.assertIsNone(lsm_db["test_key_0003"])
+        self.assertEqual(lsm_db.get_all(), expected_content)
+        lsm_db._clear_db()
+        self.assertEqual(lsm_db.get_all(), {})
+        lsm_db.close()
+
+    def test_lsm_compaction(self) -> None:
+        """
+        Testing the compaction of the LSM-tree storage engine with a clearing during the merging
+        and with the size of the output segments.
+        :return: None
+        """
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lsm_tree: LsmTree = LsmTree(
+                os.path.join(tmp_dir, "lsm_tree"), memtable_size=5, level0_trigger=2
+            )
+            original_merge = LsmTree._merge
+
+            def merge_after_clear(sources: List[Any]) -> Any:
+                lsm_tree.clear()
+                return original_merge(sources)
+
+            # The output of the compaction is dropped, the cleared data doesn't come back.
+            with patch.object(lsm_tree, "_merge", side_effect=merge_after_clear):
+                for index in range(10):
+                    lsm_tree["test_key_{}".format(index)] = index
+                lsm_tree.wait_for_compaction()
+            self.assertEqual(len(lsm_tree), 0)
+            self.assertEqual(
+                sorted(os.listdir(lsm_tree.path_of_db)), ["manifest.json", "memtable.log"]
+            )
+
+            # The compaction thread is still running.
+            self.assertTrue(lsm_tree.compaction_thread.is_alive())
+            for index in range(10):
+                lsm_tree["test_key_{}".format(index)] = index
+            lsm_tree.wait_for_compaction()
+            self.assertEqual(lsm_tree.get_stats()["segments_per_level"], [0, 1])
+            self.assertEqual(len(lsm_tree), 10)
+            lsm_tree.close()
+
+            # The size of the output segments contains the values too.
+            lsm_tree = LsmTree(
+                os.path.join(tmp_dir, "lsm_tree_big_values"),
+                memtable_size=20,
+                segment_size=4096,
+                level0_trigger=2,
+            )
+            for index in range(40):
+                lsm_tree["test_key_{:02d}".format(index)] = "x" * 1000
+            lsm_tree.wait_for_compaction()
+            output_segments: List[Any] = [
+                segment for level in lsm_tree.levels[1:] for segment in level
+            ]
+            self.assertTrue(len(output_segments) >= 8)
+            for segment in output_segments:
+                self.assertLess(segment.data_size, 4096 + 1100)
+            self.assertEqual(len(lsm_tree), 40)
+            lsm_tree.close()
+
+    def test_sqlite_storage_engine(self) -> None:
+        """
+        Testing the SQLite storage engine ("storage_engine = sqlite").
+        :return: None
+        """
+
+        path_of_sqlite_db: str = os.path.abspath("unit_test_sqlite.db")
+        self.addCleanup(self.remove_db_files, path_of_sqlite_db)
+        sqlite_db_kwargs: Dict[str, str] = dict(
+            config_file=self.config_file_path,
+            path_of_db=path_of_sqlite_db,
+            storage_engine="sqlite",
+            persistence_mode="deferred",
+        )
+
+        sqlite_db: DettiDB = DettiDB(**sqlite_db_kwargs)
+        self.assertTrue(isinstance(sqlite_db.detti_db, SqliteStore))
+        sqlite_db["test_key"] = "test_val"
+        sqlite_db.set_int("test_int_key", 5)
+        sqlite_db.set_int("test_big_int_key", 2 ** 70)
+        sqlite_db.set_float("test_float_key", 5.5)
+        sqlite_db.set_list("test_list_key", ["a", True, None])
+        sqlite_db.set_dict("test_dict_key", {"a": {"b": [1, 2.5]}})
+        sqlite_db.set_dict("test_key_to_delete", {})
+        sqlite_db.delete("test_key_to_delete")
+        expected_content: Dict[str, Any] = {
+            "test_key": "test_val",
+            "test_int_key": 5,
+            "test_big_int_key": 2 ** 70,
+            "test_float_key": 5.5,
+            "test_list_key": ["a", True, None],
+            "test_dict_key": {"a": {"b": [1, 2.5]}},
+        }
+        self.assertEqual(sqlite_db.get_all(), expected_content)
+        self.assertTrue(isinstance(sqlite_db["test_float_key"], float))
+        self.assertEqual(
+            sqlite_db.search_keys_in_db("test_i"),
+            {"test_int_key": 5},
+        )
+        self.assertEqual(sqlite_db.get_number_of_elements(), 6)
+        self.assertFalse(sqlite_db.bgsave())
+
+        # An other connection (Eg.: other process) reads the committed changes.
+        sqlite_db.dump_json()
+        with closing(
+            sqlite3.connect(os.path.join(path_of_sqlite_db, SQLITE_FILE_NAME))
+        ) as connection:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM detti").fetchone()[0], 6)
+        sqlite_db.close()
+
+        sqlite_db = DettiDB(**sqlite_db_kwargs)
+        self.assertEqual(sqlite_db.get_all(), expected_content)
+        sqlite_db._clear_db()
+        self.assertEqual(sqlite_db.get_all(), {})
+        sqlite_db.close()
+
 
 if __name__ == "__main__":
     unittest.main()
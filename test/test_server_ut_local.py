@@ -4,7 +4,7 @@ import os
 import warnings
 import configparser
 import requests
-from typing import Optional
+from typing import Optional, Dict, Iterator
 
 sys.path.append(os.path.join(os.path.realpath(os.path.dirname(__file__)), ".."))
 
@@ -80,6 +80,14 @@ class DettiServerTestCases(unittest.TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.json(), {"exist": "value_of_exist_key"})
 
+        # More items are set in one write batch.
+        put_resp = requests.put(
+            "http://localhost:5000/set", data={"exist_1": "value_1", "exist_2": "value_2"}
+        )
+        self.assertEqual(put_resp.json(), {"STATUS": "OK"})
+        resp = requests.get("http://localhost:5000/get/exist_2")
+        self.assertEqual(resp.json(), {"exist_2": "value_2"})
+
     def test_invalid_put_to_db(self) -> None:
         """
         Testing when the data type is invalid in PUT.
@@ -209,6 +217,245 @@ class DettiServerTestCases(unittest.TestCase):
         self.assertEqual(resp.status_code, 201)
         self.assertEqual(resp.json(), {"nonono": "Cannot find values for prefix"})
 
+    def test_search_substr_and_glob(self) -> None:
+        """
+        Searching keys in the DB by substring and by glob pattern.
+        End-point(s):
+            /search_substr/<string:text>
+            /search_glob/<string:pattern>
+        :return: None
+        """
+
+        for key, value in (("session:1:cart", "user_42"), ("session:1:user", "b")):
+            put_resp: requests.models.Response = requests.put(
+                "http://localhost:5000/set", data={key: value}
+            )
+            self.assertEqual(put_resp.status_code, 200)
+
+        resp: requests.models.Response = requests.get("http://localhost:5000/search_substr/1:us")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"session:1:user": "b"})
+
+        resp: requests.models.Response = requests.get(
+            "http://localhost:5000/search_substr/er_4", params={"in": "values"}
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"session:1:cart": "user_42"})
+
+        resp: requests.models.Response = requests.get(
+            "http://localhost:5000/search_glob/session:%3F:c*"
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"session:1:cart": "user_42"})
+
+        resp: requests.models.Response = requests.get("http://localhost:5000/search_glob/nonono*")
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.json(), {"nonono*": "Cannot find keys matching the pattern"})
+
+    def test_find(self) -> None:
+        """
+        Finding the dict values by a field.
+        End-point(s):
+            /find/<string:field>/<string:value>
+        :return: None
+        """
+
+        resp: requests.models.Response = requests.get("http://localhost:5000/find/status/nonono")
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.json(), {"status": "Cannot find values for field"})
+
+        resp: requests.models.Response = requests.get(
+            "http://localhost:5000/find/status/nonono?value_type=json"
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json(), {"nonono": "Invalid Json value"})
+
+    def test_scan(self) -> None:
+        """
+        Scanning the DB in key order with cursor based pagination.
+        End-point(s):
+            /scan
+        :return: None
+        """
+
+        for index in range(3):
+            put_resp: requests.models.Response = requests.put(
+                "http://localhost:5000/set", data={"scan_key_{}".format(index): "scan_val"}
+            )
+            self.assertEqual(put_resp.status_code, 200)
+
+        resp: requests.models.Response = requests.get(
+            "http://localhost:5000/scan", params={"start": "scan_", "end": "scan_z", "limit": 2}
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["items"], {"scan_key_0": "scan_val", "scan_key_1": "scan_val"})
+
+        resp: requests.models.Response = requests.get(
+            "http://localhost:5000/scan",
+            params={"start": "scan_", "end": "scan_z", "limit": 2, "cursor": resp.json()["cursor"]},
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"items": {"scan_key_2": "scan_val"}, "cursor": None})
+
+        resp: requests.models.Response = requests.get(
+            "http://localhost:5000/scan", params={"cursor": "invalid"}
+        )
+        self.assertEqual(resp.status_code, 400)
+
+        resp: requests.models.Response = requests.get(
+            "http://localhost:5000/scan", params={"limit": 1000000}
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    def test_aggregate(self) -> None:
+        """
+        Aggregating the numeric values (The server sets only string values).
+        End-point(s):
+            /aggregate/<string:operation>/<string:key_prefix>
+            /aggregate/<string:operation>
+        :return: None
+        """
+
+        put_resp: requests.models.Response = requests.put(
+            "http://localhost:5000/set", data={"aggr_key": "aggr_val"}
+        )
+        self.assertEqual(put_resp.status_code, 200)
+
+        resp: requests.models.Response = requests.get("http://localhost:5000/aggregate/count/aggr_")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"operation": "count", "key_prefix": "aggr_", "result": 0})
+
+        resp: requests.models.Response = requests.get("http://localhost:5000/aggregate/max")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["key_prefix"], "")
+
+        resp: requests.models.Response = requests.get("http://localhost:5000/aggregate/median")
+        self.assertEqual(resp.status_code, 400)
+
+        resp: requests.models.Response = requests.get(
+            "http://localhost:5000/aggregate/percentile/aggr_", params={"p": "high"}
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    def test_bulk_operations(self) -> None:
+        """
+        Testing the bulk end-points with Json bodies.
+        End-point(s):
+            /mget
+            /mset
+            /mdelete
+        :return: None
+        """
+
+        put_resp: requests.models.Response = requests.put(
+            "http://localhost:5000/mset",
+            json={
+                "items": {"bulk_str": "a", "bulk_int": 1, "bulk_list": [1, "b"], "bulk_bool": True}
+            },
+        )
+        self.assertEqual(put_resp.status_code, 200)
+        self.assertEqual(put_resp.json(), {"STATUS": "OK"})
+
+        resp: requests.models.Response = requests.post(
+            "http://localhost:5000/mget",
+            json={"keys": ["bulk_str", "bulk_list", "bulk_bool", "bulk_missing"]},
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json(),
+            {
+                "items": {"bulk_str": "a", "bulk_list": [1, "b"], "bulk_bool": True},
+                "missing": ["bulk_missing"],
+            },
+        )
+
+        # No item is set if an item is invalid.
+        put_resp = requests.put(
+            "http://localhost:5000/mset", json={"items": {"bulk_new": "c", "bulk_none": None}}
+        )
+        self.assertEqual(put_resp.status_code, 400)
+        self.assertEqual(put_resp.json()["invalid_keys"], ["bulk_none"])
+        resp = requests.get("http://localhost:5000/get/bulk_new")
+        self.assertEqual(resp.status_code, 201)
+
+        resp = requests.delete(
+            "http://localhost:5000/mdelete", json={"keys": ["bulk_str", "bulk_int", "bulk_missing"]}
+        )
+        self.assertEqual(resp.json(), {"deleted": ["bulk_str", "bulk_int"]})
+        resp = requests.post("http://localhost:5000/mget", json={"keys": ["bulk_str", "bulk_int"]})
+        self.assertEqual(resp.json(), {"items": {}, "missing": ["bulk_str", "bulk_int"]})
+
+        # Invalid bodies and the size limit ("bulk_max_keys" in the config file).
+        resp = requests.post("http://localhost:5000/mget", data="not json")
+        self.assertEqual(resp.status_code, 400)
+        resp = requests.post("http://localhost:5000/mget", json={"keys": [1, 2]})
+        self.assertEqual(resp.status_code, 400)
+        resp = requests.put("http://localhost:5000/mset", json={"items": ["bulk_str"]})
+        self.assertEqual(resp.status_code, 400)
+        resp = requests.post(
+            "http://localhost:5000/mget", json={"keys": ["key_{}".format(i) for i in range(1001)]}
+        )
+        self.assertEqual(resp.status_code, 413)
+
+        # The chunked bodies (without "Content-Length" header) are limited too.
+        def chunked_body() -> Iterator[bytes]:
+            yield b'{"keys": ['
+            for _ in range(100):
+                yield b'"' + b"x" * 20000 + b'",'
+            yield b'"x"]}'
+
+        resp = requests.post("http://localhost:5000/mget", data=chunked_body())
+        self.assertEqual(resp.status_code, 413)
+        resp = requests.post(
+            "http://localhost:5000/mget", data=iter([b'{"keys": ', b'["bulk_list"]}'])
+        )
+        self.assertEqual(resp.json(), {"items": {"bulk_list": [1, "b"]}, "missing": []})
+
+    def test_atomic_operations(self) -> None:
+        """
+        Testing the atomic increments, compare-and-set and get-and-set.
+        End-point(s):
+            /incr/<string:db_key>
+            /incrbyfloat/<string:db_key>
+            /cas/<string:db_key>
+            /getset/<string:db_key>
+        :return: None
+        """
+
+        requests.delete("http://localhost:5000/delete/atomic_counter")
+        resp: requests.models.Response = requests.put("http://localhost:5000/incr/atomic_counter")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"atomic_counter": 1})
+        resp = requests.put("http://localhost:5000/incr/atomic_counter", data={"by": "-3"})
+        self.assertEqual(resp.json(), {"atomic_counter": -2})
+        resp = requests.put("http://localhost:5000/incr/atomic_counter", data={"by": "x"})
+        self.assertEqual(resp.status_code, 400)
+
+        # The string values of the "/set" end-point are increased too.
+        requests.put("http://localhost:5000/set", data={"atomic_gauge": "1.5"})
+        resp = requests.put("http://localhost:5000/incrbyfloat/atomic_gauge", data={"by": "1"})
+        self.assertEqual(resp.json(), {"atomic_gauge": 2.5})
+        resp = requests.put("http://localhost:5000/incr/atomic_gauge")
+        self.assertEqual(resp.status_code, 400)
+
+        requests.delete("http://localhost:5000/delete/atomic_owner")
+        resp = requests.put("http://localhost:5000/cas/atomic_owner", data={"value": "worker_1"})
+        self.assertEqual(resp.status_code, 200)
+        resp = requests.put("http://localhost:5000/cas/atomic_owner", data={"value": "worker_2"})
+        self.assertEqual(resp.status_code, 409)
+        resp = requests.put(
+            "http://localhost:5000/cas/atomic_owner",
+            data={"expected": "worker_1", "value": "worker_2"},
+        )
+        self.assertEqual(resp.status_code, 200)
+        resp = requests.put("http://localhost:5000/cas/atomic_owner")
+        self.assertEqual(resp.status_code, 400)
+
+        resp = requests.put("http://localhost:5000/getset/atomic_owner", data={"value": "free"})
+        self.assertEqual(resp.json(), {"atomic_owner": "worker_2"})
+        resp = requests.get("http://localhost:5000/get/atomic_owner")
+        self.assertEqual(resp.json(), {"atomic_owner": "free"})
+
     def test_delete_element(self) -> None:
         """
         Deleting an element from the DB.
@@ -233,6 +480,101 @@ class DettiServerTestCases(unittest.TestCase):
         self.assertEqual(resp.status_code, 201)
         self.assertTrue(resp.json(), {"to_be_deleted": "The key doesn't exist in DB."})
 
+    def test_conditional_get(self) -> None:
+        """
+        Conditional getting with ETag and If-None-Match headers.
+        End-point(s):
+            /get/<string:db_key>
+            /getall
+        :return: None
+        """
+
+        put_resp: requests.models.Response = requests.put(
+            "http://localhost:5000/set", data={"etag_key": "etag_val"}
+        )
+        self.assertEqual(put_resp.status_code, 200)
+
+        resp: requests.models.Response = requests.get("http://localhost:5000/get/etag_key")
+        self.assertEqual(resp.status_code, 200)
+        etag: str = resp.headers["ETag"]
+
+        resp = requests.get("http://localhost:5000/get/etag_key", headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.content, b"")
+        self.assertEqual(resp.headers["ETag"], etag)
+
+        resp = requests.get("http://localhost:5000/getall")
+        self.assertEqual(resp.status_code, 200)
+        db_etag: str = resp.headers["ETag"]
+        resp = requests.get("http://localhost:5000/getall", headers={"If-None-Match": db_etag})
+        self.assertEqual(resp.status_code, 304)
+
+        # A change of the key changes the ETags.
+        put_resp = requests.put("http://localhost:5000/set", data={"etag_key": "new_val"})
+        self.assertEqual(put_resp.status_code, 200)
+        resp = requests.get("http://localhost:5000/get/etag_key", headers={"If-None-Match": etag})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"etag_key": "new_val"})
+        self.assertNotEqual(resp.headers["ETag"], etag)
+        resp = requests.get("http://localhost:5000/getall", headers={"If-None-Match": db_etag})
+        self.assertEqual(resp.status_code, 200)
+
+    def test_response_cache(self) -> None:
+        """
+        Answering the repeated requests from the response cache.
+        End-point(s):
+            /get/<string:db_key>
+            /search_key/<string:key_prefix>
+            /cache_info
+        :return: None
+        """
+
+        put_resp: requests.models.Response = requests.put(
+            "http://localhost:5000/set", data={"cached_key": "cached_val"}
+        )
+        self.assertEqual(put_resp.status_code, 200)
+
+        cache_info: Dict[str, int] = requests.get("http://localhost:5000/cache_info").json()
+        for _ in range(2):
+            resp: requests.models.Response = requests.get("http://localhost:5000/get/cached_key")
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json(), {"cached_key": "cached_val"})
+            self.assertEqual(resp.headers["Content-Type"], "application/json")
+        # The search response is cached when the result is already in the search cache.
+        for _ in range(3):
+            resp = requests.get("http://localhost:5000/search_key/cached_")
+            self.assertEqual(resp.json(), {"cached_key": "cached_val"})
+        new_cache_info: Dict[str, int] = requests.get("http://localhost:5000/cache_info").json()
+        self.assertEqual(new_cache_info["hits"], cache_info["hits"] + 2)
+        self.assertEqual(new_cache_info["misses"], cache_info["misses"] + 2)
+
+        # The changes of the other keys don't invalidate the cached search responses.
+        put_resp = requests.put("http://localhost:5000/set", data={"other_key": "other_val"})
+        self.assertEqual(put_resp.status_code, 200)
+        resp = requests.get("http://localhost:5000/search_key/cached_")
+        self.assertEqual(resp.json(), {"cached_key": "cached_val"})
+        self.assertEqual(
+            requests.get("http://localhost:5000/cache_info").json()["hits"],
+            new_cache_info["hits"] + 1,
+        )
+
+        # The changes invalidate the cached responses.
+        put_resp = requests.put("http://localhost:5000/set", data={"cached_key": "new_val"})
+        self.assertEqual(put_resp.status_code, 200)
+        resp = requests.get("http://localhost:5000/get/cached_key")
+        self.assertEqual(resp.json(), {"cached_key": "new_val"})
+        resp = requests.get("http://localhost:5000/search_key/cached_")
+        self.assertEqual(resp.json(), {"cached_key": "new_val"})
+
+        delete_resp: requests.models.Response = requests.delete(
+            "http://localhost:5000/delete/cached_key"
+        )
+        self.assertEqual(delete_resp.status_code, 200)
+        resp = requests.get("http://localhost:5000/get/cached_key")
+        self.assertEqual(resp.status_code, 201)
+        resp = requests.get("http://localhost:5000/search_key/cached_")
+        self.assertEqual(resp.status_code, 201)
+
     def test_get_all(self) -> None:
         """
         Get all elements from the DB.
@@ -0,0 +1,103 @@
+"""
+This file contains the conversion of the Detti DB files between the storage formats.
+The storage format of the source file is detected automatically.
+The destination file is written atomically and the permissions of the source file are kept.
+Possible storage formats:
+    json_pretty, json, marshal, pickle
+Usage example:
+    Convert the DB file in place:
+        >> python3 tools/convert_db.py test.db --storage_format marshal
+        > The 'test.db' DB file (json_pretty) has been converted to 'test.db' (marshal).
+    Convert the DB file to another file:
+        >> python3 tools/convert_db.py test.db --storage_format json_pretty --output test.json
+        > The 'test.db' DB file (marshal) has been converted to 'test.json' (json_pretty).
+IMPORTANT: Stop the DB (and the server) before the in place conversion of its DB file!
+"""
+
+import os
+import sys
+import argparse
+from typing import Dict, Any, Optional
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from detti_serializers import SERIALIZERS, get_serializer, load_file, dump_file  # noqa: E402
+
+
+def convert_db_file(
+    path_of_db: str, storage_format: str, path_of_output: Optional[str] = None
+) -> str:
+    """
+    Convert a DB file to another storage format.
+    :param path_of_db: Path of the source DB file.
+    :param storage_format: The storage format of the destination file.
+    :param path_of_output: Path of the destination file. Default: The source file (in place).
+    :return: The detected storage format of the source file.
+    """
+
+    if not path_of_output:
+        path_of_output = path_of_db
+
+    db_content: Dict[str, Any]
+    source_storage_format: str
+    if os.path.getsize(path_of_db):
+        db_content, source_storage_format = load_file(path_of_db)
+    else:
+        db_content, source_storage_format = {}, "json"
+
+    if path_of_output != path_of_db and not os.path.isfile(path_of_output):
+        # Only the owner has permissions for the new DB file.
+        with open(path_of_output, "w"):
+            os.chmod(path_of_output, os.stat(path_of_db).st_mode & 0o777)
+
+    dump_file(db_content, path_of_output, get_serializer(storage_format))
+
+    return source_storage_format
+
+
+def main() -> None:
+    """
+    Main function of the conversion tool.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.RawTextHelpFormatter, description=__doc__
+    )
+    parser.add_argument("path_of_db", type=str, help="Path of the source DB file.")
+    parser.add_argument(
+        "--storage_format",
+        dest="storage_format",
+        type=str,
+        required=True,
+        choices=list(SERIALIZERS),
+        help="Storage format of the destination file.",
+    )
+    parser.add_argument(
+        "--output",
+        dest="path_of_output",
+        type=str,
+        required=False,
+        default=None,
+        help="Path of the destination file. Default: The source file (in place).",
+    )
+    args = parser.parse_args()
+
+    source_storage_format: str = convert_db_file(
+        args.path_of_db, args.storage_format, path_of_output=args.path_of_output
+    )
+    print(
+        "The '{}' DB file ({}) has been converted to '{}' ({}).".format(
+            args.path_of_db,
+            source_storage_format,
+            args.path_of_output if args.path_of_output else args.path_of_db,
+            args.storage_format,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+This file contains the write batches of the Detti DB.
+A batch buffers the changes (sets and deletes) of more keys. They are validated like the normal
+changes, but they are applied on the DB at the end of the batch together: atomically for the
+readers and with one persistence step (one dump of the DB or one record of the write-ahead log).
+Usage example:
+    Code part:
+        with detti_db.batch() as write_batch:
+            write_batch["test_key_1"] = "test_val_1"
+            write_batch.set("test_key_2", 2)
+            write_batch.delete("old_key")
+            print(write_batch.get("test_key_2"), "test_key_1" in detti_db)
+        print(detti_db["test_key_1"])
+    Output:
+        2 False
+        test_val_1
+"""
+
+from typing import Dict, Any, List, Optional
+
+# Marker of the keys which are deleted by the batch.
+DELETED: object = object()
+
+
+class WriteBatch(object):
+    """
+    Buffer of the changes of a batch. It is not thread-safe (It is used by one thread).
+    """
+
+    def __init__(self, detti_db: Any) -> None:
+        """
+        Init method of 'WriteBatch' class.
+        :param detti_db: The DettiDB instance.
+        """
+
+        self.detti_db: Any = detti_db
+        # The change records in order. Eg.: [{"op": "set", "key": "a", "val": 1}]
+        self.records: List[Dict[str, Any]] = []
+        # Key -> The last buffered value of the key (or DELETED).
+        self.pending: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __setitem__(self, key: str, value: Any) -> bool:
+        return self.set(key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.get(key)
+
+    def __delitem__(self, key: str) -> bool:
+        return self.delete(key)
+
+    def __contains__(self, key: str) -> bool:
+        if key in self.pending:
+            return self.pending[key] is not DELETED
+        return key in self.detti_db
+
+    def add_record(self, record: Dict[str, Any]) -> None:
+        """
+        Buffer a validated change record.
+        :param record: The change record.
+        :return: None
+        """
+
+        self.records.append(record)
+        self.pending[record["key"]] = record["val"] if record["op"] == "set" else DELETED
+
+    def set(self, key: str, value: Any) -> bool:
+        """
+        Buffer the setting of a key. The value is validated and converted by the setter
+        of its type (Eg.: "set_int" method of the DB), but it is not applied yet.
+        :param key: Key of the item.
+        :param value: Value of the key.
+        :return: True if the value is valid else False (It is not buffered).
+        """
+
+        return self.detti_db._buffer_set(self, key, value)
+
+    def delete(self, key: str) -> bool:
+        """
+        Buffer the deleting of a key.
+        :param key: Key of the item.
+        :return: True if the key exists (in the DB or in the batch) else False.
+        """
+
+        if key not in self:
+            return False
+        self.add_record({"op": "delete", "key": key})
+        return True
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """
+        Provide the value of a key including the buffered changes of the batch.
+        :param key: Key of the item.
+        :param default: The return value if the key doesn't exist.
+        :return: The value of the key.
+        """
+
+        if key in self.pending:
+            return default if self.pending[key] is DELETED else self.pending[key]
+        return self.detti_db.get(key, default)
+
+    def discard(self) -> None:
+        """
+        Drop the buffered changes.
+        :return: None
+        """
+
+        self.records = []
+        self.pending = {}
@@ -0,0 +1,163 @@
+"""
+This file contains the secondary indexes of the Detti DB on the fields of the dict values.
+A field is a top-level key of the dict values or a dotted path of nested keys (Eg.: "user.name").
+The index maps the values of the field to the keys whose dict value contains it,
+so the keys with a field value are found in O(matches).
+The field values are compared by their Json form, so 1, True and "1" are different values.
+Usage example:
+    Code part:
+        field_index = FieldIndex("user.status")
+        field_index.add("a", {"user": {"status": "active"}})
+        field_index.add("b", {"user": {"status": "inactive"}})
+        field_index.add("c", "not_a_dict")
+        print(field_index.find("active"), len(field_index))
+    Output:
+        {'a'} 2
+"""
+
+import json
+from threading import Event
+from typing import Dict, Any, Set, List, Tuple
+
+# Marker of the missing fields.
+MISSING: object = object()
+
+
+def field_value(value: Any, field: str) -> Any:
+    """
+    Provide the value of a (dotted) field of a dict value.
+    :param value: The value of a key.
+    :param field: The field. Eg.: "status" or "user.status"
+    :return: The value of the field or MISSING if the value doesn't have the field.
+    """
+
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return MISSING
+        value = value[part]
+    return value
+
+
+def index_token(value: Any) -> str:
+    """
+    Provide the comparable form of a field value.
+    :param value: The value of the field.
+    :return: The Json form of the value.
+    """
+
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+class FieldIndex(object):
+    """
+    Secondary index on a field. It is not thread-safe (The DB updates it under its lock).
+    The index is usable when it is ready (The building may run in a background thread, the
+    changes during the building are collected and applied at the end of the building).
+    """
+
+    def __init__(self, field: str) -> None:
+        """
+        Init method of 'FieldIndex' class.
+        :param field: The indexed field. Eg.: "status" or "user.status"
+        """
+
+        self.field: str = field
+        # Json form of the field value -> Keys.
+        self.postings: Dict[str, Set[str]] = {}
+        # Key -> Json form of its field value.
+        self.tokens_of_keys: Dict[str, str] = {}
+        self.ready: Event = Event()
+        # The change records which arrived during the building.
+        self.pending_records: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.tokens_of_keys)
+
+    def add(self, key: str, value: Any) -> None:
+        """
+        Index the value of a key (The earlier value of the key is removed from the index).
+        :param key: The key.
+        :param value: The value of the key.
+        :return: None
+        """
+
+        self.discard(key)
+        value_of_field: Any = field_value(value, self.field)
+        if value_of_field is MISSING:
+            return
+        token: str = index_token(value_of_field)
+        self.tokens_of_keys[key] = token
+        self.postings.setdefault(token, set()).add(key)
+
+    def discard(self, key: str) -> None:
+        """
+        Remove the value of a key from the index.
+        :param key: The key.
+        :return: None
+        """
+
+        token: str = self.tokens_of_keys.pop(key, None)
+        if token is None:
+            return
+        keys_of_token: Set[str] = self.postings[token]
+        keys_of_token.discard(key)
+        if not keys_of_token:
+            del self.postings[token]
+
+    def clear(self) -> None:
+        """
+        Remove all values from the index.
+        :return: None
+        """
+
+        self.postings.clear()
+        self.tokens_of_keys.clear()
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        """
+        Apply a change record. The records are collected while the index is not ready.
+        :param record: The change record. Eg.: {"op": "set", "key": "a", "val": {"status": 1}}
+        :return: None
+        """
+
+        if not self.ready.is_set():
+            self.pending_records.append(record)
+            return
+
+        operation: str = record["op"]
+        if operation == "clear":
+            self.clear()
+        elif operation == "set":
+            self.add(record["key"], record["val"])
+        else:
+            self.discard(record["key"])
+
+    def build(self, items: List[Tuple[str, Any]]) -> None:
+        """
+        Index the key-value pairs of a snapshot (It can be called without the lock of the DB).
+        :param items: The key-value pairs of the snapshot.
+        :return: None
+        """
+
+        for key, value in items:
+            self.add(key, value)
+
+    def finish_build(self) -> None:
+        """
+        Apply the collected changes and make the index ready. It is called under the lock.
+        :return: None
+        """
+
+        self.ready.set()
+        for record in self.pending_records:
+            self.apply(record)
+        self.pending_records = []
+
+    def find(self, value: Any) -> Set[str]:
+        """
+        Find the keys whose field has a value.
+        :param value: The value of the field.
+        :return: The found keys.
+        """
+
+        return set(self.postings.get(index_token(value), ()))
@@ -0,0 +1,277 @@
+"""
+This file contains the inter-process communication of the multi-process Detti Server.
+The storage-owner process holds the DettiDB instance and it serves the calls of the HTTP worker
+processes over a Unix socket (multiprocessing.connection: length-prefixed pickled messages).
+The workers use bounded pools of connections and the owner serves every connection
+by a thread, so all calls are executed by the single DettiDB instance: the changes have
+one serialized order and the workers share the versions of the DB.
+Usage example:
+    Code part:
+        storage_owner = StorageOwner(DettiDB(), "/tmp/detti.sock", b"secret")
+        storage_owner.start()
+        remote_detti_db = RemoteDettiDB("/tmp/detti.sock", b"secret")
+        remote_detti_db["test_key"] = "test_val"
+        print(remote_detti_db["test_key"], remote_detti_db.get_version("test_key"))
+        remote_detti_db.close()
+        storage_owner.close()
+    Output:
+        test_val 1
+"""
+
+import threading
+from functools import partial
+from multiprocessing.connection import Listener, Client, Connection
+from typing import Any, Optional, Callable, FrozenSet, List
+
+# The methods of the DettiDB which can be called remotely.
+REMOTE_METHODS: FrozenSet[str] = frozenset(
+    {
+        "__getitem__",
+        "__setitem__",
+        "__delitem__",
+        "__contains__",
+        "get",
+        "get_many",
+        "get_all",
+        "get_all_keys",
+        "get_number_of_elements",
+        "get_version",
+        "get_with_version",
+        "set",
+        "set_bool",
+        "set_int",
+        "set_float",
+        "set_list",
+        "set_dict",
+        "append_list",
+        "incr",
+        "incrby",
+        "incrbyfloat",
+        "compare_and_set",
+        "getset",
+        "delete",
+        "set_many",
+        "delete_many",
+        "search_keys_in_db",
+        "search_values_in_db",
+        "search_substring_in_db",
+        "search_glob_in_db",
+        "get_search_version",
+        "find",
+        "scan_page",
+        "aggregate",
+        "flush",
+    }
+)
+
+# The attributes of the DettiDB which are read once by the remote instances.
+REMOTE_ATTRIBUTES: FrozenSet[str] = frozenset({"version_epoch"})
+
+
+class StorageOwner(object):
+    """
+    Server of the calls of the remote DettiDB instances.
+    """
+
+    def __init__(self, detti_db: Any, address: str, authkey: bytes) -> None:
+        """
+        Init method of 'StorageOwner' class.
+        :param detti_db: The DettiDB instance.
+        :param address: Path of the Unix socket.
+        :param authkey: The authentication key of the connections.
+        """
+
+        self.detti_db: Any = detti_db
+        self.address: str = address
+        self.authkey: bytes = authkey
+        self.listener: Optional[Listener] = None
+        self.accept_thread: Optional[threading.Thread] = None
+        self.connections: List[Connection] = []
+        self.lock: threading.Lock = threading.Lock()
+
+    def listen(self) -> None:
+        """
+        Start to listen on the Unix socket without accepting the connections (No thread is
+        started, so the clients can be started before the "start" method).
+        :return: None
+        """
+
+        if self.listener is None:
+            self.listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+
+    def start(self) -> None:
+        """
+        Start to listen on the Unix socket and to accept the connections in the background.
+        :return: None
+        """
+
+        self.listen()
+        self.accept_thread = threading.Thread(target=self._accept_connections, daemon=True)
+        self.accept_thread.start()
+
+    def _accept_connections(self) -> None:
+        """
+        Target of the accepting thread. Every connection is served by a new thread.
+        :return: None
+        """
+
+        while True:
+            try:
+                connection: Connection = self.listener.accept()
+            except OSError:
+                # The listener is closed.
+                return
+            except Exception:
+                # Eg.: Failed authentication. The other connections are not affected.
+                continue
+            with self.lock:
+                self.connections.append(connection)
+            threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+    def _call(self, name: str, args: tuple, kwargs: dict) -> Any:
+        """
+        Execute a call of a remote instance.
+        :param name: Name of the method or of the attribute.
+        :param args: The positional arguments of the method.
+        :param kwargs: The keyword arguments of the method.
+        :return: The result of the method or the value of the attribute.
+        """
+
+        if name in REMOTE_ATTRIBUTES:
+            return getattr(self.detti_db, name)
+        if name not in REMOTE_METHODS:
+            raise AttributeError("The '{}' method cannot be called remotely.".format(name))
+        return getattr(self.detti_db, name)(*args, **kwargs)
+
+    def _serve_connection(self, connection: Connection) -> None:
+        """
+        Target of the serving threads: answer the calls of a connection until it is closed.
+        The answer is ("ok", result) or ("error", exception).
+        :param connection: The connection.
+        :return: None
+        """
+
+        try:
+            while True:
+                name, args, kwargs = connection.recv()
+                try:
+                    answer: tuple = ("ok", self._call(name, args, kwargs))
+                except Exception as call_error:
+                    answer = ("error", call_error)
+                connection.send(answer)
+        except (EOFError, OSError):
+            pass
+        finally:
+            with self.lock:
+                if connection in self.connections:
+                    self.connections.remove(connection)
+            connection.close()
+
+    def close(self) -> None:
+        """
+        Stop the listening and close the connections.
+        :return: None
+        """
+
+        if self.listener:
+            self.listener.close()
+            self.listener = None
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections = []
+
+
+class RemoteDettiDB(object):
+    """
+    Proxy of the DettiDB instance of a storage owner. It is thread-safe: the calls borrow
+    a connection from a bounded pool, so the connections (and the serving threads of the owner)
+    are reused by the short-lived request threads of the server instead of being opened
+    (with an authentication) by every thread. The methods of REMOTE_METHODS can be called
+    as on a DettiDB.
+    """
+
+    def __init__(self, address: str, authkey: bytes, pool_size: int = 8) -> None:
+        """
+        Init method of 'RemoteDettiDB' class.
+        :param address: Path of the Unix socket of the storage owner.
+        :param authkey: The authentication key of the connections.
+        :param pool_size: The maximum number of the connections. The other calls wait.
+        """
+
+        if pool_size < 1:
+            raise ValueError("Invalid pool size: {}. It has to be positive.".format(pool_size))
+
+        self.address: str = address
+        self.authkey: bytes = authkey
+        # The idle connections of the pool and the free places of the pool.
+        self.idle_connections: List[Connection] = []
+        self.pool_slots: threading.BoundedSemaphore = threading.BoundedSemaphore(pool_size)
+        self.lock: threading.Lock = threading.Lock()
+        self.version_epoch: str = self.call("version_epoch")
+
+    def _connection(self) -> Connection:
+        """
+        Provide an idle connection of the pool or open a new one.
+        It is called with a free place of the pool.
+        :return: The connection.
+        """
+
+        with self.lock:
+            if self.idle_connections:
+                return self.idle_connections.pop()
+        return Client(self.address, family="AF_UNIX", authkey=self.authkey)
+
+    def call(self, name: str, *args, **kwargs) -> Any:
+        """
+        Call a method of the DettiDB of the storage owner.
+        The exceptions of the method are raised again.
+        :param name: Name of the method (or of an attribute of REMOTE_ATTRIBUTES).
+        :param args: The positional arguments of the method.
+        :param kwargs: The keyword arguments of the method.
+        :return: The result of the method.
+        """
+
+        with self.pool_slots:
+            connection: Connection = self._connection()
+            try:
+                connection.send((name, args, kwargs))
+                status, result = connection.recv()
+            except BaseException:
+                # The state of the connection is unknown. It is not reused.
+                connection.close()
+                raise
+            with self.lock:
+                self.idle_connections.append(connection)
+        if status == "error":
+            raise result
+        return result
+
+    def __getattr__(self, name: str) -> Callable:
+        if name in REMOTE_METHODS:
+            return partial(self.call, name)
+        raise AttributeError("The '{}' method cannot be called remotely.".format(name))
+
+    def __getitem__(self, key: str) -> Any:
+        return self.call("__getitem__", key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.call("__setitem__", key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self.call("__delitem__", key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.call("__contains__", key)
+
+    def close(self) -> None:
+        """
+        Close the idle connections of the pool (The later calls open new ones).
+        :return: None
+        """
+
+        with self.lock:
+            idle_connections: List[Connection] = self.idle_connections
+            self.idle_connections = []
+        for connection in idle_connections:
+            connection.close()
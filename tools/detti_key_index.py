@@ -0,0 +1,159 @@
+"""
+This file contains the sorted key index of the Detti DB.
+The keys are kept in sorted buckets (a sorted list of sorted lists), so a key is inserted
+or removed by two bisections and a short list operation, and the keys with a prefix are found
+by a bisection to the first possible key and a scan of only the matched keys: O(log n + k).
+Usage example:
+    Code part:
+        key_index = SortedKeyIndex(["b", "ab", "c"])
+        key_index.add("aa")
+        key_index.discard("c")
+        print(list(key_index.iter_prefix("a")), len(key_index))
+    Output:
+        ['aa', 'ab'] 3
+"""
+
+import bisect
+from typing import List, Iterable, Iterator, Optional
+
+
+class SortedKeyIndex(object):
+    """
+    Sorted index of the keys. It is not thread-safe (The DB updates it under its lock).
+    """
+
+    # Number of the keys in a new bucket. A bucket is split when it is twice as big.
+    BUCKET_SIZE: int = 1000
+
+    def __init__(self, keys: Iterable[str] = ()) -> None:
+        """
+        Init method of 'SortedKeyIndex' class.
+        :param keys: The initial keys.
+        """
+
+        sorted_keys: List[str] = sorted(set(keys))
+        self.buckets: List[List[str]] = []
+        for start in range(0, len(sorted_keys), self.BUCKET_SIZE):
+            end: int = start + self.BUCKET_SIZE
+            self.buckets.append(sorted_keys[start:end])
+        # The biggest key of every bucket (The bucket of a key is found by bisection).
+        self.maxes: List[str] = [bucket[-1] for bucket in self.buckets]
+        self.number_of_keys: int = len(sorted_keys)
+
+    def __len__(self) -> int:
+        return self.number_of_keys
+
+    def __iter__(self) -> Iterator[str]:
+        return self.irange()
+
+    def __contains__(self, key: str) -> bool:
+        position: int = bisect.bisect_left(self.maxes, key)
+        if position == len(self.maxes):
+            return False
+        bucket: List[str] = self.buckets[position]
+        return bucket[bisect.bisect_left(bucket, key)] == key
+
+    def add(self, key: str) -> None:
+        """
+        Add a key to the index (The existing keys are ignored).
+        :param key: The key.
+        :return: None
+        """
+
+        if not self.buckets:
+            self.buckets.append([key])
+            self.maxes.append(key)
+            self.number_of_keys = 1
+            return
+
+        # The keys after the last bucket are added to the last bucket.
+        position: int = min(bisect.bisect_left(self.maxes, key), len(self.maxes) - 1)
+        bucket: List[str] = self.buckets[position]
+        key_position: int = bisect.bisect_left(bucket, key)
+        if key_position < len(bucket) and bucket[key_position] == key:
+            return
+        bucket.insert(key_position, key)
+        self.maxes[position] = bucket[-1]
+        self.number_of_keys += 1
+
+        if len(bucket) > 2 * self.BUCKET_SIZE:
+            bucket_size: int = self.BUCKET_SIZE
+            self.buckets[position] = bucket[:bucket_size]
+            self.buckets.insert(position + 1, bucket[bucket_size:])
+            self.maxes[position] = bucket[bucket_size - 1]
+            self.maxes.insert(position + 1, bucket[-1])
+
+    def discard(self, key: str) -> None:
+        """
+        Remove a key from the index (The not existing keys are ignored).
+        :param key: The key.
+        :return: None
+        """
+
+        position: int = bisect.bisect_left(self.maxes, key)
+        if position == len(self.maxes):
+            return
+        bucket: List[str] = self.buckets[position]
+        key_position: int = bisect.bisect_left(bucket, key)
+        if bucket[key_position] != key:
+            return
+        del bucket[key_position]
+        self.number_of_keys -= 1
+        if bucket:
+            self.maxes[position] = bucket[-1]
+        else:
+            del self.buckets[position]
+            del self.maxes[position]
+
+    def clear(self) -> None:
+        """
+        Remove all keys from the index.
+        :return: None
+        """
+
+        self.buckets = []
+        self.maxes = []
+        self.number_of_keys = 0
+
+    def copy(self) -> "SortedKeyIndex":
+        """
+        Copy the index (The buckets are copied, the keys are shared).
+        :return: The copy of the index.
+        """
+
+        key_index: SortedKeyIndex = SortedKeyIndex()
+        key_index.buckets = [bucket[:] for bucket in self.buckets]
+        key_index.maxes = self.maxes[:]
+        key_index.number_of_keys = self.number_of_keys
+        return key_index
+
+    def irange(self, start_key: str = "", end_key: Optional[str] = None) -> Iterator[str]:
+        """
+        Iterate the keys in order from a key (inclusive) to a key (exclusive).
+        :param start_key: The first key (It doesn't have to exist).
+        :param end_key: The end of the range or None for the last key.
+        :return: Iterator of the keys.
+        """
+
+        position: int = bisect.bisect_left(self.maxes, start_key)
+        for bucket_position in range(position, len(self.buckets)):
+            bucket: List[str] = self.buckets[bucket_position]
+            key_position: int = (
+                bisect.bisect_left(bucket, start_key) if bucket_position == position else 0
+            )
+            for key in bucket[key_position:]:
+                if end_key is not None and key >= end_key:
+                    return
+                yield key
+
+    def iter_prefix(self, key_prefix: str) -> Iterator[str]:
+        """
+        Iterate the keys with a prefix in order.
+        :param key_prefix: Prefix of the keys.
+        :return: Iterator of the keys.
+        """
+
+        for key in self.irange(key_prefix):
+            if not key.startswith(key_prefix):
+                return
+            yield key
@@ -0,0 +1,170 @@
+"""
+This file contains the lazy loading of the Detti DB files which use the "lazy" storage format.
+Only the index (the keys and the end offsets of the values) is read during loading,
+a value is read and decoded from the DB file when it is accessed first time.
+The decoded values are cached optionally, so the RAM usage depends on the accessed values.
+The changed values are kept in the memory until the next dump of the DB.
+The DB file is kept open, so the values are readable after the replacing of the DB file
+(The replaced file is released when the last copy of the lazily loaded DB is released).
+Usage example:
+    Code part:
+        with open("test.db", "wb") as opened_db:
+            get_serializer("lazy").dump({"test_key": "test_val"}, opened_db)
+        lazy_db = LazyDict("test.db")
+        print(len(lazy_db), lazy_db.materialized_count())
+        print(lazy_db["test_key"], lazy_db.materialized_count())
+    Output:
+        1 0
+        test_val 1
+"""
+
+import os
+import array
+from collections.abc import MutableMapping
+from threading import Lock
+from typing import Dict, Any, IO, Iterator, List, Tuple
+
+from detti_serializers import LazySerializer, get_serializer
+
+
+class LazyDict(MutableMapping):
+    """
+    Dict like view of a DB file in "lazy" storage format.
+    The not decoded values are described by their entry number in the index of the DB file.
+    """
+
+    def __init__(self, path_of_file: str, cache_values: bool = True) -> None:
+        """
+        Init method of 'LazyDict' class.
+        :param path_of_file: Path of the DB file.
+        :param cache_values: Keep the decoded values in the memory.
+        """
+
+        self.serializer: LazySerializer = get_serializer("lazy")
+        self.ends: array.array
+        self.opened_file: IO[bytes] = open(path_of_file, "rb")
+        if self.opened_file.read(len(self.serializer.header())) != self.serializer.header():
+            self.opened_file.close()
+            raise ValueError("Invalid header of '{}' storage format.".format(self.serializer.name))
+        keys: List[str]
+        keys, self.ends = self.serializer.read_index(self.opened_file)
+        # Key -> Entry number of the not decoded values.
+        self.offsets: Dict[str, int] = dict(zip(keys, range(len(keys))))
+        self.values: Dict[str, Any] = {}
+        self.cache_values: bool = cache_values
+        self.lock: Lock = Lock()
+
+    def _read_raw_value(self, entry: int) -> bytes:
+        """
+        Read an encoded value from the DB file (Thread-safe, the file position is not used).
+        :param entry: The entry number of the value in the index.
+        :return: The encoded value.
+        """
+
+        start: int = self.ends[entry - 1] if entry else len(self.serializer.header())
+        return os.pread(self.opened_file.fileno(), self.ends[entry] - start, start)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self.values[key]
+        except KeyError:
+            pass
+
+        entry: int = self.offsets.get(key)
+        if entry is None:
+            # The value may be decoded by another thread in the meantime.
+            return self.values[key]
+
+        value: Any = self.serializer.decode_value(self._read_raw_value(entry))
+        if self.cache_values:
+            with self.lock:
+                # The key may be changed or deleted by another thread in the meantime.
+                if self.offsets.pop(key, None) is not None:
+                    self.values[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self.lock:
+            self.values[key] = value
+            self.offsets.pop(key, None)
+
+    def __delitem__(self, key: str) -> None:
+        with self.lock:
+            if self.offsets.pop(key, None) is None:
+                del self.values[key]
+            else:
+                self.values.pop(key, None)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.values or key in self.offsets
+
+    def __iter__(self) -> Iterator[str]:
+        # The keys are copied, so the decoding during the iteration doesn't break it.
+        with self.lock:
+            keys: List[str] = [*self.offsets, *self.values]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return len(self.offsets) + len(self.values)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.offsets.clear()
+            self.values.clear()
+
+    def copy(self) -> "LazyDict":
+        """
+        Provide a shallow copy which shares the DB file. The values are not decoded.
+        The copy doesn't cache the decoded values (It is used for snapshots).
+        :return: LazyDict object
+        """
+
+        lazy_copy: LazyDict = LazyDict.__new__(LazyDict)
+        lazy_copy.serializer = self.serializer
+        lazy_copy.opened_file = self.opened_file
+        lazy_copy.ends = self.ends
+        with self.lock:
+            lazy_copy.offsets = dict(self.offsets)
+            lazy_copy.values = dict(self.values)
+        lazy_copy.cache_values = False
+        lazy_copy.lock = Lock()
+        return lazy_copy
+
+    def raw_items(self) -> Iterator[Tuple[str, bytes]]:
+        """
+        Provide the encoded values. The not decoded values are copied without decoding.
+        :return: Iterator of the (key, encoded value) pairs.
+        """
+
+        with self.lock:
+            offsets: List[Tuple[str, int]] = list(self.offsets.items())
+            values: List[Tuple[str, Any]] = list(self.values.items())
+        for key, entry in offsets:
+            yield key, self._read_raw_value(entry)
+        for key, value in values:
+            yield key, self.serializer.encode_value(value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Decode all values to a dict without caching them.
+        :return: The content of the DB.
+        """
+
+        with self.lock:
+            offsets: List[Tuple[str, int]] = list(self.offsets.items())
+            values: Dict[str, Any] = dict(self.values)
+        return {
+            **{
+                key: self.serializer.decode_value(self._read_raw_value(entry))
+                for key, entry in offsets
+            },
+            **values,
+        }
+
+    def materialized_count(self) -> int:
+        """
+        Provide the number of the values which are kept in the memory.
+        :return: Number of the decoded or changed values.
+        """
+
+        return len(self.values)
@@ -0,0 +1,785 @@
+"""
+This file contains the LSM-tree storage engine of the Detti DB ("lsm" storage engine).
+The writes go to an in-memory memtable which is backed by a log (See: detti_wal.py).
+A full memtable is flushed to an immutable sorted segment file, and a background thread
+merges the segments level by level (leveled compaction), so a write costs an append
+instead of a rewrite of the DB.
+Files in the DB directory:
+    memtable.log - Log of the changes of the memtable.
+    manifest.json - The segments of the levels. It is replaced atomically.
+    <id>.sst - Sorted segment files.
+Segment file layout:
+    <entries><bloom filter><sparse index><footer>
+    The entries are compact Json lines in key order: ["<key>", <value>] or ["<key>"] (deleted).
+    The sparse index contains every INDEX_INTERVAL. key and its offset,
+    so a key (or a prefix) is sought by reading only one block of the segment.
+    The bloom filter tells that a key is surely not in the segment without reading the disk.
+Levels:
+    Level 0 contains the flushed memtables (They may overlap, the newest wins).
+    Level 1 and the higher levels contain non-overlapping segments. If a level becomes too big,
+    its segments are merged into the next level. The deleted keys are dropped in the last level.
+Usage example:
+    Code part:
+        lsm_db = LsmTree("test_db_dir")
+        lsm_db["test_key"] = {"a": [1, 2]}
+        print(lsm_db["test_key"], lsm_db.search_prefix("test"))
+        lsm_db.close()
+    Output:
+        {'a': [1, 2]} {'test_key': {'a': [1, 2]}}
+"""
+
+import os
+import glob
+import json
+import heapq
+import struct
+import bisect
+import hashlib
+from collections.abc import MutableMapping
+from threading import Thread, RLock, Condition
+from typing import Dict, Any, Iterator, Optional, Tuple, List, IO, Iterable
+
+from detti_wal import WriteAheadLog
+from detti_serializers import fsync_directory
+
+# Every INDEX_INTERVAL. key of a segment is stored in the sparse index.
+INDEX_INTERVAL: int = 32
+
+# Bits per key and number of hash functions of the bloom filters (~1% false positive rate).
+BLOOM_BITS_PER_KEY: int = 10
+BLOOM_HASH_COUNT: int = 7
+
+# Footer of the segment files: (Offset of bloom filter, Offset of index, Entries, Magic)
+SEGMENT_FOOTER: struct.Struct = struct.Struct("<QQQ8s")
+SEGMENT_MAGIC: bytes = b"DETTILSM"
+
+# Marker of the deleted keys in the memtable and in the merged iterations.
+TOMBSTONE: object = object()
+
+
+class BloomFilter(object):
+    """
+    Bloom filter with double hashing.
+    """
+
+    def __init__(self, bits: bytearray) -> None:
+        """
+        Init method of 'BloomFilter' class.
+        :param bits: The bit array of the filter.
+        """
+
+        self.bits: bytearray = bits
+        self.number_of_bits: int = len(bits) * 8
+
+    @classmethod
+    def create(cls, number_of_keys: int) -> "BloomFilter":
+        """
+        Create an empty bloom filter for a number of keys.
+        :param number_of_keys: The expected number of the keys.
+        :return: BloomFilter object
+        """
+
+        return cls(bytearray(max(8, (number_of_keys * BLOOM_BITS_PER_KEY + 7) // 8)))
+
+    def _positions(self, key: str) -> Iterator[int]:
+        """
+        Provide the bit positions of a key.
+        :param key: The key.
+        :return: Iterator of the positions.
+        """
+
+        digest: bytes = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first_hash: int = int.from_bytes(digest[:8], "little")
+        second_hash: int = int.from_bytes(digest[8:], "little") | 1
+        for index in range(BLOOM_HASH_COUNT):
+            yield (first_hash + index * second_hash) % self.number_of_bits
+
+    def add(self, key: str) -> None:
+        """
+        Add a key to the filter.
+        :param key: The key.
+        :return: None
+        """
+
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, key: str) -> bool:
+        """
+        Check a key. False means that the key is surely not in the filter.
+        :param key: The key.
+        :return: False if the key is not in the filter else True
+        """
+
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key)
+        )
+
+
+class Segment(object):
+    """
+    Immutable sorted segment file.
+    The bloom filter and the sparse index are kept in the memory, the entries are read by blocks.
+    """
+
+    def __init__(self, path_of_segment: str) -> None:
+        """
+        Init method of 'Segment' class.
+        :param path_of_segment: Path of the segment file.
+        """
+
+        self.path_of_segment: str = path_of_segment
+        self.name: str = os.path.basename(path_of_segment)
+        self.opened_segment: IO[bytes] = open(path_of_segment, "rb")
+        self.size: int = os.fstat(self.opened_segment.fileno()).st_size
+        footer: Tuple[int, int, int, bytes] = SEGMENT_FOOTER.unpack(
+            os.pread(
+                self.opened_segment.fileno(), SEGMENT_FOOTER.size, self.size - SEGMENT_FOOTER.size
+            )
+        )
+        bloom_offset: int
+        index_offset: int
+        magic: bytes
+        bloom_offset, index_offset, self.entries, magic = footer
+        if magic != SEGMENT_MAGIC:
+            self.opened_segment.close()
+            raise ValueError("Invalid segment file: {}".format(path_of_segment))
+        self.data_size: int = bloom_offset
+        self.bloom: BloomFilter = BloomFilter(
+            bytearray(
+                os.pread(self.opened_segment.fileno(), index_offset - bloom_offset, bloom_offset)
+            )
+        )
+        index: Dict[str, Any] = json.loads(
+            os.pread(
+                self.opened_segment.fileno(),
+                self.size - SEGMENT_FOOTER.size - index_offset,
+                index_offset,
+            ).decode("utf-8")
+        )
+        self.index_keys: List[str] = index["keys"]
+        self.index_offsets: List[int] = index["offsets"]
+        self.min_key: str = self.index_keys[0]
+        self.max_key: str = index["max_key"]
+
+    @staticmethod
+    def encode_entry(key: str, value: Any) -> bytes:
+        """
+        Encode an entry to a line of a segment file.
+        :param key: The key.
+        :param value: The value or TOMBSTONE.
+        :return: The encoded line.
+        """
+
+        return (
+            json.dumps(
+                [key] if value is TOMBSTONE else [key, value],
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+            + b"\n"
+        )
+
+    @staticmethod
+    def write(path_of_segment: str, entries: Iterable[Tuple[str, Any]]) -> int:
+        """
+        Write a segment file from sorted entries.
+        :param path_of_segment: Path of the segment file.
+        :param entries: The (key, value or TOMBSTONE) pairs in key order.
+        :return: The written bytes.
+        """
+
+        keys: List[str] = []
+        lines: List[bytes] = []
+        for key, value in entries:
+            keys.append(key)
+            lines.append(Segment.encode_entry(key, value))
+        return Segment.write_lines(path_of_segment, keys, lines)
+
+    @staticmethod
+    def write_lines(path_of_segment: str, keys: List[str], lines: List[bytes]) -> int:
+        """
+        Write a segment file from sorted encoded entries (See: "encode_entry" method).
+        :param path_of_segment: Path of the segment file.
+        :param keys: The keys in order.
+        :param lines: The encoded entries of the keys.
+        :return: The written bytes.
+        """
+
+        bloom: BloomFilter = BloomFilter.create(len(keys))
+        index_keys: List[str] = []
+        index_offsets: List[int] = []
+        offset: int = 0
+        for position, (key, line) in enumerate(zip(keys, lines)):
+            bloom.add(key)
+            if not position % INDEX_INTERVAL:
+                index_keys.append(key)
+                index_offsets.append(offset)
+            offset += len(line)
+
+        index: bytes = json.dumps(
+            {"keys": index_keys, "offsets": index_offsets, "max_key": keys[-1]},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+        with open(path_of_segment, "wb") as opened_segment:
+            opened_segment.write(b"".join(lines))
+            opened_segment.write(bloom.bits)
+            opened_segment.write(index)
+            opened_segment.write(
+                SEGMENT_FOOTER.pack(offset, offset + len(bloom.bits), len(keys), SEGMENT_MAGIC)
+            )
+            opened_segment.flush()
+            os.fsync(opened_segment.fileno())
+            written_bytes: int = opened_segment.tell()
+        os.chmod(path_of_segment, 0o600)
+        return written_bytes
+
+    def _read_block(self, block: int) -> List[Tuple[str, Any]]:
+        """
+        Read a block of entries (between two keys of the sparse index).
+        :param block: Index of the block.
+        :return: The (key, value or TOMBSTONE) pairs of the block.
+        """
+
+        start: int = self.index_offsets[block]
+        end: int = (
+            self.index_offsets[block + 1] if block + 1 < len(self.index_offsets) else self.data_size
+        )
+        entries: List[Tuple[str, Any]] = []
+        for line in os.pread(self.opened_segment.fileno(), end - start, start).splitlines():
+            entry: List[Any] = json.loads(line.decode("utf-8"))
+            entries.append((entry[0], entry[1] if len(entry) > 1 else TOMBSTONE))
+        return entries
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a key (The bloom filter is checked first).
+        :param key: The key.
+        :return: (True if the key is in the segment, The value or TOMBSTONE)
+        """
+
+        if not self.min_key <= key <= self.max_key or not self.bloom.might_contain(key):
+            return False, None
+        for entry_key, value in self._read_block(bisect.bisect_right(self.index_keys, key) - 1):
+            if entry_key == key:
+                return True, value
+            if entry_key > key:
+                break
+        return False, None
+
+    def iter_from(self, start_key: str) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate the entries from a key (The first block is sought with the sparse index).
+        :param start_key: The first key (It doesn't have to exist).
+        :return: Iterator of the (key, value or TOMBSTONE) pairs.
+        """
+
+        block: int = max(0, bisect.bisect_right(self.index_keys, start_key) - 1)
+        for block in range(block, len(self.index_offsets)):
+            for key, value in self._read_block(block):
+                if key >= start_key:
+                    yield key, value
+
+
+class LsmTree(MutableMapping):
+    """
+    Dict like LSM-tree storage engine. The operations are thread-safe.
+    """
+
+    def __init__(
+        self,
+        path_of_db: str,
+        memtable_size: int = 10000,
+        segment_size: int = 2 * 1024 * 1024,
+        level0_trigger: int = 4,
+        level_size_ratio: int = 10,
+    ) -> None:
+        """
+        Init method of 'LsmTree' class.
+        The DB directory is created if it doesn't exist and the log of the memtable is replayed.
+        :param path_of_db: Path of the DB directory.
+        :param memtable_size: Number of the keys of a full memtable.
+        :param segment_size: The size of the segments which are written by the compaction.
+        :param level0_trigger: Number of the level 0 segments which trigger a compaction.
+        :param level_size_ratio: The size ratio of the neighbouring levels.
+        """
+
+        self.path_of_db: str = path_of_db
+        self.memtable_size: int = memtable_size
+        self.segment_size: int = segment_size
+        self.level0_trigger: int = level0_trigger
+        self.level_size_ratio: int = level_size_ratio
+        self.lock: RLock = RLock()
+        self.compaction_condition: Condition = Condition(self.lock)
+        self.closed: bool = False
+        self.memtable: Dict[str, Any] = {}
+        self.levels: List[List[Segment]] = []
+        self.next_segment_id: int = 0
+        # It is increased by every clearing. The output of a compaction which was running
+        # during a clearing is dropped (Its inputs have been cleared).
+        self.clear_epoch: int = 0
+        # Statistics of the write amplification.
+        self.user_bytes: int = 0
+        self.log_bytes: int = 0
+        self.segment_bytes: int = 0
+
+        os.makedirs(path_of_db, exist_ok=True)
+        self._load_manifest()
+
+        path_of_log: str = os.path.join(path_of_db, "memtable.log")
+        for record in WriteAheadLog.read_records(path_of_log):
+            self.memtable[record["key"]] = record["val"] if record["op"] == "set" else TOMBSTONE
+        # The log is synced by the "flush" method (The persistence mode decides when).
+        self.log: WriteAheadLog = WriteAheadLog(path_of_log, fsync_policy="never")
+        self.log.open()
+
+        self.compaction_thread: Thread = Thread(target=self._compactor, daemon=True)
+        self.compaction_thread.start()
+
+    def _manifest_path(self) -> str:
+        """
+        Provide the path of the manifest file.
+        :return: Path of the file.
+        """
+
+        return os.path.join(self.path_of_db, "manifest.json")
+
+    def _load_manifest(self) -> None:
+        """
+        Load the manifest and open the segments. The segments which are not in the manifest
+        (E.g.: crash during a flush or a compaction) are removed.
+        :return: None
+        """
+
+        names_of_levels: List[List[str]] = []
+        if os.path.isfile(self._manifest_path()):
+            with open(self._manifest_path(), "rt", encoding="utf-8") as opened_manifest:
+                manifest: Dict[str, Any] = json.load(opened_manifest)
+            names_of_levels = manifest["levels"]
+            self.next_segment_id = manifest["next_segment_id"]
+
+        self.levels = [
+            [Segment(os.path.join(self.path_of_db, name)) for name in names]
+            for names in names_of_levels
+        ]
+        used_names: List[str] = [name for names in names_of_levels for name in names]
+        for path_of_file in glob.glob(os.path.join(glob.escape(self.path_of_db), "*.sst*")):
+            if os.path.basename(path_of_file) not in used_names:
+                os.remove(path_of_file)
+
+    def _write_manifest(self) -> None:
+        """
+        Write the manifest atomically (temporary file and rename). It is called under the lock.
+        :return: None
+        """
+
+        path_of_tmp_manifest: str = "{}.tmp".format(self._manifest_path())
+        with open(path_of_tmp_manifest, "wt", encoding="utf-8") as opened_manifest:
+            json.dump(
+                {
+                    "levels": [[segment.name for segment in level] for level in self.levels],
+                    "next_segment_id": self.next_segment_id,
+                },
+                opened_manifest,
+            )
+            opened_manifest.flush()
+            os.fsync(opened_manifest.fileno())
+        os.chmod(path_of_tmp_manifest, 0o600)
+        os.replace(path_of_tmp_manifest, self._manifest_path())
+        # The new segment files and the new manifest are made durable together.
+        fsync_directory(self._manifest_path())
+
+    def _new_segment_path(self) -> str:
+        """
+        Provide the path of a new segment file. It is called under the lock.
+        :return: Path of the file.
+        """
+
+        self.next_segment_id += 1
+        return os.path.join(self.path_of_db, "{:08d}.sst".format(self.next_segment_id))
+
+    def __getitem__(self, key: str) -> Any:
+        with self.lock:
+            if key in self.memtable:
+                value: Any = self.memtable[key]
+                if value is TOMBSTONE:
+                    raise KeyError(key)
+                return value
+            levels: List[List[Segment]] = [list(level) for level in self.levels]
+
+        # The segments are immutable, so they are read without the lock.
+        for level_number, level in enumerate(levels):
+            if level_number == 0:
+                candidates: Iterable[Segment] = reversed(level)
+            else:
+                position: int = bisect.bisect_right([segment.min_key for segment in level], key)
+                candidates = [level[position - 1]] if position else []
+            for segment in candidates:
+                found: bool
+                found, value = segment.get(key)
+                if found:
+                    if value is TOMBSTONE:
+                        raise KeyError(key)
+                    return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._write({"op": "set", "key": key, "val": value})
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._write({"op": "delete", "key": key})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """
+        Append a change to the log and apply it on the memtable.
+        The full memtable is flushed to a level 0 segment.
+        :param record: The change record. Eg.: {"op": "set", "key": "a", "val": 1}
+        :return: None
+        """
+
+        with self.lock:
+            log_size: int = self.log.size
+            self.log.append(record)
+            self.log_bytes += self.log.size - log_size
+            self.user_bytes += self.log.size - log_size
+            self.memtable[record["key"]] = record["val"] if record["op"] == "set" else TOMBSTONE
+            if len(self.memtable) >= self.memtable_size:
+                self.flush_memtable()
+
+    def flush_memtable(self) -> None:
+        """
+        Write the memtable to a new level 0 segment and start a new log.
+        :return: None
+        """
+
+        with self.lock:
+            if not self.memtable:
+                return
+            path_of_segment: str = self._new_segment_path()
+            self.segment_bytes += Segment.write(path_of_segment, sorted(self.memtable.items()))
+            if not self.levels:
+                self.levels.append([])
+            self.levels[0].append(Segment(path_of_segment))
+            self._write_manifest()
+            # The flushed changes are in the segment, so the log can be emptied.
+            self.log.rotate("{}.flushed".format(self.log.path_of_wal))
+            os.remove("{}.flushed".format(self.log.path_of_wal))
+            self.memtable = {}
+            self.compaction_condition.notify()
+
+    def _level_max_size(self, level_number: int) -> int:
+        """
+        Provide the maximum size of a level (level 1 and higher).
+        :param level_number: Number of the level.
+        :return: Size in bytes.
+        """
+
+        return 4 * self.segment_size * self.level_size_ratio ** (level_number - 1)
+
+    def _pick_compaction(self) -> Optional[Tuple[int, List[Segment], List[Segment]]]:
+        """
+        Choose the next compaction. It is called under the lock.
+        :return: (Output level, Input segments of the upper level, Input segments of the output
+                 level) or None if no compaction is needed.
+        """
+
+        for level_number, level in enumerate(self.levels):
+            if level_number == 0:
+                if len(level) < self.level0_trigger:
+                    continue
+                upper_segments: List[Segment] = list(level)
+            elif sum(segment.size for segment in level) > self._level_max_size(level_number):
+                upper_segments = [level[0]]
+            else:
+                continue
+            min_key: str = min(segment.min_key for segment in upper_segments)
+            max_key: str = max(segment.max_key for segment in upper_segments)
+            lower_level: List[Segment] = (
+                self.levels[level_number + 1] if level_number + 1 < len(self.levels) else []
+            )
+            lower_segments: List[Segment] = [
+                segment
+                for segment in lower_level
+                if not (segment.max_key < min_key or segment.min_key > max_key)
+            ]
+            return level_number + 1, upper_segments, lower_segments
+        return None
+
+    def _compactor(self) -> None:
+        """
+        Target of the background compaction thread.
+        :return: None
+        """
+
+        while True:
+            with self.lock:
+                self.compaction_condition.wait_for(
+                    lambda: self.closed or self._pick_compaction() is not None
+                )
+                if self.closed:
+                    return
+                compaction: Tuple[int, List[Segment], List[Segment]] = self._pick_compaction()
+            self._compact(*compaction)
+
+    def _compact(
+        self, output_level: int, upper_segments: List[Segment], lower_segments: List[Segment]
+    ) -> None:
+        """
+        Merge segments into the output level. The merging is done without the lock,
+        the levels and the manifest are updated under the lock.
+        :param output_level: Number of the output level.
+        :param upper_segments: The segments of the upper level (newer).
+        :param lower_segments: The overlapping segments of the output level (older).
+        :return: None
+        """
+
+        with self.lock:
+            clear_epoch: int = self.clear_epoch
+            # The deleted keys can be dropped if there is no older data below the output level.
+            first_lower_level: int = output_level + 1
+            last_level: bool = all(not level for level in self.levels[first_lower_level:])
+
+        # The newer segments have lower priority numbers.
+        sources: List[Segment] = list(reversed(upper_segments)) + lower_segments
+        new_segments: List[Segment] = []
+        written_bytes: int = 0
+        keys: List[str] = []
+        lines: List[bytes] = []
+        # The size of the encoded entries (The data part of the segment file).
+        entries_size: int = 0
+        for key, value in self._merge([segment.iter_from("") for segment in sources]):
+            if value is TOMBSTONE and last_level:
+                continue
+            line: bytes = Segment.encode_entry(key, value)
+            keys.append(key)
+            lines.append(line)
+            entries_size += len(line)
+            if entries_size >= self.segment_size:
+                with self.lock:
+                    path_of_segment: str = self._new_segment_path()
+                written_bytes += Segment.write_lines(path_of_segment, keys, lines)
+                new_segments.append(Segment(path_of_segment))
+                keys, lines, entries_size = [], [], 0
+        if keys:
+            with self.lock:
+                path_of_segment = self._new_segment_path()
+            written_bytes += Segment.write_lines(path_of_segment, keys, lines)
+            new_segments.append(Segment(path_of_segment))
+
+        with self.lock:
+            self.segment_bytes += written_bytes
+            if clear_epoch != self.clear_epoch:
+                # The DB has been cleared during the merging, the output is outdated.
+                self._remove_segment_files(new_segments)
+                return
+            input_names: List[str] = [segment.name for segment in upper_segments + lower_segments]
+            while len(self.levels) <= output_level:
+                self.levels.append([])
+            for level_number in (output_level - 1, output_level):
+                self.levels[level_number] = [
+                    segment
+                    for segment in self.levels[level_number]
+                    if segment.name not in input_names
+                ]
+            self.levels[output_level] = sorted(
+                self.levels[output_level] + new_segments, key=lambda segment: segment.min_key
+            )
+            self._write_manifest()
+
+        # The removed segments may be read by a running lookup, their files are kept open.
+        self._remove_segment_files(upper_segments + lower_segments, close=False)
+
+    @staticmethod
+    def _remove_segment_files(segments: List[Segment], close: bool = True) -> None:
+        """
+        Remove the files of segments (The already removed files are skipped).
+        :param segments: The segments.
+        :param close: Close the files of the segments too.
+        :return: None
+        """
+
+        for segment in segments:
+            if close:
+                segment.opened_segment.close()
+            try:
+                os.remove(segment.path_of_segment)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _merge(sources: List[Iterator[Tuple[str, Any]]]) -> Iterator[Tuple[str, Any]]:
+        """
+        Merge sorted sources. If a key is in more sources, the earlier source wins.
+        :param sources: Sorted iterators of (key, value or TOMBSTONE) pairs (newest first).
+        :return: Sorted iterator of the (key, value or TOMBSTONE) pairs.
+        """
+
+        last_key: Optional[str] = None
+        merged: Iterator[Tuple[str, int, Any]] = heapq.merge(
+            *(
+                ((key, priority, value) for key, value in source)
+                for priority, source in enumerate(sources)
+            ),
+            key=lambda entry: (entry[0], entry[1]),
+        )
+        for key, _, value in merged:
+            if key != last_key:
+                last_key = key
+                yield key, value
+
+    def _scan(self, start_key: str = "") -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate the live keys and values in key order from a key.
+        :param start_key: The first key (It doesn't have to exist).
+        :return: Iterator of the (key, value) pairs.
+        """
+
+        with self.lock:
+            memtable: List[Tuple[str, Any]] = (
+                sorted((key, value) for key, value in self.memtable.items() if key >= start_key)
+                if self.memtable
+                else []
+            )
+            sources: List[Iterator[Tuple[str, Any]]] = [iter(memtable)]
+            for level_number, level in enumerate(self.levels):
+                segments: Iterable[Segment] = reversed(level) if level_number == 0 else level
+                sources.extend(
+                    segment.iter_from(start_key)
+                    for segment in segments
+                    if segment.max_key >= start_key
+                )
+
+        for key, value in self._merge(sources):
+            if value is not TOMBSTONE:
+                yield key, value
+
+    def irange(self, start_key: str = "", end_key: Optional[str] = None) -> Iterator[str]:
+        """
+        Iterate the keys in order from a key (inclusive) to a key (exclusive).
+        :param start_key: The first key (It doesn't have to exist).
+        :param end_key: The end of the range or None for the last key.
+        :return: Iterator of the keys.
+        """
+
+        for key, _ in self._scan(start_key):
+            if end_key is not None and key >= end_key:
+                return
+            yield key
+
+    def search_prefix(self, key_prefix: str) -> Dict[str, Any]:
+        """
+        Search the keys with a prefix. The segments are sought to the prefix with their
+        sparse index and the iteration stops at the first key after the prefix.
+        :param key_prefix: Prefix of the keys.
+        :return: The found key-value pairs.
+        """
+
+        found: Dict[str, Any] = {}
+        for key, value in self._scan(key_prefix):
+            if not key.startswith(key_prefix):
+                break
+            found[key] = value
+        return found
+
+    def __contains__(self, key: Any) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in self._scan())
+
+    def __len__(self) -> int:
+        # The deleted and the overwritten keys are known only after merging the sources.
+        return sum(1 for _ in self._scan())
+
+    def clear(self) -> None:
+        with self.lock:
+            removed_segments: List[Segment] = [
+                segment for level in self.levels for segment in level
+            ]
+            self.levels = []
+            self.memtable = {}
+            self.clear_epoch += 1
+            self._write_manifest()
+            self.log.rotate("{}.flushed".format(self.log.path_of_wal))
+            os.remove("{}.flushed".format(self.log.path_of_wal))
+        # The removed segments may be read by a running lookup or compaction.
+        self._remove_segment_files(removed_segments, close=False)
+
+    def flush(self) -> None:
+        """
+        Make the changes durable (fsync of the log).
+        :return: None
+        """
+
+        self.log.sync()
+
+    def close(self) -> None:
+        """
+        Stop the compaction thread, sync and close the log.
+        :return: None
+        """
+
+        with self.lock:
+            self.closed = True
+            self.compaction_condition.notify_all()
+        self.compaction_thread.join()
+        self.log.sync()
+        self.log.close()
+
+    def wait_for_compaction(self) -> None:
+        """
+        Wait until no compaction is needed.
+        :return: None
+        """
+
+        with self.lock:
+            self.compaction_condition.notify()
+            while self._pick_compaction() is not None:
+                self.compaction_condition.wait(0.01)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Read the complete DB to a dict.
+        :return: The content of the DB.
+        """
+
+        return dict(self._scan())
+
+    def size_on_disk(self) -> int:
+        """
+        Provide the size of the DB files.
+        :return: Size in bytes.
+        """
+
+        return sum(
+            os.path.getsize(path_of_file)
+            for path_of_file in glob.glob(os.path.join(glob.escape(self.path_of_db), "*"))
+            if os.path.isfile(path_of_file)
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Provide the statistics of the engine.
+            segments_per_level: Number of the segments per level.
+            user_bytes: The bytes of the changes (Since the opening).
+            written_bytes: The bytes written to the log and to the segments (Since the opening).
+            write_amplification: written_bytes / user_bytes
+        :return: The statistics in a dict.
+        """
+
+        with self.lock:
+            written_bytes: int = self.log_bytes + self.segment_bytes
+            return {
+                "segments_per_level": [len(level) for level in self.levels],
+                "user_bytes": self.user_bytes,
+                "written_bytes": written_bytes,
+                "write_amplification": written_bytes / self.user_bytes if self.user_bytes else 0.0,
+            }
@@ -0,0 +1,591 @@
+"""
+This file contains the memory-mapped storage engine of the Detti DB ("mmap" storage engine).
+The DB is not held in Python objects, it is stored in two memory-mapped files, so the DB can
+be bigger than the available memory (The operating system keeps only the used pages in RAM).
+Files in the DB directory:
+    table.mmap - Open-addressing hash table (linear probing) with fixed size slots.
+    heap.<generation>.mmap - Heap of the keys and the values (compact Json).
+Slot of the hash table:
+    (Hash of the key, Offset of the key, Offset of the value,
+     Length of the key, Length of the value, Capacity of the value)
+The hash 0 means empty slot and the hash 1 means deleted slot (tombstone).
+The values are updated in place if the new value fits into the capacity of the old value,
+otherwise the new value is appended to the heap. The heap is compacted when the garbage
+reaches the half of the heap. The values are decoded directly from the mapped memory
+(through "memoryview", without copying the bytes of the value).
+The compaction writes a new heap file and the hash table is replaced atomically,
+so a crash during the compaction (or the growing of the hash table) doesn't break the DB.
+The changes are made durable by the "flush" method (msync).
+Usage example:
+    Code part:
+        mmap_db = MmapHashTable("test_db_dir")
+        mmap_db["test_key"] = {"a": [1, 2]}
+        print(mmap_db["test_key"], len(mmap_db))
+        mmap_db.close()
+    Output:
+        {'a': [1, 2]} 1
+"""
+
+import os
+import glob
+import json
+import mmap
+import struct
+import hashlib
+from collections.abc import MutableMapping
+from threading import RLock
+from typing import Dict, Any, Iterator, Optional, Tuple, IO
+
+from detti_serializers import fsync_directory
+
+# Header of the hash table: (Magic, Capacity, Count, Tombstones, Generation of the heap)
+TABLE_HEADER: struct.Struct = struct.Struct("<8sQQQQ")
+TABLE_MAGIC: bytes = b"DETTIMMT"
+
+# Slot of the hash table: (Hash, Key offset, Value offset, Key length, Value length, Capacity)
+SLOT: struct.Struct = struct.Struct("<QQQIII4x")
+
+# Header of the heap: (Magic, Used bytes, Garbage bytes)
+HEAP_HEADER: struct.Struct = struct.Struct("<8sQQ")
+HEAP_MAGIC: bytes = b"DETTIMMH"
+
+EMPTY_SLOT: int = 0
+DELETED_SLOT: int = 1
+
+# The hash table is grown if the used (and deleted) slots reach this ratio.
+MAX_LOAD_FACTOR: float = 0.7
+MIN_CAPACITY: int = 1024
+MIN_HEAP_SIZE: int = 1024 * 1024
+
+
+class MmapHashTable(MutableMapping):
+    """
+    Dict like storage engine based on memory-mapped hash table and value heap files.
+    The operations are thread-safe.
+    """
+
+    def __init__(self, path_of_db: str, initial_capacity: int = MIN_CAPACITY) -> None:
+        """
+        Init method of 'MmapHashTable' class.
+        The DB directory and the files are created if they don't exist.
+        :param path_of_db: Path of the DB directory.
+        :param initial_capacity: Number of the slots of a new hash table.
+        """
+
+        self.path_of_db: str = path_of_db
+        self.lock: RLock = RLock()
+        # It is changed when the hash table is rebuilt (It breaks the running iterations).
+        self.generation: int = 0
+        self.table_file: Optional[IO[bytes]] = None
+        self.table: Optional[mmap.mmap] = None
+        self.heap_file: Optional[IO[bytes]] = None
+        self.heap: Optional[mmap.mmap] = None
+
+        os.makedirs(path_of_db, exist_ok=True)
+        if not os.path.isfile(self._table_path()):
+            self._create_heap(0)
+            self._write_table_file(max(initial_capacity, MIN_CAPACITY), 0)
+        self._open()
+
+    def _table_path(self) -> str:
+        """
+        Provide the path of the hash table file.
+        :return: Path of the file.
+        """
+
+        return os.path.join(self.path_of_db, "table.mmap")
+
+    def _heap_path(self, heap_generation: int) -> str:
+        """
+        Provide the path of a heap file.
+        :param heap_generation: Generation of the heap (It is increased by the compaction).
+        :return: Path of the file.
+        """
+
+        return os.path.join(self.path_of_db, "heap.{}.mmap".format(heap_generation))
+
+    def _create_heap(self, heap_generation: int, size: int = MIN_HEAP_SIZE) -> None:
+        """
+        Create an empty heap file.
+        :param heap_generation: Generation of the heap.
+        :param size: Size of the heap file.
+        :return: None
+        """
+
+        with open(self._heap_path(heap_generation), "wb") as opened_heap:
+            opened_heap.write(HEAP_HEADER.pack(HEAP_MAGIC, HEAP_HEADER.size, 0))
+            opened_heap.truncate(size)
+            opened_heap.flush()
+            os.fsync(opened_heap.fileno())
+        os.chmod(self._heap_path(heap_generation), 0o600)
+
+    def _write_table_file(
+        self, capacity: int, heap_generation: int, source_table: Optional[mmap.mmap] = None
+    ) -> Tuple[int, int]:
+        """
+        Write a new hash table file atomically (temporary file and rename).
+        The slots of the source hash table are inserted (The tombstones are dropped).
+        :param capacity: Number of the slots.
+        :param heap_generation: Generation of the used heap.
+        :param source_table: The hash table whose slots are copied. Default: Empty hash table.
+        :return: (Capacity, Count) of the new hash table.
+        """
+
+        path_of_tmp_table: str = "{}.tmp".format(self._table_path())
+        count: int = 0
+        with open(path_of_tmp_table, "w+b") as opened_table:
+            opened_table.truncate(TABLE_HEADER.size + capacity * SLOT.size)
+            with mmap.mmap(opened_table.fileno(), 0) as new_table:
+                for slot in self._live_slots(source_table):
+                    new_index: int = slot[0] % capacity
+                    while SLOT.unpack_from(new_table, TABLE_HEADER.size + new_index * SLOT.size)[0]:
+                        new_index = (new_index + 1) % capacity
+                    SLOT.pack_into(new_table, TABLE_HEADER.size + new_index * SLOT.size, *slot)
+                    count += 1
+                TABLE_HEADER.pack_into(
+                    new_table, 0, TABLE_MAGIC, capacity, count, 0, heap_generation
+                )
+                new_table.flush()
+        os.chmod(path_of_tmp_table, 0o600)
+        os.replace(path_of_tmp_table, self._table_path())
+        fsync_directory(self._table_path())
+        return capacity, count
+
+    @staticmethod
+    def _live_slots(table: Optional[mmap.mmap]) -> Iterator[Tuple[int, int, int, int, int, int]]:
+        """
+        Provide the used (not empty and not deleted) slots of a hash table.
+        :param table: The mapped hash table file or None.
+        :return: Iterator of the slots.
+        """
+
+        if table is None:
+            return
+        for index in range(TABLE_HEADER.unpack_from(table, 0)[1]):
+            slot: Tuple[int, int, int, int, int, int] = SLOT.unpack_from(
+                table, TABLE_HEADER.size + index * SLOT.size
+            )
+            if slot[0] > DELETED_SLOT:
+                yield slot
+
+    def _open(self) -> None:
+        """
+        Map the hash table file and its heap file. The stale files of a crash are removed.
+        :return: None
+        """
+
+        self.table_file = open(self._table_path(), "r+b")
+        self.table = mmap.mmap(self.table_file.fileno(), 0)
+        magic: bytes = TABLE_HEADER.unpack_from(self.table, 0)[0]
+        if magic != TABLE_MAGIC:
+            self._close_maps()
+            raise ValueError("Invalid hash table file: {}".format(self._table_path()))
+
+        heap_generation: int = self._header()[3]
+        for path_of_file in glob.glob(os.path.join(glob.escape(self.path_of_db), "*.mmap*")):
+            if path_of_file not in (self._table_path(), self._heap_path(heap_generation)):
+                os.remove(path_of_file)
+
+        self.heap_file = open(self._heap_path(heap_generation), "r+b")
+        self.heap = mmap.mmap(self.heap_file.fileno(), 0)
+        if HEAP_HEADER.unpack_from(self.heap, 0)[0] != HEAP_MAGIC:
+            self._close_maps()
+            raise ValueError("Invalid heap file: {}".format(self._heap_path(heap_generation)))
+
+    def _close_maps(self) -> None:
+        """
+        Close the mapped files.
+        :return: None
+        """
+
+        for mapped in (self.table, self.heap, self.table_file, self.heap_file):
+            if mapped is not None:
+                mapped.close()
+        self.table, self.heap, self.table_file, self.heap_file = None, None, None, None
+
+    def _header(self) -> Tuple[int, int, int, int]:
+        """
+        Read the header of the hash table.
+        :return: (Capacity, Count, Tombstones, Generation of the heap)
+        """
+
+        return TABLE_HEADER.unpack_from(self.table, 0)[1:]
+
+    def _set_header(self, capacity: int, count: int, tombstones: int, heap_generation: int) -> None:
+        """
+        Write the header of the hash table.
+        :return: None
+        """
+
+        TABLE_HEADER.pack_into(
+            self.table, 0, TABLE_MAGIC, capacity, count, tombstones, heap_generation
+        )
+
+    def _slot(self, index: int) -> Tuple[int, int, int, int, int, int]:
+        """
+        Read a slot of the hash table.
+        :param index: Index of the slot.
+        :return: (Hash, Key offset, Value offset, Key length, Value length, Value capacity)
+        """
+
+        return SLOT.unpack_from(self.table, TABLE_HEADER.size + index * SLOT.size)
+
+    def _set_slot(self, index: int, *slot: int) -> None:
+        """
+        Write a slot of the hash table.
+        :param index: Index of the slot.
+        :param slot: (Hash, Key offset, Value offset, Key length, Value length, Value capacity)
+        :return: None
+        """
+
+        SLOT.pack_into(self.table, TABLE_HEADER.size + index * SLOT.size, *slot)
+
+    def _read_heap(self, offset: int, length: int) -> bytes:
+        """
+        Read bytes of the heap.
+        :param offset: Offset of the bytes in the heap.
+        :param length: Number of the bytes.
+        :return: The bytes.
+        """
+
+        end: int = offset + length
+        return self.heap[offset:end]
+
+    def _write_heap(self, offset: int, data: bytes) -> None:
+        """
+        Write bytes to the heap.
+        :param offset: Offset of the bytes in the heap.
+        :param data: The bytes.
+        :return: None
+        """
+
+        end: int = offset + len(data)
+        self.heap[offset:end] = data
+
+    @staticmethod
+    def _hash(key_bytes: bytes) -> int:
+        """
+        Provide the stable 64-bit hash of a key (0 and 1 are reserved for the slot states).
+        :param key_bytes: The encoded key.
+        :return: The hash.
+        """
+
+        key_hash: int = int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), "little")
+        return key_hash if key_hash > DELETED_SLOT else key_hash + 2
+
+    def _find(self, key_bytes: bytes, key_hash: int) -> Tuple[Optional[int], int]:
+        """
+        Find the slot of a key with linear probing.
+        :param key_bytes: The encoded key.
+        :param key_hash: The hash of the key.
+        :return: (Index of the slot of the key or None, Index of the first free slot)
+        """
+
+        capacity: int = self._header()[0]
+        index: int = key_hash % capacity
+        first_free: Optional[int] = None
+        while True:
+            slot: Tuple[int, int, int, int, int, int] = self._slot(index)
+            if slot[0] == EMPTY_SLOT:
+                return None, index if first_free is None else first_free
+            if slot[0] == DELETED_SLOT:
+                if first_free is None:
+                    first_free = index
+            elif slot[0] == key_hash and self._read_heap(slot[1], slot[3]) == key_bytes:
+                return index, index
+            index = (index + 1) % capacity
+
+    def _heap_header(self) -> Tuple[int, int]:
+        """
+        Read the header of the heap.
+        :return: (Used bytes, Garbage bytes)
+        """
+
+        return HEAP_HEADER.unpack_from(self.heap, 0)[1:]
+
+    def _allocate(self, size: int) -> int:
+        """
+        Allocate space at the end of the heap (The heap file is grown if it is needed).
+        :param size: The needed bytes.
+        :return: Offset of the allocated space.
+        """
+
+        used: int
+        garbage: int
+        used, garbage = self._heap_header()
+        if used + size > len(self.heap):
+            self.heap.resize(max(len(self.heap) * 2, used + size))
+        HEAP_HEADER.pack_into(self.heap, 0, HEAP_MAGIC, used + size, garbage)
+        return used
+
+    def _add_garbage(self, size: int) -> None:
+        """
+        Register garbage bytes of the heap.
+        :param size: The released bytes.
+        :return: None
+        """
+
+        used: int
+        garbage: int
+        used, garbage = self._heap_header()
+        HEAP_HEADER.pack_into(self.heap, 0, HEAP_MAGIC, used, garbage + size)
+
+    @staticmethod
+    def _value_capacity(length: int) -> int:
+        """
+        Provide the capacity of a new value (It has a reserve for the in place updates).
+        :param length: Length of the encoded value.
+        :return: The capacity.
+        """
+
+        return (length + length // 4 + 7) // 8 * 8
+
+    def __getitem__(self, key: str) -> Any:
+        key_bytes: bytes = key.encode("utf-8")
+        with self.lock:
+            index: Optional[int] = self._find(key_bytes, self._hash(key_bytes))[0]
+            if index is None:
+                raise KeyError(key)
+            slot: Tuple[int, int, int, int, int, int] = self._slot(index)
+            # The value is decoded from the mapped memory without copying its bytes.
+            with memoryview(self.heap) as heap_view:
+                value_offset: int = slot[2]
+                value_end: int = value_offset + slot[4]
+                with heap_view[value_offset:value_end] as value_view:
+                    return json.loads(str(value_view, "utf-8"))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        key_bytes: bytes = key.encode("utf-8")
+        value_bytes: bytes = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        key_hash: int = self._hash(key_bytes)
+        with self.lock:
+            index: Optional[int]
+            free_index: int
+            index, free_index = self._find(key_bytes, key_hash)
+
+            if index is not None:
+                slot: Tuple[int, int, int, int, int, int] = self._slot(index)
+                if len(value_bytes) <= slot[5]:
+                    # In place update.
+                    self._write_heap(slot[2], value_bytes)
+                    self._set_slot(index, *slot[:4], len(value_bytes), slot[5])
+                    return
+                self._add_garbage(slot[5])
+                value_capacity: int = self._value_capacity(len(value_bytes))
+                value_offset: int = self._allocate(value_capacity)
+                self._write_heap(value_offset, value_bytes)
+                self._set_slot(
+                    index, *slot[:2], value_offset, slot[3], len(value_bytes), value_capacity
+                )
+                self._compact_if_needed()
+                return
+
+            capacity: int
+            count: int
+            tombstones: int
+            heap_generation: int
+            capacity, count, tombstones, heap_generation = self._header()
+            if (count + tombstones + 1) > capacity * MAX_LOAD_FACTOR:
+                self._rebuild(
+                    capacity * 2 if count + 1 > capacity * MAX_LOAD_FACTOR / 2 else capacity
+                )
+                free_index = self._find(key_bytes, key_hash)[1]
+                capacity, count, tombstones, heap_generation = self._header()
+
+            value_capacity = self._value_capacity(len(value_bytes))
+            key_offset: int = self._allocate(len(key_bytes) + value_capacity)
+            value_offset = key_offset + len(key_bytes)
+            self.heap[key_offset:value_offset] = key_bytes
+            self._write_heap(value_offset, value_bytes)
+            if self._slot(free_index)[0] == DELETED_SLOT:
+                tombstones -= 1
+            self._set_slot(
+                free_index,
+                key_hash,
+                key_offset,
+                value_offset,
+                len(key_bytes),
+                len(value_bytes),
+                value_capacity,
+            )
+            self._set_header(capacity, count + 1, tombstones, heap_generation)
+
+    def __delitem__(self, key: str) -> None:
+        key_bytes: bytes = key.encode("utf-8")
+        with self.lock:
+            index: Optional[int] = self._find(key_bytes, self._hash(key_bytes))[0]
+            if index is None:
+                raise KeyError(key)
+            slot: Tuple[int, int, int, int, int, int] = self._slot(index)
+            self._set_slot(index, DELETED_SLOT, 0, 0, 0, 0, 0)
+            capacity, count, tombstones, heap_generation = self._header()
+            self._set_header(capacity, count - 1, tombstones + 1, heap_generation)
+            self._add_garbage(slot[3] + slot[5])
+            self._compact_if_needed()
+
+    def __contains__(self, key: Any) -> bool:
+        if not isinstance(key, str):
+            return False
+        key_bytes: bytes = key.encode("utf-8")
+        with self.lock:
+            return self._find(key_bytes, self._hash(key_bytes))[0] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self.lock:
+            generation: int = self.generation
+            capacity: int = self._header()[0]
+        for index in range(capacity):
+            with self.lock:
+                if generation != self.generation:
+                    raise RuntimeError("The hash table has been rebuilt during the iteration.")
+                slot: Tuple[int, int, int, int, int, int] = self._slot(index)
+                if slot[0] > DELETED_SLOT:
+                    key: str = self._read_heap(slot[1], slot[3]).decode("utf-8")
+                else:
+                    continue
+            yield key
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self._header()[1]
+
+    def clear(self) -> None:
+        with self.lock:
+            heap_generation: int = self._header()[3] + 1
+            self._create_heap(heap_generation)
+            self._write_table_file(MIN_CAPACITY, heap_generation)
+            self._reopen()
+
+    def _reopen(self) -> None:
+        """
+        Remap the files after replacing them.
+        :return: None
+        """
+
+        self._close_maps()
+        self._open()
+        self.generation += 1
+
+    def _compact_if_needed(self) -> None:
+        """
+        Compact the heap if the garbage reaches the half of the heap.
+        :return: None
+        """
+
+        used: int
+        garbage: int
+        used, garbage = self._heap_header()
+        if used > MIN_HEAP_SIZE and garbage * 2 > used:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Compact the heap: The live keys and values are copied to a new heap file,
+        then the hash table which refers to the new heap is replaced atomically.
+        :return: None
+        """
+
+        with self.lock:
+            capacity: int
+            heap_generation: int
+            capacity, _, _, heap_generation = self._header()
+            self._rebuild(capacity, heap_generation + 1)
+
+    def _rebuild(self, capacity: int, heap_generation: Optional[int] = None) -> None:
+        """
+        Rebuild the hash table with a new capacity (The tombstones are dropped).
+        If the heap generation is given, the live data is copied to a new heap as well
+        and the slots of the new hash table refer to the new heap.
+        The data is streamed to the new files, so the rebuilding doesn't load the DB to RAM.
+        :param capacity: Number of the slots of the new hash table.
+        :param heap_generation: Generation of the new heap. Default: The current heap is kept.
+        :return: None
+        """
+
+        if heap_generation is None:
+            # The changes of the current heap have to be on the disk before the table is replaced.
+            self.heap.flush()
+            self._write_table_file(capacity, self._header()[3], source_table=self.table)
+            self._reopen()
+            return
+
+        path_of_heap: str = self._heap_path(heap_generation)
+        with open(path_of_heap, "w+b") as opened_heap:
+            opened_heap.write(HEAP_HEADER.pack(HEAP_MAGIC, 0, 0))
+            # The slots which refer to the new heap are collected in a temporary hash table.
+            path_of_moved_table: str = "{}.moved".format(self._table_path())
+            with open(path_of_moved_table, "w+b") as opened_moved_table:
+                number_of_slots: int = self._header()[1]
+                opened_moved_table.truncate(TABLE_HEADER.size + max(number_of_slots, 1) * SLOT.size)
+                with mmap.mmap(opened_moved_table.fileno(), 0) as moved_table:
+                    TABLE_HEADER.pack_into(
+                        moved_table, 0, TABLE_MAGIC, number_of_slots, number_of_slots, 0, 0
+                    )
+                    for index, slot in enumerate(self._live_slots(self.table)):
+                        key_hash, key_offset, value_offset, key_length, value_length, _ = slot
+                        value_capacity: int = self._value_capacity(value_length)
+                        new_key_offset: int = opened_heap.tell()
+                        opened_heap.write(self._read_heap(key_offset, key_length))
+                        opened_heap.write(self._read_heap(value_offset, value_length))
+                        opened_heap.write(bytes(value_capacity - value_length))
+                        SLOT.pack_into(
+                            moved_table,
+                            TABLE_HEADER.size + index * SLOT.size,
+                            key_hash,
+                            new_key_offset,
+                            new_key_offset + key_length,
+                            key_length,
+                            value_length,
+                            value_capacity,
+                        )
+                    used: int = opened_heap.tell()
+                    opened_heap.seek(0)
+                    opened_heap.write(HEAP_HEADER.pack(HEAP_MAGIC, used, 0))
+                    opened_heap.truncate(max(MIN_HEAP_SIZE, used * 2))
+                    opened_heap.flush()
+                    os.fsync(opened_heap.fileno())
+                    self._write_table_file(capacity, heap_generation, source_table=moved_table)
+            os.remove(path_of_moved_table)
+        os.chmod(path_of_heap, 0o600)
+        self._reopen()
+
+    def flush(self) -> None:
+        """
+        Make the changes durable (msync of the mapped files).
+        :return: None
+        """
+
+        with self.lock:
+            if self.table is not None:
+                self.heap.flush()
+                self.table.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the mapped files.
+        :return: None
+        """
+
+        with self.lock:
+            self.flush()
+            self._close_maps()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Decode the complete DB to a dict.
+        :return: The content of the DB.
+        """
+
+        with self.lock:
+            return {key: self[key] for key in self}
+
+    def size_on_disk(self) -> int:
+        """
+        Provide the size of the DB files.
+        :return: Size in bytes.
+        """
+
+        with self.lock:
+            return len(self.table) + len(self.heap)
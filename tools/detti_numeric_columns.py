@@ -0,0 +1,294 @@
+"""
+This file contains the numeric columns of the Detti DB for the aggregations.
+The int values are stored in an array('q') column and the float values (and the ints which
+don't fit in 64 bits) in an array('d') column. The columns are kept in key order in sorted
+buckets (See: detti_key_index.py), so the values of a key prefix are contiguous slices of
+the arrays and an aggregation is a C level pass over them (sum, min, max, sorted).
+The bools are not numbers (They are not stored in the columns).
+Usage example:
+    Code part:
+        numeric_columns = NumericColumns()
+        numeric_columns.set("cnt_a", 5)
+        numeric_columns.set("cnt_b", 7.5)
+        numeric_columns.set("cnt_c", "not_a_number")
+        numeric_columns.set("gauge", 100)
+        print(numeric_columns.aggregate("sum", "cnt_"), numeric_columns.aggregate("count", ""))
+    Output:
+        12.5 3
+"""
+
+import bisect
+import math
+from array import array
+from itertools import chain
+from typing import List, Iterator, Optional, Union, Tuple, Any
+
+from detti_sqlite import prefix_upper_bound
+
+# The supported aggregations.
+AGGREGATIONS: Tuple[str, ...] = ("count", "sum", "min", "max", "mean", "percentile")
+
+# Range of the values of the array('q') column.
+INT64_MIN: int = -(2 ** 63)
+INT64_MAX: int = 2 ** 63 - 1
+
+
+class NumericColumn(object):
+    """
+    Column of numbers in key order. It is not thread-safe (The DB updates it under its lock).
+    """
+
+    # Number of the values in a new bucket. A bucket is split when it is twice as big.
+    BUCKET_SIZE: int = 1000
+
+    def __init__(self, typecode: str) -> None:
+        """
+        Init method of 'NumericColumn' class.
+        :param typecode: Type code of the array of the values ("q" or "d").
+        """
+
+        self.typecode: str = typecode
+        # Sorted keys and the array of their values by bucket.
+        self.key_buckets: List[List[str]] = []
+        self.value_buckets: List[array] = []
+        # The biggest key of every bucket (The bucket of a key is found by bisection).
+        self.maxes: List[str] = []
+        self.number_of_values: int = 0
+
+    def __len__(self) -> int:
+        return self.number_of_values
+
+    def set(self, key: str, value: Union[int, float]) -> None:
+        """
+        Set the value of a key in the column.
+        :param key: The key.
+        :param value: The value.
+        :return: None
+        """
+
+        if not self.key_buckets:
+            self.key_buckets.append([key])
+            self.value_buckets.append(array(self.typecode, [value]))
+            self.maxes.append(key)
+            self.number_of_values = 1
+            return
+
+        # The keys after the last bucket are added to the last bucket.
+        position: int = min(bisect.bisect_left(self.maxes, key), len(self.maxes) - 1)
+        keys: List[str] = self.key_buckets[position]
+        values: array = self.value_buckets[position]
+        key_position: int = bisect.bisect_left(keys, key)
+        if key_position < len(keys) and keys[key_position] == key:
+            values[key_position] = value
+            return
+        keys.insert(key_position, key)
+        values.insert(key_position, value)
+        self.maxes[position] = keys[-1]
+        self.number_of_values += 1
+
+        if len(keys) > 2 * self.BUCKET_SIZE:
+            bucket_size: int = self.BUCKET_SIZE
+            self.key_buckets[position] = keys[:bucket_size]
+            self.key_buckets.insert(position + 1, keys[bucket_size:])
+            self.value_buckets[position] = values[:bucket_size]
+            self.value_buckets.insert(position + 1, values[bucket_size:])
+            self.maxes[position] = keys[bucket_size - 1]
+            self.maxes.insert(position + 1, keys[-1])
+
+    def discard(self, key: str) -> None:
+        """
+        Remove the value of a key from the column (The not existing keys are ignored).
+        :param key: The key.
+        :return: None
+        """
+
+        position: int = bisect.bisect_left(self.maxes, key)
+        if position == len(self.maxes):
+            return
+        keys: List[str] = self.key_buckets[position]
+        key_position: int = bisect.bisect_left(keys, key)
+        if keys[key_position] != key:
+            return
+        del keys[key_position]
+        del self.value_buckets[position][key_position]
+        self.number_of_values -= 1
+        if keys:
+            self.maxes[position] = keys[-1]
+        else:
+            del self.key_buckets[position]
+            del self.value_buckets[position]
+            del self.maxes[position]
+
+    def clear(self) -> None:
+        """
+        Remove all values from the column.
+        :return: None
+        """
+
+        self.key_buckets = []
+        self.value_buckets = []
+        self.maxes = []
+        self.number_of_values = 0
+
+    def prefix_slices(self, key_prefix: str) -> Iterator[array]:
+        """
+        Iterate the values of the keys with a prefix as contiguous arrays.
+        :param key_prefix: Prefix of the keys.
+        :return: Iterator of the arrays (The complete buckets are not copied).
+        """
+
+        upper_bound: Optional[str] = prefix_upper_bound(key_prefix)
+        position: int = bisect.bisect_left(self.maxes, key_prefix)
+        for bucket_position in range(position, len(self.key_buckets)):
+            keys: List[str] = self.key_buckets[bucket_position]
+            values: array = self.value_buckets[bucket_position]
+            start: int = bisect.bisect_left(keys, key_prefix) if bucket_position == position else 0
+            end: int = (
+                len(keys) if upper_bound is None else bisect.bisect_left(keys, upper_bound, start)
+            )
+            if start == 0 and end == len(keys):
+                yield values
+            elif start < end:
+                yield values[start:end]
+            if end < len(keys):
+                return
+
+
+def aggregate_arrays(
+    operation: str,
+    int_arrays: List[array],
+    float_arrays: List[array],
+    percentile: Optional[float] = None,
+) -> Optional[Union[int, float]]:
+    """
+    Aggregate the values of int and float arrays.
+    :param operation: The aggregation (See: AGGREGATIONS).
+    :param int_arrays: The arrays of the int values.
+    :param float_arrays: The arrays of the float values.
+    :param percentile: The percentile (0-100) of the "percentile" aggregation.
+    :return: The result or None if there are no values (The count and the sum are 0).
+    """
+
+    count: int = sum(len(values) for values in chain(int_arrays, float_arrays))
+    if operation == "count":
+        return count
+    if operation in ("sum", "mean"):
+        # The ints are summed exactly, the floats without accumulated rounding errors.
+        total: Union[int, float] = sum(sum(values) for values in int_arrays)
+        if float_arrays:
+            total += math.fsum(chain.from_iterable(float_arrays))
+        if operation == "sum":
+            return total
+        return total / count if count else None
+    if not count:
+        return None
+    if operation == "min":
+        return min(min(values) for values in chain(int_arrays, float_arrays) if values)
+    if operation == "max":
+        return max(max(values) for values in chain(int_arrays, float_arrays) if values)
+    if operation == "percentile":
+        # Linear interpolation between the closest ranks.
+        sorted_values: List[Union[int, float]] = sorted(
+            chain.from_iterable(chain(int_arrays, float_arrays))
+        )
+        rank: float = percentile / 100 * (count - 1)
+        lower_rank: int = math.floor(rank)
+        upper_rank: int = min(lower_rank + 1, count - 1)
+        return sorted_values[lower_rank] + (
+            sorted_values[upper_rank] - sorted_values[lower_rank]
+        ) * (rank - lower_rank)
+    raise ValueError("Unknown aggregation: {}".format(operation))
+
+
+def numeric_kind(value: Any) -> Optional[str]:
+    """
+    Provide the column of a value.
+    :param value: The value.
+    :return: "q" for the 64 bit ints, "d" for the other numbers or None for the other types.
+    """
+
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return "q" if INT64_MIN <= value <= INT64_MAX else "d"
+    if isinstance(value, float):
+        return "d"
+    return None
+
+
+class NumericColumns(object):
+    """
+    The int and float columns of the numeric values of the DB.
+    It is not thread-safe (The DB updates it under its lock).
+    """
+
+    def __init__(self) -> None:
+        """
+        Init method of 'NumericColumns' class.
+        """
+
+        self.int_column: NumericColumn = NumericColumn("q")
+        self.float_column: NumericColumn = NumericColumn("d")
+
+    def __len__(self) -> int:
+        return len(self.int_column) + len(self.float_column)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Set the value of a key (The not numeric values remove the key from the columns).
+        :param key: The key.
+        :param value: The value.
+        :return: None
+        """
+
+        kind: Optional[str] = numeric_kind(value)
+        if kind == "q":
+            self.float_column.discard(key)
+            self.int_column.set(key, value)
+            return
+        self.int_column.discard(key)
+        if kind == "d":
+            try:
+                self.float_column.set(key, float(value))
+                return
+            except OverflowError:
+                # The too big ints can't be converted to float.
+                pass
+        self.float_column.discard(key)
+
+    def discard(self, key: str) -> None:
+        """
+        Remove the value of a key from the columns.
+        :param key: The key.
+        :return: None
+        """
+
+        self.int_column.discard(key)
+        self.float_column.discard(key)
+
+    def clear(self) -> None:
+        """
+        Remove all values from the columns.
+        :return: None
+        """
+
+        self.int_column.clear()
+        self.float_column.clear()
+
+    def aggregate(
+        self, operation: str, key_prefix: str = "", percentile: Optional[float] = None
+    ) -> Optional[Union[int, float]]:
+        """
+        Aggregate the numeric values of the keys with a prefix.
+        :param operation: The aggregation (See: AGGREGATIONS).
+        :param key_prefix: Prefix of the keys.
+        :param percentile: The percentile (0-100) of the "percentile" aggregation.
+        :return: The result or None if there are no values (The count and the sum are 0).
+        """
+
+        return aggregate_arrays(
+            operation,
+            list(self.int_column.prefix_slices(key_prefix)),
+            list(self.float_column.prefix_slices(key_prefix)),
+            percentile,
+        )
@@ -0,0 +1,141 @@
+"""
+This file contains the response cache of the Detti Server.
+The cache keeps the already encoded (Json) bodies of the responses with the version of the DB
+or of the key which they were created from (See: "get_version" method of DettiDB).
+An entry is valid only if the version is still the same, so every change of the DB
+(by the server or directly by DettiDB) invalidates exactly the affected entries.
+The size of the cached bodies is bounded, the least recently used entries are evicted.
+Usage example:
+    Code part:
+        response_cache = ResponseCache(max_size=1024)
+        response_cache.put("/get/a", 3, 200, b'{"a": "1"}')
+        print(response_cache.get("/get/a", 3), response_cache.get("/get/a", 4))
+        print(response_cache.get_info())
+    Output:
+        (200, b'{"a": "1"}') None
+        {'hits': 1, 'misses': 1, 'evictions': 0, 'entries': 0, 'size': 0, 'max_size': 1024}
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+
+class ResponseCache(object):
+    """
+    LRU cache of the encoded response bodies. The operations are thread-safe.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """
+        Init method of 'ResponseCache' class.
+        :param max_size: The maximum size of the cached bodies and keys in bytes (0: disabled).
+        """
+
+        self.max_size: int = max_size
+        # Cache key (path of the request) -> (Version, status code, encoded body).
+        # The least recently used entry is the first one.
+        self.entries: "OrderedDict[str, Tuple[int, int, bytes]]" = OrderedDict()
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _size_of_entry(cache_key: str, body: bytes) -> int:
+        """
+        Provide the accounted size of an entry.
+        :param cache_key: The cache key.
+        :param body: The encoded body.
+        :return: Size in bytes.
+        """
+
+        return len(cache_key) + len(body)
+
+    def _remove(self, cache_key: str) -> None:
+        """
+        Remove an entry. It is called under the lock.
+        :param cache_key: The cache key.
+        :return: None
+        """
+
+        _, _, body = self.entries.pop(cache_key)
+        self.size -= self._size_of_entry(cache_key, body)
+
+    def get(self, cache_key: str, version: int) -> Optional[Tuple[int, bytes]]:
+        """
+        Provide a cached response if it was created from the current version.
+        :param cache_key: The cache key.
+        :param version: The current version of the DB or of the key.
+        :return: The status code and the encoded body or None (The outdated entry is removed).
+        """
+
+        with self.lock:
+            entry: Optional[Tuple[int, int, bytes]] = self.entries.get(cache_key)
+            if entry is None or entry[0] != version:
+                if entry is not None:
+                    self._remove(cache_key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, cache_key: str, version: int, status: int, body: bytes) -> None:
+        """
+        Cache an encoded response. The least recently used entries are evicted if it is needed.
+        :param cache_key: The cache key.
+        :param version: The version of the DB or of the key which the response was created from.
+        :param status: The status code of the response.
+        :param body: The encoded body of the response.
+        :return: None
+        """
+
+        size_of_entry: int = self._size_of_entry(cache_key, body)
+        if size_of_entry > self.max_size:
+            return
+
+        with self.lock:
+            if cache_key in self.entries:
+                self._remove(cache_key)
+            self.entries[cache_key] = (version, status, body)
+            self.size += size_of_entry
+            while self.size > self.max_size:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove all entries (The counters are kept).
+        :return: None
+        """
+
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def get_info(self) -> Dict[str, int]:
+        """
+        Provide the counters and the size of the cache.
+            hits: Number of the requests which were answered from the cache.
+            misses: Number of the requests which were not found in the cache (or outdated).
+            evictions: Number of the evicted entries.
+            entries: Number of the cached responses.
+            size: Size of the cached responses in bytes.
+            max_size: Maximum size of the cached responses in bytes.
+        :return: The information in a dict.
+        """
+
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "size": self.size,
+                "max_size": self.max_size,
+            }
@@ -0,0 +1,175 @@
+"""
+This file contains the search result cache of the Detti DB.
+The results of the prefix searches are cached by (search type, prefix) with LRU eviction.
+A change invalidates only the results which it can affect: a change of a key invalidates
+the cached key searches whose prefix is a prefix of the key, and the value searches whose
+prefix is a prefix of a term of the old or the new value (See: detti_value_index.py).
+Only the lengths of the cached prefixes are checked, so an invalidation costs a few lookups.
+Every cached result has a version which changes only if the result is invalidated and cached
+again (Eg.: The response cache of the server uses it instead of the version of the DB).
+Usage example:
+    Code part:
+        search_cache = SearchCache(max_entries=100)
+        search_cache.put("key", "prod_", {"prod_1": "a"}, search_cache.generation)
+        search_cache.put("key", "test_", {"test_1": "b"}, search_cache.generation)
+        search_cache.invalidate("key", ["prod_2"])
+        print(search_cache.get("key", "prod_"), search_cache.get("key", "test_"))
+    Output:
+        None {'test_1': 'b'}
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Iterable, Union
+
+
+class SearchCache(object):
+    """
+    LRU cache of the search results. It is not thread-safe (The DB uses it under its lock).
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        """
+        Init method of 'SearchCache' class.
+        :param max_entries: The maximum number of the cached results.
+        """
+
+        self.max_entries: int = max_entries
+        # (Search type, prefix) -> Result. The least recently used entry is the first one.
+        self.entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        # Search type -> Length of the cached prefixes -> Number of the cached prefixes.
+        self.prefix_lengths: Dict[str, Dict[int, int]] = {}
+        # (Search type, prefix) -> Version of the cached result. The versions are unique.
+        self.versions: Dict[Tuple[str, str], int] = {}
+        self.last_version: int = 0
+        # It is increased by every invalidation. The results of the searches which were
+        # running during an invalidation are not cached (They may be outdated).
+        self.generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.invalidations: int = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _remove(self, cache_key: Tuple[str, str]) -> None:
+        """
+        Remove a cached result.
+        :param cache_key: The search type and the prefix.
+        :return: None
+        """
+
+        del self.entries[cache_key]
+        del self.versions[cache_key]
+        search_type, prefix = cache_key
+        lengths: Dict[int, int] = self.prefix_lengths[search_type]
+        lengths[len(prefix)] -= 1
+        if not lengths[len(prefix)]:
+            del lengths[len(prefix)]
+
+    def get(self, search_type: str, prefix: str) -> Optional[Dict[str, Any]]:
+        """
+        Provide a cached result.
+        :param search_type: Type of the search. Eg.: "key" or "value"
+        :param prefix: The searched prefix.
+        :return: Copy of the cached result or None.
+        """
+
+        result: Optional[Dict[str, Any]] = self.entries.get((search_type, prefix))
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end((search_type, prefix))
+        self.hits += 1
+        return dict(result)
+
+    def put(self, search_type: str, prefix: str, result: Dict[str, Any], generation: int) -> None:
+        """
+        Cache a result. The least recently used result is evicted if the cache is full.
+        :param search_type: Type of the search.
+        :param prefix: The searched prefix.
+        :param result: The result of the search.
+        :param generation: The generation at the beginning of the search.
+        :return: None
+        """
+
+        if generation != self.generation:
+            return
+        cache_key: Tuple[str, str] = (search_type, prefix)
+        if cache_key in self.entries:
+            self._remove(cache_key)
+        self.entries[cache_key] = dict(result)
+        self.last_version += 1
+        self.versions[cache_key] = self.last_version
+        lengths: Dict[int, int] = self.prefix_lengths.setdefault(search_type, {})
+        lengths[len(prefix)] = lengths.get(len(prefix), 0) + 1
+        if len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+
+    def get_version(self, search_type: str, prefix: str) -> Optional[int]:
+        """
+        Provide the version of a cached result (The LRU order and the counters are not changed).
+        :param search_type: Type of the search.
+        :param prefix: The searched prefix.
+        :return: The version or None if the result is not cached.
+        """
+
+        return self.versions.get((search_type, prefix))
+
+    def has_entries(self, search_type: str) -> bool:
+        """
+        Check if there are cached results of a search type.
+        :param search_type: Type of the search.
+        :return: True if there are cached results.
+        """
+
+        return bool(self.prefix_lengths.get(search_type))
+
+    def invalidate(self, search_type: str, texts: Iterable[str]) -> None:
+        """
+        Remove the cached results whose prefix is a prefix of a changed text.
+        :param search_type: Type of the search.
+        :param texts: The changed texts (The key or the terms of the old and the new value).
+        :return: None
+        """
+
+        self.generation += 1
+        lengths: Dict[int, int] = self.prefix_lengths.get(search_type, {})
+        for text in texts:
+            for length in list(lengths):
+                if length <= len(text) and (search_type, text[:length]) in self.entries:
+                    self._remove((search_type, text[:length]))
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Remove all cached results (The counters are kept).
+        :return: None
+        """
+
+        self.generation += 1
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.versions.clear()
+        self.prefix_lengths.clear()
+
+    def get_info(self) -> Dict[str, Union[int, float]]:
+        """
+        Provide the counters and the size of the cache.
+            hits: Number of the searches which were answered from the cache.
+            misses: Number of the searches which were not found in the cache.
+            hit_rate: Ratio of the hits (0.0 without searches).
+            invalidations: Number of the results which were removed by changes.
+            entries: Number of the cached results.
+            max_entries: Maximum number of the cached results.
+        :return: The information in a dict.
+        """
+
+        searches: int = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / searches if searches else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+        }
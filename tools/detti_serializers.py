@@ -0,0 +1,397 @@
+"""
+This file contains the serialization backends of the Detti DB file.
+The backend can be selected with the "storage_format" parameter of the config file.
+Storage formats:
+    json_pretty - Indented Json (Human readable, the default format).
+    json - Compact Json (Without indentation and spaces).
+    marshal - Binary format of the "marshal" standard module (Fast, Python version dependent).
+    pickle - Binary format of the "pickle" standard module (Protocol 5 if it's available).
+    lazy - Offset indexed format. The values are stored one by one (compact Json) and a
+           key -> offset index is stored at the end of the file, so the DB can be
+           loaded lazily (See: detti_lazy.py).
+The binary formats start with a header (Eg.: b"DETTI:marshal\n"), so the format of a DB file
+can be detected automatically. The files without header are Json files.
+IMPORTANT: The binary formats must be loaded only from trusted DB files!
+Usage example:
+    Code part:
+        serializer = get_serializer("marshal")
+        with open("test.db", "wb") as opened_db:
+            serializer.dump({"test_key": "test_val"}, opened_db)
+        print(detect_storage_format("test.db"))
+        with open("test.db", "rb") as opened_db:
+            print(get_serializer(detect_storage_format("test.db")).load(opened_db))
+    Output:
+        marshal
+        {'test_key': 'test_val'}
+"""
+
+import io
+import os
+import sys
+import json
+import array
+import marshal
+import pickle
+import struct
+import tempfile
+from typing import Dict, Any, IO, Tuple, Optional, Iterator, List
+
+# Header prefix of the binary storage formats.
+HEADER_PREFIX: bytes = b"DETTI:"
+
+# The used pickle protocol (The protocol 5 is available from Python 3.8).
+PICKLE_PROTOCOL: int = min(5, pickle.HIGHEST_PROTOCOL)
+
+# Footer of the "lazy" storage format: (Offset of the keys, Number of the keys, Magic bytes)
+LAZY_FOOTER: struct.Struct = struct.Struct("<QQ8s")
+LAZY_FOOTER_MAGIC: bytes = b"DETTIIDX"
+
+
+class Serializer(object):
+    """
+    Base class of the serialization backends.
+    The inherited classes implement the "_dumps" and "_load" methods.
+    """
+
+    name: str = ""
+    binary: bool = False
+
+    def dump(self, db_content: Dict[str, Any], opened_file: IO[bytes]) -> None:
+        """
+        Serialize the content of the DB to a file (The header is written in binary formats).
+        :param db_content: The content of the DB.
+        :param opened_file: The file which is opened for binary writing.
+        :return: None
+        """
+
+        if self.binary:
+            opened_file.write(self.header())
+        opened_file.write(self._dumps(db_content))
+
+    def load(self, opened_file: IO[bytes]) -> Dict[str, Any]:
+        """
+        Deserialize the content of the DB from a file (The header is skipped in binary formats).
+        :param opened_file: The file which is opened for binary reading.
+        :return: The content of the DB.
+        """
+
+        if self.binary:
+            header: bytes = opened_file.read(len(self.header()))
+            if header != self.header():
+                raise ValueError("Invalid header of '{}' storage format.".format(self.name))
+        return self._load(opened_file)
+
+    def header(self) -> bytes:
+        """
+        Provide the header of the storage format.
+        :return: The header as bytes.
+        """
+
+        return HEADER_PREFIX + self.name.encode("ascii") + b"\n"
+
+    def _dumps(self, db_content: Dict[str, Any]) -> bytes:
+        """
+        Serialize the content of the DB to bytes (without header).
+        :param db_content: The content of the DB.
+        :return: The serialized content.
+        """
+
+        raise NotImplementedError
+
+    def _load(self, opened_file: IO[bytes]) -> Dict[str, Any]:
+        """
+        Deserialize the content of the DB from a file (after the header).
+        :param opened_file: The file which is opened for binary reading.
+        :return: The content of the DB.
+        """
+
+        raise NotImplementedError
+
+
+class JsonSerializer(Serializer):
+    """
+    Json serialization backend (pretty or compact).
+    """
+
+    def __init__(self, name: str, indent: int = None) -> None:
+        """
+        Init method of 'JsonSerializer' class.
+        :param name: Name of the storage format.
+        :param indent: Indentation of the Json. None means compact Json.
+        """
+
+        self.name: str = name
+        self.indent: int = indent
+        self.separators: Tuple[str, str] = (",", ": ") if indent else (",", ":")
+
+    def _dumps(self, db_content: Dict[str, Any]) -> bytes:
+        # The "dumps" uses the C encoder in case of compact Json (The "dump" doesn't use it).
+        return json.dumps(
+            db_content, ensure_ascii=False, indent=self.indent, separators=self.separators
+        ).encode("utf-8")
+
+    def _load(self, opened_file: IO[bytes]) -> Dict[str, Any]:
+        return json.load(io.TextIOWrapper(opened_file, encoding="utf-8"))
+
+
+class MarshalSerializer(Serializer):
+    """
+    Marshal serialization backend.
+    """
+
+    name: str = "marshal"
+    binary: bool = True
+
+    def _dumps(self, db_content: Dict[str, Any]) -> bytes:
+        return marshal.dumps(db_content)
+
+    def _load(self, opened_file: IO[bytes]) -> Dict[str, Any]:
+        return marshal.loads(opened_file.read())
+
+
+class PickleSerializer(Serializer):
+    """
+    Pickle serialization backend.
+    """
+
+    name: str = "pickle"
+    binary: bool = True
+
+    def _dumps(self, db_content: Dict[str, Any]) -> bytes:
+        return pickle.dumps(db_content, protocol=PICKLE_PROTOCOL)
+
+    def _load(self, opened_file: IO[bytes]) -> Dict[str, Any]:
+        return pickle.load(opened_file)
+
+
+class LazySerializer(Serializer):
+    """
+    Offset indexed serialization backend.
+    Layout:
+        <header><value_0>...<value_N-1><keys><ends><footer>
+    The values are compact Json documents which follow each other.
+    The keys are a compact Json list: ["<key_0>", ..., "<key_N-1>"]
+    The ends are the end offsets of the values (N unsigned 64-bit little-endian integers),
+    so the value of the i. key is between ends[i-1] (or the end of the header) and ends[i].
+    The footer contains the offset of the keys and the number of the keys,
+    so the index can be read without reading the values.
+    """
+
+    name: str = "lazy"
+    binary: bool = True
+
+    def dump(self, db_content: Dict[str, Any], opened_file: IO[bytes]) -> None:
+        """
+        Serialize the content of the DB to a file value by value, then write the index.
+        The not decoded values of a lazily loaded DB are copied without decoding.
+        :param db_content: The content of the DB.
+        :param opened_file: The file which is opened for binary writing.
+        :return: None
+        """
+
+        opened_file.write(self.header())
+        offset: int = len(self.header())
+        keys: List[str] = []
+        ends: array.array = array.array("Q")
+        for key, raw_value in self.raw_items(db_content):
+            opened_file.write(raw_value)
+            offset += len(raw_value)
+            keys.append(key)
+            ends.append(offset)
+        if sys.byteorder != "little":  # pragma: no cover
+            ends.byteswap()
+        opened_file.write(self.encode_value(keys))
+        opened_file.write(ends.tobytes())
+        opened_file.write(LAZY_FOOTER.pack(offset, len(keys), LAZY_FOOTER_MAGIC))
+
+    def _load(self, opened_file: IO[bytes]) -> Dict[str, Any]:
+        # The content is read after the header, so the offsets are shifted by the header.
+        header_size: int = len(self.header())
+        content: bytes = opened_file.read()
+        keys: List[str]
+        ends: array.array
+        keys, ends = self.read_index(opened_file)
+        db_content: Dict[str, Any] = {}
+        start: int = 0
+        for key, end in zip(keys, ends):
+            stop: int = end - header_size
+            db_content[key] = self.decode_value(content[start:stop])
+            start = stop
+        return db_content
+
+    def read_index(self, opened_file: IO[bytes]) -> Tuple[List[str], array.array]:
+        """
+        Read the index (the keys and the end offsets of the values) of a file.
+        :param opened_file: The file which is opened for binary reading.
+        :return: (The keys, The end offsets of the values)
+        """
+
+        opened_file.seek(-LAZY_FOOTER.size, os.SEEK_END)
+        footer_offset: int = opened_file.tell()
+        keys_offset: int
+        number_of_keys: int
+        magic: bytes
+        keys_offset, number_of_keys, magic = LAZY_FOOTER.unpack(opened_file.read(LAZY_FOOTER.size))
+        ends_offset: int = footer_offset - number_of_keys * 8
+        if magic != LAZY_FOOTER_MAGIC or not len(self.header()) <= keys_offset <= ends_offset:
+            raise ValueError("Invalid footer of '{}' storage format.".format(self.name))
+        opened_file.seek(keys_offset)
+        keys: List[str] = self.decode_value(opened_file.read(ends_offset - keys_offset))
+        ends: array.array = array.array("Q")
+        ends.frombytes(opened_file.read(number_of_keys * 8))
+        if sys.byteorder != "little":  # pragma: no cover
+            ends.byteswap()
+        return keys, ends
+
+    @staticmethod
+    def raw_items(db_content: Dict[str, Any]) -> Iterator[Tuple[str, bytes]]:
+        """
+        Provide the encoded values of a DB.
+        :param db_content: The content of the DB (A dict or a lazily loaded DB).
+        :return: Iterator of the (key, encoded value) pairs.
+        """
+
+        if hasattr(db_content, "raw_items"):
+            return db_content.raw_items()
+        return ((key, LazySerializer.encode_value(value)) for key, value in db_content.items())
+
+    @staticmethod
+    def encode_value(value: Any) -> bytes:
+        """
+        Encode a value to compact Json.
+        :param value: The value.
+        :return: The encoded value.
+        """
+
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def decode_value(raw_value: bytes) -> Any:
+        """
+        Decode a compact Json value.
+        :param raw_value: The encoded value.
+        :return: The value.
+        """
+
+        return json.loads(raw_value.decode("utf-8"))
+
+
+SERIALIZERS: Dict[str, Serializer] = {
+    "json_pretty": JsonSerializer("json_pretty", indent=4),
+    "json": JsonSerializer("json"),
+    "marshal": MarshalSerializer(),
+    "pickle": PickleSerializer(),
+    "lazy": LazySerializer(),
+}
+
+
+def get_serializer(storage_format: str) -> Serializer:
+    """
+    Provide the serialization backend of a storage format.
+    :param storage_format: Name of the storage format.
+    :return: Serializer object
+    """
+
+    if storage_format not in SERIALIZERS:
+        raise ValueError(
+            "Invalid storage format: {}. Possible: {}".format(storage_format, tuple(SERIALIZERS))
+        )
+    return SERIALIZERS[storage_format]
+
+
+def detect_storage_format(path_of_file: str) -> str:
+    """
+    Detect the storage format of a DB file based on its header.
+    The files without header (and the empty files) are Json files.
+    The indented Json files start with "{" in a separated line.
+    :param path_of_file: Path of the DB file.
+    :return: Name of the storage format.
+    """
+
+    with open(path_of_file, "rb") as opened_file:
+        first_line: bytes = opened_file.readline(64)
+
+    if first_line.startswith(HEADER_PREFIX) and first_line.endswith(b"\n"):
+        prefix_size: int = len(HEADER_PREFIX)
+        storage_format: str = first_line[prefix_size:-1].decode("ascii", "replace")
+        if storage_format in SERIALIZERS:
+            return storage_format
+        raise ValueError("Unknown storage format in the header: {}".format(storage_format))
+
+    return "json_pretty" if first_line == b"{\n" else "json"
+
+
+def load_file(path_of_file: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Load a DB file with automatic detection of the storage format.
+    :param path_of_file: Path of the DB file.
+    :return: (The content of the DB, Name of the detected storage format)
+    """
+
+    storage_format: str = detect_storage_format(path_of_file)
+    with open(path_of_file, "rb") as opened_file:
+        return get_serializer(storage_format).load(opened_file), storage_format
+
+
+def fsync_directory(path_of_file: str) -> None:
+    """
+    Sync the directory of a file, so a rename or a creation of the file is durable too
+    (The fsync of the file doesn't sync its directory entry).
+    It is skipped on the platforms which cannot open a directory (Eg.: Windows).
+    :param path_of_file: Path of the file.
+    :return: None
+    """
+
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    directory_descriptor: int = os.open(
+        os.path.dirname(os.path.abspath(path_of_file)), os.O_RDONLY | os.O_DIRECTORY
+    )
+    try:
+        os.fsync(directory_descriptor)
+    finally:
+        os.close(directory_descriptor)
+
+
+def dump_file(
+    db_content: Dict[str, Any],
+    path_of_file: str,
+    serializer: Serializer,
+    path_of_tmp_file: Optional[str] = None,
+) -> None:
+    """
+    Write the content of the DB to a file atomically.
+    The content is written to a temporary file which replaces the destination file,
+    so a reader or a crash never sees a truncated or a half-written file.
+    The directory is synced after the replacing, so the new file survives a crash.
+    The permissions of the existing destination file are kept.
+    :param db_content: The content of the DB.
+    :param path_of_file: Path of the destination file.
+    :param serializer: The serialization backend.
+    :param path_of_tmp_file: Path of the temporary file.
+                             Default: An unique file next to the destination file.
+    :return: None
+    """
+
+    file_descriptor: int
+    if path_of_tmp_file:
+        file_descriptor = os.open(path_of_tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    else:
+        file_descriptor, path_of_tmp_file = tempfile.mkstemp(
+            prefix="{}.".format(os.path.basename(path_of_file)),
+            suffix=".tmp",
+            dir=os.path.dirname(os.path.abspath(path_of_file)),
+        )
+    try:
+        with os.fdopen(file_descriptor, "wb") as opened_tmp_file:
+            serializer.dump(db_content, opened_tmp_file)
+            opened_tmp_file.flush()
+            os.fsync(opened_tmp_file.fileno())
+        if os.path.isfile(path_of_file):
+            os.chmod(path_of_tmp_file, os.stat(path_of_file).st_mode & 0o777)
+        os.replace(path_of_tmp_file, path_of_file)
+    except BaseException:
+        if os.path.isfile(path_of_tmp_file):
+            os.remove(path_of_tmp_file)
+        raise
+    fsync_directory(path_of_file)
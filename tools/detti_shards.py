@@ -0,0 +1,125 @@
+"""
+This file contains the hash-sharded on-disk layout of the Detti DB.
+In the sharded layout the "path_of_db" is a directory which contains N shard files.
+The shard of a key is selected by a stable hash (CRC32) of the key, so a change of a key
+rewrites only the shard file of the key instead of the complete DB.
+Layout:
+    <path_of_db>/detti_shards.json - Metadata of the layout. Eg.: {"shard_count": 16}
+    <path_of_db>/shard_0000.db
+    ...
+    <path_of_db>/shard_<N-1>.db
+The shard files use the same storage formats as the single DB file (See: detti_serializers.py).
+Usage example:
+    Code part:
+        print(shard_index("test_key", 16))
+        print(split_to_shards({"a": 1, "b": 2}, 2))
+    Output:
+        13
+        {0: {'b': 2}, 1: {'a': 1}}
+"""
+
+import os
+import json
+import zlib
+from typing import Dict, Any, Optional, Iterable
+
+from detti_serializers import load_file
+
+SHARDS_METADATA_FILE: str = "detti_shards.json"
+
+
+def shard_index(db_key: str, shard_count: int) -> int:
+    """
+    Provide the shard index of a key (Stable between the Python processes).
+    :param db_key: The key.
+    :param shard_count: Number of the shards.
+    :return: Index of the shard.
+    """
+
+    return zlib.crc32(db_key.encode("utf-8")) % shard_count
+
+
+def shard_file_path(path_of_db: str, index: int) -> str:
+    """
+    Provide the path of a shard file.
+    :param path_of_db: Path of the DB directory.
+    :param index: Index of the shard.
+    :return: Path of the shard file.
+    """
+
+    return os.path.join(path_of_db, "shard_{:04d}.db".format(index))
+
+
+def read_shard_count(path_of_db: str) -> Optional[int]:
+    """
+    Read the number of the shards from the metadata of a DB directory.
+    :param path_of_db: Path of the DB directory.
+    :return: Number of the shards or None if the metadata doesn't exist.
+    """
+
+    path_of_metadata: str = os.path.join(path_of_db, SHARDS_METADATA_FILE)
+    if not os.path.isfile(path_of_metadata):
+        return None
+    with open(path_of_metadata, "rt", encoding="utf-8") as opened_metadata:
+        return int(json.load(opened_metadata)["shard_count"])
+
+
+def write_shards_metadata(path_of_db: str, shard_count: int) -> None:
+    """
+    Write the metadata of a DB directory.
+    :param path_of_db: Path of the DB directory.
+    :param shard_count: Number of the shards.
+    :return: None
+    """
+
+    path_of_metadata: str = os.path.join(path_of_db, SHARDS_METADATA_FILE)
+    with open(path_of_metadata, "wt", encoding="utf-8") as opened_metadata:
+        json.dump({"shard_count": shard_count}, opened_metadata)
+    os.chmod(path_of_metadata, 0o600)
+
+
+def split_to_shards(
+    db_content: Dict[str, Any], shard_count: int, indexes: Optional[Iterable[int]] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Split the content of the DB to shards.
+    :param db_content: The content of the DB.
+    :param shard_count: Number of the shards.
+    :param indexes: The requested shards. Default: All shards.
+    :return: The content of the requested shards by shard index.
+    """
+
+    shards: Dict[int, Dict[str, Any]] = {
+        index: {} for index in (range(shard_count) if indexes is None else indexes)
+    }
+    for key, value in db_content.items():
+        index: int = shard_index(key, shard_count)
+        if index in shards:
+            shards[index][key] = value
+    return shards
+
+
+def load_shard(path_of_shard: str) -> Dict[str, Any]:
+    """
+    Load a shard file. The missing and the empty shard files are empty shards.
+    :param path_of_shard: Path of the shard file.
+    :return: The content of the shard.
+    """
+
+    if not os.path.isfile(path_of_shard) or not os.path.getsize(path_of_shard):
+        return {}
+    return load_file(path_of_shard)[0]
+
+
+def load_shards(path_of_db: str, shard_count: int) -> Dict[str, Any]:
+    """
+    Load the shard files of a DB directory.
+    :param path_of_db: Path of the DB directory.
+    :param shard_count: Number of the shards.
+    :return: The merged content of the shards.
+    """
+
+    db_content: Dict[str, Any] = {}
+    for index in range(shard_count):
+        db_content.update(load_shard(shard_file_path(path_of_db, index)))
+    return db_content
@@ -0,0 +1,282 @@
+"""
+This file contains the SQLite storage engine of the Detti DB ("sqlite" storage engine).
+The key-value pairs are stored in a table of a SQLite DB file (standard "sqlite3" module)
+in WAL journal mode, so more processes can read the DB file while it is written.
+The changes are committed in batches: "flush" commits the pending changes (The persistence
+mode decides when it is called) and a batch is committed automatically when it is full.
+The uncommitted changes are visible only for the current process.
+The values are stored by type, so the int, float, str and the Json types (list, dict, bool,
+None and the too big ints) are read back with their original type.
+Files in the DB directory:
+    detti.sqlite3 - The SQLite DB file (and its "-wal" and "-shm" files).
+Usage example:
+    Code part:
+        sqlite_db = SqliteStore("test_db_dir")
+        sqlite_db["test_key"] = 5
+        sqlite_db["test_key_2"] = [1.5, "a"]
+        print(sqlite_db["test_key"], sqlite_db.search_prefix("test_key_"))
+        sqlite_db.close()
+    Output:
+        5 {'test_key_2': [1.5, 'a']}
+"""
+
+import os
+import glob
+import json
+import sqlite3
+from collections.abc import MutableMapping
+from threading import RLock
+from typing import Dict, Any, Iterator, Optional, Tuple, List
+
+# Name of the SQLite DB file in the DB directory.
+SQLITE_FILE_NAME: str = "detti.sqlite3"
+
+# Types of the stored values. The "str", "int" and "float" values are stored natively.
+TYPE_STR: str = "s"
+TYPE_INT: str = "i"
+TYPE_FLOAT: str = "f"
+TYPE_JSON: str = "j"
+
+# Range of the integers of SQLite.
+SQLITE_INT_MIN: int = -(2 ** 63)
+SQLITE_INT_MAX: int = 2 ** 63 - 1
+
+
+def encode_value(value: Any) -> Tuple[str, Any]:
+    """
+    Encode a value to (type, SQLite value).
+    :param value: The value.
+    :return: The type and the stored value.
+    """
+
+    # The bool is an int subclass, so it is checked by exact types.
+    if type(value) is str:
+        return TYPE_STR, value
+    if type(value) is int and SQLITE_INT_MIN <= value <= SQLITE_INT_MAX:
+        return TYPE_INT, value
+    # The NaN would be stored as NULL.
+    if type(value) is float and value == value:
+        return TYPE_FLOAT, value
+    return TYPE_JSON, json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_value(value_type: str, value: Any) -> Any:
+    """
+    Decode a stored value.
+    :param value_type: Type of the value.
+    :param value: The stored value.
+    :return: The value.
+    """
+
+    if value_type == TYPE_JSON:
+        return json.loads(value)
+    return value
+
+
+def prefix_upper_bound(key_prefix: str) -> Optional[str]:
+    """
+    Provide the smallest key which is bigger than all keys with a prefix.
+    :param key_prefix: Prefix of the keys.
+    :return: The upper bound or None if there is no upper bound.
+    """
+
+    while key_prefix and ord(key_prefix[-1]) == 0x10FFFF:
+        key_prefix = key_prefix[:-1]
+    if not key_prefix:
+        return None
+    next_code_point: int = ord(key_prefix[-1]) + 1
+    # The surrogates are not valid in UTF-8, so they are skipped.
+    if 0xD800 <= next_code_point <= 0xDFFF:
+        next_code_point = 0xE000
+    return key_prefix[:-1] + chr(next_code_point)
+
+
+class SqliteStore(MutableMapping):
+    """
+    Dict like SQLite storage engine. The operations are thread-safe.
+    """
+
+    def __init__(
+        self, path_of_db: str, synchronous: str = "NORMAL", batch_size: int = 1000
+    ) -> None:
+        """
+        Init method of 'SqliteStore' class.
+        The DB directory and the table are created if they don't exist.
+        :param path_of_db: Path of the DB directory.
+        :param synchronous: The "synchronous" setting of SQLite (NORMAL or FULL).
+        :param batch_size: Number of the pending changes which are committed automatically.
+        """
+
+        self.path_of_db: str = path_of_db
+        self.batch_size: int = batch_size
+        self.pending_changes: int = 0
+        self.lock: RLock = RLock()
+
+        os.makedirs(path_of_db, exist_ok=True)
+        path_of_sqlite_db: str = os.path.join(path_of_db, SQLITE_FILE_NAME)
+        # The transactions are handled by hand (isolation_level=None).
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            path_of_sqlite_db, isolation_level=None, check_same_thread=False, timeout=30.0
+        )
+        os.chmod(path_of_sqlite_db, 0o600)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous={}".format(synchronous))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS detti "
+            "(key TEXT PRIMARY KEY, type TEXT NOT NULL, value) WITHOUT ROWID"
+        )
+
+    def _execute(self, sql: str, parameters: Tuple[Any, ...] = ()) -> sqlite3.Cursor:
+        """
+        Execute a changing statement in the current batch (transaction).
+        :param sql: The SQL statement.
+        :param parameters: The parameters of the statement.
+        :return: The cursor of the statement.
+        """
+
+        with self.lock:
+            if not self.connection.in_transaction:
+                self.connection.execute("BEGIN")
+            cursor: sqlite3.Cursor = self.connection.execute(sql, parameters)
+            self.pending_changes += 1
+            if self.pending_changes >= self.batch_size:
+                self.flush()
+            return cursor
+
+    def _query(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        """
+        Run a query. The pending changes of the current process are visible.
+        :param sql: The SQL query.
+        :param parameters: The parameters of the query.
+        :return: The result rows.
+        """
+
+        with self.lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def __getitem__(self, key: str) -> Any:
+        rows: List[Tuple[Any, ...]] = self._query(
+            "SELECT type, value FROM detti WHERE key = ?", (key,)
+        )
+        if not rows:
+            raise KeyError(key)
+        return decode_value(*rows[0])
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._execute(
+            "INSERT OR REPLACE INTO detti (key, type, value) VALUES (?, ?, ?)",
+            (key, *encode_value(value)),
+        )
+
+    def __delitem__(self, key: str) -> None:
+        if not self._execute("DELETE FROM detti WHERE key = ?", (key,)).rowcount:
+            raise KeyError(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return bool(self._query("SELECT 1 FROM detti WHERE key = ?", (key,)))
+
+    def __iter__(self) -> Iterator[str]:
+        # The keys are read at once, so the changes during the iteration don't break it.
+        return iter([row[0] for row in self._query("SELECT key FROM detti ORDER BY key")])
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM detti")[0][0]
+
+    def clear(self) -> None:
+        self._execute("DELETE FROM detti")
+
+    def irange(
+        self, start_key: str = "", end_key: Optional[str] = None, page_size: int = 1000
+    ) -> Iterator[str]:
+        """
+        Iterate the keys in order from a key (inclusive) to a key (exclusive).
+        The keys are read by pages (range queries on the key index).
+        :param start_key: The first key (It doesn't have to exist).
+        :param end_key: The end of the range or None for the last key.
+        :param page_size: Number of the keys in a page.
+        :return: Iterator of the keys.
+        """
+
+        condition: str = "key >= ?"
+        while True:
+            rows: List[Tuple[Any, ...]] = (
+                self._query(
+                    "SELECT key FROM detti WHERE {} AND key < ? ORDER BY key LIMIT ?".format(
+                        condition
+                    ),
+                    (start_key, end_key, page_size),
+                )
+                if end_key is not None
+                else self._query(
+                    "SELECT key FROM detti WHERE {} ORDER BY key LIMIT ?".format(condition),
+                    (start_key, page_size),
+                )
+            )
+            for row in rows:
+                yield row[0]
+            if len(rows) < page_size:
+                return
+            # The next page starts after the last key.
+            condition, start_key = "key > ?", rows[-1][0]
+
+    def search_prefix(self, key_prefix: str) -> Dict[str, Any]:
+        """
+        Search the keys with a prefix. It is a range query on the primary key index.
+        :param key_prefix: Prefix of the keys.
+        :return: The found key-value pairs.
+        """
+
+        upper_bound: Optional[str] = prefix_upper_bound(key_prefix)
+        rows: List[Tuple[Any, ...]] = (
+            self._query(
+                "SELECT key, type, value FROM detti WHERE key >= ? AND key < ? ORDER BY key",
+                (key_prefix, upper_bound),
+            )
+            if upper_bound is not None
+            else self._query(
+                "SELECT key, type, value FROM detti WHERE key >= ? ORDER BY key", (key_prefix,)
+            )
+        )
+        return {key: decode_value(value_type, value) for key, value_type, value in rows}
+
+    def flush(self) -> None:
+        """
+        Commit the pending changes.
+        :return: None
+        """
+
+        with self.lock:
+            if self.connection.in_transaction:
+                self.connection.execute("COMMIT")
+            self.pending_changes = 0
+
+    def close(self) -> None:
+        """
+        Commit the pending changes, checkpoint the WAL file and close the DB.
+        :return: None
+        """
+
+        with self.lock:
+            self.flush()
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.connection.close()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Read the complete DB to a dict.
+        :return: The content of the DB.
+        """
+
+        return self.search_prefix("")
+
+    def size_on_disk(self) -> int:
+        """
+        Provide the size of the DB files (with the WAL file).
+        :return: Size in bytes.
+        """
+
+        return sum(
+            os.path.getsize(path_of_file)
+            for path_of_file in glob.glob(os.path.join(glob.escape(self.path_of_db), "*"))
+            if os.path.isfile(path_of_file)
+        )
@@ -0,0 +1,190 @@
+"""
+This file contains the trigram index of the Detti DB for the substring and glob searching.
+Every indexed text is split to trigrams (3 character long substrings). The texts are padded
+with a start and an end marker, so the beginning and the end of a text have own trigrams.
+A query is split to trigrams too, the candidates are the intersection of the posting lists
+of the trigrams, and only the candidates are verified (substring check or glob matching).
+The queries without trigrams (Eg.: "ab" or "*") verify all documents.
+The documents are the keys of the DB and their texts are the key or the strings of the value.
+Usage example:
+    Code part:
+        trigram_index = TrigramIndex()
+        trigram_index.add("session:1:cart", ["session:1:cart"])
+        trigram_index.add("session:2:user", ["session:2:user"])
+        trigram_index.add("user_42", ["user_42"])
+        print(trigram_index.search_glob("session:*:cart"), trigram_index.search_substring("user"))
+    Output:
+        {'session:1:cart'} {'session:2:user', 'user_42'}
+"""
+
+import re
+import fnmatch
+from typing import Dict, Set, Tuple, Iterable, Optional, List, Callable, Pattern
+
+# Markers of the beginning and the end of the texts (They are not used in keys in practice).
+START_MARKER: str = "\x02"
+END_MARKER: str = "\x03"
+
+
+def trigrams_of(text: str) -> Set[str]:
+    """
+    Provide the trigrams of a text (without padding).
+    :param text: The text.
+    :return: The trigrams.
+    """
+
+    return {"".join(trigram) for trigram in zip(text, text[1:], text[2:])}
+
+
+def glob_fragments(pattern: str) -> List[str]:
+    """
+    Provide the literal fragments of a glob pattern (between the "*", "?" and "[...]" parts).
+    The first fragment starts with START_MARKER if the pattern starts with a literal character,
+    the last fragment ends with END_MARKER if the pattern ends with a literal character.
+    :param pattern: The glob pattern. Eg.: "session:*:cart"
+    :return: The literal fragments. Eg.: ["\\x02session:", ":cart\\x03"]
+    """
+
+    fragments: List[str] = []
+    fragment: str = START_MARKER
+    index: int = 0
+    while index < len(pattern):
+        character: str = pattern[index]
+        if character in "*?":
+            fragments.append(fragment)
+            fragment = ""
+        elif character == "[":
+            # The same bracket parsing as in "fnmatch.translate" (No closing bracket: literal).
+            closing_index: int = index + 1
+            if closing_index < len(pattern) and pattern[closing_index] == "!":
+                closing_index += 1
+            if closing_index < len(pattern) and pattern[closing_index] == "]":
+                closing_index += 1
+            while closing_index < len(pattern) and pattern[closing_index] != "]":
+                closing_index += 1
+            if closing_index >= len(pattern):
+                fragment += character
+            else:
+                fragments.append(fragment)
+                fragment = ""
+                index = closing_index
+        else:
+            fragment += character
+        index += 1
+    fragments.append(fragment + END_MARKER)
+    return [fragment for fragment in fragments if fragment not in ("", START_MARKER, END_MARKER)]
+
+
+class TrigramIndex(object):
+    """
+    Trigram index of texts. It is not thread-safe (The DB updates it under its lock).
+    """
+
+    def __init__(self) -> None:
+        """
+        Init method of 'TrigramIndex' class.
+        """
+
+        # Trigram -> Documents which have it.
+        self.postings: Dict[str, Set[str]] = {}
+        # Document -> Its texts (The candidates are verified by them).
+        self.texts_of_documents: Dict[str, Tuple[str, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.texts_of_documents)
+
+    def add(self, document: str, texts: Iterable[str]) -> None:
+        """
+        Index the texts of a document (The earlier texts of the document are removed).
+        :param document: The document (The key of the DB).
+        :param texts: The texts of the document.
+        :return: None
+        """
+
+        self.discard(document)
+        unique_texts: Tuple[str, ...] = tuple(set(texts))
+        if not unique_texts:
+            return
+        self.texts_of_documents[document] = unique_texts
+        for text in unique_texts:
+            for trigram in trigrams_of(START_MARKER + text + END_MARKER):
+                self.postings.setdefault(trigram, set()).add(document)
+
+    def discard(self, document: str) -> None:
+        """
+        Remove a document from the index.
+        :param document: The document.
+        :return: None
+        """
+
+        texts: Tuple[str, ...] = self.texts_of_documents.pop(document, ())
+        for text in texts:
+            for trigram in trigrams_of(START_MARKER + text + END_MARKER):
+                documents: Optional[Set[str]] = self.postings.get(trigram)
+                if documents is None:
+                    continue
+                documents.discard(document)
+                if not documents:
+                    del self.postings[trigram]
+
+    def clear(self) -> None:
+        """
+        Remove all documents from the index.
+        :return: None
+        """
+
+        self.postings.clear()
+        self.texts_of_documents.clear()
+
+    def _candidates(self, trigrams: Set[str]) -> Iterable[str]:
+        """
+        Provide the candidate documents of the trigrams of a query.
+        :param trigrams: The trigrams of the query.
+        :return: The intersection of the posting lists or all documents if there are no trigrams.
+        """
+
+        if not trigrams:
+            return list(self.texts_of_documents)
+        posting_lists: List[Set[str]] = sorted(
+            (self.postings.get(trigram, set()) for trigram in trigrams), key=len
+        )
+        # The intersection starts with the shortest posting list.
+        return set(posting_lists[0]).intersection(*posting_lists[1:])
+
+    def _verify(self, candidates: Iterable[str], matcher: Callable[[str], bool]) -> Set[str]:
+        """
+        Verify the candidate documents.
+        :param candidates: The candidate documents.
+        :param matcher: The matching of a text.
+        :return: The documents which have a matched text.
+        """
+
+        return {
+            document
+            for document in candidates
+            if any(matcher(text) for text in self.texts_of_documents[document])
+        }
+
+    def search_substring(self, substring: str) -> Set[str]:
+        """
+        Search the documents which have a text containing a substring.
+        :param substring: The substring.
+        :return: The found documents.
+        """
+
+        return self._verify(
+            self._candidates(trigrams_of(substring)), lambda text: substring in text
+        )
+
+    def search_glob(self, pattern: str) -> Set[str]:
+        """
+        Search the documents which have a text matching a glob pattern (See: "fnmatch" module).
+        :param pattern: The glob pattern. Eg.: "session:*:cart"
+        :return: The found documents.
+        """
+
+        trigrams: Set[str] = set()
+        for fragment in glob_fragments(pattern):
+            trigrams.update(trigrams_of(fragment))
+        regex: Pattern = re.compile(fnmatch.translate(pattern), re.DOTALL)
+        return self._verify(self._candidates(trigrams), lambda text: bool(regex.match(text)))
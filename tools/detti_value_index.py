@@ -0,0 +1,153 @@
+"""
+This file contains the value prefix index of the Detti DB.
+The indexed terms of a value are the strings of the value (with the strings in the lists and
+in the dict values at any depth) and optionally the string form of the numbers (Eg.: 128 -> "128").
+The index maps the terms to the keys whose value contains them, and the terms are kept in a
+sorted key index (See: detti_key_index.py), so a value prefix search is a range lookup.
+The index is updated incrementally (a changed value replaces the terms of its key).
+Usage example:
+    Code part:
+        value_index = ValueIndex(index_numbers=True)
+        value_index.add("a", "prod_1")
+        value_index.add("b", ["x", {"c": "prod_2"}])
+        value_index.add("c", 128)
+        print(sorted(value_index.search_prefix("prod_")), value_index.search_prefix("12"))
+    Output:
+        ['a', 'b'] {'c'}
+"""
+
+import sys
+from typing import Dict, Any, Set, Tuple, Iterator
+
+from detti_key_index import SortedKeyIndex
+
+
+def value_terms(value: Any, index_numbers: bool = False) -> Iterator[str]:
+    """
+    Provide the indexed terms of a value.
+    :param value: The value.
+    :param index_numbers: Provide the string form of the numbers (The bools are not numbers).
+    :return: Iterator of the terms (They may repeat).
+    """
+
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        if index_numbers:
+            yield str(value)
+    elif isinstance(value, list):
+        for element in value:
+            yield from value_terms(element, index_numbers)
+    elif isinstance(value, dict):
+        for element in value.values():
+            yield from value_terms(element, index_numbers)
+
+
+class ValueIndex(object):
+    """
+    Index of the value terms. It is not thread-safe (The DB updates it under its lock).
+    """
+
+    def __init__(self, index_numbers: bool = False) -> None:
+        """
+        Init method of 'ValueIndex' class.
+        :param index_numbers: Index the string form of the numbers.
+        """
+
+        self.index_numbers: bool = index_numbers
+        # Term -> Keys whose value contains the term.
+        self.postings: Dict[str, Set[str]] = {}
+        # Key -> Terms of its value (The terms are removed by them when the value changes).
+        self.terms_of_keys: Dict[str, Tuple[str, ...]] = {}
+        self.sorted_terms: SortedKeyIndex = SortedKeyIndex()
+
+    def add(self, key: str, value: Any) -> None:
+        """
+        Index the value of a key (The earlier value of the key is removed from the index).
+        :param key: The key.
+        :param value: The value.
+        :return: None
+        """
+
+        self.discard(key)
+        terms: Tuple[str, ...] = tuple(set(value_terms(value, self.index_numbers)))
+        if not terms:
+            return
+        self.terms_of_keys[key] = terms
+        for term in terms:
+            keys_of_term: Set[str] = self.postings.get(term)
+            if keys_of_term is None:
+                self.postings[term] = {key}
+                self.sorted_terms.add(term)
+            else:
+                keys_of_term.add(key)
+
+    def discard(self, key: str) -> None:
+        """
+        Remove the value of a key from the index.
+        :param key: The key.
+        :return: None
+        """
+
+        for term in self.terms_of_keys.pop(key, ()):
+            keys_of_term: Set[str] = self.postings[term]
+            keys_of_term.discard(key)
+            if not keys_of_term:
+                del self.postings[term]
+                self.sorted_terms.discard(term)
+
+    def clear(self) -> None:
+        """
+        Remove all values from the index.
+        :return: None
+        """
+
+        self.postings.clear()
+        self.terms_of_keys.clear()
+        self.sorted_terms.clear()
+
+    def search_prefix(self, value_prefix: str) -> Set[str]:
+        """
+        Search the keys whose value contains a term with a prefix.
+        :param value_prefix: Prefix of the terms.
+        :return: The found keys.
+        """
+
+        found_keys: Set[str] = set()
+        for term in self.sorted_terms.iter_prefix(value_prefix):
+            found_keys.update(self.postings[term])
+        return found_keys
+
+    def memory_usage(self) -> int:
+        """
+        Estimate the memory usage of the index (The containers and the terms of the numbers,
+        the keys and the string values are shared with the DB).
+        :return: Size in bytes.
+        """
+
+        size: int = sys.getsizeof(self.postings) + sys.getsizeof(self.terms_of_keys)
+        size += sum(sys.getsizeof(keys_of_term) for keys_of_term in self.postings.values())
+        size += sum(sys.getsizeof(terms) for terms in self.terms_of_keys.values())
+        size += sys.getsizeof(self.sorted_terms.buckets) + sys.getsizeof(self.sorted_terms.maxes)
+        size += sum(sys.getsizeof(bucket) for bucket in self.sorted_terms.buckets)
+        if self.index_numbers:
+            # The string forms of the numbers are created by the index.
+            size += sum(
+                sys.getsizeof(term) for term in self.postings if term and term[0] in "-0123456789"
+            )
+        return size
+
+    def get_info(self) -> Dict[str, int]:
+        """
+        Provide the size of the index.
+            indexed_keys: Number of the keys with indexed terms.
+            terms: Number of the different terms.
+            memory_usage: Estimated memory usage in bytes.
+        :return: The information in a dict.
+        """
+
+        return {
+            "indexed_keys": len(self.terms_of_keys),
+            "terms": len(self.postings),
+            "memory_usage": self.memory_usage(),
+        }
@@ -0,0 +1,238 @@
+"""
+This file contains the write-ahead log (WAL) related attributes of the Detti DB.
+Every change of the DB is appended to the log as a compact Json record (one record per line),
+so a change costs an append instead of a complete rewrite of the DB file.
+Record format:
+    {"op": "set", "key": "<key>", "val": <value>}
+    {"op": "delete", "key": "<key>"}
+    {"op": "clear"}
+Fsync policies:
+    always - The log file is synced to disk after every record (the safest, the slowest).
+    every_sec - The log file is synced to disk once per second by a background thread.
+    never - The syncing is left to the operating system (the fastest).
+Usage example:
+    Code part:
+        wal = WriteAheadLog("test.db.wal", fsync_policy="every_sec")
+        wal.open()
+        wal.append({"op": "set", "key": "test_key", "val": "test_val"})
+        wal.close()
+        for record in WriteAheadLog.read_records("test.db.wal"):
+            print(record)
+    Output:
+        {'op': 'set', 'key': 'test_key', 'val': 'test_val'}
+"""
+
+import os
+import json
+import shutil
+from threading import Thread, Lock, Event
+from typing import Dict, Any, Iterator, Optional, IO, Tuple
+
+from detti_serializers import fsync_directory
+
+FSYNC_POLICIES: Tuple[str, ...] = ("always", "every_sec", "never")
+
+
+class WriteAheadLog(object):
+    """
+    Append-only log of the DB changes.
+    The appending is thread-safe.
+    """
+
+    def __init__(self, path_of_wal: str, fsync_policy: str = "every_sec") -> None:
+        """
+        Init method of 'WriteAheadLog' class.
+        :param path_of_wal: Path of the log file.
+        :param fsync_policy: Fsync policy of the log. Possible: always, every_sec, never
+        """
+
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(
+                "Invalid fsync policy: {}. Possible: {}".format(fsync_policy, FSYNC_POLICIES)
+            )
+
+        self.path_of_wal: str = path_of_wal
+        self.fsync_policy: str = fsync_policy
+        self.lock: Lock = Lock()
+        # It is held during the fsync calls (The appending is not blocked by them).
+        self.sync_lock: Lock = Lock()
+        self.opened_wal: Optional[IO[bytes]] = None
+        self.size: int = 0
+        self.unsynced: bool = False
+        self.stop_event: Event = Event()
+        self.fsync_thread: Optional[Thread] = None
+
+    def open(self) -> None:
+        """
+        Open the log file for appending (The file is created if it doesn't exist).
+        A truncated last record is cut off, so the new records start in a new line.
+        The background fsync thread is started in case of "every_sec" policy.
+        :return: None
+        """
+
+        self._cut_truncated_record()
+        created: bool = not os.path.isfile(self.path_of_wal)
+        self.opened_wal = open(self.path_of_wal, "ab")
+        os.chmod(self.path_of_wal, 0o600)
+        if created:
+            fsync_directory(self.path_of_wal)
+        self.size = self.opened_wal.tell()
+
+        if self.fsync_policy == "every_sec" and not self.fsync_thread:
+            self.stop_event.clear()
+            self.fsync_thread = Thread(target=self._fsync_every_sec, daemon=True)
+            self.fsync_thread.start()
+
+    @staticmethod
+    def encode_record(record: Dict[str, Any]) -> bytes:
+        """
+        Encode a record to a line of the log.
+        :param record: The record of the change.
+        :return: The encoded line.
+        """
+
+        return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode(
+            "utf-8"
+        )
+
+    def append(
+        self, record: Dict[str, Any], line: Optional[bytes] = None, sync: bool = True
+    ) -> int:
+        """
+        Append a record to the end of the log.
+        :param record: The record of the change.
+        :param line: The already encoded record (See: "encode_record" method) or None.
+        :param sync: Sync the log in case of "always" policy. If it is False, the caller has to
+                     call the "sync" method (The fsync calls of more appends can be grouped).
+        :return: The size of the log in bytes after appending.
+        """
+
+        if line is None:
+            line = self.encode_record(record)
+
+        with self.lock:
+            self.opened_wal.write(line)
+            self.opened_wal.flush()
+            if self.fsync_policy == "always" and sync:
+                os.fsync(self.opened_wal.fileno())
+            else:
+                self.unsynced = True
+            self.size += len(line)
+            return self.size
+
+    def sync(self) -> None:
+        """
+        Sync the content of the log to the disk.
+        The records which are appended during an fsync are synced by the next call
+        (Group commit: an fsync syncs all records which were appended before it).
+        :return: None
+        """
+
+        with self.sync_lock:
+            with self.lock:
+                if not self.opened_wal or not self.unsynced:
+                    return
+                self.unsynced = False
+                fileno: int = self.opened_wal.fileno()
+            os.fsync(fileno)
+
+    def rotate(self, path_of_rotated_wal: str) -> None:
+        """
+        Rename the current log file and continue the logging in a new (empty) file.
+        It is used by the compaction. The renamed log file can be folded into the DB file.
+        If the rotated log file already exists (a previous compaction has failed),
+        the records of the current log are appended to it instead of overwriting it.
+        :param path_of_rotated_wal: The new path of the current log file.
+        :return: None
+        """
+
+        with self.sync_lock, self.lock:
+            self.opened_wal.flush()
+            os.fsync(self.opened_wal.fileno())
+            self.opened_wal.close()
+            if os.path.isfile(path_of_rotated_wal):
+                with open(path_of_rotated_wal, "ab") as opened_rotated_wal:
+                    with open(self.path_of_wal, "rb") as opened_current_wal:
+                        shutil.copyfileobj(opened_current_wal, opened_rotated_wal)
+                    opened_rotated_wal.flush()
+                    os.fsync(opened_rotated_wal.fileno())
+                os.remove(self.path_of_wal)
+            else:
+                os.replace(self.path_of_wal, path_of_rotated_wal)
+            self.opened_wal = open(self.path_of_wal, "ab")
+            os.chmod(self.path_of_wal, 0o600)
+            # The rename (or the removal) and the new log file are made durable.
+            fsync_directory(self.path_of_wal)
+            self.size = 0
+            self.unsynced = False
+
+    def close(self) -> None:
+        """
+        Sync and close the log file and stop the background fsync thread.
+        :return: None
+        """
+
+        self.stop_event.set()
+        if self.fsync_thread:
+            self.fsync_thread.join()
+            self.fsync_thread = None
+
+        with self.sync_lock, self.lock:
+            if self.opened_wal:
+                self.opened_wal.flush()
+                if self.fsync_policy != "never":
+                    os.fsync(self.opened_wal.fileno())
+                self.opened_wal.close()
+                self.opened_wal = None
+
+    def _cut_truncated_record(self) -> None:
+        """
+        Cut off the truncated last record of the log file (if there is any).
+        :return: None
+        """
+
+        if not os.path.isfile(self.path_of_wal) or not os.path.getsize(self.path_of_wal):
+            return
+
+        with open(self.path_of_wal, "r+b") as opened_wal:
+            content: bytes = opened_wal.read()
+            if content.endswith(b"\n"):
+                return
+            opened_wal.truncate(content.rfind(b"\n") + 1)
+
+    def _fsync_every_sec(self) -> None:
+        """
+        Target of the background fsync thread ("every_sec" policy).
+        :return: None
+        """
+
+        while not self.stop_event.wait(1.0):
+            self.sync()
+
+    @staticmethod
+    def read_records(path_of_wal: str) -> Iterator[Dict[str, Any]]:
+        """
+        Read the records of a log file in order.
+        A truncated last record (E.g.: crash during appending) is skipped.
+        :param path_of_wal: Path of the log file.
+        :return: Iterator of the records.
+        """
+
+        if not os.path.isfile(path_of_wal):
+            return
+
+        with open(path_of_wal, "rb") as opened_wal:
+            lines = opened_wal.read().split(b"\n")
+
+        # The last element is empty if the last record has been written completely.
+        last_index: int = len(lines) - 1
+        for index, line in enumerate(lines):
+            if not line:
+                continue
+            try:
+                yield json.loads(line.decode("utf-8"))
+            except ValueError:
+                if index == last_index:
+                    # Truncated record at the end of the log.
+                    return
+                raise
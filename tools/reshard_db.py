@@ -0,0 +1,172 @@
+"""
+This file contains the offline resharding of the Detti DB.
+The DB can be converted between the single DB file and the sharded layout (a directory of
+shard files) or between different shard counts. The shard count 0 means the single DB file.
+The storage format of the source is kept (See: detti_serializers.py).
+The new layout is written next to the source, then it replaces the source.
+The write-ahead log of the DB doesn't depend on the layout, so it is kept.
+Usage example:
+    Convert a single DB file to 16 shards:
+        >> python3 tools/reshard_db.py test.db --shard_count 16
+        > The 'test.db' DB has been resharded from 0 to 16 shards.
+    Convert the sharded DB back to a single DB file:
+        >> python3 tools/reshard_db.py test.db --shard_count 0
+        > The 'test.db' DB has been resharded from 16 to 0 shards.
+IMPORTANT: Stop the DB (and the server) before the resharding and set the new "shard_count"
+           in the config file after it!
+"""
+
+import os
+import sys
+import shutil
+import argparse
+from typing import Dict, Any, Optional, Tuple
+
+# Get the path of the directory of the current file.
+PATH_OF_FILE_DIR: str = os.path.realpath(os.path.dirname(__file__))
+
+sys.path.append(PATH_OF_FILE_DIR)
+
+from detti_serializers import (  # noqa: E402
+    get_serializer,
+    detect_storage_format,
+    load_file,
+    dump_file,
+)
+from detti_shards import (  # noqa: E402
+    shard_file_path,
+    read_shard_count,
+    write_shards_metadata,
+    split_to_shards,
+    load_shards,
+)
+
+
+def load_db(path_of_db: str) -> Tuple[Dict[str, Any], int, str]:
+    """
+    Load a single file or a sharded DB.
+    :param path_of_db: Path of the DB file or the DB directory.
+    :return: (The content of the DB, Number of the shards, Name of the storage format)
+    """
+
+    if os.path.isfile(path_of_db):
+        if not os.path.getsize(path_of_db):
+            return {}, 0, "json_pretty"
+        db_content: Dict[str, Any]
+        storage_format: str
+        db_content, storage_format = load_file(path_of_db)
+        return db_content, 0, storage_format
+
+    shard_count: Optional[int] = read_shard_count(path_of_db) if os.path.isdir(path_of_db) else None
+    if not shard_count:
+        raise FileNotFoundError("The '{}' is not a Detti DB.".format(path_of_db))
+
+    # The empty shards ("{}") look like compact Json files, so a Json based storage format is
+    # detected as compact Json only if every non-empty shard is compact Json.
+    storage_format = "json_pretty"
+    for index in range(shard_count):
+        path_of_shard: str = shard_file_path(path_of_db, index)
+        if os.path.isfile(path_of_shard) and os.path.getsize(path_of_shard):
+            storage_format = detect_storage_format(path_of_shard)
+            if storage_format != "json":
+                break
+
+    return load_shards(path_of_db, shard_count), shard_count, storage_format
+
+
+def write_db(
+    db_content: Dict[str, Any], path_of_db: str, shard_count: int, storage_format: str
+) -> None:
+    """
+    Write a DB as a single file or as a sharded DB directory.
+    :param db_content: The content of the DB.
+    :param path_of_db: Path of the DB file or the DB directory (It must not exist).
+    :param shard_count: Number of the shards. 0 means single DB file.
+    :param storage_format: Name of the storage format.
+    :return: None
+    """
+
+    if not shard_count:
+        dump_file(db_content, path_of_db, get_serializer(storage_format))
+        os.chmod(path_of_db, 0o600)
+        return
+
+    os.makedirs(path_of_db)
+    # Only the owner has permissions for DB directory
+    os.chmod(path_of_db, 0o700)
+    for index, shard_content in split_to_shards(db_content, shard_count).items():
+        dump_file(shard_content, shard_file_path(path_of_db, index), get_serializer(storage_format))
+    write_shards_metadata(path_of_db, shard_count)
+
+
+def remove_db(path_of_db: str) -> None:
+    """
+    Remove a DB file or a DB directory.
+    :param path_of_db: Path of the DB file or the DB directory.
+    :return: None
+    """
+
+    if os.path.isdir(path_of_db):
+        shutil.rmtree(path_of_db)
+    elif os.path.exists(path_of_db):
+        os.remove(path_of_db)
+
+
+def reshard_db(path_of_db: str, shard_count: int) -> int:
+    """
+    Reshard a DB in place.
+    :param path_of_db: Path of the DB file or the DB directory.
+    :param shard_count: The new number of the shards. 0 means single DB file.
+    :return: The number of the shards of the source DB.
+    """
+
+    if shard_count < 0:
+        raise ValueError("Invalid shard count: {}".format(shard_count))
+
+    db_content: Dict[str, Any]
+    source_shard_count: int
+    storage_format: str
+    db_content, source_shard_count, storage_format = load_db(path_of_db)
+
+    path_of_new_db: str = "{}.resharding".format(path_of_db)
+    path_of_old_db: str = "{}.resharded".format(path_of_db)
+    remove_db(path_of_new_db)
+    write_db(db_content, path_of_new_db, shard_count, storage_format)
+
+    remove_db(path_of_old_db)
+    os.rename(path_of_db, path_of_old_db)
+    os.rename(path_of_new_db, path_of_db)
+    remove_db(path_of_old_db)
+
+    return source_shard_count
+
+
+def main() -> None:
+    """
+    Main function of the resharding tool.
+    :return: None
+    """
+
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.RawTextHelpFormatter, description=__doc__
+    )
+    parser.add_argument("path_of_db", type=str, help="Path of the DB file or the DB directory.")
+    parser.add_argument(
+        "--shard_count",
+        dest="shard_count",
+        type=int,
+        required=True,
+        help="The new number of the shards. 0 means single DB file.",
+    )
+    args = parser.parse_args()
+
+    source_shard_count: int = reshard_db(args.path_of_db, args.shard_count)
+    print(
+        "The '{}' DB has been resharded from {} to {} shards.".format(
+            args.path_of_db, source_shard_count, args.shard_count
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()